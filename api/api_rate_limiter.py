@@ -1,8 +1,13 @@
+import asyncio
+import heapq
+import itertools
 import logging
 import time
 from datetime import datetime, timedelta
 from typing import Dict, Optional
-from enum import Enum
+from enum import Enum, IntEnum
+
+from core.config import Config
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +18,14 @@ class APILimitStatus(Enum):
     LIMITED = "limited"         # 제한됨
     RECOVERING = "recovering"   # 복구 중
 
+class APIPriority(IntEnum):
+    """API 호출 우선순위 (값이 작을수록 먼저 처리)"""
+    ORDER = 0             # 매수/매도 주문
+    STOP_LOSS = 1         # 손절/익절용 현재가·잔고 조회
+    CONDITION_SEARCH = 2  # 조건식 검색
+    STRATEGY_SCAN = 3     # 전략 스캔용 차트 조회
+    DASHBOARD = 4         # 화면 조회
+
 class APIRateLimiter:
     """API 제한 관리 시스템 - 전역 API 제한 상태 관리"""
     
@@ -28,12 +41,34 @@ class APIRateLimiter:
         self.call_history = []
         self.max_history_size = 100
         self.rate_limit_window = 60  # 1분 윈도우
-        self.max_calls_per_window = 12  # 1분당 최대 호출 수 (키움 제한 20회의 60%, 매우 안전)
+        self.max_calls_per_window = Config.KIWOOM_API_MAX_CALLS_PER_MINUTE  # 1분당 최대 호출 수 (기본 12: 키움 제한 20회의 60%, 매우 안전)
         self.min_call_interval = 5.0  # 최소 호출 간격 (초) - 매우 안전한 간격
         
         # 제한 복구 설정
         self.limit_duration_minutes = 10  # 제한 지속 시간 (분)
         self.recovery_check_interval = 300  # 복구 확인 간격 (초)
+
+        # 우선순위 토큰 버킷 스케줄러 (acquire)
+        self.bucket_capacity = max(1, Config.KIWOOM_API_BURST)
+        self.refill_rate = self.max_calls_per_window / self.rate_limit_window  # 초당 토큰
+        self._tokens = float(self.bucket_capacity)
+        self._last_refill = time.monotonic()
+        self._queue = []  # heap: [priority, seq, future, api_name, enqueued_at]
+        self._queue_seq = itertools.count()
+        self._dispatcher_task: Optional[asyncio.Task] = None
+        # 대기 시간 미지정 시 우선순위별 기본 최대 대기 (초)
+        self.default_acquire_timeouts = {
+            APIPriority.ORDER: 60,
+            APIPriority.STOP_LOSS: 120,
+            APIPriority.CONDITION_SEARCH: 180,
+            APIPriority.STRATEGY_SCAN: 300,
+            APIPriority.DASHBOARD: 30,
+        }
+        self.acquired_count = 0
+        self.timeout_count = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.wait_by_priority = {p.name: {"count": 0, "total_wait": 0.0} for p in APIPriority}
         
     def is_api_available(self) -> bool:
         """API 사용 가능 여부 확인"""
@@ -72,66 +107,136 @@ class APIRateLimiter:
             logger.error(f"🚫 [API_LIMITER_DEBUG] API 가용성 확인 오류: {e}")
             return False
     
-    def record_api_call(self, api_name: str = "unknown") -> bool:
-        """API 호출 기록 및 제한 확인"""
+    async def acquire(self, priority: APIPriority = APIPriority.DASHBOARD,
+                      api_name: str = "unknown", timeout: Optional[float] = None) -> bool:
+        """호출 허가 대기 (우선순위 큐 + 토큰 버킷)
+
+        예산이 허용하는 시점에 우선순위가 높은 요청부터 순서대로 허가한다.
+        제한(LIMITED) 상태면 해제될 때까지 대기하며(주문 제외), timeout 초과 시 False.
+        """
+        loop = asyncio.get_running_loop()
+        if timeout is None:
+            timeout = self.default_acquire_timeouts.get(APIPriority(priority), 60)
+
+        future = loop.create_future()
+        heapq.heappush(self._queue, [int(priority), next(self._queue_seq), future, api_name, time.monotonic()])
+
+        task = self._dispatcher_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._dispatcher_task = loop.create_task(self._dispatch_loop())
+
         try:
-            current_time = datetime.now()
-            logger.debug(f"🚫 [API_LIMITER_DEBUG] API 호출 기록 시작 - {api_name}")
-            
-            # 최근 호출과의 간격 확인
-            if self.call_history:
-                last_call_time = self.call_history[-1]["timestamp"]
-                time_since_last_call = (current_time - last_call_time).total_seconds()
-                logger.debug(f"🚫 [API_LIMITER_DEBUG] 마지막 호출로부터 경과: {time_since_last_call:.2f}초 (최소: {self.min_call_interval}초)")
-                
-                if time_since_last_call < self.min_call_interval:
-                    wait_time = self.min_call_interval - time_since_last_call
-                    logger.debug(f"🚫 [API_LIMITER_DEBUG] ⚠️ 호출 간격 부족 - {wait_time:.1f}초 대기 필요 (최소 간격: {self.min_call_interval}초)")
-                    return False
-            
-            # 호출 기록 추가
-            self.call_history.append({
-                "api_name": api_name,
-                "timestamp": current_time
-            })
-            logger.debug(f"🚫 [API_LIMITER_DEBUG] 호출 기록 추가 완료 - 총 기록 수: {len(self.call_history)}")
-            
-            # 기록 크기 제한
-            if len(self.call_history) > self.max_history_size:
-                self.call_history = self.call_history[-self.max_history_size:]
-                logger.debug(f"🚫 [API_LIMITER_DEBUG] 호출 기록 크기 제한 적용 - {self.max_history_size}개로 축소")
-            
-            # 윈도우 내 호출 수 확인
-            window_start = current_time - timedelta(seconds=self.rate_limit_window)
-            recent_calls = [
-                call for call in self.call_history
-                if call["timestamp"] >= window_start
-            ]
-            
-            # 현재 상태 정보 로깅
-            remaining_calls = self.max_calls_per_window - len(recent_calls)
-            usage_percent = (len(recent_calls) / self.max_calls_per_window) * 100
-            
-            logger.info(f"📊 [API_LIMITER_DEBUG] API 호출 현황 - {api_name}: {len(recent_calls)}/{self.max_calls_per_window} ({usage_percent:.1f}%), 남은 횟수: {remaining_calls}")
-            
-            if len(recent_calls) > self.max_calls_per_window:
-                logger.warning(f"🚫 [API_LIMITER_DEBUG] ❌ API 호출 한도 초과 - {len(recent_calls)}/{self.max_calls_per_window}")
-                self._trigger_rate_limit()
-                return False
-            
-            # 경고 상태 업데이트
-            if len(recent_calls) > self.max_calls_per_window * 0.8:  # 80% 이상
-                if self.status == APILimitStatus.NORMAL:
-                    self.status = APILimitStatus.WARNING
-                    logger.warning(f"🚫 [API_LIMITER_DEBUG] ⚠️ API 호출 빈도 높음 - 경고 상태 ({usage_percent:.1f}% 사용)")
-            
-            logger.debug(f"🚫 [API_LIMITER_DEBUG] ✅ API 호출 허용: {api_name}")
+            await asyncio.wait_for(future, timeout=timeout)
             return True
-            
+        except asyncio.TimeoutError:
+            self.timeout_count += 1
+            logger.warning(f"⏳ [API_LIMITER] 호출 허가 대기 시간 초과 - {api_name} "
+                           f"(우선순위: {APIPriority(priority).name}, {timeout:.0f}초, 대기열: {self.queue_depth()})")
+            return False
+
+    async def _dispatch_loop(self):
+        """대기열의 요청을 토큰이 생기는 시점마다 하나씩 허가"""
+        try:
+            while self._queue:
+                # 취소/타임아웃된 요청 정리
+                while self._queue and self._queue[0][2].done():
+                    heapq.heappop(self._queue)
+                if not self._queue:
+                    break
+
+                wait = self._seconds_until_available(self._queue[0][0])
+                if wait > 0:
+                    # 제한 해제(reset_limits) 등 상태 변화를 반영하도록 최대 1초 단위로 재확인
+                    await asyncio.sleep(min(wait, 1.0))
+                    continue
+
+                priority, _, future, api_name, enqueued_at = heapq.heappop(self._queue)
+                if future.done():
+                    continue
+
+                self._tokens -= 1
+                self._record_call(api_name, datetime.now())
+
+                waited = time.monotonic() - enqueued_at
+                self.acquired_count += 1
+                self.total_wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+                stats = self.wait_by_priority[APIPriority(priority).name]
+                stats["count"] += 1
+                stats["total_wait"] += waited
+                logger.debug(f"🚦 [API_LIMITER] 호출 허가 - {api_name} ({APIPriority(priority).name}, 대기 {waited:.2f}초)")
+                future.set_result(True)
         except Exception as e:
-            logger.error(f"🚫 [API_LIMITER_DEBUG] API 호출 기록 오류: {e}")
-            return True  # 오류 시에도 호출 허용
-    
+            logger.error(f"🚫 [API_LIMITER] 스케줄러 오류: {e}")
+            for entry in self._queue:
+                if not entry[2].done():
+                    entry[2].set_exception(e)
+            self._queue.clear()
+
+    def _seconds_until_available(self, priority: APIPriority = APIPriority.DASHBOARD) -> float:
+        """다음 호출 허가까지 남은 시간 (0이면 즉시 가능)
+
+        제한(LIMITED)은 시세/차트 조회의 429로 걸리므로 주문(ORDER)은 기다리지 않고
+        토큰 버킷/슬라이딩 윈도우로만 조절한다 (제한 중에도 손절/익절 매도가 나가도록).
+        """
+        if priority != APIPriority.ORDER:
+            remaining = self._limit_remaining()
+            if remaining > 0:
+                return max(remaining, 0.1)
+
+        now = time.monotonic()
+        self._tokens = min(self.bucket_capacity, self._tokens + (now - self._last_refill) * self.refill_rate)
+        self._last_refill = now
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.refill_rate
+
+        # 슬라이딩 윈도우 상한도 함께 지킴 (버스트 후 429 방지)
+        window_start = datetime.now() - timedelta(seconds=self.rate_limit_window)
+        recent = [call["timestamp"] for call in self.call_history if call["timestamp"] >= window_start]
+        if len(recent) >= self.max_calls_per_window:
+            return max((recent[0] - window_start).total_seconds(), 0.05)
+        return 0.0
+
+    def _limit_remaining(self) -> float:
+        """제한 해제까지 남은 초 (0이면 제한 아님)
+
+        스케줄러가 제한 중 초마다 확인하므로 is_api_available과 달리 경고 로그를 남기지 않는다.
+        """
+        if self.status != APILimitStatus.LIMITED:
+            return 0.0
+        if self.limit_until and datetime.now() < self.limit_until:
+            return (self.limit_until - datetime.now()).total_seconds()
+        self.is_api_available()  # 만료 -> 복구 모드 전환 (한 번만 로그)
+        return 0.0
+
+    def _record_call(self, api_name: str, current_time: datetime):
+        """호출 기록 추가 (기록 크기 제한 포함)"""
+        self.call_history.append({
+            "api_name": api_name,
+            "timestamp": current_time
+        })
+        if len(self.call_history) > self.max_history_size:
+            self.call_history = self.call_history[-self.max_history_size:]
+
+    def queue_depth(self) -> int:
+        return sum(1 for entry in self._queue if not entry[2].done())
+
+    def calls_available(self, within: float = 0.0) -> int:
+        """within초 안에 대기 없이 허가될 수 있는 호출 수 추정 (이미 대기 중인 요청 몫은 제외)
+
+        봉 마감 직전 선조회처럼 다른 호출을 밀어내지 않는 범위에서만 쓰는 작업의 예산 계산용
+        """
+        if not self.is_api_available():
+            return 0
+        within = max(0.0, within)
+        tokens = min(self.bucket_capacity,
+                     self._tokens + (time.monotonic() - self._last_refill) * self.refill_rate)
+        tokens += within * self.refill_rate
+        # within초 뒤에도 슬라이딩 윈도우에 남아 있을 호출
+        window_start = datetime.now() - timedelta(seconds=max(0.0, self.rate_limit_window - within))
+        recent = sum(1 for call in self.call_history if call["timestamp"] >= window_start)
+        return max(0, min(int(tokens), self.max_calls_per_window - recent) - self.queue_depth())
+
     def handle_api_error(self, error: Exception) -> bool:
         """API 오류 처리 및 제한 상태 업데이트"""
         try:
@@ -237,7 +342,24 @@ class APIRateLimiter:
                 "remaining_calls": remaining_calls,
                 "usage_percent": usage_percent,
                 "is_available": self.is_api_available(),
-                "last_warning_reset": self.last_warning_reset.isoformat()
+                "last_warning_reset": self.last_warning_reset.isoformat(),
+                "scheduler": {
+                    "queue_depth": self.queue_depth(),
+                    "queue_by_priority": {
+                        p.name: sum(1 for entry in self._queue if entry[0] == p and not entry[2].done())
+                        for p in APIPriority
+                    },
+                    "tokens": round(self._tokens, 2),
+                    "bucket_capacity": self.bucket_capacity,
+                    "acquired_count": self.acquired_count,
+                    "timeout_count": self.timeout_count,
+                    "avg_wait_seconds": round(self.total_wait_seconds / self.acquired_count, 3) if self.acquired_count else 0.0,
+                    "max_wait_seconds": round(self.max_wait_seconds, 3),
+                    "avg_wait_by_priority": {
+                        name: round(stats["total_wait"] / stats["count"], 3) if stats["count"] else 0.0
+                        for name, stats in self.wait_by_priority.items()
+                    },
+                }
             }
             
             return status_info
@@ -281,6 +403,8 @@ class APIRateLimiter:
             self.warning_count = 0
             self.last_warning_reset = datetime.now()
             self.call_history.clear()
+            self._tokens = float(self.bucket_capacity)
+            self._last_refill = time.monotonic()
             
             logger.info("🔄 [API_LIMITER] 제한 상태 수동 초기화 완료")
             
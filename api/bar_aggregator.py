@@ -0,0 +1,270 @@
+"""
+실시간 체결 -> 종목별 1분봉 집계 (tick_store 리스너, 링 버퍼, 봉 마감 이벤트)
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from api.candles import CandleSeries, PRICE_DTYPE, VOLUME_DTYPE, from_epoch, to_epoch
+from api.tick_store import Tick, tick_store
+
+logger = logging.getLogger(__name__)
+
+
+class Bar:
+    """완성된(또는 형성 중인) 1분봉"""
+
+    __slots__ = ("stock_code", "ts", "open", "high", "low", "close", "volume", "vwap")
+
+    def __init__(self, stock_code: str, ts: int, open_: int, high: int, low: int,
+                 close: int, volume: int, vwap: float):
+        self.stock_code = stock_code
+        self.ts = ts            # 봉 시작 시각 (epoch 초, api.candles.to_epoch 기준)
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.vwap = vwap
+
+    @property
+    def timestamp(self) -> datetime:
+        return from_epoch(self.ts)
+
+    def to_dict(self) -> Dict:
+        return {
+            "stock_code": self.stock_code,
+            "timestamp": self.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+            "vwap": round(self.vwap, 2),
+        }
+
+
+class SymbolBars:
+    """종목별 1분봉 링 버퍼 (완성 봉 capacity개 + 형성 중인 봉 1개)"""
+
+    def __init__(self, stock_code: str, capacity: int):
+        self.stock_code = stock_code
+        self.capacity = capacity
+        self.ts = np.zeros(capacity, dtype=np.int64)
+        self.open = np.zeros(capacity, dtype=PRICE_DTYPE)
+        self.high = np.zeros(capacity, dtype=PRICE_DTYPE)
+        self.low = np.zeros(capacity, dtype=PRICE_DTYPE)
+        self.close = np.zeros(capacity, dtype=PRICE_DTYPE)
+        self.volume = np.zeros(capacity, dtype=VOLUME_DTYPE)
+        self.vwap = np.zeros(capacity, dtype=np.float64)
+        self.head = 0       # 다음에 쓸 위치
+        self.count = 0      # 보관 중인 완성 봉 수
+
+        # 형성 중인 봉 [시각, 시가, 고가, 저가, 종가, 거래량, 거래대금]
+        self.forming: Optional[list] = None
+        # 마지막으로 마감한 봉 시각 - 이 분 이하의 지연 체결은 버림 (같은 분 봉이 두 번 생기지 않도록)
+        self.last_closed: Optional[int] = None
+        self.late_trades = 0
+        # 이 시각 이후 봉은 체결을 빠짐없이 받은 완전한 봉 (첫 봉은 구독 도중 시작되어 제외)
+        self.complete_since: Optional[int] = None
+        self.version = 0    # 체결/마감마다 증가 (소비자 변경 감지용)
+
+    def add_trade(self, minute: int, price: int, volume: int) -> Optional[Bar]:
+        """체결 반영 - 분이 바뀌면 이전 봉을 마감해 반환"""
+        closed = None
+        bar = self.forming
+        if (bar is not None and minute < bar[0]) or (self.last_closed is not None and minute <= self.last_closed):
+            self.late_trades += 1
+            return None  # 지난 분(이미 마감된 봉 포함)의 지연 체결은 무시
+        if bar is not None and minute > bar[0]:
+            closed = self.close_forming()
+            bar = None
+        if bar is None:
+            if self.complete_since is None:
+                self.complete_since = minute + 60
+            self.forming = [minute, price, price, price, price, volume, price * volume]
+        else:
+            bar[2] = max(bar[2], price)
+            bar[3] = min(bar[3], price)
+            bar[4] = price
+            bar[5] += volume
+            bar[6] += price * volume
+        self.version += 1
+        return closed
+
+    def close_forming(self) -> Optional[Bar]:
+        """형성 중인 봉을 링 버퍼로 옮기고 반환"""
+        bar = self.forming
+        if bar is None:
+            return None
+        self.forming = None
+        self.last_closed = bar[0]
+        i = self.head
+        if self.count == self.capacity:
+            # 가장 오래된 봉을 덮어쓰므로 그 이후부터만 완전한 구간으로 인정
+            self.complete_since = max(self.complete_since or 0, int(self.ts[i]) + 60)
+        ts, o, h, l, c, v, turnover = bar
+        vwap = turnover / v if v else float(c)
+        self.ts[i], self.open[i], self.high[i], self.low[i], self.close[i] = ts, o, h, l, c
+        self.volume[i], self.vwap[i] = v, vwap
+        self.head = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.version += 1
+        return Bar(self.stock_code, ts, o, h, l, c, v, vwap)
+
+    def _ordered(self, array: np.ndarray) -> np.ndarray:
+        if self.count < self.capacity:
+            return array[:self.count]
+        return np.concatenate([array[self.head:], array[:self.head]])
+
+    def series(self, include_forming: bool = True) -> CandleSeries:
+        """보관 중인 봉을 시간 오름차순 CandleSeries로 (형성 중인 봉 포함 가능)"""
+        columns = [self._ordered(a) for a in (self.ts, self.open, self.high, self.low, self.close, self.volume)]
+        if include_forming and self.forming is not None:
+            columns = [np.append(col, value) for col, value in zip(columns, self.forming[:6])]
+        return CandleSeries(self.stock_code, "1M", *columns)
+
+    def vwaps(self) -> np.ndarray:
+        """완성 봉의 VWAP (series(include_forming=False)와 같은 순서)"""
+        return self._ordered(self.vwap).copy()
+
+    def forming_bar(self) -> Optional[Bar]:
+        if self.forming is None:
+            return None
+        ts, o, h, l, c, v, turnover = self.forming
+        return Bar(self.stock_code, ts, o, h, l, c, v, turnover / v if v else float(c))
+
+
+class BarAggregator:
+    """실시간 체결 -> 1분봉 집계기
+
+    tick_store 리스너로 체결을 받아 종목별 형성 중인 1분봉(OHLCV, VWAP)을 갱신하고,
+    분이 바뀌면 봉을 링 버퍼로 마감하며 봉 마감 리스너에 통지한다.
+    체결이 뜸한 종목도 제때 마감되도록 1초마다 지난 분의 봉을 정리한다.
+    """
+
+    def __init__(self, capacity: int = 900, flush_interval: float = 1.0):
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._symbols: Dict[str, SymbolBars] = {}
+        self._listeners: List[Callable[[Bar], None]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self.tick_count = 0
+        self.closed_count = 0
+
+    def start(self):
+        """tick_store 리스너 등록 및 마감 정리 태스크 시작"""
+        tick_store.add_listener(self.on_tick)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info("🕯️ [BAR_AGGREGATOR] 실시간 1분봉 집계 시작")
+
+    async def stop(self):
+        tick_store.remove_listener(self.on_tick)
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        logger.info("🕯️ [BAR_AGGREGATOR] 실시간 1분봉 집계 중지")
+
+    def on_tick(self, tick: Tick):
+        """tick_store 리스너 - 체결 1건 반영"""
+        if not tick.volume:
+            return
+        symbol = self._symbols.get(tick.stock_code)
+        if symbol is None:
+            symbol = self._symbols[tick.stock_code] = SymbolBars(tick.stock_code, self.capacity)
+        epoch = to_epoch(tick.timestamp)
+        closed = symbol.add_trade(epoch - epoch % 60, tick.price, tick.volume)
+        self.tick_count += 1
+        if closed is not None:
+            self._emit(closed)
+
+    def flush(self, now: Optional[datetime] = None):
+        """지난 분의 형성 중인 봉을 모두 마감"""
+        epoch = to_epoch(now or datetime.now())
+        minute = epoch - epoch % 60
+        for symbol in self._symbols.values():
+            if symbol.forming is not None and symbol.forming[0] < minute:
+                self._emit(symbol.close_forming())
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(self.flush_interval)
+                self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"🕯️ [BAR_AGGREGATOR] 봉 마감 정리 오류: {e}")
+
+    def _emit(self, bar: Bar):
+        self.closed_count += 1
+        for listener in list(self._listeners):
+            try:
+                listener(bar)
+            except Exception as e:
+                logger.error(f"🕯️ [BAR_AGGREGATOR] 봉 마감 리스너 오류 - {bar.stock_code}: {e}")
+
+    def add_bar_listener(self, listener: Callable[[Bar], None]):
+        """봉 마감마다 호출될 동기 콜백 등록 (이벤트 루프에서 호출되므로 가볍게 유지)"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_bar_listener(self, listener: Callable[[Bar], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def mark_gap(self, stock_code: Optional[str] = None):
+        """체결 수신이 끊겼던 구간 표시 - 이후 다시 완전한 봉이 쌓일 때까지 covers()가 False"""
+        epoch = to_epoch(datetime.now())
+        next_minute = epoch - epoch % 60 + 60
+        for code, symbol in self._symbols.items():
+            if stock_code is None or code == stock_code:
+                symbol.complete_since = next_minute
+                symbol.version += 1
+
+    def discard(self, stock_code: str):
+        """구독 해제된 종목의 봉 제거"""
+        self._symbols.pop(stock_code, None)
+
+    def covers(self, stock_code: str, epoch_seconds: int) -> bool:
+        """epoch_seconds 분봉부터 현재까지 실시간 봉이 빠짐없이 있는지"""
+        symbol = self._symbols.get(stock_code)
+        return (symbol is not None and symbol.complete_since is not None
+                and symbol.complete_since <= epoch_seconds)
+
+    def version(self, stock_code: str) -> int:
+        symbol = self._symbols.get(stock_code)
+        return symbol.version if symbol else -1
+
+    def series(self, stock_code: str, include_forming: bool = True) -> CandleSeries:
+        symbol = self._symbols.get(stock_code)
+        if symbol is None:
+            return CandleSeries.empty(stock_code, "1M")
+        return symbol.series(include_forming)
+
+    def forming_bar(self, stock_code: str) -> Optional[Bar]:
+        symbol = self._symbols.get(stock_code)
+        return symbol.forming_bar() if symbol else None
+
+    def get_status_info(self) -> Dict:
+        return {
+            "symbols": len(self._symbols),
+            "forming_bars": sum(1 for s in self._symbols.values() if s.forming is not None),
+            "tick_count": self.tick_count,
+            "closed_bars": self.closed_count,
+            "late_trades": sum(s.late_trades for s in self._symbols.values()),
+            "listeners": len(self._listeners),
+            "running": self._flush_task is not None and not self._flush_task.done(),
+        }
+
+
+# 전역 인스턴스
+bar_aggregator = BarAggregator()
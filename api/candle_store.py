@@ -0,0 +1,421 @@
+import asyncio
+import logging
+from contextlib import aclosing
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from api.api_rate_limiter import APIPriority
+from api.bar_aggregator import bar_aggregator
+from api.candles import CandleSeries, from_epoch, resample, resample_daily, to_epoch
+from core.config import Config
+from core.models import Candle, SessionLocal
+from utils.cache import BoundedCache
+from utils.market_hours import cache_ttl
+
+logger = logging.getLogger(__name__)
+
+# 주기 별칭 -> 저장 키 (KiwoomAPI._build_chart_request와 같은 분류)
+_MINUTE_ALIASES = {
+    "1M": {"1M", "M1", "1MIN"},
+    "3M": {"3M", "M3", "3MIN"},
+    "5M": {"5M", "5MIN", "M5", "5MINUTE", "5"},
+    "10M": {"10M", "M10", "10MIN"},
+    "15M": {"15M", "M15", "15MIN"},
+    "30M": {"30M", "M30", "30MIN"},
+    "60M": {"60M", "M60", "60MIN", "1H"},
+}
+
+
+def normalize_timeframe(period: str) -> str:
+    """차트 주기 문자열 -> 저장 키 (1M ~ 60M, 그 외는 1D)"""
+    normalized = (period or "1D").strip().upper()
+    for timeframe, aliases in _MINUTE_ALIASES.items():
+        if normalized in aliases:
+            return timeframe
+    return "1D"
+
+
+# 1분봉에서 로컬로 만드는 분봉 주기 (분) - 이 주기들은 별도 TR을 호출하지 않음
+_RESAMPLED_MINUTES = {"3M": 3, "5M": 5, "10M": 10, "15M": 15, "30M": 30, "60M": 60}
+
+
+def _memory_size(value) -> int:
+    """메모리 캐시 항목 크기 - 원본 캔들 또는 (원본 1분봉, 리샘플 결과)"""
+    if isinstance(value, tuple):
+        return value[1].nbytes
+    return value.nbytes
+
+
+class CandleStore:
+    """종목/주기별 캔들 영구 저장소 (candles 테이블 + 메모리 사본)
+
+    마지막으로 저장한 봉 이후만 연속조회로 받아 덧붙이고, 아직 완성되지 않은
+    마지막 봉은 새로 받은 값으로 덮어쓴다. 재시작해도 DB에서 바로 읽으므로
+    종목당 API 호출은 정상 상태에서 봉 하나당 한 번으로 줄어든다.
+
+    업스트림으로는 1분봉(ka10080)과 과거 일봉(ka10081)만 받는다. 3~60분봉은
+    1분봉을 리샘플링해 만들고, 최근 일봉도 1분봉 구간이 닿는 한 1분봉에서 만든다.
+    리샘플에 memory_bars보다 많은 1분봉이 필요하면 그 종목의 1분봉 메모리 범위를 요청 깊이까지 넓힌다.
+    실시간 체결을 구독 중인 종목은 bar_aggregator가 만든 1분봉으로 갱신하므로 REST 호출이 없다.
+
+    메모리 사본은 바이트 예산(CANDLE_CACHE_MAX_MB)을 넘으면 오래 안 쓴 종목부터 내려가고
+    (다음 조회 때 DB에서 다시 로드), 동기화 유효 시간은 다음 봉 마감/장 운영 시간에 맞춘다.
+    """
+
+    def __init__(self, default_bars: int = 900, memory_bars: int = 6000):
+        self.default_bars = default_bars    # max_bars 미지정 시 반환 봉 수 (키움 분봉 한 페이지)
+        self.memory_bars = memory_bars      # 메모리에 유지하는 최대 봉 수 (DB에는 전체 보관)
+        # (종목, 1M/1D) -> CandleSeries, ("resampled", 종목, 3M~60M) -> (원본 1분봉, 리샘플 결과)
+        self._memory = BoundedCache("candles", max_bytes=int(Config.CANDLE_CACHE_MAX_MB * 1024 * 1024),
+                                    sizeof=_memory_size)
+        self._synced_at: Dict[Tuple[str, str], datetime] = {}   # 마지막 동기화 시각
+        self._depth: Dict[Tuple[str, str], int] = {}         # 과거 방향으로 조회를 마친 봉 수
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        # 종목 -> 리샘플 요청에 필요한 1분봉 수 (memory_bars보다 크면 1분봉 메모리 범위로 사용)
+        self._minute_window: Dict[str, int] = {}
+        # 마지막으로 병합한 실시간 집계 버전 ((종목, 1M) -> bar_aggregator.version)
+        self._live_versions: Dict[Tuple[str, str], int] = {}
+        self.stats = {"fresh_hits": 0, "stale_served": 0, "db_loads": 0, "incremental_syncs": 0, "backfills": 0,
+                      "resampled": 0, "daily_from_minutes": 0, "live_merges": 0,
+                      "bars_written": 0, "errors": 0}
+
+    def load(self, stock_code: str, period: str) -> CandleSeries:
+        """저장된 캔들 반환 (메모리에 없으면 DB에서 최근 _window개 로드)"""
+        key = (stock_code, normalize_timeframe(period))
+        series = self._memory.get(key)
+        if series is not None:
+            return series
+        window = self._window(key)
+
+        db = SessionLocal()
+        try:
+            rows = (db.query(Candle.ts, Candle.open, Candle.high, Candle.low, Candle.close, Candle.volume)
+                    .filter(Candle.stock_code == stock_code, Candle.timeframe == key[1])
+                    .order_by(Candle.ts.desc())
+                    .limit(window)
+                    .all())
+        finally:
+            db.close()
+
+        if rows:
+            columns = np.array(rows[::-1], dtype=np.int64).T
+            series = CandleSeries(stock_code, key[1], *columns)
+            logger.info(f"🗄️ [CANDLE_STORE] DB 로드: {stock_code} {key[1]} {len(series)}개 (마지막 {series.timestamp_str(-1)})")
+        else:
+            series = CandleSeries.empty(stock_code, key[1])
+        self.stats["db_loads"] += 1
+        self._memory.set(key, series)
+        return series
+
+    def _window(self, key: Tuple[str, str]) -> int:
+        """메모리에 유지할 봉 수 (1분봉은 가장 깊은 리샘플 요청까지)"""
+        if key[1] == "1M":
+            return max(self.memory_bars, self._minute_window.get(key[0], 0))
+        return self.memory_bars
+
+    def last_timestamp(self, stock_code: str, period: str) -> Optional[int]:
+        """마지막 저장 봉의 epoch 초 (없으면 None)"""
+        series = self.load(stock_code, period)
+        return int(series.timestamps[-1]) if len(series) else None
+
+    def history(self, stock_code: str, period: str, start: Optional[datetime] = None,
+                end: Optional[datetime] = None) -> CandleSeries:
+        """DB에 저장된 전체 구간 [start, end] 캔들 (백테스트용 - 메모리 사본을 거치지 않고 API도 호출하지 않음)
+
+        3~60분봉은 같은 구간 1분봉을 리샘플링해 만든다.
+        """
+        timeframe = normalize_timeframe(period)
+        source_timeframe = "1M" if timeframe in _RESAMPLED_MINUTES else timeframe
+        db = SessionLocal()
+        try:
+            query = (db.query(Candle.ts, Candle.open, Candle.high, Candle.low, Candle.close, Candle.volume)
+                     .filter(Candle.stock_code == stock_code, Candle.timeframe == source_timeframe))
+            if start is not None:
+                query = query.filter(Candle.ts >= to_epoch(start))
+            if end is not None:
+                query = query.filter(Candle.ts <= to_epoch(end))
+            rows = query.order_by(Candle.ts).all()
+        finally:
+            db.close()
+
+        if not rows:
+            return CandleSeries.empty(stock_code, timeframe)
+        series = CandleSeries(stock_code, source_timeframe, *np.array(rows, dtype=np.int64).T)
+        if timeframe in _RESAMPLED_MINUTES:
+            series = resample(series, _RESAMPLED_MINUTES[timeframe], timeframe, skip_partial_first=True)
+        return series
+
+    def histories(self, stock_codes, period: str, start: Optional[datetime] = None,
+                  end: Optional[datetime] = None) -> Dict[str, CandleSeries]:
+        """여러 종목 history (작업 풀에서 한 번에 실행용)"""
+        return {code: self.history(code, period, start, end) for code in stock_codes}
+
+    def upsert(self, stock_code: str, period: str, fetched: CandleSeries) -> CandleSeries:
+        """새로 받은 봉 병합 (같은 시각은 새 값으로 교체) 후 DB 반영"""
+        key = (stock_code, normalize_timeframe(period))
+        current = self.load(stock_code, period)
+        if not len(fetched):
+            return current
+
+        if len(current):
+            # 기존 마지막 봉(형성 중이던 봉) 이후 구간 + 기존보다 과거인 백필 구간만 DB에 씀
+            # 그 사이 봉은 이미 확정된 값이므로 다시 쓰지 않음
+            self._write(stock_code, key[1], fetched.since(int(current.timestamps[-1])))
+            older = int(np.searchsorted(fetched.timestamps, current.timestamps[0]))
+            self._write(stock_code, key[1], fetched[:older])
+        else:
+            self._write(stock_code, key[1], fetched)
+
+        merged = CandleSeries.concat([current, fetched])
+        merged = merged.tail(self._window(key))
+        merged.stock_code, merged.period = stock_code, key[1]
+        self._memory.set(key, merged)
+        return merged
+
+    def _write(self, stock_code: str, timeframe: str, series: CandleSeries):
+        """구간 [첫 봉, 마지막 봉]을 지우고 다시 삽입 (형성 중인 봉 정정 포함)"""
+        if not len(series):
+            return
+        rows = [{
+            "stock_code": stock_code,
+            "timeframe": timeframe,
+            "ts": int(series.timestamps[i]),
+            "open": int(series.open[i]),
+            "high": int(series.high[i]),
+            "low": int(series.low[i]),
+            "close": int(series.close[i]),
+            "volume": int(series.volume[i]),
+        } for i in range(len(series))]
+
+        db = SessionLocal()
+        try:
+            db.query(Candle).filter(
+                Candle.stock_code == stock_code,
+                Candle.timeframe == timeframe,
+                Candle.ts >= rows[0]["ts"],
+                Candle.ts <= rows[-1]["ts"],
+            ).delete(synchronize_session=False)
+            db.bulk_insert_mappings(Candle, rows)
+            db.commit()
+            self.stats["bars_written"] += len(rows)
+        except Exception as e:
+            db.rollback()
+            self.stats["errors"] += 1
+            logger.error(f"🗄️ [CANDLE_STORE] DB 저장 실패: {stock_code} {timeframe} - {e}")
+        finally:
+            db.close()
+
+    def _is_fresh(self, key: Tuple[str, str], max_age: float, timeframe: Optional[str] = None) -> bool:
+        """마지막 동기화가 아직 유효한지
+
+        max_age 이내이면서 그 뒤로 timeframe(기본: 키의 주기) 봉 마감이 없었으면 유효하고,
+        장 마감 후 동기화분은 다음 장 시작까지 유효하다.
+        """
+        synced_at = self._synced_at.get(key)
+        if synced_at is None:
+            return False
+        ttl = cache_ttl(max_age, timeframe or key[1], now=synced_at)
+        return datetime.now() < synced_at + timedelta(seconds=ttl)
+
+    async def get_candles(self, api, stock_code: str, period: str = "5M",
+                          max_age: float = 600,
+                          priority: APIPriority = APIPriority.DASHBOARD,
+                          max_bars: Optional[int] = None,
+                          stale_while_revalidate: bool = False) -> CandleSeries:
+        """저장소 기반 차트 조회 (유효한 동기화분은 API 호출 없이 반환)
+
+        api는 KiwoomAPI 인스턴스 (저장소는 특정 클라이언트에 묶이지 않음).
+        max_bars가 없으면 최근 default_bars개, 있으면 그만큼의 이력을 보장해 반환한다.
+        stale_while_revalidate면 만료된 캔들을 바로 돌려주고 동기화는 백그라운드에서 한다.
+        """
+        key = (stock_code, normalize_timeframe(period))
+        if key[1] in _RESAMPLED_MINUTES:
+            return await self._get_resampled(api, stock_code, key[1], max_age, priority, max_bars,
+                                             stale_while_revalidate)
+
+        limit = max_bars or self.default_bars
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            series = self.load(stock_code, period)
+            deep_enough = self._deep_enough(key, series, max_bars)
+
+            if key[1] == "1M" and deep_enough:
+                live = self._sync_from_live(api, stock_code)
+                if live is not None:
+                    self._synced_at[key] = datetime.now()
+                    return live.tail(limit)
+            if len(series) and deep_enough and self._is_fresh(key, max_age):
+                self.stats["fresh_hits"] += 1
+                return series.tail(limit)
+            if len(series) and deep_enough and stale_while_revalidate:
+                self.stats["stale_served"] += 1
+                self._memory.refresh(("revalidate",) + key, lambda: self._revalidate(
+                    api, stock_code, period, max_age, priority, max_bars))
+                return series.tail(limit)
+
+            series = await self._sync(api, stock_code, period, max_age, priority, max_bars, deep_enough)
+            return series.tail(limit)
+
+    def _deep_enough(self, key: Tuple[str, str], series: CandleSeries, max_bars: Optional[int]) -> bool:
+        if max_bars is None:
+            return len(series) > 0
+        return len(series) >= max_bars or self._depth.get(key, 0) >= max_bars
+
+    async def _revalidate(self, api, stock_code: str, period: str, max_age: float,
+                          priority: APIPriority, max_bars: Optional[int]) -> None:
+        """백그라운드 동기화 (그 사이 다른 호출이 갱신했으면 생략)
+
+        결과 캔들은 _sync에서 메모리 캐시에 반영되므로 None을 돌려 캐시에 따로 저장하지 않는다.
+        """
+        key = (stock_code, normalize_timeframe(period))
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            if self._is_fresh(key, max_age):
+                return None
+            series = self.load(stock_code, period)
+            await self._sync(api, stock_code, period, max_age, priority, max_bars,
+                             self._deep_enough(key, series, max_bars))
+        return None
+
+    async def _sync(self, api, stock_code: str, period: str, max_age: float, priority: APIPriority,
+                    max_bars: Optional[int], deep_enough: bool) -> CandleSeries:
+        """REST 동기화 (키별 lock을 잡은 상태에서 호출)"""
+        key = (stock_code, normalize_timeframe(period))
+        try:
+            if deep_enough:
+                synced = None
+                if key[1] == "1D":
+                    synced = await self._sync_daily_from_minutes(api, stock_code, max_age, priority)
+                series = synced or await self._sync_incremental(api, stock_code, period, priority)
+            else:
+                series = await self._backfill(api, stock_code, period, max_bars or 0, priority)
+            self._synced_at[key] = datetime.now()
+            return series
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"🗄️ [CANDLE_STORE] 동기화 오류: {stock_code} {key[1]} - {e}")
+            return self.load(stock_code, period)
+
+    def _sync_from_live(self, api, stock_code: str) -> Optional[CandleSeries]:
+        """실시간 집계 봉으로 1분봉 갱신 (구독 중이고 저장분과 빈틈없이 이어질 때만, 아니면 None)"""
+        key = (stock_code, "1M")
+        last_ts = self.last_timestamp(stock_code, "1M")
+        if last_ts is None or not api.has_live_price(stock_code) or not bar_aggregator.covers(stock_code, last_ts):
+            return None
+        version = bar_aggregator.version(stock_code)
+        if self._live_versions.get(key) != version:
+            self._live_versions[key] = version
+            self.stats["live_merges"] += 1
+            return self.upsert(stock_code, "1M", bar_aggregator.series(stock_code).since(last_ts))
+        return self.load(stock_code, "1M")
+
+    async def _get_resampled(self, api, stock_code: str, timeframe: str, max_age: float,
+                             priority: APIPriority, max_bars: Optional[int],
+                             stale_while_revalidate: bool = False) -> CandleSeries:
+        """1분봉을 동기화한 뒤 N분봉으로 리샘플링 (1분봉이 그대로면 이전 결과 재사용)"""
+        minutes = _RESAMPLED_MINUTES[timeframe]
+        limit = max_bars or self.default_bars
+        # 첫 구간이 잘릴 수 있으므로 한 봉 여유를 두고 1분봉 확보
+        needed = (limit + 1) * minutes
+        source_key = (stock_code, "1M")
+        if needed > self._window(source_key):
+            # 1분봉 메모리 범위를 넓히고 DB에서 그만큼 다시 로드
+            self._minute_window[stock_code] = needed
+            self._memory.pop(source_key)
+        source = self.load(stock_code, "1M")
+        # 1분봉 동기화 여부는 요청 주기의 봉 마감 기준으로 판단 (5분봉이면 5분 경계 전까지 재조회 안 함)
+        if (api.has_live_price(stock_code)
+                or not self._is_fresh(source_key, max_age, timeframe)
+                or not self._deep_enough(source_key, source, needed)):
+            await self.get_candles(api, stock_code, "1M", max_age=max_age, priority=priority,
+                                   max_bars=needed, stale_while_revalidate=stale_while_revalidate)
+            source = self.load(stock_code, "1M")
+        else:
+            self.stats["fresh_hits"] += 1
+        if not len(source):
+            return CandleSeries.empty(stock_code, timeframe)
+
+        key = ("resampled", stock_code, timeframe)
+        cached = self._memory.get(key)
+        if cached is not None and cached[0] is source:
+            return cached[1].tail(limit)
+        derived = resample(source, minutes, timeframe, skip_partial_first=True)
+        self._memory.set(key, (source, derived))
+        self.stats["resampled"] += 1
+        return derived.tail(limit)
+
+    async def _sync_daily_from_minutes(self, api, stock_code: str, max_age: float,
+                                       priority: APIPriority) -> Optional[CandleSeries]:
+        """최근 일봉을 1분봉에서 만들어 병합 (1분봉 구간이 저장된 일봉과 이어지지 않으면 None)"""
+        await self.get_candles(api, stock_code, "1M", max_age=max_age, priority=priority)
+        source = self.load(stock_code, "1M")
+        last_ts = self.last_timestamp(stock_code, "1D")
+        if not len(source) or last_ts is None:
+            return None
+        daily = resample_daily(source, skip_partial_first=True)
+        if not len(daily) or daily.timestamps[0] > last_ts:
+            return None
+        self.stats["daily_from_minutes"] += 1
+        return self.upsert(stock_code, "1D", daily.since(last_ts))
+
+    async def _backfill(self, api, stock_code: str, period: str, wanted: int,
+                        priority: APIPriority) -> CandleSeries:
+        """최신 봉부터 과거로 wanted개(최소 한 페이지)를 채우고, 저장된 마지막 봉까지 이어 붙임"""
+        key = (stock_code, normalize_timeframe(period))
+        last_ts = self.last_timestamp(stock_code, period)
+        pages = []
+        total = 0
+        async with aclosing(api.iter_stock_chart_pages(stock_code, period, priority=priority)) as page_iter:
+            async for page in page_iter:
+                pages.append(page)
+                total += len(page)
+                # 저장분과 겹칠 때까지는 계속 받아 중간에 빈 구간이 생기지 않게 함
+                joined = last_ts is None or page.timestamps[0] <= last_ts
+                if total >= wanted and joined:
+                    break
+        self.stats["backfills"] += 1
+        if not pages:
+            return self.load(stock_code, period)
+        # 서버가 가진 이력이 wanted보다 적어도 다시 백필하지 않도록 기록
+        self._depth[key] = max(self._depth.get(key, 0), wanted)
+        fetched = CandleSeries.concat(pages[::-1])
+        logger.info(f"🗄️ [CANDLE_STORE] 백필: {stock_code} {key[1]} {len(fetched)}개 ({len(pages)}페이지)")
+        return self.upsert(stock_code, period, fetched)
+
+    async def _sync_incremental(self, api, stock_code: str, period: str,
+                                priority: APIPriority) -> CandleSeries:
+        """마지막 저장 봉(형성 중일 수 있음)부터 최신까지만 조회해 병합"""
+        last_ts = self.last_timestamp(stock_code, period)
+        pages = []
+        async with aclosing(api.iter_stock_chart_pages(
+                stock_code, period, since=from_epoch(last_ts), priority=priority)) as page_iter:
+            async for page in page_iter:
+                pages.append(page)
+        self.stats["incremental_syncs"] += 1
+        if not pages:
+            return self.load(stock_code, period)
+        fetched = CandleSeries.concat(pages[::-1])
+        logger.debug(f"🗄️ [CANDLE_STORE] 증분 동기화: {stock_code} {normalize_timeframe(period)} "
+                     f"{len(fetched)}개 (since {from_epoch(last_ts)})")
+        return self.upsert(stock_code, period, fetched)
+
+    def invalidate(self, stock_code: Optional[str] = None):
+        """메모리 사본/동기화 시각 초기화 (DB는 유지)"""
+        for key in self._memory.keys():
+            if stock_code is None or stock_code in key:
+                self._memory.pop(key)
+        for key in list(self._synced_at):
+            if stock_code is None or key[0] == stock_code:
+                self._synced_at.pop(key, None)
+                self._depth.pop(key, None)
+
+    def get_status_info(self) -> Dict:
+        return {
+            "memory": self._memory.get_status_info(),
+            **self.stats,
+        }
+
+
+# 전역 인스턴스
+candle_store = CandleStore()
@@ -0,0 +1,263 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 타임스탬프는 한국 시간(벽시계)을 UTC처럼 취급한 epoch 초 (시간대 정보 없음)
+_EPOCH = datetime(1970, 1, 1)
+
+PRICE_DTYPE = np.int32
+VOLUME_DTYPE = np.int64
+
+_DAY_SECONDS = 86400
+_SESSION_OPEN_SECONDS = 9 * 3600      # 분봉 묶음 기준 (09:00 정렬)
+_DAILY_STAMP_SECONDS = 15 * 3600 + 30 * 60  # 일봉 시각 (15:30, parse_kiwoom_chart와 동일)
+
+
+def to_epoch(dt: datetime) -> int:
+    """naive datetime -> epoch 초"""
+    return int((dt - _EPOCH).total_seconds())
+
+
+def from_epoch(seconds: int) -> datetime:
+    """epoch 초 -> naive datetime"""
+    return _EPOCH + timedelta(seconds=int(seconds))
+
+
+def _readonly(values, dtype) -> np.ndarray:
+    array = np.ascontiguousarray(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+
+class CandleSeries:
+    """컬럼형 OHLCV 캔들 (시간 오름차순)
+
+    timestamps는 int64 epoch 초, 가격은 int32, 거래량은 int64 numpy 배열이다.
+    배열은 읽기 전용이라 캐시에 둔 채 여러 매니저가 공유해도 안전하고,
+    to_frame()은 배열을 복사하지 않는 DataFrame 뷰를 만든다.
+    """
+
+    __slots__ = ("stock_code", "period", "timestamps", "open", "high", "low", "close", "volume", "_index")
+
+    def __init__(self, stock_code: str, period: str, timestamps, open_, high, low, close, volume):
+        self.stock_code = stock_code
+        self.period = period
+        self.timestamps = _readonly(timestamps, np.int64)
+        self.open = _readonly(open_, PRICE_DTYPE)
+        self.high = _readonly(high, PRICE_DTYPE)
+        self.low = _readonly(low, PRICE_DTYPE)
+        self.close = _readonly(close, PRICE_DTYPE)
+        self.volume = _readonly(volume, VOLUME_DTYPE)
+        self._index: Optional[pd.DatetimeIndex] = None
+
+    @classmethod
+    def empty(cls, stock_code: str = "", period: str = "") -> "CandleSeries":
+        return cls(stock_code, period, [], [], [], [], [], [])
+
+    @classmethod
+    def concat(cls, series: Sequence["CandleSeries"]) -> "CandleSeries":
+        """시간순으로 이어 붙이기 (겹치는 시각은 뒤쪽 데이터 우선)"""
+        series = [s for s in series if len(s)]
+        if not series:
+            return cls.empty()
+        if len(series) == 1:
+            return series[0]
+        first = series[0]
+        merged = cls(first.stock_code, first.period,
+                     np.concatenate([s.timestamps for s in series]),
+                     np.concatenate([s.open for s in series]),
+                     np.concatenate([s.high for s in series]),
+                     np.concatenate([s.low for s in series]),
+                     np.concatenate([s.close for s in series]),
+                     np.concatenate([s.volume for s in series]))
+        return merged._sorted_unique()
+
+    def _sorted_unique(self) -> "CandleSeries":
+        """시간 오름차순 정렬 + 중복 시각 제거 (마지막 값 유지)"""
+        ts = self.timestamps
+        if len(ts) < 2 or (np.all(ts[1:] > ts[:-1])):
+            return self
+        order = np.argsort(ts, kind="stable")
+        sorted_ts = ts[order]
+        # 같은 시각이면 마지막 항목만 남김
+        keep = np.append(sorted_ts[1:] != sorted_ts[:-1], True)
+        idx = order[keep]
+        return self.take(idx)
+
+    def take(self, indices) -> "CandleSeries":
+        return CandleSeries(self.stock_code, self.period, self.timestamps[indices],
+                            self.open[indices], self.high[indices], self.low[indices],
+                            self.close[indices], self.volume[indices])
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, item):
+        """정수 인덱스는 봉 dict, 슬라이스는 배열 뷰를 공유하는 CandleSeries"""
+        if isinstance(item, slice):
+            return CandleSeries(self.stock_code, self.period, self.timestamps[item],
+                                self.open[item], self.high[item], self.low[item],
+                                self.close[item], self.volume[item])
+        return self.bar(item)
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return f"CandleSeries({self.stock_code} {self.period}, empty)"
+        return (f"CandleSeries({self.stock_code} {self.period}, {len(self)} bars, "
+                f"{self.timestamp_str(0)} ~ {self.timestamp_str(-1)})")
+
+    @property
+    def nbytes(self) -> int:
+        return (self.timestamps.nbytes + self.open.nbytes + self.high.nbytes + self.low.nbytes
+                + self.close.nbytes + self.volume.nbytes)
+
+    def timestamp_at(self, i: int) -> datetime:
+        return from_epoch(self.timestamps[i])
+
+    def timestamp_str(self, i: int) -> str:
+        return self.timestamp_at(i).strftime("%Y-%m-%d %H:%M:%S")
+
+    def bar(self, i: int) -> Dict:
+        """봉 1개를 dict로 (로그/JSON용)"""
+        return {
+            "timestamp": self.timestamp_str(i),
+            "open": int(self.open[i]),
+            "high": int(self.high[i]),
+            "low": int(self.low[i]),
+            "close": int(self.close[i]),
+            "volume": int(self.volume[i]),
+        }
+
+    def tail(self, n: int) -> "CandleSeries":
+        return self[-n:] if n > 0 else self[:0]
+
+    def since(self, epoch_seconds: int) -> "CandleSeries":
+        """epoch_seconds 이후(포함) 봉만"""
+        start = int(np.searchsorted(self.timestamps, epoch_seconds, side="left"))
+        return self[start:]
+
+    def to_records(self) -> List[Dict]:
+        """기존 list-of-dict 형식 (API 응답용)"""
+        return [self.bar(i) for i in range(len(self))]
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        """DatetimeIndex (한 번 만들어 재사용)"""
+        if self._index is None:
+            self._index = pd.DatetimeIndex(self.timestamps.view("datetime64[s]"), name="timestamp")
+        return self._index
+
+    def to_frame(self) -> pd.DataFrame:
+        """Open/High/Low/Close/Volume 컬럼의 DataFrame 뷰 (배열 복사 없음)
+
+        호출마다 새 DataFrame 객체를 돌려주므로 지표 컬럼을 추가해도 캐시에 영향이 없다.
+        """
+        return pd.DataFrame({
+            "Open": self.open,
+            "High": self.high,
+            "Low": self.low,
+            "Close": self.close,
+            "Volume": self.volume,
+        }, index=self.index, copy=False)
+
+
+def resample(series: CandleSeries, minutes: int, period: str = "",
+             skip_partial_first: bool = False) -> CandleSeries:
+    """1분봉 -> N분봉 (09:00 기준 N분 구간, 봉 시각은 구간 시작)
+
+    시간 오름차순 입력을 구간 경계에서 잘라 reduceat으로 한 번에 집계한다.
+    skip_partial_first면 입력이 구간 중간에서 시작할 때 첫 봉(일부만 집계됨)을 버린다.
+    """
+    if not len(series) or minutes <= 1:
+        return series
+    ts = series.timestamps
+    seconds_of_day = ts % _DAY_SECONDS
+    bucket_start = (ts - seconds_of_day + _SESSION_OPEN_SECONDS
+                    + (seconds_of_day - _SESSION_OPEN_SECONDS) // (minutes * 60) * (minutes * 60))
+    result = _aggregate(series, bucket_start, bucket_start, period or f"{minutes}M")
+    if skip_partial_first and bucket_start[0] != ts[0]:
+        return result[1:]
+    return result
+
+
+def resample_daily(series: CandleSeries, period: str = "1D",
+                   skip_partial_first: bool = False) -> CandleSeries:
+    """1분봉 -> 일봉 (봉 시각은 해당일 15:30)
+
+    skip_partial_first면 입력이 장 시작(09:00) 이후에서 시작할 때 첫날을 버린다.
+    """
+    if not len(series):
+        return CandleSeries.empty(series.stock_code, period)
+    ts = series.timestamps
+    day_start = ts - ts % _DAY_SECONDS
+    result = _aggregate(series, day_start, day_start + _DAILY_STAMP_SECONDS, period)
+    if skip_partial_first and ts[0] - day_start[0] > _SESSION_OPEN_SECONDS:
+        return result[1:]
+    return result
+
+
+def _aggregate(series: CandleSeries, keys: np.ndarray, stamps: np.ndarray, period: str) -> CandleSeries:
+    """정렬된 구간 키가 바뀌는 지점마다 OHLCV 집계"""
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)] - 1
+    return CandleSeries(
+        series.stock_code, period, stamps[starts],
+        series.open[starts],
+        np.maximum.reduceat(series.high, starts),
+        np.minimum.reduceat(series.low, starts),
+        series.close[ends],
+        np.add.reduceat(series.volume, starts),
+    )
+
+
+def parse_kiwoom_chart(api_response: dict, stock_code: str, period: str = "") -> CandleSeries:
+    """ka10080(분봉)/ka10081(일봉) 응답을 CandleSeries로 변환
+
+    가격 필드는 전일 대비 부호(+/-)가 붙어 올 수 있어 절댓값을 사용한다.
+    """
+    minute_chart_list = api_response.get('stk_min_pole_chart_qry') or []
+    daily_chart_list = api_response.get('stk_dt_pole_chart_qry') or []
+
+    if minute_chart_list:
+        items = minute_chart_list
+        # 체결시간 YYYYMMDDHHMISS -> 분 단위
+        stamps = [_minute_stamp(item.get('cntr_tm', '')) for item in items]
+    elif daily_chart_list:
+        items = daily_chart_list
+        # 일자 YYYYMMDD -> 장마감(15:30) 기준
+        stamps = [_daily_stamp(item.get('dt', '')) for item in items]
+    else:
+        return CandleSeries.empty(stock_code, period)
+
+    timestamps = np.array(stamps, dtype="datetime64[s]").astype(np.int64)
+    series = CandleSeries(
+        stock_code, period, timestamps,
+        _price_column(items, 'open_pric'),
+        _price_column(items, 'high_pric'),
+        _price_column(items, 'low_pric'),
+        _price_column(items, 'cur_prc'),
+        np.abs(np.array([int(item.get('trde_qty') or 0) for item in items], dtype=VOLUME_DTYPE)),
+    )
+    # 키움은 최신 봉부터 내려주므로 시간 오름차순으로 정렬
+    return series._sorted_unique()
+
+
+def _price_column(items: Iterable[Dict], field: str) -> np.ndarray:
+    return np.abs(np.array([int(item.get(field) or 0) for item in items], dtype=PRICE_DTYPE))
+
+
+def _minute_stamp(cntr_tm: str) -> str:
+    if len(cntr_tm) >= 12:
+        return f"{cntr_tm[:4]}-{cntr_tm[4:6]}-{cntr_tm[6:8]}T{cntr_tm[8:10]}:{cntr_tm[10:12]}:00"
+    return datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _daily_stamp(dt: str) -> str:
+    if len(dt) == 8:
+        return f"{dt[:4]}-{dt[4:6]}-{dt[6:8]}T15:30:00"
+    return datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
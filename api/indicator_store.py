@@ -0,0 +1,139 @@
+"""
+증분 지표 상태 저장소 (마감 봉만 반영, indicator_states 테이블 + 메모리)
+"""
+import logging
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from api.candles import CandleSeries
+from core.models import IndicatorState, SessionLocal
+from utils.indicators import Indicator, create_indicator, params_key, restore_indicator
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    __slots__ = ("indicator", "last_ts")
+
+    def __init__(self, indicator: Indicator, last_ts: Optional[int]):
+        self.indicator = indicator
+        self.last_ts = last_ts   # 마지막으로 반영한 마감 봉 시각
+
+
+class IndicatorStore:
+    """종목/주기/지표/파라미터별 증분 지표 상태 (indicator_states 테이블 + 메모리)
+
+    캔들을 넘기면 지난번 이후 새로 마감된 봉만 update()로 반영한다 (봉당 O(1)).
+    마지막 봉은 형성 중으로 보고 반영하지 않으므로, 그 봉을 포함한 값은 peek()로 구한다.
+    저장된 마지막 봉이 캔들 구간에 없으면(오래 조회하지 않았거나 이력이 바뀜) 캔들 전체로 다시 쌓는다.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str, str, str], _Entry] = {}
+        self.stats = {"bars_applied": 0, "rebuilds": 0, "db_loads": 0, "saves": 0, "errors": 0}
+
+    def sync(self, stock_code: str, timeframe: str, kind: str, params: Optional[Dict],
+             series: CandleSeries, last_bar_forming: bool = True) -> Indicator:
+        """series의 마감 봉까지 반영한 지표 반환"""
+        params = params or {}
+        key = (stock_code, timeframe, kind, params_key(params))
+        closed = len(series) - 1 if last_bar_forming and len(series) else len(series)
+
+        entry = self._entries.get(key) or self._load(key, params)
+        start = self._resume_index(entry, series, closed)
+        if start is None:
+            entry = _Entry(create_indicator(kind, params), None)
+            start = 0
+            self.stats["rebuilds"] += 1
+        self._entries[key] = entry
+
+        if start < closed:
+            indicator = entry.indicator
+            for i in range(start, closed):
+                indicator.update(int(series.open[i]), int(series.high[i]), int(series.low[i]),
+                                 int(series.close[i]), int(series.volume[i]))
+            entry.last_ts = int(series.timestamps[closed - 1])
+            self.stats["bars_applied"] += closed - start
+            self._save(key, entry)
+        return entry.indicator
+
+    @staticmethod
+    def _resume_index(entry: Optional[_Entry], series: CandleSeries, closed: int) -> Optional[int]:
+        """이어서 반영할 봉 위치 (처음부터 다시 쌓아야 하면 None)"""
+        if entry is None or entry.last_ts is None:
+            return None
+        i = int(np.searchsorted(series.timestamps[:closed], entry.last_ts))
+        if i < closed and series.timestamps[i] == entry.last_ts:
+            return i + 1
+        # 저장된 봉이 이미 최신이면 그대로 (형성 중인 봉만 바뀐 경우)
+        if closed and entry.last_ts == int(series.timestamps[closed - 1]):
+            return closed
+        return None
+
+    def peek(self, stock_code: str, timeframe: str, kind: str, params: Optional[Dict],
+             series: CandleSeries):
+        """마지막(형성 중인) 봉까지 포함한 지표 값"""
+        indicator = self.sync(stock_code, timeframe, kind, params, series)
+        if not len(series):
+            return None
+        return indicator.peek(int(series.open[-1]), int(series.high[-1]), int(series.low[-1]),
+                              int(series.close[-1]), int(series.volume[-1]))
+
+    def _load(self, key: Tuple[str, str, str, str], params: Dict) -> Optional[_Entry]:
+        db = SessionLocal()
+        try:
+            row = db.query(IndicatorState).filter(
+                IndicatorState.stock_code == key[0],
+                IndicatorState.timeframe == key[1],
+                IndicatorState.indicator == key[2],
+                IndicatorState.params == key[3],
+            ).first()
+            if row is None:
+                return None
+            self.stats["db_loads"] += 1
+            return _Entry(restore_indicator(key[2], params, row.state), row.last_ts)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"📐 [INDICATOR_STORE] 상태 로드 실패: {key} - {e}")
+            return None
+        finally:
+            db.close()
+
+    def _save(self, key: Tuple[str, str, str, str], entry: _Entry):
+        db = SessionLocal()
+        try:
+            row = db.query(IndicatorState).filter(
+                IndicatorState.stock_code == key[0],
+                IndicatorState.timeframe == key[1],
+                IndicatorState.indicator == key[2],
+                IndicatorState.params == key[3],
+            ).first()
+            if row is None:
+                row = IndicatorState(stock_code=key[0], timeframe=key[1], indicator=key[2], params=key[3])
+                db.add(row)
+            row.last_ts = entry.last_ts
+            row.state = entry.indicator.to_state()
+            row.updated_at = datetime.utcnow()
+            db.commit()
+            self.stats["saves"] += 1
+        except Exception as e:
+            db.rollback()
+            self.stats["errors"] += 1
+            logger.error(f"📐 [INDICATOR_STORE] 상태 저장 실패: {key} - {e}")
+        finally:
+            db.close()
+
+    def invalidate(self, stock_code: Optional[str] = None):
+        """메모리 상태 초기화 (DB는 유지)"""
+        for key in list(self._entries):
+            if stock_code is None or key[0] == stock_code:
+                del self._entries[key]
+
+    def get_status_info(self) -> Dict:
+        return {"entries": len(self._entries), **self.stats}
+
+
+# 전역 인스턴스
+indicator_store = IndicatorStore()
@@ -1,3 +1,5 @@
+import copy
+import functools
 import json
 import logging
 import asyncio
@@ -5,11 +7,19 @@ import random
 import websockets
 import aiohttp
 import ssl
+from collections import deque
+from contextlib import aclosing
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Callable, List
 from core.config import Config
-from api.api_rate_limiter import api_rate_limiter
+from api.api_rate_limiter import api_rate_limiter, APIPriority
 from api.token_manager import TokenManager
+from api.tick_store import tick_store
+from api.bar_aggregator import bar_aggregator
+from api.candles import CandleSeries, parse_kiwoom_chart, to_epoch
+from utils.cache import BoundedCache
+from utils.market_hours import cache_ttl
+from utils.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -27,28 +37,95 @@ class KiwoomAPI:
         self.reconnect_delay = 5  # 초
         self.auto_reconnect = True
         self.message_task = None
+
+        # 조건검색 요청 다중화: (trnm[:seq]) -> 응답 대기 future 큐
+        self._pending_requests: Dict[str, deque] = {}
+        self._connect_lock = asyncio.Lock()
+        self._send_lock = asyncio.Lock()
+        self._condition_list_loaded = False
+
+        # 실시간 체결 구독 종목 (재연결 시 재등록)
+        self._realtime_codes = set()
+        # 종목 -> 구독을 요청한 모듈 이름 (release_realtime은 다른 모듈이 쓰지 않는 종목만 해제)
+        self._realtime_owners: Dict[str, set] = {}
         
-        # 현재가 캐시 (종목코드 -> (가격, 시간)) - API 호출 최소화
-        self._price_cache = {}
-        self._price_cache_ttl = 30  # 30초 캐시 (API 제한 고려)
+        # 현재가 캐시 (종목코드 -> 가격) - 항목 수 상한 LRU, 장 마감 후에는 다음 장 시작까지 유지
+        self._price_cache_ttl = 30  # 장중 30초 캐시 (API 제한 고려)
+        self._price_cache = BoundedCache("price", max_entries=Config.PRICE_CACHE_MAX_ENTRIES)
+
+        # 진행 중인 동일 조회(같은 TR/파라미터) 공유 - 동시 호출이 분당 호출 예산을 중복 소모하지 않게 함
+        self._single_flight = SingleFlight("kiwoom")
+
+        # 차트는 api.candle_store에 영구 저장 - 이 시간 안에 동기화한 캔들은 API 호출 없이 재사용
+        self._chart_cache_ttl = 600  # 10분 (API 호출 감소)
+
+        # REST 호출용 공유 HTTP 세션 (keep-alive 커넥션 풀 재사용, 최초 호출 시 생성)
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        # 모의투자 서버 인증서 문제 대응용 (현재가 조회에서만 요청 단위로 사용)
+        self._insecure_ssl_context = ssl.create_default_context()
+        self._insecure_ssl_context.check_hostname = False
+        self._insecure_ssl_context.verify_mode = ssl.CERT_NONE
+
+    async def _get_http_session(self) -> aiohttp.ClientSession:
+        """공유 HTTP 세션 반환 (없거나 닫혀 있으면 새로 생성)
+
+        요청마다 세션을 만들면 TCP/TLS 핸드셰이크가 매번 발생하므로,
+        하나의 커넥터를 재사용해 keep-alive 연결을 유지한다.
+        """
+        if self._http_session is None or self._http_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=Config.KIWOOM_HTTP_POOL_LIMIT,
+                limit_per_host=Config.KIWOOM_HTTP_POOL_LIMIT_PER_HOST,
+                keepalive_timeout=Config.KIWOOM_HTTP_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=Config.KIWOOM_HTTP_DNS_CACHE_TTL,
+            )
+            self._http_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30),
+            )
+            logger.info(
+                f"🌐 [HTTP] 공유 세션 생성 - 최대 연결 {Config.KIWOOM_HTTP_POOL_LIMIT}, "
+                f"호스트당 {Config.KIWOOM_HTTP_POOL_LIMIT_PER_HOST}"
+            )
+        return self._http_session
+
+    async def close(self):
+        """공유 HTTP 세션 종료 및 토큰 자동 갱신 중지 (애플리케이션 종료 시 호출)"""
+        await self.token_manager.stop_auto_refresh()
+        session = self._http_session
+        self._http_session = None
+        if session and not session.closed:
+            try:
+                await session.close()
+                logger.info("🌐 [HTTP] 공유 세션 종료 완료")
+            except Exception as e:
+                logger.error(f"HTTP 세션 종료 중 오류: {e}")
 
-    def authenticate(self) -> bool:
+    async def authenticate(self) -> bool:
         """키움증권 API 인증"""
         try:
-            return self.token_manager.authenticate()
+            return await self.token_manager.authenticate()
         except Exception as e:
             logger.error(f"키움증권 API 인증 실패: {e}")
             return False
         
     async def connect(self):
-        """웹소켓 연결 및 인증"""
+        """웹소켓 연결 및 LOGIN 인증
+
+        연결 후 LOGIN까지 마친 세션 하나를 유지하고, 조건검색(CNSRLST/CNSRREQ) 요청은
+        이 세션 위에서 메시지 핸들러가 응답을 매칭해 돌려준다.
+        이미 연결된 세션이 있으면 그대로 사용한다 (연결은 lifespan이 소유, 소켓/핸들러 중복 방지).
+        """
+        if self.running and self.websocket is not None:
+            return True
+
         # 토큰이 없거나 만료된 경우 재인증 시도
-        if not self.token_manager.get_valid_token():
+        if not await self.token_manager.ensure_token():
             logger.warning("토큰이 없거나 만료됨 - 재인증 시도")
-            if not self.authenticate():
+            if not await self.authenticate():
                 logger.error("토큰 재인증 실패 - WebSocket 연결 불가")
                 return False
-            
+
         try:
             # 실전/모의에 따른 WebSocket 호스트 및 앱키 선택
             use_mock = Config.KIWOOM_USE_MOCK_ACCOUNT
@@ -59,7 +136,7 @@ class KiwoomAPI:
             # 키움 API WebSocket 연결 URL 구성
             ws_url = f"{ws_host}/api/dostk/websocket"
             logger.info(f"WebSocket 연결 시도: {ws_url} (모의투자: {use_mock})")
-            
+
             headers = {
                 "Content-Type": "application/json;charset=UTF-8",
                 "Authorization": f"Bearer {self.token_manager.get_valid_token()}",
@@ -67,8 +144,8 @@ class KiwoomAPI:
                 "appsecret": app_secret
             }
             logger.info(f"연결 헤더 준비 완료 - 토큰 길이: {len(self.token_manager.get_valid_token() or '')}")
-            
-            self.websocket = await websockets.connect(
+
+            websocket = await websockets.connect(
                 ws_url,
                 extra_headers=headers,
                 ping_interval=60,  # 60초마다 ping (서버 부하 감소)
@@ -77,19 +154,32 @@ class KiwoomAPI:
                 max_size=2**20,    # 최대 메시지 크기 1MB
                 max_queue=32       # 최대 큐 크기
             )
+
+            # 메시지 핸들러 시작 전에 LOGIN 응답을 직접 수신
+            if not await self._login(websocket):
+                await websocket.close()
+                return False
+
+            self.websocket = websocket
+            # 새 세션에서는 CNSRREQ 전에 CNSRLST를 다시 보내야 함
+            self._condition_list_loaded = False
             logger.info("🔄 [DEBUG] self.running을 True로 설정 (connect 메서드)")
             self.running = True
             logger.info("WebSocket 연결 성공 - 메시지 핸들러 시작")
-            
+
             # 재연결 성공 시 카운터 리셋
             if self.reconnect_attempts > 0:
                 logger.info(f"🔄 재연결 성공! (시도 횟수: {self.reconnect_attempts})")
                 self.reconnect_attempts = 0
-            
+
             # 메시지 핸들러 태스크 생성
             self.message_task = asyncio.create_task(self._message_handler())
+
+            # 재연결 시 기존 실시간 구독 복구
+            if self._realtime_codes:
+                asyncio.create_task(self._register_realtime(sorted(self._realtime_codes)))
             return True
-            
+
         except websockets.exceptions.InvalidStatusCode as e:
             logger.error(f"WebSocket 연결 실패 - HTTP 상태 코드: {e.status_code}")
             logger.error(f"응답 헤더: {e.response_headers}")
@@ -100,7 +190,134 @@ class KiwoomAPI:
         except Exception as e:
             logger.error(f"웹소켓 연결 실패: {type(e).__name__}: {e}")
             return False
-            
+
+    async def _login(self, websocket) -> bool:
+        """LOGIN 패킷 전송 및 응답 확인 (토큰 오류 시 재발급 후 False 반환)"""
+        await websocket.send(json.dumps({
+            'trnm': 'LOGIN',
+            'token': self.token_manager.get_valid_token()
+        }))
+        logger.info("LOGIN 패킷 전송")
+
+        # LOGIN 응답 전에 PING이 먼저 올 수 있어 몇 개까지는 건너뜀
+        for _ in range(5):
+            raw = await asyncio.wait_for(websocket.recv(), timeout=10.0)
+            try:
+                data = json.loads(raw)
+            except json.JSONDecodeError:
+                logger.warning("LOGIN 응답 파싱 실패 - JSON 형식이 아님")
+                continue
+
+            trnm = data.get('trnm')
+            if trnm == 'PING':
+                await websocket.send(raw)
+                continue
+            if trnm != 'LOGIN':
+                logger.debug(f"LOGIN 대기 중 다른 메시지 수신: {trnm}")
+                continue
+
+            return_code = data.get('return_code')
+            if return_code == 0:
+                logger.info("LOGIN 성공")
+                return True
+            if return_code == 805004:  # 토큰 인증 실패
+                logger.error("토큰 인증 실패 - 재인증 시도")
+                # 기존 토큰 무효화 후 재발급 (재연결은 호출 측에서 수행)
+                self.token_manager.access_token = None
+                self.token_manager.token_expiry = None
+                if await self.authenticate():
+                    logger.info("토큰 재인증 성공 - WebSocket 재연결 필요")
+                else:
+                    logger.error("토큰 재인증 실패")
+                return False
+            logger.error(f"LOGIN 실패: {data}")
+            return False
+
+        logger.error("LOGIN 응답을 받지 못함")
+        return False
+
+    async def _ensure_session(self) -> bool:
+        """로그인된 WebSocket 세션 확보 (없으면 연결, 동시 호출은 한 번만 연결)"""
+        if self.running and self.websocket is not None:
+            return True
+        async with self._connect_lock:
+            if self.running and self.websocket is not None:
+                return True
+            # 첫 시도에서 토큰이 재발급된 경우를 위해 한 번 더 시도
+            for _ in range(2):
+                if await self.connect():
+                    return True
+            return False
+
+    @staticmethod
+    def _ws_request_key(trnm: str, seq: Optional[str] = None) -> str:
+        """요청/응답 매칭 키 (trnm + 조건식 일련번호)"""
+        seq = str(seq).strip() if seq is not None else ''
+        return f"{trnm}:{seq}" if seq else trnm
+
+    async def _ws_send(self, message: str):
+        """WebSocket 전송 (동시 전송 직렬화)"""
+        async with self._send_lock:
+            if self.websocket is None:
+                raise ConnectionError("WebSocket 연결 없음")
+            await self.websocket.send(message)
+
+    async def _ws_request(self, payload: Dict, seq: Optional[str] = None, timeout: float = 15.0) -> Optional[Dict]:
+        """세션에 요청을 보내고 같은 trnm/seq의 응답을 기다림"""
+        if not await self._ensure_session():
+            logger.error(f"WebSocket 세션 확보 실패 - {payload.get('trnm')} 요청 불가")
+            return None
+
+        key = self._ws_request_key(payload['trnm'], seq)
+        future = asyncio.get_running_loop().create_future()
+        self._pending_requests.setdefault(key, deque()).append(future)
+        try:
+            await self._ws_send(json.dumps(payload))
+            logger.debug(f"{key} 요청 전송 (대기 중: {self._pending_count()}건)")
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            queue = self._pending_requests.get(key)
+            if queue is not None:
+                if future in queue:
+                    queue.remove(future)
+                if not queue:
+                    self._pending_requests.pop(key, None)
+
+    def _pending_count(self) -> int:
+        return sum(len(queue) for queue in self._pending_requests.values())
+
+    def _resolve_pending_request(self, data: Dict) -> bool:
+        """응답을 대기 중인 요청 future에 전달 (매칭되면 True)"""
+        trnm = data.get('trnm')
+        if not trnm or not self._pending_requests:
+            return False
+
+        key = self._ws_request_key(trnm, data.get('seq'))
+        keys = [key, trnm]
+        if key == trnm:
+            # 응답에 seq가 없을 때만 같은 trnm의 가장 오래된 요청으로 폴백
+            # (seq가 있는데 대기자가 없으면 타임아웃/취소된 요청의 응답이므로 다른 seq 대기자에게 넘기지 않음)
+            keys += [key for key in self._pending_requests if key.startswith(f"{trnm}:")]
+        for key in keys:
+            queue = self._pending_requests.get(key)
+            while queue:
+                future = queue.popleft()
+                if not future.done():
+                    future.set_result(data)
+                    return True
+        return False
+
+    def _fail_pending_requests(self, reason: str):
+        """연결 종료 시 대기 중인 요청을 모두 실패 처리"""
+        if not self._pending_requests:
+            return
+        logger.warning(f"WebSocket 대기 요청 {self._pending_count()}건 실패 처리: {reason}")
+        for queue in self._pending_requests.values():
+            for future in queue:
+                if not future.done():
+                    future.set_exception(ConnectionError(reason))
+        self._pending_requests.clear()
+
     async def disconnect(self):
         """웹소켓 연결 종료 (빠르고 안전하게)"""
         logger.info("🔄 [DEBUG] self.running을 False로 설정 (disconnect 메서드)")
@@ -110,6 +327,8 @@ class KiwoomAPI:
             self.auto_reconnect = False
         except Exception:
             pass
+        self._fail_pending_requests("WebSocket 연결 종료")
+        bar_aggregator.mark_gap()
         # 메시지 태스크 취소
         message_task = getattr(self, 'message_task', None)
         if message_task:
@@ -132,29 +351,40 @@ class KiwoomAPI:
                 logger.warning(f"WebSocket close error: {e}")
             finally:
                 self.websocket = None
-            
+
     async def _message_handler(self):
-        """웹소켓 메시지 처리 - Keep-Alive 포함"""
+        """웹소켓 메시지 처리 - Keep-Alive 및 요청/응답 매칭 포함"""
         logger.info("🔄 [DEBUG] 메시지 핸들러 시작 - running 상태 모니터링")
         while self.running and self.websocket:
             try:
                 # 타임아웃을 ping_interval보다 약간 길게 설정
                 message = await asyncio.wait_for(self.websocket.recv(), timeout=90.0)
                 data = json.loads(message)
-                
+
                 # 안전한 키 접근으로 수정
+                trnm = data.get("trnm")
                 message_type = data.get("type")
-                if message_type == "condition":
+                if trnm == "PING":
+                    # 서버 PING은 그대로 돌려보내야 세션이 유지됨
+                    await self._ws_send(message)
+                elif trnm == "REAL":
+                    self._handle_real_data(data)
+                elif self._resolve_pending_request(data):
+                    pass
+                elif message_type == "condition":
                     condition_name = data.get("condition_name")
                     if condition_name and condition_name in self.condition_callbacks:
                         await self.condition_callbacks[condition_name](data)
                 else:
                     # 예상하지 못한 메시지 타입 로깅
-                    logger.debug(f"알 수 없는 메시지 타입: {message_type}, 데이터: {data}")
-                    
+                    logger.debug(f"알 수 없는 메시지 타입: {trnm or message_type}, 데이터: {data}")
+
             except websockets.exceptions.ConnectionClosed as e:
                 logger.warning(f"🔄 [DEBUG] ConnectionClosed 예외 발생 - 코드: {e.code}, 이유: {e.reason}")
-                
+                self._fail_pending_requests(f"WebSocket 연결 끊김 (코드 {e.code})")
+                # 끊긴 동안의 체결은 받지 못하므로 실시간 봉은 이 시점부터 다시 완전해질 때까지 사용하지 않음
+                bar_aggregator.mark_gap()
+
                 # 정상 종료(1000) vs 비정상 종료 구분
                 if e.code == 1000:
                     logger.info("서버에서 정상적으로 연결을 종료했습니다.")
@@ -165,18 +395,21 @@ class KiwoomAPI:
                     break
                 else:
                     logger.warning(f"비정상적인 연결 종료: 코드 {e.code}")
-                
+
                 # 비정상 종료 시에만 재연결 시도
                 if self.auto_reconnect and self.reconnect_attempts < self.max_reconnect_attempts:
                     self.reconnect_attempts += 1
                     wait_time = self.reconnect_delay * self.reconnect_attempts
                     logger.info(f"🔄 재연결 시도 {self.reconnect_attempts}/{self.max_reconnect_attempts} - {wait_time}초 후")
-                    
+
                     self.websocket = None
-                    await asyncio.sleep(wait_time)
-                    
+                    # 재연결 중에는 요청 측(_ensure_session)이 중복 연결하지 않도록 잠금 유지
+                    async with self._connect_lock:
+                        await asyncio.sleep(wait_time)
+                        reconnected = await self.connect()
+
                     # 재연결 시도
-                    if await self.connect():
+                    if reconnected:
                         logger.info("🔄 재연결 성공!")
                         return  # 새로운 메시지 핸들러가 시작됨
                     else:
@@ -198,16 +431,17 @@ class KiwoomAPI:
             except Exception as e:
                 logger.error(f"웹소켓 메시지 처리 중 예상치 못한 오류: {e}")
                 await asyncio.sleep(1)
-        
+
         logger.info("🔄 [DEBUG] 메시지 핸들러 종료")
-        
-    
+
+
     async def graceful_shutdown(self):
         """우아한 종료"""
         logger.info("WebSocket 우아한 종료 시작")
         self.auto_reconnect = False  # 자동 재연결 비활성화
         self.running = False
-        
+        self._fail_pending_requests("WebSocket 종료")
+
         if self.websocket:
             try:
                 await self.websocket.close(code=1000, reason="Client shutdown")
@@ -217,175 +451,211 @@ class KiwoomAPI:
             finally:
                 self.websocket = None
 
-    
-    async def get_condition_list_websocket(self) -> List[Dict]:
-        """조건식 목록 조회 (WebSocket) - 키움증권 API 방식"""
-        logger.debug("get_condition_list_websocket 시작")
-        
-        # 새로운 WebSocket 연결 생성 (기존 연결과 충돌 방지)
-        try:
-            # 실전/모의에 따른 WebSocket 호스트 및 앱키 선택
-            use_mock = Config.KIWOOM_USE_MOCK_ACCOUNT
-            ws_host = Config.KIWOOM_MOCK_WS_URL if use_mock else Config.KIWOOM_WS_URL
-            app_key = Config.KIWOOM_MOCK_APP_KEY if use_mock else Config.KIWOOM_APP_KEY
-            app_secret = Config.KIWOOM_MOCK_APP_SECRET if use_mock else Config.KIWOOM_APP_SECRET
 
-            ws_url = f"{ws_host}/api/dostk/websocket"
-            
-            websocket = await websockets.connect(
-                ws_url,
-                extra_headers={
-                    "Content-Type": "application/json;charset=UTF-8",
-                    "Authorization": f"Bearer {self.token_manager.get_valid_token()}",
-                    "appkey": app_key,
-                    "appsecret": app_secret
+    async def subscribe_realtime(self, stock_codes: List[str], owner: str = "shared") -> bool:
+        """실시간 체결(0B) 구독 등록 - 수신 시세는 tick_store에 기록됨
+
+        owner는 구독을 요청한 모듈 이름으로, release_realtime(owner)로 그 모듈 몫만 놓을 수 있다.
+        """
+        if not Config.KIWOOM_REALTIME_PRICE_ENABLED:
+            return False
+
+        for code in stock_codes:
+            if code in self._realtime_codes:
+                self._realtime_owners.setdefault(code, set()).add(owner)
+        new_codes = [code for code in dict.fromkeys(stock_codes) if code and code not in self._realtime_codes]
+        if not new_codes:
+            return True
+
+        available = Config.KIWOOM_REALTIME_MAX_SUBSCRIPTIONS - len(self._realtime_codes)
+        if available <= 0:
+            logger.warning(f"📶 [REALTIME] 구독 상한({Config.KIWOOM_REALTIME_MAX_SUBSCRIPTIONS}) 도달 - REST 조회 사용: {new_codes}")
+            return False
+        if len(new_codes) > available:
+            logger.warning(f"📶 [REALTIME] 구독 상한 초과 - {len(new_codes) - available}개 종목은 REST 조회 사용")
+            new_codes = new_codes[:available]
+
+        self._realtime_codes.update(new_codes)
+        if await self._register_realtime(new_codes):
+            for code in new_codes:
+                self._realtime_owners.setdefault(code, set()).add(owner)
+            return True
+        self._realtime_codes.difference_update(new_codes)
+        return False
+
+    async def _register_realtime(self, stock_codes: List[str]) -> bool:
+        """REG 패킷 전송 (기존 등록 유지)"""
+        try:
+            # 한 번에 등록 가능한 종목 수를 고려해 나눠서 전송
+            for i in range(0, len(stock_codes), 100):
+                chunk = stock_codes[i:i + 100]
+                param = {
+                    'trnm': 'REG',
+                    'grp_no': '1',
+                    'refresh': '1',  # 기존 등록 유지
+                    'data': [{'item': chunk, 'type': ['0B']}]
                 }
-            )
-            
-            # 먼저 로그인 인증 메시지 전송
-            auth_param = {
-                'trnm': 'LOGIN',
-                'token': self.token_manager.get_valid_token()
+                data = await self._ws_request(param, timeout=10.0)
+                if data is None or data.get('return_code', 0) != 0:
+                    logger.error(f"📶 [REALTIME] 실시간 등록 실패: {data}")
+                    return False
+            logger.info(f"📶 [REALTIME] 실시간 체결 등록: {len(stock_codes)}개 종목 (총 {len(self._realtime_codes)}개)")
+            return True
+        except asyncio.TimeoutError:
+            logger.error("📶 [REALTIME] 실시간 등록 응답 타임아웃")
+            return False
+        except Exception as e:
+            logger.error(f"📶 [REALTIME] 실시간 등록 중 오류: {e}")
+            return False
+
+    async def unsubscribe_realtime(self, stock_codes: List[str]) -> bool:
+        """실시간 체결 구독 해제"""
+        codes = [code for code in stock_codes if code in self._realtime_codes]
+        if not codes:
+            return True
+        self._realtime_codes.difference_update(codes)
+        for code in codes:
+            self._realtime_owners.pop(code, None)
+            tick_store.discard(code)
+            bar_aggregator.discard(code)
+        if not (self.running and self.websocket is not None):
+            return True
+        try:
+            param = {
+                'trnm': 'REMOVE',
+                'grp_no': '1',
+                'data': [{'item': codes, 'type': ['0B']}]
             }
-            
-            auth_json = json.dumps(auth_param)
-            logger.info(f"LOGIN 패킷 전송: {auth_json}")
-            await websocket.send(auth_json)
-            
-            # 로그인 응답 대기
-            auth_response = await asyncio.wait_for(websocket.recv(), timeout=10.0)
-            logger.info(f"LOGIN 응답 수신: {auth_response}")
-            
-            # LOGIN 응답 파싱 및 토큰 오류 확인
+            data = await self._ws_request(param, timeout=10.0)
+            return data is not None and data.get('return_code', 0) == 0
+        except Exception as e:
+            logger.error(f"📶 [REALTIME] 실시간 해제 중 오류: {e}")
+            return False
+
+    async def release_realtime(self, owner: str) -> bool:
+        """owner가 구독한 종목을 놓고, 다른 모듈이 더 이상 쓰지 않는 종목만 구독 해제 (연결은 유지)"""
+        unused = []
+        for code, owners in list(self._realtime_owners.items()):
+            if owner in owners:
+                owners.discard(owner)
+                if not owners:
+                    unused.append(code)
+        if unused:
+            logger.info(f"📶 [REALTIME] {owner} 구독 해제: {len(unused)}개 종목")
+        return await self.unsubscribe_realtime(unused)
+
+    def _handle_real_data(self, data: Dict):
+        """REAL 메시지 처리 - 주식체결(0B)을 tick_store에 반영"""
+        for item in data.get('data') or []:
             try:
-                auth_data = json.loads(auth_response)
-                if auth_data.get("return_code") == 805004:  # 토큰 인증 실패
-                    logger.error("토큰 인증 실패 - 재인증 시도")
-                    # 기존 토큰 무효화
-                    self.token_manager.access_token = None
-                    self.token_manager.token_expiry = None
-                    
-                    # 재인증 시도
-                    if self.authenticate():
-                        logger.info("토큰 재인증 성공 - WebSocket 재연결 필요")
-                        await websocket.close()
-                        return None  # 재연결 필요
-                    else:
-                        logger.error("토큰 재인증 실패")
-                        await websocket.close()
-                        return None
-            except json.JSONDecodeError:
-                logger.warning("LOGIN 응답 파싱 실패 - JSON 형식이 아님")
-            
+                if item.get('type') != '0B':
+                    continue
+                stock_code = (item.get('item') or '').replace('A', '')
+                values = item.get('values') or {}
+                # 가격/거래량 필드는 부호(+/-)가 붙어 올 수 있음
+                price = abs(int(values.get('10') or 0))
+                volume = abs(int(values.get('15') or 0))
+                cum_volume = values.get('13')
+                cum_volume = abs(int(cum_volume)) if cum_volume else None
+
+                timestamp = None
+                trade_time = values.get('20')
+                if trade_time and len(trade_time) == 6:
+                    timestamp = datetime.combine(datetime.now().date(), datetime.strptime(trade_time, '%H%M%S').time())
+
+                tick_store.update(stock_code, price, volume, cum_volume, timestamp)
+            except (ValueError, TypeError) as e:
+                logger.debug(f"📶 [REALTIME] 체결 데이터 파싱 실패: {e}, 데이터: {item}")
+
+    def has_live_price(self, stock_code: str) -> bool:
+        """실시간 구독 중이고 체결 시세를 받은 종목인지 여부"""
+        return (stock_code in self._realtime_codes
+                and self.running and self.websocket is not None
+                and tick_store.get(stock_code) is not None)
+
+    async def await_price_update(self, stock_code: str, timeout: Optional[float] = None,
+                                 fallback_to_rest: bool = True,
+                                 priority: APIPriority = APIPriority.DASHBOARD) -> Optional[int]:
+        """실시간 시세로 현재가 확보 (미구독 시 구독 후 첫 체결 대기, 실패 시 REST 조회)"""
+        if self.has_live_price(stock_code):
+            return tick_store.get_price(stock_code)
+
+        if await self.subscribe_realtime([stock_code]):
+            wait_timeout = Config.KIWOOM_REALTIME_WAIT_TIMEOUT if timeout is None else timeout
+            tick = await tick_store.wait_for_update(stock_code, timeout=wait_timeout)
+            if tick:
+                return tick.price
+            logger.debug(f"📶 [REALTIME] {stock_code} 체결 대기 타임아웃 ({wait_timeout}초)")
+
+        if fallback_to_rest:
+            return await self.get_current_price(stock_code, priority=priority)
+        return None
+
+    async def get_condition_list_websocket(self) -> List[Dict]:
+        """조건식 목록 조회 (WebSocket) - 유지 중인 세션으로 CNSRLST 요청"""
+        logger.debug("get_condition_list_websocket 시작")
+
+        try:
             # 조건식 목록 조회 요청 패킷 (키움증권 API 방식)
             param = {
                 'trnm': 'CNSRLST',
                 'token': self.token_manager.get_valid_token()
             }
-            
-            logger.debug(f"CNSRLST 패킷 전송: {param}")
-            await websocket.send(json.dumps(param))
+
             logger.info("CNSRLST 패킷 전송")
-            
-            # OnReceiveConditionVer 응답 대기 (타임아웃 10초)
-            logger.debug("응답 대기 중...")
-            response = await asyncio.wait_for(websocket.recv(), timeout=10.0)
-            logger.debug(f"응답 수신: {response}")
-            data = json.loads(response)
-            
-            if data.get("trnm") == "CNSRLST":
-                if data.get("return_code") == 0:
-                    # 조건식 목록 파싱 (배열 형태: [['0', '조건식명'], ['1', '조건식명'], ...])
-                    condition_data = data.get("data", [])
-                    conditions = []
-                    
-                    if condition_data:
-                        logger.info(f"키움 API 원본 조건식 데이터: {condition_data}")
-                        logger.info(f"원본 데이터 개수: {len(condition_data)}")
-                        for i, item in enumerate(condition_data):
-                            logger.info(f"원본 아이템 {i}: {item} (타입: {type(item)}, 길이: {len(item) if isinstance(item, list) else 'N/A'})")
-                            if isinstance(item, list) and len(item) == 2:
-                                conditions.append({
-                                    "condition_id": item[0],
-                                    "condition_name": item[1]
-                                })
-                                logger.info(f"조건식 추가: ID={item[0]}, 이름={item[1]}")
-                            else:
-                                logger.warning(f"조건식 파싱 실패: {item}")
-                    
-                    logger.info(f"조건식 목록 조회 성공: {len(conditions)}개")
-                    logger.info(f"반환할 조건식 목록:")
-                    for i, cond in enumerate(conditions):
-                        logger.info(f"  {i+1}. {cond.get('condition_name')} (API ID: {cond.get('condition_id')})")
-                    return conditions
-                else:
-                    logger.error(f"조건식 목록 응답 오류: {data}")
-                    return []
+            data = await self._ws_request(param, timeout=10.0)
+            if data is None:
+                return []
+            logger.debug(f"응답 수신: {data}")
+
+            if data.get("return_code") == 0:
+                self._condition_list_loaded = True
+                return self._parse_condition_list(data)
             else:
-                logger.error(f"CNSRLST 실패: {data}")
+                logger.error(f"조건식 목록 응답 오류: {data}")
                 return []
-                
+
         except asyncio.TimeoutError:
             logger.error("조건식 목록 조회 타임아웃")
             return []
         except Exception as e:
             logger.error(f"WebSocket 조건식 목록 조회 중 오류: {e}")
             return []
-        finally:
-            # WebSocket 연결 정리
-            if 'websocket' in locals():
-                await websocket.close()
-    
+
+    def _parse_condition_list(self, data: Dict) -> List[Dict]:
+        """CNSRLST 응답 파싱 (배열 형태: [['0', '조건식명'], ['1', '조건식명'], ...])"""
+        condition_data = data.get("data", [])
+        conditions = []
+
+        if condition_data:
+            logger.info(f"키움 API 원본 조건식 데이터: {condition_data}")
+            logger.info(f"원본 데이터 개수: {len(condition_data)}")
+            for i, item in enumerate(condition_data):
+                logger.info(f"원본 아이템 {i}: {item} (타입: {type(item)}, 길이: {len(item) if isinstance(item, list) else 'N/A'})")
+                if isinstance(item, list) and len(item) == 2:
+                    conditions.append({
+                        "condition_id": item[0],
+                        "condition_name": item[1]
+                    })
+                    logger.info(f"조건식 추가: ID={item[0]}, 이름={item[1]}")
+                else:
+                    logger.warning(f"조건식 파싱 실패: {item}")
+
+        logger.info(f"조건식 목록 조회 성공: {len(conditions)}개")
+        logger.info(f"반환할 조건식 목록:")
+        for i, cond in enumerate(conditions):
+            logger.info(f"  {i+1}. {cond.get('condition_name')} (API ID: {cond.get('condition_id')})")
+        return conditions
+
     async def search_condition_stocks(self, condition_id: str, condition_name: str) -> List[Dict]:
-        """조건식으로 종목 검색 (WebSocket)"""
+        """조건식으로 종목 검색 (WebSocket) - 유지 중인 세션으로 CNSRREQ 요청"""
         logger.debug(f"조건식 검색 시작: {condition_name} (ID: {condition_id})")
-        
+
         try:
-            # 실전/모의에 따른 WebSocket 호스트 및 앱키 선택
-            use_mock = Config.KIWOOM_USE_MOCK_ACCOUNT
-            ws_host = Config.KIWOOM_MOCK_WS_URL if use_mock else Config.KIWOOM_WS_URL
-            app_key = Config.KIWOOM_MOCK_APP_KEY if use_mock else Config.KIWOOM_APP_KEY
-            app_secret = Config.KIWOOM_MOCK_APP_SECRET if use_mock else Config.KIWOOM_APP_SECRET
+            # 키움은 세션마다 CNSRLST 이후에만 CNSRREQ를 받으므로 최초 1회만 목록 조회
+            if not (self.running and self.websocket is not None and self._condition_list_loaded):
+                await self.get_condition_list_websocket()
 
-            ws_url = f"{ws_host}/api/dostk/websocket"
-            
-            websocket = await websockets.connect(
-                ws_url,
-                extra_headers={
-                    "Content-Type": "application/json;charset=UTF-8",
-                    "Authorization": f"Bearer {self.token_manager.get_valid_token()}",
-                    "appkey": app_key,
-                    "appsecret": app_secret
-                }
-            )
-            
-            # 먼저 로그인 인증 메시지 전송
-            auth_param = {
-                'trnm': 'LOGIN',
-                'token': self.token_manager.get_valid_token()
-            }
-            
-            logger.debug(f"LOGIN 패킷 전송: {auth_param}")
-            await websocket.send(json.dumps(auth_param))
-            logger.info("LOGIN 패킷 전송")
-            
-            # 로그인 응답 대기
-            auth_response = await asyncio.wait_for(websocket.recv(), timeout=10.0)
-            logger.debug(f"로그인 응답: {auth_response}")
-            
-            # 먼저 조건검색 목록 조회
-            list_param = {
-                'trnm': 'CNSRLST'
-            }
-            
-            list_json = json.dumps(list_param)
-            logger.info(f"CNSRLST 패킷 전송: {list_json}")
-            await websocket.send(list_json)
-            
-            # 조건검색 목록 응답 대기
-            list_response = await asyncio.wait_for(websocket.recv(), timeout=10.0)
-            logger.info(f"조건검색 목록 응답: {list_response}")
-            
             # 조건식 검색 요청 패킷 (키움증권 API 형식)
             search_param = {
                 'trnm': 'CNSRREQ',
@@ -395,265 +665,314 @@ class KiwoomAPI:
                 'cont_yn': 'N',
                 'next_key': ''
             }
-            
-            search_json = json.dumps(search_param)
-            logger.info(f"CNSRREQ 패킷 전송: {search_json}")
-            await websocket.send(search_json)
-            
-            # 조건식 검색 응답 대기 (PING 응답 처리)
-            logger.info("조건식 검색 응답 대기 중...")
-            
-            # PING 응답을 처리하고 실제 응답을 기다림
-            max_attempts = 10
-            for attempt in range(max_attempts):
-                response = await asyncio.wait_for(websocket.recv(), timeout=15.0)
-                
-                try:
-                    data = json.loads(response)
-                    # PING 응답이면 그대로 다시 전송
-                    if data.get('trnm') == 'PING':
-                        logger.debug(f"PING 응답 수신 (시도 {attempt + 1}), 응답 전송")
-                        await websocket.send(response)
-                        continue
-                    # 실제 응답이면 처리
-                    elif data.get('trnm') == 'CNSRREQ':
-                        logger.info(f"CNSRREQ 응답 수신 (시도 {attempt + 1}): {response}")
-                        break
-                    else:
-                        logger.warning(f"예상치 못한 응답 (시도 {attempt + 1}): {data.get('trnm', 'UNKNOWN')}")
-                        continue
-                except json.JSONDecodeError:
-                    logger.warning(f"JSON 파싱 실패 (시도 {attempt + 1}): {response[:100]}...")
-                    continue
-            else:
-                logger.error("최대 시도 횟수 초과, 유효한 응답을 받지 못함")
+
+            logger.info(f"CNSRREQ 패킷 전송: {json.dumps(search_param)}")
+            data = await self._ws_request(search_param, seq=condition_id, timeout=15.0)
+            if data is None:
                 return []
-            
-            # 응답 데이터 처리
-            if data.get('trnm') == 'CNSRREQ':
-                stocks = []
-                stock_data = data.get('data', [])
-                
-                if stock_data:
-                    for item in stock_data:
-                        if isinstance(item, dict):
-                            # 키움증권 응답 필드 매핑 (수정됨)
-                            stock_code = item.get('9001', '').replace('A', '')  # 종목코드에서 'A' 제거
-                            stock_name = item.get('302', '')
-                            current_price = item.get('10', '0')  # 현재가
-                            price_diff = item.get('11', '0')     # 전일대비 (기존 prev_close)
-                            change_rate = item.get('12', '0')    # 등락률
-                            volume = item.get('13', '0')        # 거래량
-                            
-                            # 전일종가 계산 (현재가 - 전일대비)
-                            try:
-                                current_price_int = int(current_price)
-                                price_diff_int = int(price_diff)
-                                prev_close = str(current_price_int - price_diff_int)
-                            except (ValueError, TypeError):
-                                prev_close = current_price
-                            
-                            # 등락률을 현실적인 범위로 조정 (키움 API 데이터가 비현실적일 수 있음)
-                            try:
-                                change_rate_float = float(change_rate)
-                                # 등락률이 ±30%를 초과하면 종목코드 기반으로 일관된 값 생성
-                                if abs(change_rate_float) > 30:
-                                    # 종목코드를 시드로 사용하여 일관된 랜덤값 생성
-                                    import random
-                                    random.seed(hash(stock_code) % 1000000)
-                                    change_rate = str(round(random.uniform(-5.0, 5.0), 2))
-                                else:
-                                    change_rate = str(round(change_rate_float, 2))
-                            except (ValueError, TypeError):
-                                # 종목코드를 시드로 사용하여 일관된 랜덤값 생성
-                                import random
-                                random.seed(hash(stock_code) % 1000000)
-                                change_rate = str(round(random.uniform(-3.0, 3.0), 2))
-                            
-                            stock_info = {
-                                'stock_code': stock_code,      # 'code' → 'stock_code'
-                                'stock_name': stock_name,      # 'name' → 'stock_name'
-                                'current_price': current_price, # 'price' → 'current_price'
-                                'prev_close': prev_close,
-                                'change_rate': change_rate,
-                                'volume': volume
-                            }
-                            stocks.append(stock_info)
-                
-                logger.info(f"조건식 검색 성공: {condition_name}, 종목 수: {len(stocks)}개")
-                return stocks
-            else:
+
+            if data.get('return_code', 0) != 0:
                 logger.error(f"조건식 검색 실패: {data}")
                 return []
-                
+
+            stocks = self._parse_condition_search_result(data)
+            logger.info(f"조건식 검색 성공: {condition_name}, 종목 수: {len(stocks)}개")
+            return stocks
+
         except asyncio.TimeoutError:
             logger.error("조건식 검색 타임아웃")
             return []
         except Exception as e:
             logger.error(f"조건식 검색 중 오류: {e}")
             return []
-        finally:
-            # WebSocket 연결 정리
-            if 'websocket' in locals():
-                await websocket.close()
+
+    def _parse_condition_search_result(self, data: Dict) -> List[Dict]:
+        """CNSRREQ 응답 파싱"""
+        stocks = []
+        stock_data = data.get('data', [])
+
+        if stock_data:
+            for item in stock_data:
+                if isinstance(item, dict):
+                    # 키움증권 응답 필드 매핑 (수정됨)
+                    stock_code = item.get('9001', '').replace('A', '')  # 종목코드에서 'A' 제거
+                    stock_name = item.get('302', '')
+                    current_price = item.get('10', '0')  # 현재가
+                    price_diff = item.get('11', '0')     # 전일대비 (기존 prev_close)
+                    change_rate = item.get('12', '0')    # 등락률
+                    volume = item.get('13', '0')        # 거래량
+
+                    # 전일종가 계산 (현재가 - 전일대비)
+                    try:
+                        current_price_int = int(current_price)
+                        price_diff_int = int(price_diff)
+                        prev_close = str(current_price_int - price_diff_int)
+                    except (ValueError, TypeError):
+                        prev_close = current_price
+
+                    # 등락률을 현실적인 범위로 조정 (키움 API 데이터가 비현실적일 수 있음)
+                    try:
+                        change_rate_float = float(change_rate)
+                        # 등락률이 ±30%를 초과하면 종목코드 기반으로 일관된 값 생성
+                        if abs(change_rate_float) > 30:
+                            # 종목코드를 시드로 사용하여 일관된 랜덤값 생성
+                            random.seed(hash(stock_code) % 1000000)
+                            change_rate = str(round(random.uniform(-5.0, 5.0), 2))
+                        else:
+                            change_rate = str(round(change_rate_float, 2))
+                    except (ValueError, TypeError):
+                        # 종목코드를 시드로 사용하여 일관된 랜덤값 생성
+                        random.seed(hash(stock_code) % 1000000)
+                        change_rate = str(round(random.uniform(-3.0, 3.0), 2))
+
+                    stock_info = {
+                        'stock_code': stock_code,      # 'code' → 'stock_code'
+                        'stock_name': stock_name,      # 'name' → 'stock_name'
+                        'current_price': current_price, # 'price' → 'current_price'
+                        'prev_close': prev_close,
+                        'change_rate': change_rate,
+                        'volume': volume
+                    }
+                    stocks.append(stock_info)
+        return stocks
     
-    async def get_stock_chart_data(self, stock_code: str, period: str = "1D"):
-        """종목 차트 데이터 조회 - 실제 키움 API 사용"""
-        try:
-            logger.info(f"차트 데이터 조회 시작: {stock_code}, 기간: {period}")
-            
-            if not self.token_manager.get_valid_token():
-                logger.error("키움 API 토큰이 없습니다")
-                return []
-            
-            # 레이트 리미터: 가용성 확인 (제한 중이면 즉시 건너뜀)
-            if not api_rate_limiter.is_api_available():
-                logger.warning("차트 조회 건너뜀 - API 제한 상태")
-                return []
-            
-            # 키움 API 호출 설정 - 실전/모의 분기
-            use_mock = Config.KIWOOM_USE_MOCK_ACCOUNT
-            host = Config.KIWOOM_MOCK_API_URL if use_mock else Config.KIWOOM_REAL_API_URL
-            endpoint = '/api/dostk/chart'
-            url = host + endpoint
-            
-            # 기간/주기에 따른 API 분기
-            normalized = (period or "1D").strip().upper()
-            is_minute_chart = normalized in {"5M", "5MIN", "M5", "5MINUTE", "5", "1M", "M1", "1MIN", "3M", "M3", "3MIN", "10M", "M10", "10MIN", "15M", "M15", "30M", "M30", "60M", "M60", "60MIN", "1H"}
-            
-            if is_minute_chart:
-                # 분봉 차트 API (ka10080)
-                api_id = 'ka10080'
-                
-                # 틱범위 설정: 1:1분, 3:3분, 5:5분, 10:10분, 15:15분, 30:30분, 45:45분, 60:60분
-                if normalized in {"5M", "5MIN", "M5", "5MINUTE", "5"}:
-                    tic_scope = "5"  # 5분봉
-                elif normalized in {"1M", "M1", "1MIN"}:
-                    tic_scope = "1"  # 1분봉
-                elif normalized in {"3M", "M3", "3MIN"}:
-                    tic_scope = "3"  # 3분봉
-                elif normalized in {"10M", "M10", "10MIN"}:
-                    tic_scope = "10"  # 10분봉
-                elif normalized in {"15M", "M15", "15MIN"}:
-                    tic_scope = "15"  # 15분봉
-                elif normalized in {"30M", "M30", "30MIN"}:
-                    tic_scope = "30"  # 30분봉
-                elif normalized in {"60M", "M60", "60MIN", "1H"}:
-                    tic_scope = "60"  # 60분봉
-                else:
-                    tic_scope = "5"  # 기본값: 5분봉
-                
-                request_data = {
-                    "stk_cd": stock_code,     # 종목코드
-                    "tic_scope": tic_scope,   # 틱범위
-                    "upd_stkpc_tp": "1"       # 수정주가타입 (1: 수정주가)
-                }
-                logger.info(f"📊 [CHART_DEBUG] 분봉 API 사용: {stock_code}, period={period}, tic_scope={tic_scope}, api_id={api_id}")
+    async def get_cached_chart_data(self, stock_code: str, period: str = "5M",
+                                    max_age: Optional[float] = None,
+                                    priority: APIPriority = APIPriority.DASHBOARD,
+                                    max_bars: Optional[int] = None,
+                                    stale_while_revalidate: bool = False) -> CandleSeries:
+        """캔들 저장소를 거친 차트 데이터 조회 (max_age 초 이내이고 봉 마감 전이면 재사용)
+
+        저장소가 마지막 저장 봉 이후만 증분 조회해 DB에 쌓으므로 재시작 후에도 바로 쓸 수 있다.
+        max_bars를 지정하면 연속조회로 그만큼의 이력을 채운다.
+        stale_while_revalidate면 만료된 캔들을 즉시 반환하고 갱신은 백그라운드에서 한다 (대시보드용).
+        """
+        # DB 모듈은 차트 저장소를 실제로 쓸 때만 로드 (API 클라이언트 단독 사용 시 DB 불필요)
+        from api.candle_store import candle_store
+        max_age = self._chart_cache_ttl if max_age is None else max_age
+        return await candle_store.get_candles(self, stock_code, period, max_age=max_age,
+                                              priority=priority, max_bars=max_bars,
+                                              stale_while_revalidate=stale_while_revalidate)
+
+    def _build_chart_request(self, stock_code: str, period: str):
+        """기간/주기에 따른 차트 TR 선택 및 요청 데이터 구성 -> (api_id, request_data)"""
+        normalized = (period or "1D").strip().upper()
+        is_minute_chart = normalized in {"5M", "5MIN", "M5", "5MINUTE", "5", "1M", "M1", "1MIN", "3M", "M3", "3MIN", "10M", "M10", "10MIN", "15M", "M15", "30M", "M30", "60M", "M60", "60MIN", "1H"}
+
+        if is_minute_chart:
+            # 분봉 차트 API (ka10080)
+            api_id = 'ka10080'
+
+            # 틱범위 설정: 1:1분, 3:3분, 5:5분, 10:10분, 15:15분, 30:30분, 45:45분, 60:60분
+            if normalized in {"5M", "5MIN", "M5", "5MINUTE", "5"}:
+                tic_scope = "5"  # 5분봉
+            elif normalized in {"1M", "M1", "1MIN"}:
+                tic_scope = "1"  # 1분봉
+            elif normalized in {"3M", "M3", "3MIN"}:
+                tic_scope = "3"  # 3분봉
+            elif normalized in {"10M", "M10", "10MIN"}:
+                tic_scope = "10"  # 10분봉
+            elif normalized in {"15M", "M15", "15MIN"}:
+                tic_scope = "15"  # 15분봉
+            elif normalized in {"30M", "M30", "30MIN"}:
+                tic_scope = "30"  # 30분봉
+            elif normalized in {"60M", "M60", "60MIN", "1H"}:
+                tic_scope = "60"  # 60분봉
             else:
-                # 일봉 차트 API (ka10081)
-                api_id = 'ka10081'
-                base_dt = datetime.now().strftime('%Y%m%d')
-                request_data = {
-                    "stk_cd": stock_code,  # 종목코드
-                    "base_dt": base_dt,    # 기준일자
-                    "upd_stkpc_tp": "1"    # 수정주가타입 (1: 수정주가)
-                }
-                logger.info(f"📊 [CHART_DEBUG] 일봉 API 사용: {stock_code}, period={period}, api_id={api_id}")
-            
-            # 요청 헤더
-            headers = {
-                'Content-Type': 'application/json;charset=UTF-8',
-                'authorization': f'Bearer {self.token_manager.get_valid_token()}',
-                'cont-yn': 'N',  # 연속조회여부
-                'next-key': '',  # 연속조회키
-                'api-id': api_id,  # TR명
+                tic_scope = "5"  # 기본값: 5분봉
+
+            request_data = {
+                "stk_cd": stock_code,     # 종목코드
+                "tic_scope": tic_scope,   # 틱범위
+                "upd_stkpc_tp": "1"       # 수정주가타입 (1: 수정주가)
+            }
+            logger.info(f"📊 [CHART_DEBUG] 분봉 API 사용: {stock_code}, period={period}, tic_scope={tic_scope}, api_id={api_id}")
+        else:
+            # 일봉 차트 API (ka10081)
+            api_id = 'ka10081'
+            base_dt = datetime.now().strftime('%Y%m%d')
+            request_data = {
+                "stk_cd": stock_code,  # 종목코드
+                "base_dt": base_dt,    # 기준일자
+                "upd_stkpc_tp": "1"    # 수정주가타입 (1: 수정주가)
             }
+            logger.info(f"📊 [CHART_DEBUG] 일봉 API 사용: {stock_code}, period={period}, api_id={api_id}")
+        return api_id, request_data
+
+    async def _fetch_chart_page(self, stock_code: str, api_id: str, request_data: Dict,
+                                cont_yn: str, next_key: str, priority: APIPriority):
+        """차트 TR 한 페이지 조회 (지수 백오프 리트라이) -> (응답, cont-yn, next-key), 실패 시 (None, 'N', '')"""
+        use_mock = Config.KIWOOM_USE_MOCK_ACCOUNT
+        host = Config.KIWOOM_MOCK_API_URL if use_mock else Config.KIWOOM_REAL_API_URL
+        url = host + '/api/dostk/chart'
+
+        # 요청 헤더 (연속조회 시 이전 응답의 cont-yn/next-key 전달)
+        headers = {
+            'Content-Type': 'application/json;charset=UTF-8',
+            'authorization': f'Bearer {self.token_manager.get_valid_token()}',
+            'cont-yn': cont_yn,  # 연속조회여부
+            'next-key': next_key,  # 연속조회키
+            'api-id': api_id,  # TR명
+        }
+
+        # 지수 백오프 리트라이
+        max_attempts = 3
+        for attempt in range(max_attempts):
+            # 호출 허가 대기 (예산이 허용하는 시점까지 우선순위 순으로 대기)
+            if not await api_rate_limiter.acquire(priority, f"chart_data_{stock_code}"):
+                logger.warning(f"차트 조회 건너뜀 - 호출 허가 대기 시간 초과: {stock_code}")
+                return None, 'N', ''
+
+            session = await self._get_http_session()
+            async with session.post(
+                url,
+                headers=headers,
+                json=request_data
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    logger.info(f"📊 [CHART_DEBUG] API 응답 코드: {data.get('return_code')}")
+                    if data.get('return_code') == 0:
+                        return data, response.headers.get('cont-yn', 'N'), response.headers.get('next-key', '')
+
+                    # 응답 본문에 제한 관련 문구가 있으면 제한 처리
+                    msg = (data.get('return_msg') or "").lower()
+                    if any(k in msg for k in ["rate limit", "too many", "요청 한도", "429", "제한"]):
+                        api_rate_limiter.handle_api_error(Exception(data.get('return_msg', 'rate limit')))
+                        backoff = (2 ** attempt) + random.uniform(0, 0.5)
+                        logger.warning(f"차트 조회 제한 감지 - {backoff:.2f}s 대기 후 재시도 {attempt+1}/{max_attempts}")
+                        await asyncio.sleep(backoff)
+                        continue
+                    logger.error(f"키움 API 오류: {data.get('return_msg')}")
+                    return None, 'N', ''
+                elif response.status == 429:
+                    # HTTP 429 - 제한
+                    api_rate_limiter.handle_api_error(Exception("429 Too Many Requests"))
+                    backoff = (2 ** attempt) + random.uniform(0, 0.5)
+                    logger.warning(f"HTTP 429 수신 - {backoff:.2f}s 대기 후 재시도 {attempt+1}/{max_attempts}")
+                    await asyncio.sleep(backoff)
+                    continue
+                else:
+                    logger.error(f"키움 API 호출 실패: {response.status}")
+                    return None, 'N', ''
+        # 모든 재시도 실패
+        return None, 'N', ''
+
+    async def iter_stock_chart_pages(self, stock_code: str, period: str = "1D",
+                                     since: Optional[datetime] = None,
+                                     max_bars: Optional[int] = None,
+                                     priority: APIPriority = APIPriority.DASHBOARD):
+        """차트 이력을 연속조회(cont-yn/next-key)로 한 페이지씩 스트리밍
+
+        키움은 최신 봉부터 내려주므로 페이지는 최신 -> 과거 순으로 나온다.
+        각 페이지는 시간 오름차순 CandleSeries이며, since 이전 봉에 닿거나
+        max_bars개를 채우거나 연속조회가 끝나면 멈춘다.
+        """
+        if not await self.token_manager.ensure_token():
+            logger.error("키움 API 토큰이 없습니다")
+            return
+
+        api_id, request_data = self._build_chart_request(stock_code, period)
+        logger.info(f"📊 [CHART_DEBUG] 요청 데이터: {request_data}")
+
+        since_epoch = to_epoch(since) if since else None
+        cont_yn, next_key = 'N', ''
+        total = 0
+        page_no = 0
+        while True:
+            # 같은 TR/파라미터/연속조회키 페이지를 받는 중이면 그 응답을 공유
+            flight_key = (api_id, tuple(sorted(request_data.items())), cont_yn, next_key)
+            data, cont_yn, next_key = await self._single_flight.do(flight_key, functools.partial(
+                self._fetch_chart_page, stock_code, api_id, request_data, cont_yn, next_key, priority),
+                priority=priority)
+            if data is None:
+                return
+            page_no += 1
+
+            page = self._parse_kiwoom_chart_data(data, stock_code, period)
+            reached_since = False
+            if since_epoch is not None and len(page) and page.timestamps[0] < since_epoch:
+                page = page.since(since_epoch)
+                reached_since = True
+            if max_bars is not None and total + len(page) > max_bars:
+                # 최신 봉 우선이므로 페이지의 과거 쪽을 잘라냄
+                page = page.tail(max_bars - total)
+
+            total += len(page)
+            logger.debug(f"📊 [CHART_PAGE] {stock_code} {api_id} {page_no}페이지: {len(page)}개 (누적 {total}개, cont-yn={cont_yn})")
+            if len(page):
+                yield page
+
+            if reached_since or (max_bars is not None and total >= max_bars):
+                return
+            if cont_yn != 'Y' or not next_key:
+                return
+
+    async def get_stock_chart_data(self, stock_code: str, period: str = "1D",
+                                   priority: APIPriority = APIPriority.DASHBOARD,
+                                   max_bars: Optional[int] = None) -> CandleSeries:
+        """종목 차트 데이터 조회 - 실제 키움 API 사용 (priority: 호출 허가 우선순위)
+
+        max_bars가 없으면 첫 페이지만 조회하고, 있으면 연속조회로 최대 max_bars개까지 모은다.
+        """
+        try:
+            logger.info(f"차트 데이터 조회 시작: {stock_code}, 기간: {period}")
+
+            pages = []
+            async with aclosing(self.iter_stock_chart_pages(
+                    stock_code, period, max_bars=max_bars, priority=priority)) as page_iter:
+                async for page in page_iter:
+                    pages.append(page)
+                    if max_bars is None:
+                        break
+
+            # 페이지는 최신 -> 과거 순이므로 뒤집어 시간 오름차순으로 합침
+            if not pages:
+                return CandleSeries.empty(stock_code, period)
+            return CandleSeries.concat(pages[::-1])
 
-            logger.info(f"📊 [CHART_DEBUG] 요청 데이터: {request_data}")
-            
-            # 지수 백오프 리트라이
-            max_attempts = 3
-            for attempt in range(max_attempts):
-                # 호출 기록 (윈도우 초과 시 제한 전환 및 중단)
-                if not api_rate_limiter.record_api_call("chart_data"):
-                    logger.warning("차트 조회 호출 한도 초과 - 제한 트리거됨")
-                    return []
-
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        url,
-                        headers=headers,
-                        json=request_data
-                    ) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            logger.info(f"📊 [CHART_DEBUG] API 응답 코드: {data.get('return_code')}")
-                            if data.get('return_code') == 0:
-                                # 응답 데이터 구조 확인
-                                chart_list = data.get('stk_dt_pole_chart_qry', [])
-                                logger.info(f"📊 [CHART_DEBUG] 응답 데이터 개수: {len(chart_list)}")
-                                if chart_list and len(chart_list) > 0:
-                                    first_item = chart_list[0]
-                                    last_item = chart_list[-1]
-                                    logger.info(f"📊 [CHART_DEBUG] 첫 번째 데이터: {first_item}")
-                                    logger.info(f"📊 [CHART_DEBUG] 마지막 데이터: {last_item}")
-                                return self._parse_kiwoom_chart_data(data, stock_code)
-                            else:
-                                # 응답 본문에 제한 관련 문구가 있으면 제한 처리
-                                msg = (data.get('return_msg') or "").lower()
-                                if any(k in msg for k in ["rate limit", "too many", "요청 한도", "429", "제한"]):
-                                    api_rate_limiter.handle_api_error(Exception(data.get('return_msg', 'rate limit')))
-                                    backoff = (2 ** attempt) + random.uniform(0, 0.5)
-                                    logger.warning(f"차트 조회 제한 감지 - {backoff:.2f}s 대기 후 재시도 {attempt+1}/{max_attempts}")
-                                    await asyncio.sleep(backoff)
-                                    continue
-                                logger.error(f"키움 API 오류: {data.get('return_msg')}")
-                                return []
-                        elif response.status == 429:
-                            # HTTP 429 - 제한
-                            api_rate_limiter.handle_api_error(Exception("429 Too Many Requests"))
-                            backoff = (2 ** attempt) + random.uniform(0, 0.5)
-                            logger.warning(f"HTTP 429 수신 - {backoff:.2f}s 대기 후 재시도 {attempt+1}/{max_attempts}")
-                            await asyncio.sleep(backoff)
-                            continue
-                        else:
-                            logger.error(f"키움 API 호출 실패: {response.status}")
-                            return []
-            # 모든 재시도 실패
-            return []
-                        
         except Exception as e:
             logger.error(f"실제 차트 데이터 조회 중 오류: {e}")
             # 오류 발생 시 빈 데이터 반환
-            return []
+            return CandleSeries.empty(stock_code, period)
     
-    async def get_current_price(self, stock_code: str) -> Optional[int]:
-        """종목 현재가 조회 (캐싱 적용)"""
+    async def get_current_price(self, stock_code: str,
+                                priority: APIPriority = APIPriority.DASHBOARD) -> Optional[int]:
+        """종목 현재가 조회 (실시간 시세 우선, REST 결과는 캐싱)"""
         try:
+            # 실시간 구독 중인 종목은 마지막 체결가가 곧 현재가
+            if self.has_live_price(stock_code):
+                return tick_store.get_price(stock_code)
+
+            # 구독 전에 받은 시세라도 캐시 TTL 이내면 사용
+            live_price = tick_store.get_price(stock_code, max_age=self._price_cache_ttl)
+            if live_price:
+                logger.debug(f"📶 [REALTIME] {stock_code} 실시간 시세 사용")
+                return live_price
+
             # 캐시 확인
-            if stock_code in self._price_cache:
-                price, timestamp = self._price_cache[stock_code]
-                age = datetime.now().timestamp() - timestamp
-                if age < self._price_cache_ttl:
-                    logger.debug(f"💾 [CACHE_HIT] {stock_code} 캐시 사용 (나이: {age:.1f}초)")
-                    return price
-            
+            price = self._price_cache.get(stock_code)
+            if price:
+                logger.debug(f"💾 [CACHE_HIT] {stock_code} 캐시 사용")
+                return price
+
+            # 같은 종목 조회가 이미 진행 중이면 그 응답을 함께 사용 (중복 REST 호출 방지)
+            return await self._single_flight.do(("ka10081", stock_code),
+                                                lambda: self._fetch_current_price(stock_code, priority),
+                                                priority=priority)
+        except Exception as e:
+            logger.error(f"현재가 조회 중 오류: {e}")
+            return None
+
+    async def _fetch_current_price(self, stock_code: str, priority: APIPriority) -> Optional[int]:
+        """현재가 REST 조회 (ka10081 최근 일봉 1건, 성공 시 캐시 저장)"""
+        try:
             logger.debug(f"현재가 조회 시작: {stock_code}")
             
-            if not self.token_manager.get_valid_token():
+            if not await self.token_manager.ensure_token():
                 logger.error("키움 API 토큰이 없습니다")
                 return None
             
-            # 레이트 리미터: 가용성 확인
-            if not api_rate_limiter.is_api_available():
-                logger.warning("현재가 조회 건너뜀 - API 제한 상태")
-                # 캐시에 있으면 오래된 데이터라도 반환
-                if stock_code in self._price_cache:
-                    price, _ = self._price_cache[stock_code]
-                    logger.warning(f"⚠️ API 제한으로 오래된 캐시 사용: {stock_code}")
-                    return price
-                return None
-            
             # 키움 API 호출 설정 - 실전/모의 분기
             use_mock = Config.KIWOOM_USE_MOCK_ACCOUNT
             host = Config.KIWOOM_MOCK_API_URL if use_mock else Config.KIWOOM_REAL_API_URL
@@ -689,213 +1008,142 @@ class KiwoomAPI:
             }
             
             # SSL 검증 완화 및 타임아웃 설정 (모의투자 서버 연결 문제 해결)
+            # 공유 세션을 그대로 쓰되, 이 요청에만 검증 비활성화 컨텍스트와 긴 타임아웃 적용
             timeout = aiohttp.ClientTimeout(total=60, connect=20, sock_read=30)
-            # SSL 컨텍스트 생성 - 인증서 검증 비활성화
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            
-            async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
-                async with session.post(url, headers=headers, json=request_data) as response:
-                    if response.status == 200:
-                        try:
-                            response_data = await response.json()
-                            
-                            # API 호출 기록
-                            api_rate_limiter.record_api_call(f"get_current_price_{stock_code}")
-                            
-                            # 응답 데이터 파싱 및 디버깅
-                            rt_cd = response_data.get("rt_cd")
-                            return_msg = response_data.get("return_msg", "")
-                            
-                            # 디버깅: 전체 응답 구조 로깅
-                            logger.debug(f"현재가 조회 응답 - {stock_code}: rt_cd={rt_cd}, return_msg={return_msg}")
-                            logger.debug(f"응답 데이터 키: {list(response_data.keys())}")
+
+            # 호출 허가 대기
+            if not await api_rate_limiter.acquire(priority, f"get_current_price_{stock_code}"):
+                logger.warning(f"현재가 조회 건너뜀 - 호출 허가 대기 시간 초과: {stock_code}")
+                return self._price_cache.get(stock_code, allow_stale=True)
+
+            session = await self._get_http_session()
+            async with session.post(url, headers=headers, json=request_data,
+                                    timeout=timeout, ssl=self._insecure_ssl_context) as response:
+                if response.status == 200:
+                    try:
+                        response_data = await response.json()
+                        
+                        # 응답 데이터 파싱 및 디버깅
+                        rt_cd = response_data.get("rt_cd")
+                        return_msg = response_data.get("return_msg", "")
+                        
+                        # 디버깅: 전체 응답 구조 로깅
+                        logger.debug(f"현재가 조회 응답 - {stock_code}: rt_cd={rt_cd}, return_msg={return_msg}")
+                        logger.debug(f"응답 데이터 키: {list(response_data.keys())}")
+                        
+                        # 성공 조건 확인 (rt_cd가 "0"이거나 "정상적으로 처리되었습니다" 메시지)
+                        is_success = (rt_cd == "0" or rt_cd == "1" or "정상적으로 처리되었습니다" in return_msg)
+                        
+                        if is_success:
+                            # 다양한 가능한 필드명 시도
+                            chart_list = None
+                            possible_fields = [
+                                'stk_dt_pole_chart_qry',
+                                'output',
+                                'data',
+                                'chart_data',
+                                'stock_data'
+                            ]
                             
-                            # 성공 조건 확인 (rt_cd가 "0"이거나 "정상적으로 처리되었습니다" 메시지)
-                            is_success = (rt_cd == "0" or rt_cd == "1" or "정상적으로 처리되었습니다" in return_msg)
+                            for field in possible_fields:
+                                if field in response_data and response_data[field]:
+                                    chart_list = response_data[field]
+                                    logger.debug(f"데이터 필드 발견: {field}")
+                                    break
                             
-                            if is_success:
-                                # 다양한 가능한 필드명 시도
-                                chart_list = None
-                                possible_fields = [
-                                    'stk_dt_pole_chart_qry',
-                                    'output',
-                                    'data',
-                                    'chart_data',
-                                    'stock_data'
-                                ]
+                            if chart_list and len(chart_list) > 0:
+                                # 다양한 가격 필드명 시도
+                                price_fields = ['cur_prc', 'close_price', 'price', 'current_price', 'close', 'last_price']
+                                current_price = None
                                 
-                                for field in possible_fields:
-                                    if field in response_data and response_data[field]:
-                                        chart_list = response_data[field]
-                                        logger.debug(f"데이터 필드 발견: {field}")
+                                for price_field in price_fields:
+                                    if price_field in chart_list[0]:
+                                        current_price = int(chart_list[0].get(price_field, 0))
+                                        logger.debug(f"가격 필드 발견: {price_field} = {current_price}")
                                         break
                                 
-                                if chart_list and len(chart_list) > 0:
-                                    # 다양한 가격 필드명 시도
-                                    price_fields = ['cur_prc', 'close_price', 'price', 'current_price', 'close', 'last_price']
-                                    current_price = None
-                                    
-                                    for price_field in price_fields:
-                                        if price_field in chart_list[0]:
-                                            current_price = int(chart_list[0].get(price_field, 0))
-                                            logger.debug(f"가격 필드 발견: {price_field} = {current_price}")
-                                            break
-                                    
-                                    if current_price and current_price > 0:
-                                        # 캐시에 저장
-                                        self._price_cache[stock_code] = (current_price, datetime.now().timestamp())
-                                        logger.info(f"💾 현재가 조회 성공 (캐시 저장): {stock_code} = {current_price:,}원")
-                                        return current_price
-                                    else:
-                                        logger.warning(f"유효한 가격 데이터 없음: {stock_code}")
-                                        logger.debug(f"차트 데이터: {chart_list[0]}")
-                                        return None
+                                if current_price and current_price > 0:
+                                    # 캐시에 저장
+                                    self._price_cache.set(stock_code, current_price,
+                                                          cache_ttl(self._price_cache_ttl))
+                                    logger.info(f"💾 현재가 조회 성공 (캐시 저장): {stock_code} = {current_price:,}원")
+                                    return current_price
                                 else:
-                                    logger.warning(f"차트 데이터 없음: {stock_code}")
-                                    logger.debug(f"전체 응답: {response_data}")
+                                    logger.warning(f"유효한 가격 데이터 없음: {stock_code}")
+                                    logger.debug(f"차트 데이터: {chart_list[0]}")
                                     return None
                             else:
-                                logger.error(f"현재가 조회 실패: {stock_code} - rt_cd={rt_cd}, return_msg={return_msg}")
+                                logger.warning(f"차트 데이터 없음: {stock_code}")
+                                logger.debug(f"전체 응답: {response_data}")
                                 return None
-                                
-                        except json.JSONDecodeError as e:
-                            logger.error(f"현재가 조회 응답 파싱 실패: {e}")
+                        else:
+                            logger.error(f"현재가 조회 실패: {stock_code} - rt_cd={rt_cd}, return_msg={return_msg}")
                             return None
-                    else:
-                        # 429 에러는 Rate Limit 초과를 의미
-                        if response.status == 429:
-                            logger.error(f"❌ [429 ERROR] API 호출 제한 초과!")
-                            logger.error(f"   - 종목코드: {stock_code}")
-                            logger.error(f"   - API URL: {url}")
-                            logger.error(f"   - 응답 헤더: {dict(response.headers)}")
                             
-                            # 응답 본문 확인
-                            try:
-                                error_body = await response.text()
-                                logger.error(f"   - 응답 본문: {error_body}")
-                            except:
-                                pass
-                            
-                            logger.error(f"   ⚠️  해결방법:")
-                            logger.error(f"      1. API 호출 간격을 더 늘리세요 (현재: {api_rate_limiter.min_call_interval}초)")
-                            logger.error(f"      2. 동시에 여러 종목 조회를 줄이세요")
-                            logger.error(f"      3. 키움 API 제한 정책 확인: 1초당 1회, 1분당 20회")
-                        else:
-                            logger.error(f"현재가 조회 API 호출 실패: HTTP {response.status}")
-                            try:
-                                error_body = await response.text()
-                                logger.error(f"   - 오류 내용: {error_body}")
-                            except:
-                                pass
-                        
+                    except json.JSONDecodeError as e:
+                        logger.error(f"현재가 조회 응답 파싱 실패: {e}")
                         return None
+                else:
+                    # 429 에러는 Rate Limit 초과를 의미
+                    if response.status == 429:
+                        logger.error(f"❌ [429 ERROR] API 호출 제한 초과!")
+                        logger.error(f"   - 종목코드: {stock_code}")
+                        logger.error(f"   - API URL: {url}")
+                        logger.error(f"   - 응답 헤더: {dict(response.headers)}")
+                        
+                        # 응답 본문 확인
+                        try:
+                            error_body = await response.text()
+                            logger.error(f"   - 응답 본문: {error_body}")
+                        except:
+                            pass
+                        
+                        logger.error(f"   ⚠️  해결방법:")
+                        logger.error(f"      1. API 호출 간격을 더 늘리세요 (현재: {api_rate_limiter.min_call_interval}초)")
+                        logger.error(f"      2. 동시에 여러 종목 조회를 줄이세요")
+                        logger.error(f"      3. 키움 API 제한 정책 확인: 1초당 1회, 1분당 20회")
+                    else:
+                        logger.error(f"현재가 조회 API 호출 실패: HTTP {response.status}")
+                        try:
+                            error_body = await response.text()
+                            logger.error(f"   - 오류 내용: {error_body}")
+                        except:
+                            pass
+                    
+                    return None
                         
         except Exception as e:
             logger.error(f"현재가 조회 중 오류: {e}")
             return None
     
-    def _parse_kiwoom_chart_data(self, api_response: dict, stock_code: str) -> list:
-        """키움 API 응답을 차트 데이터로 변환"""
-        chart_data = []
-        
+    def _parse_kiwoom_chart_data(self, api_response: dict, stock_code: str, period: str = "") -> CandleSeries:
+        """키움 API 응답을 컬럼형 캔들(CandleSeries)로 변환"""
         try:
-            # 분봉 데이터 (ka10080)
-            minute_chart_list = api_response.get('stk_min_pole_chart_qry', [])
-            # 일봉 데이터 (ka10081)
-            daily_chart_list = api_response.get('stk_dt_pole_chart_qry', [])
-            
-            if minute_chart_list:
-                # 분봉 데이터 파싱
-                logger.info(f"📊 [CHART_DEBUG] 분봉 데이터 파싱: {len(minute_chart_list)}개")
-                
-                # 원본 데이터 샘플 확인 (처음 3개)
-                logger.info(f"📊 [CHART_DEBUG] 원본 데이터 샘플:")
-                for i, sample in enumerate(minute_chart_list[:3]):
-                    logger.info(f"📊 [CHART_DEBUG] [{i+1}] {sample}")
-                
-                for item in minute_chart_list:
-                    # 분봉 API 응답 필드 매핑
-                    cntr_tm = item.get('cntr_tm', '')  # 체결시간 (YYYYMMDDHHMISS)
-                    open_price = abs(int(item.get('open_pric', 0)))  # 시가 (음수 제거)
-                    high_price = abs(int(item.get('high_pric', 0)))  # 고가 (음수 제거)
-                    low_price = abs(int(item.get('low_pric', 0)))   # 저가 (음수 제거)
-                    close_price = abs(int(item.get('cur_prc', 0)))  # 종가 (음수 제거)
-                    volume = int(item.get('trde_qty', 0))      # 거래량
-                    
-                    # 시간 형식 변환: YYYYMMDDHHMISS → YYYY-MM-DD HH:MM:00
-                    if len(cntr_tm) >= 12:
-                        formatted_date = f"{cntr_tm[:4]}-{cntr_tm[4:6]}-{cntr_tm[6:8]} {cntr_tm[8:10]}:{cntr_tm[10:12]}:00"
-                    else:
-                        formatted_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    
-                    chart_data.append({
-                        "timestamp": formatted_date,
-                        "open": open_price,
-                        "high": high_price,
-                        "low": low_price,
-                        "close": close_price,
-                        "volume": volume
-                    })
-                    
-            elif daily_chart_list:
-                # 일봉 데이터 파싱
-                logger.info(f"📊 [CHART_DEBUG] 일봉 데이터 파싱: {len(daily_chart_list)}개")
-                for item in daily_chart_list:
-                    # 일봉 API 응답 필드 매핑
-                    dt = item.get('dt', '')  # 날짜 (YYYYMMDD)
-                    open_price = int(item.get('open_pric', 0))  # 시가
-                    high_price = int(item.get('high_pric', 0))  # 고가
-                    low_price = int(item.get('low_pric', 0))   # 저가
-                    close_price = int(item.get('cur_prc', 0))  # 종가
-                    volume = int(item.get('trde_qty', 0))      # 거래량
-                    
-                    # 날짜 형식 변환: YYYYMMDD → YYYY-MM-DD 15:30:00 (장마감 기준)
-                    if len(dt) == 8:
-                        formatted_date = f"{dt[:4]}-{dt[4:6]}-{dt[6:8]} 15:30:00"
-                    else:
-                        formatted_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    
-                    chart_data.append({
-                        "timestamp": formatted_date,
-                        "open": open_price,
-                        "high": high_price,
-                        "low": low_price,
-                        "close": close_price,
-                        "volume": volume
-                    })
-            
-            # 날짜순으로 정렬 (오래된 것부터)
-            chart_data.sort(key=lambda x: x['timestamp'])
-            
-            logger.info(f"실제 차트 데이터 파싱 완료: {stock_code}, {len(chart_data)}개 포인트")
-            return chart_data
-            
+            candles = parse_kiwoom_chart(api_response, stock_code, period)
+            if len(candles):
+                logger.info(f"실제 차트 데이터 파싱 완료: {stock_code}, {len(candles)}개 포인트 "
+                            f"({candles.timestamp_str(0)} ~ {candles.timestamp_str(-1)})")
+            return candles
+
         except Exception as e:
             logger.error(f"차트 데이터 파싱 중 오류: {e}")
-            return []
-    
-    
+            return CandleSeries.empty(stock_code, period)
+
+    async def get_account_profit(self, stex_tp: str = "0", limit: int = 500,
+                                 priority: APIPriority = APIPriority.DASHBOARD) -> Dict:
+        """ka10085: 계좌수익률요청 - 보유종목별 수익현황 조회 (동시 조회는 한 번의 호출로 합침)"""
+        profit = await self._single_flight.do(("ka10085", stex_tp, limit),
+                                              lambda: self._fetch_account_profit(stex_tp, limit, priority),
+                                              priority=priority)
+        return copy.deepcopy(profit)
 
-    async def get_account_profit(self, stex_tp: str = "0", limit: int = 500) -> Dict:
-        """ka10085: 계좌수익률요청 - 보유종목별 수익현황 조회"""
-        if not self.token_manager.get_valid_token():
+    async def _fetch_account_profit(self, stex_tp: str, limit: int, priority: APIPriority) -> Dict:
+        """계좌수익률 REST 조회"""
+        if not await self.token_manager.ensure_token():
             logger.error("키움 API 토큰이 없습니다")
             return {"positions": [], "_data_source": "API_ERROR"}
 
         try:
-            # API 제한 확인 및 기록
-            if not api_rate_limiter.is_api_available():
-                logger.warning("🚫 [KIWOOM_API] API 제한 상태로 인해 손익 조회 건너뜀")
-                return {"positions": [], "_data_source": "API_ERROR"}
-            
-            # API 호출 기록 (간격 체크 포함)
-            if not api_rate_limiter.record_api_call("get_account_profit"):
-                logger.warning("🚫 [KIWOOM_API] API 호출 간격 부족으로 손익 조회 건너뜀")
-                return {"positions": [], "_data_source": "API_ERROR"}
-            
             use_mock = Config.KIWOOM_USE_MOCK_ACCOUNT
             host = Config.KIWOOM_MOCK_API_URL if use_mock else Config.KIWOOM_REAL_API_URL
             url = host + "/api/dostk/acnt"
@@ -913,60 +1161,67 @@ class KiwoomAPI:
             positions: List[Dict] = []
             cont_yn, next_key = 'N', ''
 
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
-                while True:
-                    h = dict(headers)
-                    h['cont-yn'] = cont_yn
-                    h['next-key'] = next_key
+            session = await self._get_http_session()
+            while True:
+                # 페이지마다 호출 허가 대기
+                if not await api_rate_limiter.acquire(priority, "get_account_profit"):
+                    logger.warning("🚫 [KIWOOM_API] 호출 허가 대기 시간 초과로 손익 조회 중단")
+                    if not positions:
+                        return {"positions": [], "_data_source": "API_ERROR"}
+                    break
 
-                    async with session.post(url, headers=h, json=body) as resp:
-                        text = await resp.text()
-                        if resp.status != 200:
-                            logger.error(f"ka10085 호출 실패: {resp.status} {text}")
-                            break
-                        try:
-                            data = json.loads(text)
-                        except json.JSONDecodeError:
-                            logger.error(f"ka10085 JSON 파싱 실패: {text}")
-                            break
+                h = dict(headers)
+                h['cont-yn'] = cont_yn
+                h['next-key'] = next_key
 
-                        if data.get('return_code') != 0:
-                            logger.error(f"ka10085 오류: {data}")
-                            break
+                async with session.post(url, headers=h, json=body) as resp:
+                    text = await resp.text()
+                    if resp.status != 200:
+                        logger.error(f"ka10085 호출 실패: {resp.status} {text}")
+                        break
+                    try:
+                        data = json.loads(text)
+                    except json.JSONDecodeError:
+                        logger.error(f"ka10085 JSON 파싱 실패: {text}")
+                        break
 
-                        for it in data.get('acnt_prft_rt', []) or []:
-                            def _to_int(v: str) -> int:
-                                try:
-                                    if isinstance(v, str) and (v.startswith('+') or v.startswith('-')):
-                                        return int(v.replace('+',''))
-                                    return int(v)
-                                except Exception:
-                                    return 0
-
-                            positions.append({
-                                "stock_code": it.get('stk_cd', ''),
-                                "stock_name": it.get('stk_nm', ''),
-                                "quantity": _to_int(it.get('rmnd_qty', '0')),
-                                "avg_price": _to_int(it.get('pur_pric', '0')),
-                                "purchase_amount": _to_int(it.get('pur_amt', '0')),
-                                "current_price_delta": _to_int(it.get('cur_prc', '0')),
-                                "today_pl": _to_int(it.get('tdy_sel_pl', '0')),
-                                "commission_today": _to_int(it.get('tdy_trde_cmsn', '0')),
-                                "tax_today": _to_int(it.get('tdy_trde_tax', '0')),
-                                "credit_type": it.get('crd_tp', ''),
-                                "loan_date": it.get('loan_dt', ''),
-                                "settle_remain": _to_int(it.get('setl_remn', '0')),
-                            })
-                            if len(positions) >= limit:
-                                break
+                    if data.get('return_code') != 0:
+                        logger.error(f"ka10085 오류: {data}")
+                        break
+
+                    for it in data.get('acnt_prft_rt', []) or []:
+                        def _to_int(v: str) -> int:
+                            try:
+                                if isinstance(v, str) and (v.startswith('+') or v.startswith('-')):
+                                    return int(v.replace('+',''))
+                                return int(v)
+                            except Exception:
+                                return 0
 
+                        positions.append({
+                            "stock_code": it.get('stk_cd', ''),
+                            "stock_name": it.get('stk_nm', ''),
+                            "quantity": _to_int(it.get('rmnd_qty', '0')),
+                            "avg_price": _to_int(it.get('pur_pric', '0')),
+                            "purchase_amount": _to_int(it.get('pur_amt', '0')),
+                            "current_price_delta": _to_int(it.get('cur_prc', '0')),
+                            "today_pl": _to_int(it.get('tdy_sel_pl', '0')),
+                            "commission_today": _to_int(it.get('tdy_trde_cmsn', '0')),
+                            "tax_today": _to_int(it.get('tdy_trde_tax', '0')),
+                            "credit_type": it.get('crd_tp', ''),
+                            "loan_date": it.get('loan_dt', ''),
+                            "settle_remain": _to_int(it.get('setl_remn', '0')),
+                        })
                         if len(positions) >= limit:
                             break
 
-                        cont_yn = resp.headers.get('cont-yn', 'N')
-                        next_key = resp.headers.get('next-key', '')
-                        if cont_yn != 'Y' or not next_key:
-                            break
+                    if len(positions) >= limit:
+                        break
+
+                    cont_yn = resp.headers.get('cont-yn', 'N')
+                    next_key = resp.headers.get('next-key', '')
+                    if cont_yn != 'Y' or not next_key:
+                        break
 
             return {
                 "positions": positions[:limit],
@@ -981,11 +1236,16 @@ class KiwoomAPI:
 
     async def place_buy_order(self, stock_code: str, quantity: int, price: int = 0, order_type: str = "3") -> Dict:
         """주식 매수 주문 (키움 API kt10000 스펙)"""
-        if not self.token_manager.get_valid_token():
+        if not await self.token_manager.ensure_token():
             logger.error("키움 API 토큰이 없습니다")
             return {"success": False, "error": "토큰 없음"}
             
         try:
+            # 주문은 최우선 순위로 호출 허가 대기
+            if not await api_rate_limiter.acquire(APIPriority.ORDER, "place_buy_order"):
+                logger.error(f"매수 주문 실패 - 호출 허가 대기 시간 초과: {stock_code}")
+                return {"success": False, "error": "API 호출 허가 대기 시간 초과"}
+
             # 계좌 타입에 따른 도메인 설정
             use_mock_account = Config.KIWOOM_USE_MOCK_ACCOUNT
             if use_mock_account:
@@ -1037,56 +1297,56 @@ class KiwoomAPI:
             
             logger.info(f"매수 주문 요청: {stock_code}, 수량: {quantity}, 가격: {price}, 타입: {order_type}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url, 
-                    headers=headers, 
-                    json=request_data,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    
-                    response_text = await response.text()
-                    logger.info(f"매수 주문 응답: {response.status} - {response_text}")
-                    
-                    if response.status == 200:
-                        try:
-                            data = json.loads(response_text)
-
-                            # 키움 응답 키가 버전에 따라 다를 수 있어 둘 다 허용
-                            return_code = data.get("return_code")
-                            rt_cd = data.get("rt_cd")
-                            success = (return_code == 0) or (rt_cd == "0")
-
-                            if success:
-                                order_no = data.get('ord_no', '') or data.get("order_no", "")
-                                logger.info(f"매수 주문 성공: {stock_code} - 주문번호: {order_no}")
-                                return {
-                                    "success": True,
-                                    "order_id": order_no,
-                                    "order_no": order_no,
-                                    "message": data.get('return_msg') or data.get("msg1") or '정상적으로 처리되었습니다'
-                                }
-
-                            error_msg = data.get('return_msg') or data.get("msg1") or '알 수 없는 오류'
-                            logger.error(f"매수 주문 실패: {error_msg}")
-                            return {
-                                "success": False,
-                                "error": error_msg,
-                                "_request": request_data,
-                                "_response": data,
-                            }
-                        except json.JSONDecodeError as e:
-                            logger.error(f"매수 주문 응답 파싱 실패: {e}")
+            session = await self._get_http_session()
+            async with session.post(
+                url, 
+                headers=headers, 
+                json=request_data,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+                
+                response_text = await response.text()
+                logger.info(f"매수 주문 응답: {response.status} - {response_text}")
+                
+                if response.status == 200:
+                    try:
+                        data = json.loads(response_text)
+
+                        # 키움 응답 키가 버전에 따라 다를 수 있어 둘 다 허용
+                        return_code = data.get("return_code")
+                        rt_cd = data.get("rt_cd")
+                        success = (return_code == 0) or (rt_cd == "0")
+
+                        if success:
+                            order_no = data.get('ord_no', '') or data.get("order_no", "")
+                            logger.info(f"매수 주문 성공: {stock_code} - 주문번호: {order_no}")
                             return {
-                                "success": False,
-                                "error": "응답 파싱 실패"
+                                "success": True,
+                                "order_id": order_no,
+                                "order_no": order_no,
+                                "message": data.get('return_msg') or data.get("msg1") or '정상적으로 처리되었습니다'
                             }
-                    else:
-                        logger.error(f"매수 주문 API 호출 실패: {response.status}")
+
+                        error_msg = data.get('return_msg') or data.get("msg1") or '알 수 없는 오류'
+                        logger.error(f"매수 주문 실패: {error_msg}")
                         return {
                             "success": False,
-                            "error": f"API 호출 실패: {response.status}"
+                            "error": error_msg,
+                            "_request": request_data,
+                            "_response": data,
                         }
+                    except json.JSONDecodeError as e:
+                        logger.error(f"매수 주문 응답 파싱 실패: {e}")
+                        return {
+                            "success": False,
+                            "error": "응답 파싱 실패"
+                        }
+                else:
+                    logger.error(f"매수 주문 API 호출 실패: {response.status}")
+                    return {
+                        "success": False,
+                        "error": f"API 호출 실패: {response.status}"
+                    }
                         
         except Exception as e:
             logger.error(f"매수 주문 중 오류: {e}")
@@ -1097,11 +1357,16 @@ class KiwoomAPI:
 
     async def place_sell_order(self, stock_code: str, quantity: int, price: int = 0, order_type: str = "3") -> Dict:
         """주식 매도 주문 (키움 API kt10000 스펙)"""
-        if not self.token_manager.get_valid_token():
+        if not await self.token_manager.ensure_token():
             logger.error("키움 API 토큰이 없습니다")
             return {"success": False, "error": "토큰 없음"}
             
         try:
+            # 주문은 최우선 순위로 호출 허가 대기
+            if not await api_rate_limiter.acquire(APIPriority.ORDER, "place_sell_order"):
+                logger.error(f"매도 주문 실패 - 호출 허가 대기 시간 초과: {stock_code}")
+                return {"success": False, "error": "API 호출 허가 대기 시간 초과"}
+
             # 계좌 타입에 따른 도메인 설정
             use_mock_account = Config.KIWOOM_USE_MOCK_ACCOUNT
             if use_mock_account:
@@ -1151,49 +1416,49 @@ class KiwoomAPI:
             
             logger.info(f"매도 주문 요청: {stock_code}, 수량: {quantity}, 가격: {price}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=request_data) as response:
-                    if response.status == 200:
-                        try:
-                            response_text = await response.text()
-                            logger.info(f"매도 주문 응답: {response.status} - {response_text}")
-
-                            response_data = json.loads(response_text)
-
-                            # 키움 응답 키가 버전에 따라 다를 수 있어 둘 다 허용
-                            return_code = response_data.get("return_code")
-                            rt_cd = response_data.get("rt_cd")
-                            success = (return_code == 0) or (rt_cd == "0")
-
-                            if success:
-                                order_no = response_data.get("ord_no", "") or response_data.get("order_no", "")
-                                return {
-                                    "success": True,
-                                    "order_id": order_no,
-                                    "order_no": order_no,
-                                    "message": response_data.get("return_msg") or response_data.get("msg1") or "매도 주문이 성공적으로 접수되었습니다."
-                                }
-
-                            error_msg = response_data.get("return_msg") or response_data.get("msg1") or "매도 주문 실패"
-                            logger.error(f"매도 주문 실패: {error_msg}")
-                            return {
-                                "success": False,
-                                "error": error_msg,
-                                "_request": request_data,
-                                "_response": response_data,
-                            }
-                        except json.JSONDecodeError as e:
-                            logger.error(f"매도 주문 응답 파싱 실패: {e}")
+            session = await self._get_http_session()
+            async with session.post(url, headers=headers, json=request_data) as response:
+                if response.status == 200:
+                    try:
+                        response_text = await response.text()
+                        logger.info(f"매도 주문 응답: {response.status} - {response_text}")
+
+                        response_data = json.loads(response_text)
+
+                        # 키움 응답 키가 버전에 따라 다를 수 있어 둘 다 허용
+                        return_code = response_data.get("return_code")
+                        rt_cd = response_data.get("rt_cd")
+                        success = (return_code == 0) or (rt_cd == "0")
+
+                        if success:
+                            order_no = response_data.get("ord_no", "") or response_data.get("order_no", "")
                             return {
-                                "success": False,
-                                "error": "응답 파싱 실패"
+                                "success": True,
+                                "order_id": order_no,
+                                "order_no": order_no,
+                                "message": response_data.get("return_msg") or response_data.get("msg1") or "매도 주문이 성공적으로 접수되었습니다."
                             }
-                    else:
-                        logger.error(f"매도 주문 API 호출 실패: {response.status}")
+
+                        error_msg = response_data.get("return_msg") or response_data.get("msg1") or "매도 주문 실패"
+                        logger.error(f"매도 주문 실패: {error_msg}")
                         return {
                             "success": False,
-                            "error": f"API 호출 실패: {response.status}"
+                            "error": error_msg,
+                            "_request": request_data,
+                            "_response": response_data,
                         }
+                    except json.JSONDecodeError as e:
+                        logger.error(f"매도 주문 응답 파싱 실패: {e}")
+                        return {
+                            "success": False,
+                            "error": "응답 파싱 실패"
+                        }
+                else:
+                    logger.error(f"매도 주문 API 호출 실패: {response.status}")
+                    return {
+                        "success": False,
+                        "error": f"API 호출 실패: {response.status}"
+                    }
                         
         except Exception as e:
             logger.error(f"매도 주문 중 오류: {e}")
@@ -1202,22 +1467,27 @@ class KiwoomAPI:
                 "error": str(e)
             }
 
-    async def get_account_balance(self, account_number: str = None) -> Dict:
-        """계좌 잔고 정보 조회 - 키움 API kt00004 사용"""
-        """계좌 잔고 정보 조회 - 개선된 에러 처리"""
-        if not self.token_manager.get_valid_token():
+    async def get_account_balance(self, account_number: str = None,
+                                  priority: APIPriority = APIPriority.DASHBOARD) -> Dict:
+        """계좌 잔고 정보 조회 - 키움 API kt00004 사용 (동시 조회는 한 번의 호출로 합침)"""
+        if not account_number:
+            account_number = Config.KIWOOM_MOCK_ACCOUNT_NUMBER if Config.KIWOOM_USE_MOCK_ACCOUNT else Config.KIWOOM_ACCOUNT_NUMBER
+        balance = await self._single_flight.do(("kt00004", account_number),
+                                               lambda: self._fetch_account_balance(account_number, priority),
+                                               priority=priority)
+        # 합류한 호출자끼리 같은 dict를 나눠 갖지 않도록 복사본 반환
+        return copy.deepcopy(balance)
+
+    async def _fetch_account_balance(self, account_number: str, priority: APIPriority) -> Dict:
+        """계좌 잔고 REST 조회 - 개선된 에러 처리"""
+        if not await self.token_manager.ensure_token():
             logger.error("키움 API 토큰이 없습니다")
             return {}
             
         try:
-            # API 제한 확인 및 기록
-            if not api_rate_limiter.is_api_available():
-                logger.warning("🚫 [KIWOOM_API] API 제한 상태로 인해 계좌 조회 건너뜀")
-                return {}
-            
-            # API 호출 기록 (간격 체크 포함)
-            if not api_rate_limiter.record_api_call("get_account_balance"):
-                logger.debug("🚫 [KIWOOM_API] API 호출 간격 부족으로 계좌 조회 건너뜀 (정상 동작)")
+            # 호출 허가 대기 (우선순위 순)
+            if not await api_rate_limiter.acquire(priority, "get_account_balance"):
+                logger.warning("🚫 [KIWOOM_API] 호출 허가 대기 시간 초과로 계좌 조회 건너뜀")
                 return {}
             
             # 계좌번호 설정 (매개변수 우선, 없으면 환경변수 사용)
@@ -1264,41 +1534,41 @@ class KiwoomAPI:
             logger.info(f"계좌번호: {account_number}")
             logger.info(f"앱키 존재: {bool(Config.KIWOOM_APP_KEY)}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url, 
-                    headers=headers, 
-                    json=request_data,
-                    timeout=aiohttp.ClientTimeout(total=30)  # 타임아웃 추가
-                ) as response:
-                    
-                    # 응답 상세 로깅 추가
-                    response_text = await response.text()
-                    logger.debug(f"계좌 조회 응답 상태: {response.status}")
-                    
-                    if response.status == 200:
-                        try:
-                            data = json.loads(response_text)
-                            return_code = data.get('return_code')
-                            logger.debug(f"계좌 조회 return_code: {return_code}")
-                            
-                            # 응답 확인
-                            if return_code == 0:  # 성공
-                                result = self._parse_account_balance_safe(data)
-                                return result
-                            else:
-                                error_msg = data.get('msg1', '알 수 없는 오류')
-                                logger.error(f"키움 API 계좌조회 오류: {error_msg}")
-                                logger.error(f"전체 응답: {data}")
-                                return {}
-                        except json.JSONDecodeError as e:
-                            logger.error(f"JSON 파싱 실패: {e}")
-                            logger.error(f"원본 응답: {response_text}")
+            session = await self._get_http_session()
+            async with session.post(
+                url, 
+                headers=headers, 
+                json=request_data,
+                timeout=aiohttp.ClientTimeout(total=30)  # 타임아웃 추가
+            ) as response:
+                
+                # 응답 상세 로깅 추가
+                response_text = await response.text()
+                logger.debug(f"계좌 조회 응답 상태: {response.status}")
+                
+                if response.status == 200:
+                    try:
+                        data = json.loads(response_text)
+                        return_code = data.get('return_code')
+                        logger.debug(f"계좌 조회 return_code: {return_code}")
+                        
+                        # 응답 확인
+                        if return_code == 0:  # 성공
+                            result = self._parse_account_balance_safe(data)
+                            return result
+                        else:
+                            error_msg = data.get('msg1', '알 수 없는 오류')
+                            logger.error(f"키움 API 계좌조회 오류: {error_msg}")
+                            logger.error(f"전체 응답: {data}")
                             return {}
-                    else:
-                        logger.error(f"키움 API 호출 실패: {response.status}")
-                        logger.error(f"오류 응답: {response_text}")
+                    except json.JSONDecodeError as e:
+                        logger.error(f"JSON 파싱 실패: {e}")
+                        logger.error(f"원본 응답: {response_text}")
                         return {}
+                else:
+                    logger.error(f"키움 API 호출 실패: {response.status}")
+                    logger.error(f"오류 응답: {response_text}")
+                    return {}
                         
         except aiohttp.ClientError as e:
             logger.error(f"HTTP 클라이언트 오류: {e}")
@@ -1400,5 +1670,19 @@ class KiwoomAPI:
             logger.error(f"스택 트레이스: {traceback.format_exc()}")
             return {}
 
-# 전역 인스턴스
-kiwoom_api = KiwoomAPI()
\ No newline at end of file
+# 전역 인스턴스 (프로세스 전체가 하나의 토큰/세션/가격·차트 캐시를 공유)
+kiwoom_api = KiwoomAPI()
+_current_kiwoom_api = kiwoom_api
+
+
+def get_kiwoom_api() -> KiwoomAPI:
+    """프로세스 공용 KiwoomAPI 반환"""
+    return _current_kiwoom_api
+
+
+def set_kiwoom_api(api: KiwoomAPI) -> KiwoomAPI:
+    """공용 KiwoomAPI 교체 (테스트용 가짜 클라이언트 주입) - 이전 인스턴스 반환"""
+    global _current_kiwoom_api
+    previous = _current_kiwoom_api
+    _current_kiwoom_api = api
+    return previous
\ No newline at end of file
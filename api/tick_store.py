@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Tick:
+    """종목별 최신 체결 정보"""
+
+    __slots__ = ("stock_code", "price", "volume", "cum_volume", "timestamp", "received_at")
+
+    def __init__(self, stock_code: str, price: int, volume: int = 0,
+                 cum_volume: Optional[int] = None, timestamp: Optional[datetime] = None):
+        self.stock_code = stock_code
+        self.price = price
+        self.volume = volume            # 체결량 (해당 틱)
+        self.cum_volume = cum_volume    # 누적 거래량
+        self.timestamp = timestamp or datetime.now()  # 체결 시각
+        self.received_at = datetime.now().timestamp()  # 수신 시각 (epoch 초)
+
+    def to_dict(self) -> Dict:
+        return {
+            "stock_code": self.stock_code,
+            "price": self.price,
+            "volume": self.volume,
+            "cum_volume": self.cum_volume,
+            "timestamp": self.timestamp.isoformat(),
+        }
+
+
+class TickStore:
+    """실시간 체결 시세 저장소 (종목코드 -> 최신 Tick)
+
+    WebSocket 실시간 체결(0B) 수신 시 KiwoomAPI가 update()를 호출하고,
+    매니저들은 get_price()로 즉시 읽거나 wait_for_update()로 다음 체결을 기다린다.
+    """
+
+    def __init__(self):
+        self._ticks: Dict[str, Tick] = {}
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._listeners: List[Callable[[Tick], None]] = []
+        self.update_count = 0
+
+    def update(self, stock_code: str, price: int, volume: int = 0,
+               cum_volume: Optional[int] = None, timestamp: Optional[datetime] = None) -> Optional[Tick]:
+        """체결 반영 후 대기자/리스너에 통지"""
+        if not stock_code or not price or price <= 0:
+            return None
+
+        tick = Tick(stock_code, price, volume, cum_volume, timestamp)
+        self._ticks[stock_code] = tick
+        self.update_count += 1
+
+        for future in self._waiters.pop(stock_code, []):
+            if not future.done():
+                future.set_result(tick)
+
+        for listener in list(self._listeners):
+            try:
+                listener(tick)
+            except Exception as e:
+                logger.error(f"📶 [TICK_STORE] 리스너 처리 오류 - {stock_code}: {e}")
+        return tick
+
+    def get(self, stock_code: str) -> Optional[Tick]:
+        return self._ticks.get(stock_code)
+
+    def get_price(self, stock_code: str, max_age: Optional[float] = None) -> Optional[int]:
+        """최신 체결가 반환 (max_age 초보다 오래된 시세는 None)"""
+        tick = self._ticks.get(stock_code)
+        if not tick:
+            return None
+        if max_age is not None and datetime.now().timestamp() - tick.received_at > max_age:
+            return None
+        return tick.price
+
+    async def wait_for_update(self, stock_code: str, timeout: Optional[float] = None) -> Optional[Tick]:
+        """해당 종목의 다음 체결을 기다림 (타임아웃 시 None)"""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(stock_code, []).append(future)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            waiters = self._waiters.get(stock_code)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    self._waiters.pop(stock_code, None)
+
+    def add_listener(self, listener: Callable[[Tick], None]):
+        """체결마다 호출될 동기 콜백 등록 (이벤트 루프에서 호출되므로 가볍게 유지)"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Tick], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def discard(self, stock_code: str):
+        """구독 해제된 종목의 시세 제거"""
+        self._ticks.pop(stock_code, None)
+
+    def get_status_info(self) -> Dict:
+        return {
+            "symbols": len(self._ticks),
+            "update_count": self.update_count,
+            "waiters": sum(len(w) for w in self._waiters.values()),
+            "listeners": len(self._listeners),
+        }
+
+
+# 전역 인스턴스
+tick_store = TickStore()
@@ -1,38 +1,65 @@
+import asyncio
+import json
+import random
 from datetime import datetime, timedelta
 from typing import Optional
-import requests
+import aiohttp
 import logging
 from core.config import Config
-import urllib3
-
-# SSL 검증 비활성화 경고 억제 (모의투자 서버 연결 문제 해결)
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logger = logging.getLogger(__name__)
 
 class TokenManager:
+    """키움증권 접근 토큰 관리 (asyncio 기반)
+
+    - 토큰 발급은 aiohttp로 수행해 이벤트 루프를 막지 않는다.
+    - 동시에 들어온 발급 요청은 하나의 진행 중 요청으로 합쳐진다.
+    - start_auto_refresh() 이후에는 만료 전에 백그라운드에서 미리 재발급한다.
+
+    키움 expires_dt는 한국 시간 기준이므로 만료 비교는 로컬 시간(datetime.now())으로 한다.
+    """
+
     def __init__(self):
         self.access_token: Optional[str] = None
         self.token_expiry: Optional[datetime] = None
         self.refresh_token: Optional[str] = None
         self.last_429_error_time: Optional[datetime] = None  # 마지막 429 에러 발생 시간
         self.rate_limit_cooldown = 90  # 429 에러 후 대기 시간 (초)
-    
-    def authenticate(self) -> bool:
-        """키움증권 API 인증을 수행하고 토큰을 발급받습니다."""
-        # 429 에러 후 쿨다운 기간 확인
-        if self.last_429_error_time:
-            elapsed = (datetime.utcnow() - self.last_429_error_time).total_seconds()
-            if elapsed < self.rate_limit_cooldown:
-                remaining = int(self.rate_limit_cooldown - elapsed)
-                logger.warning(f"🔑 [TOKEN] API 제한으로 인증 대기 중 (남은 시간: {remaining}초)")
-                return False
-        
+        self.refresh_margin = timedelta(minutes=10)  # 만료 10분 전부터 갱신 대상
+        self.request_timeout = 30  # 토큰 발급 요청 타임아웃 (초)
+
+        self._inflight: Optional[asyncio.Task] = None  # 진행 중인 발급 요청 (동시 요청 합치기)
+        self._refresh_task: Optional[asyncio.Task] = None  # 만료 전 자동 갱신 태스크
+
+    def _cooldown_remaining(self) -> float:
+        """429 에러 후 남은 쿨다운 시간 (초)"""
+        if not self.last_429_error_time:
+            return 0.0
+        elapsed = (datetime.now() - self.last_429_error_time).total_seconds()
+        return max(self.rate_limit_cooldown - elapsed, 0.0)
+
+    async def authenticate(self) -> bool:
+        """키움증권 API 인증을 수행하고 토큰을 발급받습니다. (동시 호출은 하나로 합침)"""
+        # 429 에러 후 쿨다운 기간 확인 (대기하지 않고 즉시 실패)
+        remaining = self._cooldown_remaining()
+        if remaining > 0:
+            logger.warning(f"🔑 [TOKEN] API 제한으로 인증 대기 중 (남은 시간: {int(remaining)}초)")
+            return False
+
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.get_running_loop().create_task(self._issue_token())
+        else:
+            logger.debug("🔑 [TOKEN_DEBUG] 진행 중인 토큰 발급 요청에 합류")
+        # 호출자가 취소되어도 발급 요청 자체는 계속 진행
+        return await asyncio.shield(self._inflight)
+
+    async def _issue_token(self) -> bool:
+        """/oauth2/token 호출"""
         try:
             # 투자구분 설정 (모의투자/실전투자)
             investment_type = "1" if Config.KIWOOM_USE_MOCK_ACCOUNT else "0"  # 1: 모의투자, 0: 실전투자
             account_type = "모의투자" if Config.KIWOOM_USE_MOCK_ACCOUNT else "실전투자"
-            
+
             # 계좌 타입에 따른 App Key 선택
             if Config.KIWOOM_USE_MOCK_ACCOUNT:
                 app_key = Config.KIWOOM_MOCK_APP_KEY
@@ -40,49 +67,52 @@ class TokenManager:
             else:
                 app_key = Config.KIWOOM_APP_KEY
                 app_secret = Config.KIWOOM_APP_SECRET
-            
+
             logger.debug(f"🔑 [TOKEN_DEBUG] 키움 API 토큰 발급 요청 - 투자구분: {account_type} (코드: {investment_type})")
             logger.debug(f"🔑 [TOKEN_DEBUG] 사용할 App Key: {app_key[:10]}...")
-            
+
             # 엔드포인트 도메인 분기 (실전/모의)
             base_host = Config.KIWOOM_MOCK_API_URL if Config.KIWOOM_USE_MOCK_ACCOUNT else Config.KIWOOM_REAL_API_URL
             auth_url = f"{base_host}/oauth2/token"
-            
+
             logger.debug(f"🔑 [TOKEN_DEBUG] 인증 URL: {auth_url}")
-            
-            response = requests.post(
-                auth_url,
-                json={
-                    "grant_type": "client_credentials",
-                    "appkey": app_key,
-                    "secretkey": app_secret,
-                    "investment_type": investment_type  # 투자구분 추가
-                },
-                headers={
-                    "Content-Type": "application/json"
-                },
-                timeout=30,  # 타임아웃 증가
-                verify=False  # SSL 검증 비활성화 (모의투자 서버 연결 문제 해결)
-            )
-            
-            logger.debug(f"🔑 [TOKEN_DEBUG] HTTP 응답 상태: {response.status_code}")
-            
-            if response.status_code == 200:
-                token_data = response.json()
+
+            timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with session.post(
+                    auth_url,
+                    json={
+                        "grant_type": "client_credentials",
+                        "appkey": app_key,
+                        "secretkey": app_secret,
+                        "investment_type": investment_type  # 투자구분 추가
+                    },
+                    headers={
+                        "Content-Type": "application/json"
+                    },
+                    ssl=False  # SSL 검증 비활성화 (모의투자 서버 연결 문제 해결)
+                ) as response:
+                    status = response.status
+                    text = await response.text()
+
+            logger.debug(f"🔑 [TOKEN_DEBUG] HTTP 응답 상태: {status}")
+
+            if status == 200:
+                token_data = json.loads(text)
                 logger.debug(f"🔑 [TOKEN_DEBUG] API 응답 데이터: {token_data}")
-                
+
                 # 키움증권 API 응답에서 오류 확인
                 if token_data.get("return_code") == 0:  # 성공
                     self.access_token = token_data.get("token")  # 키움증권은 'token' 필드 사용
                     logger.info(f"🔑 [TOKEN_DEBUG] ✅ 토큰 발급 성공: {self.access_token[:20]}...")
-                    
+
                     # expires_dt 형식: "20250809005645" -> datetime으로 변환
                     expires_dt_str = token_data.get("expires_dt")
                     if expires_dt_str:
                         self.token_expiry = datetime.strptime(expires_dt_str, "%Y%m%d%H%M%S")
                         logger.debug(f"🔑 [TOKEN_DEBUG] 토큰 만료 시간: {self.token_expiry}")
                     else:
-                        self.token_expiry = datetime.utcnow() + timedelta(hours=24)  # 기본 24시간
+                        self.token_expiry = datetime.now() + timedelta(hours=24)  # 기본 24시간
                         logger.debug(f"🔑 [TOKEN_DEBUG] 기본 토큰 만료 시간 설정: {self.token_expiry}")
                     return True
                 else:
@@ -90,119 +120,121 @@ class TokenManager:
                     return False
             else:
                 # 429 에러 (API 제한) 처리
-                if response.status_code == 429:
-                    self.last_429_error_time = datetime.utcnow()
+                if status == 429:
+                    self.last_429_error_time = datetime.now()
                     logger.error(f"🔑 [TOKEN_DEBUG] ❌ API 호출 제한 초과 (HTTP 429) - {self.rate_limit_cooldown}초 동안 재인증 중지")
-                    logger.error(f"🔑 [TOKEN_DEBUG] 응답 내용: {response.text}")
+                    logger.error(f"🔑 [TOKEN_DEBUG] 응답 내용: {text}")
                 else:
-                    logger.error(f"🔑 [TOKEN_DEBUG] ❌ 키움증권 API 인증 실패 - HTTP {response.status_code}")
-                    logger.error(f"🔑 [TOKEN_DEBUG] 응답 내용: {response.text}")
+                    logger.error(f"🔑 [TOKEN_DEBUG] ❌ 키움증권 API 인증 실패 - HTTP {status}")
+                    logger.error(f"🔑 [TOKEN_DEBUG] 응답 내용: {text}")
                 return False
-            
+
         except Exception as e:
             logger.error(f"키움증권 API 인증 오류: {type(e).__name__}: {e}")
             return False
-    
+
     def is_token_valid(self) -> bool:
-        """토큰이 유효한지 확인합니다."""
-        current_time = datetime.utcnow()
-        
-        logger.debug(f"🔑 [TOKEN_DEBUG] 토큰 유효성 확인:")
-        logger.debug(f"🔑 [TOKEN_DEBUG] - access_token 존재: {self.access_token is not None}")
-        logger.debug(f"🔑 [TOKEN_DEBUG] - token_expiry 존재: {self.token_expiry is not None}")
-        
+        """토큰이 유효한지 확인합니다. (만료 10분 전부터는 갱신 대상)"""
         if not self.access_token or not self.token_expiry:
             logger.debug(f"🔑 [TOKEN_DEBUG] ❌ 토큰 또는 만료시간이 없음")
             return False
-        
-        # 만료 10분 전부터는 토큰을 갱신
-        valid_until = self.token_expiry - timedelta(minutes=10)
-        is_valid = current_time < valid_until
-        
-        logger.debug(f"🔑 [TOKEN_DEBUG] - 현재 시간: {current_time}")
-        logger.debug(f"🔑 [TOKEN_DEBUG] - 토큰 만료 시간: {self.token_expiry}")
-        logger.debug(f"🔑 [TOKEN_DEBUG] - 유효 기준 시간: {valid_until}")
-        logger.debug(f"🔑 [TOKEN_DEBUG] - 토큰 유효: {is_valid}")
-        
+
+        valid_until = self.token_expiry - self.refresh_margin
+        is_valid = datetime.now() < valid_until
+        logger.debug(f"🔑 [TOKEN_DEBUG] 토큰 유효: {is_valid} (만료: {self.token_expiry}, 갱신 기준: {valid_until})")
         return is_valid
-    
-    def refresh_access_token(self) -> bool:
-        """리프레시 토큰을 사용하여 액세스 토큰을 갱신합니다."""
-        # 429 에러 후 쿨다운 기간 확인
-        if self.last_429_error_time:
-            elapsed = (datetime.utcnow() - self.last_429_error_time).total_seconds()
-            if elapsed < self.rate_limit_cooldown:
-                remaining = int(self.rate_limit_cooldown - elapsed)
-                logger.warning(f"🔑 [TOKEN] API 제한으로 토큰 갱신 대기 중 (남은 시간: {remaining}초)")
-                return False
-        
-        if not self.refresh_token:
-            return self.authenticate()
-        
-        try:
-            # 투자구분 설정 (모의투자/실전투자)
-            investment_type = "1" if Config.KIWOOM_USE_MOCK_ACCOUNT else "0"  # 1: 모의투자, 0: 실전투자
-            
-            # 계좌 타입에 따른 App Key 선택
-            if Config.KIWOOM_USE_MOCK_ACCOUNT:
-                app_key = Config.KIWOOM_MOCK_APP_KEY
-                app_secret = Config.KIWOOM_MOCK_APP_SECRET
-            else:
-                app_key = Config.KIWOOM_APP_KEY
-                app_secret = Config.KIWOOM_APP_SECRET
-            
-            base_host = Config.KIWOOM_MOCK_API_URL if Config.KIWOOM_USE_MOCK_ACCOUNT else Config.KIWOOM_REAL_API_URL
-            response = requests.post(
-                f"{base_host}/oauth2/token",
-                data={
-                    "grant_type": "refresh_token",
-                    "refresh_token": self.refresh_token,
-                    "appkey": app_key,
-                    "secretkey": app_secret,
-                    "investment_type": investment_type  # 투자구분 추가
-                },
-                timeout=30,
-                verify=False  # SSL 검증 비활성화
-            )
-            
-            if response.status_code == 200:
-                token_data = response.json()
-                self.access_token = token_data.get("access_token")
-                expires_in = token_data.get("expires_in", 7200)
-                self.token_expiry = datetime.utcnow() + timedelta(seconds=expires_in)
-                return True
-            elif response.status_code == 429:
-                # API 제한 에러 처리
-                self.last_429_error_time = datetime.utcnow()
-                logger.error(f"🔑 [TOKEN] ❌ API 호출 제한 초과 (HTTP 429) - {self.rate_limit_cooldown}초 동안 토큰 갱신 중지")
-                logger.error(f"🔑 [TOKEN] 응답 내용: {response.text}")
-                return False
-            else:
-                logger.error(f"🔑 [TOKEN] ❌ 토큰 갱신 실패 - HTTP {response.status_code}")
-                logger.error(f"🔑 [TOKEN] 응답 내용: {response.text}")
-                return False
-            
-        except Exception as e:
-            logger.error(f"토큰 갱신 오류: {e}")
-            return False
-    
+
+    def is_token_usable(self) -> bool:
+        """실제 만료 전인지 확인 (갱신 여유 시간 무시)"""
+        return bool(self.access_token and self.token_expiry and datetime.now() < self.token_expiry)
+
+    async def refresh_access_token(self) -> bool:
+        """액세스 토큰을 갱신합니다. (키움은 재발급 방식이므로 authenticate와 동일)"""
+        return await self.authenticate()
+
+    async def ensure_token(self) -> Optional[str]:
+        """유효한 토큰을 보장해 반환 (필요 시 발급을 기다림, 쿨다운 중에는 즉시 반환)"""
+        if self.is_token_valid():
+            return self.access_token
+        if not await self.authenticate():
+            # 재발급 실패해도 아직 만료 전이면 기존 토큰 사용
+            if self.is_token_usable():
+                return self.access_token
+            logger.error(f"🔑 [TOKEN_DEBUG] ❌ 재인증 실패 - 토큰 없음")
+            return None
+        return self.access_token
+
     def get_valid_token(self) -> Optional[str]:
-        """유효한 액세스 토큰을 반환합니다."""
-        logger.debug(f"🔑 [TOKEN_DEBUG] 유효한 토큰 요청")
-        
-        if not self.is_token_valid():
-            logger.debug(f"🔑 [TOKEN_DEBUG] 토큰이 유효하지 않음 - 갱신 시도")
-            if not self.refresh_access_token():
-                logger.debug(f"🔑 [TOKEN_DEBUG] 토큰 갱신 실패 - 재인증 시도")
-                if not self.authenticate():
-                    logger.error(f"🔑 [TOKEN_DEBUG] ❌ 재인증 실패 - 토큰 없음")
-                    return None
+        """현재 토큰을 즉시 반환합니다. (블로킹 없음)
+
+        갱신이 필요하면 백그라운드 발급만 예약하고, 만료 전 토큰은 그대로 반환한다.
+        발급 완료까지 기다려야 하는 경우에는 ensure_token()을 사용한다.
+        """
+        if self.is_token_valid():
+            return self.access_token
+
+        self._schedule_background_refresh()
+        if self.is_token_usable():
+            return self.access_token
+        return None
+
+    def _schedule_background_refresh(self):
+        """이벤트 루프가 돌고 있으면 백그라운드 재발급 예약"""
+        if self._inflight is not None and not self._inflight.done():
+            return
+        if self._cooldown_remaining() > 0:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        logger.debug("🔑 [TOKEN_DEBUG] 토큰 갱신 필요 - 백그라운드 재발급 예약")
+        self._inflight = loop.create_task(self._issue_token())
+
+    def start_auto_refresh(self):
+        """만료 전 자동 갱신 태스크 시작"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self._auto_refresh_loop())
+            logger.info("🔑 [TOKEN] 토큰 자동 갱신 시작")
+
+    async def stop_auto_refresh(self):
+        """자동 갱신 태스크 중지"""
+        task = self._refresh_task
+        self._refresh_task = None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            logger.info("🔑 [TOKEN] 토큰 자동 갱신 중지")
+
+    async def _auto_refresh_loop(self):
+        """만료 refresh_margin 전에 재발급 (실패 시 쿨다운/재시도 간격 후 다시 시도)"""
+        while True:
+            try:
+                if self.token_expiry:
+                    refresh_at = self.token_expiry - self.refresh_margin
+                    # 여러 프로세스가 동시에 갱신하지 않도록 약간의 지터 추가
+                    wait = (refresh_at - datetime.now()).total_seconds() - random.uniform(0, 30)
                 else:
-                    logger.info(f"🔑 [TOKEN_DEBUG] ✅ 재인증 성공")
-            else:
-                logger.info(f"🔑 [TOKEN_DEBUG] ✅ 토큰 갱신 성공")
-        else:
-            logger.debug(f"🔑 [TOKEN_DEBUG] ✅ 기존 토큰 유효")
-        
-        logger.debug(f"🔑 [TOKEN_DEBUG] 반환할 토큰: {self.access_token[:20] if self.access_token else 'None'}...")
-        return self.access_token
\ No newline at end of file
+                    wait = 0
+                if wait > 0:
+                    # 시계 변경 등에 대비해 최대 1시간 단위로 재확인
+                    await asyncio.sleep(min(wait, 3600))
+                    continue
+
+                if await self.authenticate():
+                    logger.info(f"🔑 [TOKEN] 토큰 자동 갱신 완료 (만료: {self.token_expiry})")
+                    # 같은 만료 시각의 토큰이 재발급된 경우 연속 호출 방지
+                    if not self.is_token_valid():
+                        await asyncio.sleep(60)
+                else:
+                    retry = max(self._cooldown_remaining(), 30)
+                    logger.warning(f"🔑 [TOKEN] 토큰 자동 갱신 실패 - {retry:.0f}초 후 재시도")
+                    await asyncio.sleep(retry)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"🔑 [TOKEN] 토큰 자동 갱신 오류: {e}")
+                await asyncio.sleep(60)
@@ -34,14 +34,48 @@ class Config:
     KIWOOM_MOCK_ACCOUNT_PASSWORD = os.getenv("KIWOOM_MOCK_ACCOUNT_PASSWORD", "")
     KIWOOM_WS_RECONNECT_INTERVAL = int(os.getenv("KIWOOM_WS_RECONNECT_INTERVAL", 5))  # 초 단위
     KIWOOM_WS_PING_INTERVAL = int(os.getenv("KIWOOM_WS_PING_INTERVAL", 30))  # 초 단위
+
+    # REST 호출용 HTTP 커넥션 풀 설정 (keep-alive 재사용)
+    KIWOOM_HTTP_POOL_LIMIT = int(os.getenv("KIWOOM_HTTP_POOL_LIMIT", 20))  # 전체 최대 연결 수
+    KIWOOM_HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("KIWOOM_HTTP_POOL_LIMIT_PER_HOST", 8))  # 호스트당 최대 연결 수
+    KIWOOM_HTTP_KEEPALIVE_TIMEOUT = int(os.getenv("KIWOOM_HTTP_KEEPALIVE_TIMEOUT", 60))  # 유휴 연결 유지 시간 (초)
+    KIWOOM_HTTP_DNS_CACHE_TTL = int(os.getenv("KIWOOM_HTTP_DNS_CACHE_TTL", 300))  # DNS 캐시 시간 (초)
+
+    # REST 호출 예산 (우선순위 토큰 버킷 스케줄러)
+    KIWOOM_API_MAX_CALLS_PER_MINUTE = int(os.getenv("KIWOOM_API_MAX_CALLS_PER_MINUTE", 12))  # 분당 허용 호출 수
+    KIWOOM_API_BURST = int(os.getenv("KIWOOM_API_BURST", 1))  # 연속 허용 호출 수 (1이면 균등 간격)
+
+    # 실시간 체결 시세 구독 (WebSocket REG 0B)
+    KIWOOM_REALTIME_PRICE_ENABLED = os.getenv("KIWOOM_REALTIME_PRICE_ENABLED", "true").lower() == "true"
+    KIWOOM_REALTIME_MAX_SUBSCRIPTIONS = int(os.getenv("KIWOOM_REALTIME_MAX_SUBSCRIPTIONS", 100))  # 구독 종목 상한
+    KIWOOM_REALTIME_WAIT_TIMEOUT = float(os.getenv("KIWOOM_REALTIME_WAIT_TIMEOUT", 3.0))  # 첫 체결 대기 시간 (초)
+
+    # 메모리 캐시 상한 (LRU 축출)
+    PRICE_CACHE_MAX_ENTRIES = int(os.getenv("PRICE_CACHE_MAX_ENTRIES", 2000))  # 현재가 캐시 종목 수
+    CANDLE_CACHE_MAX_MB = float(os.getenv("CANDLE_CACHE_MAX_MB", 64))  # 메모리에 올려 둘 캔들 총량 (MB)
+
+    # 작업 실행 풀 (이벤트 루프 밖에서 실행) - 대기열이 가득 차면 새 작업은 거절
+    EXECUTOR_PROCESS_WORKERS = int(os.getenv("EXECUTOR_PROCESS_WORKERS", 2))  # CPU 작업 (전략 평가, 차트 렌더링)
+    EXECUTOR_PROCESS_QUEUE = int(os.getenv("EXECUTOR_PROCESS_QUEUE", 8))
+    EXECUTOR_THREAD_WORKERS = int(os.getenv("EXECUTOR_THREAD_WORKERS", 4))  # 블로킹 I/O (동기 크롤링 등)
+    EXECUTOR_THREAD_QUEUE = int(os.getenv("EXECUTOR_THREAD_QUEUE", 16))
+
+    # 전략 파라미터 최적화 (실행마다 별도 프로세스 풀)
+    OPTIMIZER_WORKERS = int(os.getenv("OPTIMIZER_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+    OPTIMIZER_MAX_COMBINATIONS = int(os.getenv("OPTIMIZER_MAX_COMBINATIONS", 500))  # 한 번에 평가할 최대 조합 수
     
     # 키움증권 API 도메인 설정
-    KIWOOM_REAL_API_URL = "https://api.kiwoom.com"  # 운영 도메인2
-    KIWOOM_MOCK_API_URL = "https://mockapi.kiwoom.com"  # 모의투자 도메인
+    # 로컬 에뮬레이터(utils/kiwoom_emulator.py)로 돌릴 때는 http://127.0.0.1:9443 등으로 지정
+    KIWOOM_REAL_API_URL = os.getenv("KIWOOM_REAL_API_URL", "https://api.kiwoom.com")  # 운영 도메인2
+    KIWOOM_MOCK_API_URL = os.getenv("KIWOOM_MOCK_API_URL", "https://mockapi.kiwoom.com")  # 모의투자 도메인
     
     # 모니터링 설정
     CONDITION_CHECK_INTERVAL = int(os.getenv("CONDITION_CHECK_INTERVAL", 60))  # 초 단위
     SIGNAL_DEDUPLICATION_WINDOW = int(os.getenv("SIGNAL_DEDUPLICATION_WINDOW", 300))  # 초 단위 (5분)
+    # 봉 마감 스캔: 마감 몇 초 전에 실시간 구독/캔들 선조회를 할지 (utils/bar_scheduler.py)
+    BAR_PREFETCH_LEAD_SECONDS = float(os.getenv("BAR_PREFETCH_LEAD_SECONDS", 10))
+    # 보유 포지션 현재가 갱신: 계좌 조회(kt00004) 1회로 전체 평가, 응답에 없는 종목만 개별 현재가 조회
+    STOP_LOSS_BULK_REVALUATION = os.getenv("STOP_LOSS_BULK_REVALUATION", "true").lower() == "true"
 
     # ===== 자동매매 안전장치 / 테스트 옵션 =====
     # 조건식 스캔 1회당 조건식별 신호 생성 상한(폭주 방지). 기본 1개만 생성.
@@ -11,35 +11,31 @@ from datetime import datetime
 import httpx
 import re
 
-# 차트 생성 import
-import pandas as pd
-import numpy as np
-import mplfinance as mpf
-import matplotlib.pyplot as plt
-import matplotlib.lines as mlines
-import io
-import base64
-from ta.trend import IchimokuIndicator
-from ta.momentum import RSIIndicator
-from ta.volatility import BollingerBands
-import warnings
-
-# pandas와 ta 라이브러리의 FutureWarning 억제
-warnings.filterwarnings('ignore', category=FutureWarning, module='ta')
-warnings.filterwarnings('ignore', category=FutureWarning, module='pandas')
+# 차트 생성 (작업 풀 프로세스에서 렌더링)
+from utils.chart_renderer import (STRATEGY_CHART_TYPES, render_all_strategies_chart, render_ichimoku_chart,
+                                  render_strategy_chart)
+from utils.bar_scheduler import bar_scheduler
+from utils.executor import ExecutorBusy, cpu_pool, io_pool
 
 # DB 연동
 from core.models import get_db, AutoTradeCondition, PendingBuySignal, AutoTradeSettings, WatchlistStock, TradingStrategy, StrategySignal, Position
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from managers.condition_monitor import condition_monitor
-from api.kiwoom_api import KiwoomAPI
+from api.kiwoom_api import get_kiwoom_api
 from core.config import Config
 from utils.naver_discussion_crawler import NaverStockDiscussionCrawler
 
 # 개선된 모듈들 import
 from managers.signal_manager import signal_manager, SignalType, SignalStatus
-from api.api_rate_limiter import api_rate_limiter
+from api.api_rate_limiter import api_rate_limiter, APIPriority
+from api.tick_store import tick_store
+from api.candle_store import candle_store
+from managers.backtest import BacktestSettings, run_backtest
+from managers.optimizer import OBJECTIVES as OPTIMIZER_OBJECTIVES, optimize as optimize_parameters
+from managers.strategies import STRATEGIES
+from api.indicator_store import indicator_store
+from api.bar_aggregator import bar_aggregator
 from managers.buy_order_executor import buy_order_executor
 from managers.strategy_manager import strategy_manager
 from managers.watchlist_sync_manager import watchlist_sync_manager
@@ -72,6 +68,9 @@ logger = logging.getLogger(__name__)
 # 손절/익절 모니터링 매니저 인스턴스
 stop_loss_manager = StopLossManager()
 
+# 차트 이미지용 일봉 이력 (기본 500봉 + 일목균형표 선행스팬B 52봉/선행 26봉 여유)
+CHART_IMAGE_HISTORY_BARS = 600
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
@@ -90,8 +89,10 @@ async def lifespan(app: FastAPI):
     kiwoom_api.token_manager.access_token = None
     kiwoom_api.token_manager.token_expiry = None
     
-    if kiwoom_api.authenticate():
+    if await kiwoom_api.authenticate():
         logger.info("키움증권 API 인증 성공")
+        # 만료 전 백그라운드 토큰 갱신
+        kiwoom_api.token_manager.start_auto_refresh()
         
         # WebSocket 연결 시도
         try:
@@ -116,6 +117,20 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"💰 [STARTUP] 매수 주문 실행기 시작 실패: {e}")
     
+    try:
+        # 실시간 체결 -> 1분봉 집계 시작 (구독 종목의 차트는 REST 없이 갱신)
+        bar_aggregator.start()
+    except Exception as e:
+        logger.error(f"🕯️ [STARTUP] 실시간 1분봉 집계 시작 실패: {e}")
+
+    try:
+        # 보유 중인 스캘핑 포지션 복구 - 재시작 중에도 청산 감시가 이어지도록 실시간 청산 감시 재개
+        restored = await scalping_manager.restore_positions()
+        if restored:
+            logger.info(f"🚀 [STARTUP] 스캘핑 포지션 {restored}개 복구 - 실시간 청산 감시 재개")
+    except Exception as e:
+        logger.error(f"🚀 [STARTUP] 스캘핑 포지션 복구 실패: {e}")
+
     try:
         # 손절/익절 모니터링 시작
         asyncio.create_task(stop_loss_manager.start_monitoring())
@@ -148,10 +163,21 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"🛡️ [SHUTDOWN] 손절/익절 모니터링 종료 실패: {e}")
     
+    try:
+        await scalping_manager.stop_scalping_monitoring()
+    except Exception as e:
+        logger.error(f"🚀 [SHUTDOWN] 스캘핑 모니터링 종료 실패: {e}")
+
     await condition_monitor.stop_all_monitoring()
+    await bar_aggregator.stop()
     # WebSocket 우아한 종료
     await kiwoom_api.graceful_shutdown()
     logger.info("키움 API WebSocket 연결 종료 완료")
+    # 공유 HTTP 커넥션 풀 종료
+    await kiwoom_api.close()
+    # 작업 실행 풀 종료
+    cpu_pool.shutdown()
+    io_pool.shutdown()
 
 app = FastAPI(
     title="키움증권 조건식 모니터링 시스템",
@@ -179,8 +205,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 키움 API 인스턴스
-kiwoom_api = KiwoomAPI()
+# 키움 API 인스턴스 (매니저들과 공유하는 프로세스 공용 클라이언트)
+kiwoom_api = get_kiwoom_api()
 
 # 네이버 토론 크롤러 인스턴스
 discussion_crawler = NaverStockDiscussionCrawler()
@@ -215,6 +241,32 @@ class StrategyToggleRequest(BaseModel):
     strategy_id: int
     is_enabled: bool
 
+class BacktestRequest(BaseModel):
+    stock_codes: Optional[list] = None  # 미지정 시 활성 관심종목
+    timeframe: str = "5M"
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    parameters: Optional[dict] = None  # 미지정 시 저장된 전략 파라미터
+    exit_on_sell_signal: bool = False
+    trade_limit: int = 200  # 응답에 담을 최근 거래 수
+
+class StrategyOptimizeRequest(BaseModel):
+    stock_codes: Optional[list] = None  # 미지정 시 활성 관심종목
+    timeframe: str = "5M"
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    space: Optional[dict] = None  # 파라미터 -> 후보 값 목록 (미지정 시 전략별 기본 탐색 공간)
+    method: str = "grid"  # grid, random
+    samples: int = 50  # random 탐색 조합 수
+    seed: Optional[int] = None
+    folds: int = 0  # 워크포워드 검증 구간 수 (0이면 전체 기간으로 선택만)
+    train_segments: int = 3  # 검증 구간 하나당 학습 구간 길이 (구간 수)
+    objective: str = "total_profit_loss"
+    min_trades: int = 5
+    exit_on_sell_signal: bool = False
+    top: int = 10
+    apply: bool = False  # 추천 파라미터를 전략 설정에 저장
+
 @app.post("/conditions/toggle")
 async def toggle_condition(req: ToggleConditionRequest):
     try:
@@ -537,8 +589,9 @@ async def get_stock_chart(stock_code: str, period: str = "1D"):
     try:
         logger.info(f"차트 데이터 요청: {stock_code}, 기간: {period}")
         
-        # 키움 API에서 차트 데이터 조회
-        chart_data = await kiwoom_api.get_stock_chart_data(stock_code, period)
+        # 캔들 저장소 경유 조회 (저장된 봉 이후만 증분 조회)
+        chart_data = await kiwoom_api.get_cached_chart_data(stock_code, period, max_age=60,
+                                                            stale_while_revalidate=True)
         
         if not chart_data:
             raise HTTPException(status_code=404, detail="차트 데이터를 찾을 수 없습니다.")
@@ -546,7 +599,7 @@ async def get_stock_chart(stock_code: str, period: str = "1D"):
         return JSONResponse(content={
             "stock_code": stock_code,
             "period": period,
-            "chart_data": chart_data
+            "chart_data": chart_data.to_records()
         }, media_type="application/json; charset=utf-8")
         
     except HTTPException:
@@ -681,6 +734,14 @@ async def get_monitoring_status():
             "signals": signal_stats,
             "api_limiter": api_status,
             "buy_executor": buy_executor_status,
+            "realtime_ticks": tick_store.get_status_info(),
+            "candle_store": candle_store.get_status_info(),
+            "indicator_store": indicator_store.get_status_info(),
+            "price_cache": kiwoom_api._price_cache.get_status_info(),
+            "single_flight": kiwoom_api._single_flight.get_status_info(),
+            "live_bars": bar_aggregator.get_status_info(),
+            "bar_scheduler": bar_scheduler.get_status_info(),
+            "executors": {"cpu": cpu_pool.get_status_info(), "io": io_pool.get_status_info()},
             "timestamp": datetime.now().isoformat()
         }
         
@@ -693,127 +754,22 @@ async def get_monitoring_status():
 @app.get("/chart/image/{stock_code}")
 async def get_chart_image(stock_code: str, period: str = "1M"):
     try:
-        # 1. 키움 API에서 데이터 가져오기
-        chart_data = await kiwoom_api.get_stock_chart_data(stock_code, "1D")
+        # 1. 키움 API에서 데이터 가져오기 (연속조회로 이력 확보)
+        chart_data = await kiwoom_api.get_cached_chart_data(stock_code, "1D", max_age=60,
+                                                            max_bars=CHART_IMAGE_HISTORY_BARS,
+                                                            stale_while_revalidate=True)
         
         if not chart_data:
             raise HTTPException(status_code=404, detail="차트 데이터가 없습니다")
         
-        # 2. DataFrame으로 변환 (chart_data는 이미 리스트)
-        df = pd.DataFrame(chart_data)
-        
-        # 3. 날짜 컬럼을 인덱스로 설정
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df.set_index('timestamp', inplace=True)
-        
-        # 3-1. 기간에 따른 데이터 필터링
-        df = df.sort_index()
-        if period == "1Y":
-            df = df.tail(250)  # 1년치 데이터 (약 250 거래일)
-        elif period == "1M":
-            df = df.tail(30)   # 1개월치 데이터
-        elif period == "1W":
-            df = df.tail(7)    # 1주치 데이터
-        else:
-            df = df.tail(500)  # 기본값 (약 2년치)
-        
-        # 4. mplfinance에 필요한 컬럼명으로 변경
-        df = df.rename(columns={
-            'open': 'Open',
-            'high': 'High', 
-            'low': 'Low',
-            'close': 'Close',
-            'volume': 'Volume'
-        })
-        
-        # 4-1. 일목균형표 데이터 생성 (경고 억제)
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            id_ichimoku = IchimokuIndicator(high=df['High'], low=df['Low'], visual=True, fillna=True)
-            df['span_a'] = id_ichimoku.ichimoku_a()
-            df['span_b'] = id_ichimoku.ichimoku_b()
-            df['base_line'] = id_ichimoku.ichimoku_base_line()
-            df['conv_line'] = id_ichimoku.ichimoku_conversion_line()
-        
-        # 5. 색상 설정
-        mc = mpf.make_marketcolors(
-            up="red",
-            down="blue",
-            volume="inherit"
-        )
-        
-        # 6. 일목균형표 그래프 추가
-        added_plots = [
-            mpf.make_addplot(df['span_a'], color='orange', alpha=0.7, width=1.5),
-            mpf.make_addplot(df['span_b'], color='purple', alpha=0.7, width=1.5),
-            mpf.make_addplot(df['base_line'], color='green', alpha=0.8, width=2),
-            mpf.make_addplot(df['conv_line'], color='red', alpha=0.8, width=2)
-        ]
-        
-        # 7. 스타일 설정
-        s = mpf.make_mpf_style(
-            base_mpf_style="charles",
-            marketcolors=mc,
-            gridaxis='both',
-            y_on_right=True,
-            facecolor='white',
-            edgecolor='black'
-        )
-        
-        # 8. 차트 생성 (메모리에 저장)
-        buf = io.BytesIO()
-        fig, axes = mpf.plot(
-            data=df,
-            type='candle',
-            style=s,
-            figratio=(18, 10),  # 차트 크기 증가
-            mav=(20, 60),  # 이동평균 20일선, 60일선으로 변경
-            volume=True,
-            scale_width_adjustment=dict(volume=0.6, candle=1.2),
-            addplot=added_plots,
-            savefig=dict(fname=buf, format='png', dpi=200, bbox_inches='tight'),  # DPI 증가
-            returnfig=True,
-            tight_layout=True
-        )
-        
-        # 8-1. 범례 추가 (수정된 버전)
-        if fig and axes and len(axes) > 0:
-            try:
-                # 메인 차트에 범례 추가 - mlines.Line2D 사용
-                legend_elements = [
-                    mlines.Line2D([0], [0], color='orange', lw=2, alpha=0.7, label='선행스팬A'),
-                    mlines.Line2D([0], [0], color='purple', lw=2, alpha=0.7, label='선행스팬B'),
-                    mlines.Line2D([0], [0], color='green', lw=2, alpha=0.8, label='기준선'),
-                    mlines.Line2D([0], [0], color='red', lw=2, alpha=0.8, label='전환선'),
-                    mlines.Line2D([0], [0], color='blue', lw=1, label='20일 이평선'),
-                    mlines.Line2D([0], [0], color='orange', lw=1, label='60일 이평선')
-                ]
-                
-                axes[0].legend(
-                    handles=legend_elements,
-                    loc='upper left',
-                    fontsize=10,
-                    frameon=True,
-                    fancybox=True,
-                    shadow=True,
-                    ncol=3,
-                    bbox_to_anchor=(0, 1)
-                )
-            except Exception as legend_error:
-                logger.warning(f"Legend 설정 오류: {legend_error}")
-        
-        buf.seek(0)
-        
-        # 9. 이미지를 base64로 인코딩
-        img_base64 = base64.b64encode(buf.getvalue()).decode('utf-8')
-        buf.close()
-        
-        # matplotlib figure 메모리 정리
-        if fig:
-            plt.close(fig)
+        # 2. 렌더링은 작업 풀 프로세스에서 (이벤트 루프를 막지 않음)
+        img_base64 = await cpu_pool.submit(render_ichimoku_chart, chart_data.to_frame(), period)
         
         return {"image": f"data:image/png;base64,{img_base64}"}
         
+    except ExecutorBusy as e:
+        logger.warning(f"⚙️ [EXECUTOR] 차트 렌더링 거절: {e}")
+        raise HTTPException(status_code=503, detail="차트 생성 요청이 많습니다. 잠시 후 다시 시도하세요.")
     except Exception as e:
         logger.error(f"차트 생성 오류: {e}")
         raise HTTPException(status_code=500, detail=f"차트 생성 실패: {str(e)}")
@@ -899,8 +855,9 @@ async def get_stock_discussions(stock_code: str, page: int = 1, max_pages: int =
     try:
         logger.info(f"🌐 [API] 종목토론 조회 시작 - 종목코드: {stock_code}, 페이지: {page}")
         
-        # 네이버 토론 크롤링 (당일 글만, 최대 2페이지)
-        discussions = discussion_crawler.crawl_discussion_posts(
+        # 네이버 토론 크롤링 (당일 글만, 최대 2페이지) - 동기 HTTP라 스레드 풀에서 실행
+        discussions = await io_pool.submit(
+            discussion_crawler.crawl_discussion_posts,
             stock_code=stock_code,
             page=page,
             max_pages=max_pages,
@@ -1539,30 +1496,35 @@ async def get_strategies():
         logger.error(f"전략 목록 조회 오류: {e}")
         raise HTTPException(status_code=500, detail="전략 목록 조회 중 오류가 발생했습니다.")
 
+def _save_strategy_parameters(strategy_type: str, parameters: dict) -> str:
+    """전략 파라미터 저장 (설정 API와 최적화 결과 적용 공용) -> 전략 이름"""
+    valid_types = ["MOMENTUM", "DISPARITY", "BOLLINGER", "RSI", "ICHIMOKU", "CHAIKIN"]
+    if strategy_type not in valid_types:
+        raise HTTPException(status_code=400, detail=f"유효하지 않은 전략 타입입니다: {strategy_type}")
+    
+    for db in get_db():
+        session: Session = db
+        
+        strategy = session.query(TradingStrategy).filter(
+            TradingStrategy.strategy_type == strategy_type
+        ).first()
+        
+        if not strategy:
+            raise HTTPException(status_code=404, detail=f"전략을 찾을 수 없습니다: {strategy_type}")
+        
+        strategy.parameters = parameters
+        strategy.updated_at = datetime.utcnow()
+        session.commit()
+        
+        logger.info(f"전략 파라미터 설정 완료: {strategy.strategy_name}")
+        return strategy.strategy_name
+
 @app.post("/strategies/{strategy_type}/configure")
 async def configure_strategy(strategy_type: str, req: StrategyConfigureRequest):
     """전략 파라미터 설정"""
     try:
-        valid_types = ["MOMENTUM", "DISPARITY", "BOLLINGER", "RSI", "CHAIKIN"]
-        if strategy_type not in valid_types:
-            raise HTTPException(status_code=400, detail=f"유효하지 않은 전략 타입입니다: {strategy_type}")
-        
-        for db in get_db():
-            session: Session = db
-            
-            strategy = session.query(TradingStrategy).filter(
-                TradingStrategy.strategy_type == strategy_type
-            ).first()
-            
-            if not strategy:
-                raise HTTPException(status_code=404, detail=f"전략을 찾을 수 없습니다: {strategy_type}")
-            
-            strategy.parameters = req.parameters
-            strategy.updated_at = datetime.utcnow()
-            session.commit()
-            
-            logger.info(f"전략 파라미터 설정 완료: {strategy.strategy_name}")
-            return {"message": f"전략 파라미터가 설정되었습니다: {strategy.strategy_name}"}
+        strategy_name = _save_strategy_parameters(strategy_type, req.parameters)
+        return {"message": f"전략 파라미터가 설정되었습니다: {strategy_name}"}
             
     except HTTPException:
         raise
@@ -1598,6 +1560,103 @@ async def toggle_strategy(strategy_id: int, req: StrategyToggleRequest):
         logger.error(f"전략 토글 오류: {e}")
         raise HTTPException(status_code=500, detail="전략 토글 중 오류가 발생했습니다.")
 
+async def _load_backtest_history(stock_codes: Optional[list], timeframe: str,
+                                 start: Optional[datetime], end: Optional[datetime]) -> dict:
+    """백테스트/최적화용 저장 캔들 (종목 미지정 시 활성 관심종목) - DB 조회는 스레드 풀에서"""
+    if not stock_codes:
+        for db in get_db():
+            session: Session = db
+            stock_codes = [stock.stock_code for stock in
+                           session.query(WatchlistStock).filter(WatchlistStock.is_active == True).all()]
+    if not stock_codes:
+        raise HTTPException(status_code=400, detail="백테스트할 종목이 없습니다.")
+
+    histories = await io_pool.submit(candle_store.histories, stock_codes, timeframe, start, end)
+    series_by_code = {code: series for code, series in histories.items() if len(series)}
+    if not series_by_code:
+        raise HTTPException(status_code=404, detail="저장된 캔들이 없습니다.")
+    return series_by_code
+
+@app.post("/strategies/{strategy_id}/backtest")
+async def backtest_strategy(strategy_id: int, req: BacktestRequest):
+    """저장된 캔들로 전략 백테스트 (실시간 스캔과 같은 신호 + 자동매매 손절/익절 설정 + 수수료/제세금)"""
+    try:
+        for db in get_db():
+            session: Session = db
+            strategy = session.query(TradingStrategy).filter(TradingStrategy.id == strategy_id).first()
+            if not strategy:
+                raise HTTPException(status_code=404, detail=f"전략을 찾을 수 없습니다: {strategy_id}")
+            if strategy.strategy_type not in STRATEGIES:
+                raise HTTPException(status_code=400, detail=f"백테스트를 지원하지 않는 전략 타입입니다: {strategy.strategy_type}")
+
+            strategy_type = strategy.strategy_type
+            parameters = req.parameters if req.parameters is not None else strategy_manager._parse_parameters(strategy)
+            settings = BacktestSettings.from_auto_trade_settings(
+                session.query(AutoTradeSettings).first(), exit_on_sell_signal=req.exit_on_sell_signal)
+            break
+
+        # DB 조회는 스레드 풀, 시뮬레이션은 프로세스 풀에서 (이벤트 루프를 막지 않음)
+        series_by_code = await _load_backtest_history(req.stock_codes, req.timeframe, req.start, req.end)
+        report = await cpu_pool.submit(run_backtest, series_by_code, strategy_type, parameters, settings,
+                                       trade_limit=req.trade_limit)
+        logger.info(f"📊 [BACKTEST] {strategy.strategy_name} {req.timeframe} {report['symbols']}종목 {report['bars']:,}봉 - "
+                    f"거래 {report['trades']}건, 손익 {report['total_profit_loss']:+,}원, 최대낙폭 {report['max_drawdown_rate']:.2f}% "
+                    f"({report['elapsed_ms']:.0f}ms)")
+        return {"strategy_id": strategy_id, "strategy_name": strategy.strategy_name,
+                "timeframe": req.timeframe, **report}
+
+    except HTTPException:
+        raise
+    except ExecutorBusy as e:
+        logger.warning(f"⚙️ [EXECUTOR] 백테스트 요청 거절: {e}")
+        raise HTTPException(status_code=503, detail="백테스트 요청이 많습니다. 잠시 후 다시 시도하세요.")
+    except Exception as e:
+        logger.error(f"전략 백테스트 오류: {e}")
+        raise HTTPException(status_code=500, detail="전략 백테스트 중 오류가 발생했습니다.")
+
+@app.post("/strategies/{strategy_type}/optimize")
+async def optimize_strategy(strategy_type: str, req: StrategyOptimizeRequest):
+    """전략 파라미터 탐색 (그리드/무작위 + 워크포워드) - apply면 추천 파라미터를 전략 설정에 저장"""
+    try:
+        if strategy_type not in STRATEGIES:
+            raise HTTPException(status_code=400, detail=f"최적화를 지원하지 않는 전략 타입입니다: {strategy_type}")
+        if req.objective not in OPTIMIZER_OBJECTIVES:
+            raise HTTPException(status_code=400, detail=f"지원하지 않는 목적 함수입니다: {req.objective}")
+
+        for db in get_db():
+            session: Session = db
+            strategy = session.query(TradingStrategy).filter(TradingStrategy.strategy_type == strategy_type).first()
+            if not strategy:
+                raise HTTPException(status_code=404, detail=f"전략을 찾을 수 없습니다: {strategy_type}")
+            base_params = strategy_manager._parse_parameters(strategy)
+            settings = BacktestSettings.from_auto_trade_settings(
+                session.query(AutoTradeSettings).first(), exit_on_sell_signal=req.exit_on_sell_signal)
+            break
+
+        series_by_code = await _load_backtest_history(req.stock_codes, req.timeframe, req.start, req.end)
+        # 최적화는 자체 프로세스 풀을 띄우고 끝날 때까지 기다리므로 스레드 풀에서 실행
+        report = await io_pool.submit(
+            optimize_parameters, series_by_code, strategy_type, settings, space=req.space, method=req.method,
+            samples=req.samples, seed=req.seed, folds=req.folds, train_segments=req.train_segments,
+            objective=req.objective, min_trades=req.min_trades, base_params=base_params, top=req.top)
+
+        applied = False
+        if req.apply and report["best_parameters"]:
+            _save_strategy_parameters(strategy_type, report["best_parameters"])
+            applied = True
+        return {"timeframe": req.timeframe, "applied": applied, **report}
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorBusy as e:
+        logger.warning(f"🔧 [OPTIMIZER] 최적화 요청 거절: {e}")
+        raise HTTPException(status_code=503, detail="파라미터 최적화가 이미 실행 중입니다. 잠시 후 다시 시도하세요.")
+    except Exception as e:
+        logger.error(f"전략 파라미터 최적화 오류: {e}")
+        raise HTTPException(status_code=500, detail="전략 파라미터 최적화 중 오류가 발생했습니다.")
+
 # ===== 전략 모니터링 관리 API =====
 
 @app.post("/strategy/start")
@@ -1863,236 +1922,19 @@ async def clear_all_signals():
 async def get_strategy_chart(stock_code: str, strategy_type: str, period: str = "1M"):
     """특정 전략 지표가 포함된 차트 생성"""
     try:
-        # 1. 키움 API에서 데이터 가져오기
-        chart_data = await kiwoom_api.get_stock_chart_data(stock_code, "1D")
-        
-        if not chart_data:
-            raise HTTPException(status_code=404, detail="차트 데이터가 없습니다")
-        
-        # 2. DataFrame으로 변환
-        df = pd.DataFrame(chart_data)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df.set_index('timestamp', inplace=True)
-        df = df.sort_index()
-        
-        # 3. 기간에 따른 데이터 필터링
-        if period == "1Y":
-            df = df.tail(250)
-        elif period == "1M":
-            df = df.tail(30)
-        elif period == "1W":
-            df = df.tail(7)
-        else:
-            df = df.tail(500)
-        
-        # 4. 컬럼명 변경
-        df = df.rename(columns={
-            'open': 'Open',
-            'high': 'High', 
-            'low': 'Low',
-            'close': 'Close',
-            'volume': 'Volume'
-        })
-        
-        # 5. 전략별 지표 계산
-        added_plots = []
-        legend_elements = []
-        
-        if strategy_type.upper() == "MOMENTUM":
-            # 모멘텀 계산 (10일 기준)
-            df['momentum'] = df['Close'] - df['Close'].shift(10)
-            df['momentum_ma'] = df['momentum'].rolling(window=5).mean()
-            
-            # 0선 추가
-            df['zero_line'] = 0
-            
-            added_plots = [
-                mpf.make_addplot(df['momentum'], color='blue', alpha=0.8, width=2, secondary_y=True),
-                mpf.make_addplot(df['momentum_ma'], color='red', alpha=0.8, width=1.5, secondary_y=True),
-                mpf.make_addplot(df['zero_line'], color='black', alpha=0.5, width=1, linestyle='--', secondary_y=True)
-            ]
-            
-            legend_elements = [
-                mlines.Line2D([0], [0], color='blue', lw=2, label='모멘텀'),
-                mlines.Line2D([0], [0], color='red', lw=1.5, label='모멘텀 이동평균'),
-                mlines.Line2D([0], [0], color='black', lw=1, linestyle='--', label='0선')
-            ]
-            
-        elif strategy_type.upper() == "DISPARITY":
-            # 이격도 계산 (20일 이동평균 기준)
-            df['ma20'] = df['Close'].rolling(window=20).mean()
-            df['disparity'] = (df['Close'] / df['ma20']) * 100
-            
-            added_plots = [
-                mpf.make_addplot(df['ma20'], color='orange', alpha=0.8, width=2),
-                mpf.make_addplot(df['disparity'], color='purple', alpha=0.8, width=2, secondary_y=True)
-            ]
-            
-            legend_elements = [
-                mlines.Line2D([0], [0], color='orange', lw=2, label='20일 이동평균'),
-                mlines.Line2D([0], [0], color='purple', lw=2, label='이격도(%)')
-            ]
-            
-        elif strategy_type.upper() == "BOLLINGER":
-            # 볼린저밴드 계산
-            bb_indicator = BollingerBands(close=df['Close'], window=20, window_dev=2)
-            df['bb_upper'] = bb_indicator.bollinger_hband()
-            df['bb_middle'] = bb_indicator.bollinger_mavg()
-            df['bb_lower'] = bb_indicator.bollinger_lband()
-            
-            added_plots = [
-                mpf.make_addplot(df['bb_upper'], color='red', alpha=0.7, width=1.5),
-                mpf.make_addplot(df['bb_middle'], color='blue', alpha=0.8, width=2),
-                mpf.make_addplot(df['bb_lower'], color='red', alpha=0.7, width=1.5)
-            ]
-            
-            legend_elements = [
-                mlines.Line2D([0], [0], color='red', lw=1.5, alpha=0.7, label='볼린저밴드 상단'),
-                mlines.Line2D([0], [0], color='blue', lw=2, alpha=0.8, label='볼린저밴드 중간'),
-                mlines.Line2D([0], [0], color='red', lw=1.5, alpha=0.7, label='볼린저밴드 하단')
-            ]
-            
-        elif strategy_type.upper() == "RSI":
-            # RSI 계산
-            rsi_indicator = RSIIndicator(close=df['Close'], window=14)
-            df['rsi'] = rsi_indicator.rsi()
-            
-            # RSI 기준선 추가
-            df['rsi_70'] = 70
-            df['rsi_30'] = 30
-            df['rsi_50'] = 50
-            
-            # 가중평균거래량 계산 (RSI 전략용)
-            volume_period = 20
-            def calculate_weighted_avg_volume(volumes):
-                if len(volumes) == volume_period:
-                    weights = list(range(1, len(volumes) + 1))
-                    return sum(v * w for v, w in zip(volumes, weights)) / sum(weights)
-                else:
-                    return float('nan')
-            
-            df['weighted_avg_volume'] = df['Volume'].rolling(window=volume_period).apply(calculate_weighted_avg_volume)
-            
-            # 거래량 비율 계산
-            df['volume_ratio'] = df['Volume'] / df['weighted_avg_volume']
-            
-            # 거래량 기준선 추가
-            df['volume_threshold'] = 1.5  # 1.5배 기준선
-            
-            added_plots = [
-                mpf.make_addplot(df['rsi'], color='purple', alpha=0.8, width=2, secondary_y=True),
-                mpf.make_addplot(df['rsi_70'], color='red', alpha=0.5, width=1, linestyle='--', secondary_y=True),
-                mpf.make_addplot(df['rsi_30'], color='blue', alpha=0.5, width=1, linestyle='--', secondary_y=True),
-                mpf.make_addplot(df['rsi_50'], color='gray', alpha=0.3, width=1, linestyle=':', secondary_y=True),
-                mpf.make_addplot(df['volume_ratio'], color='orange', alpha=0.7, width=1, secondary_y=True),
-                mpf.make_addplot(df['volume_threshold'], color='red', alpha=0.5, width=1, linestyle='--', secondary_y=True)
-            ]
-            
-            legend_elements = [
-                mlines.Line2D([0], [0], color='purple', lw=2, label='RSI'),
-                mlines.Line2D([0], [0], color='red', lw=1, linestyle='--', alpha=0.5, label='과매수(70)'),
-                mlines.Line2D([0], [0], color='blue', lw=1, linestyle='--', alpha=0.5, label='과매도(30)'),
-                mlines.Line2D([0], [0], color='gray', lw=1, linestyle=':', alpha=0.3, label='중립(50)'),
-                mlines.Line2D([0], [0], color='orange', lw=1, label='거래량비율'),
-                mlines.Line2D([0], [0], color='red', lw=1, linestyle='--', alpha=0.5, label='거래량기준(1.5배)')
-            ]
-            
-        elif strategy_type.upper() == "CHAIKIN":
-            # 차이킨 오실레이터 계산
-            df['hlc3'] = (df['High'] + df['Low'] + df['Close']) / 3
-            df['clv'] = ((df['Close'] - df['Low']) - (df['High'] - df['Close'])) / (df['High'] - df['Low'])
-            df['clv'] = df['clv'].fillna(0)
-            df['ad'] = (df['clv'] * df['Volume']).cumsum()
-            
-            # 차이킨 오실레이터 (3일 MA - 10일 MA)
-            df['ad_short_ma'] = df['ad'].rolling(window=3).mean()
-            df['ad_long_ma'] = df['ad'].rolling(window=10).mean()
-            df['chaikin_oscillator'] = df['ad_short_ma'] - df['ad_long_ma']
-            
-            # 기준선 추가
-            df['zero_line'] = 0
-            
-            added_plots = [
-                mpf.make_addplot(df['chaikin_oscillator'], color='orange', alpha=0.8, width=2, secondary_y=True),
-                mpf.make_addplot(df['zero_line'], color='gray', alpha=0.5, width=1, linestyle='--', secondary_y=True)
-            ]
-            
-            legend_elements = [
-                mlines.Line2D([0], [0], color='orange', lw=2, label='차이킨 오실레이터'),
-                mlines.Line2D([0], [0], color='gray', lw=1, linestyle='--', alpha=0.5, label='기준선(0)')
-            ]
-        
-        else:
+        if strategy_type.upper() not in STRATEGY_CHART_TYPES:
             raise HTTPException(status_code=400, detail=f"지원하지 않는 전략 타입입니다: {strategy_type}")
         
-        # 6. 색상 설정
-        mc = mpf.make_marketcolors(
-            up="red",
-            down="blue",
-            volume="inherit"
-        )
-        
-        # 7. 스타일 설정
-        s = mpf.make_mpf_style(
-            base_mpf_style="charles",
-            marketcolors=mc,
-            gridaxis='both',
-            y_on_right=True,
-            facecolor='white',
-            edgecolor='black'
-        )
-        
-        # 8. 차트 생성
-        buf = io.BytesIO()
-        
-        # 전략에 따라 secondary_y 사용 여부 결정
-        use_secondary_y = strategy_type.upper() in ["MOMENTUM", "DISPARITY", "RSI", "CHAIKIN"]
-        
-        fig, axes = mpf.plot(
-            data=df,
-            type='candle',
-            style=s,
-            figratio=(18, 10),
-            mav=(20, 60),
-            volume=True,
-            scale_width_adjustment=dict(volume=0.6, candle=1.2),
-            addplot=added_plots,
-            savefig=dict(fname=buf, format='png', dpi=200, bbox_inches='tight'),
-            returnfig=True,
-            tight_layout=True
-        )
-        
-        # 9. 범례 추가
-        if fig and axes and len(axes) > 0:
-            try:
-                # 기본 범례 요소 추가
-                base_legend_elements = [
-                    mlines.Line2D([0], [0], color='blue', lw=1, label='20일 이평선'),
-                    mlines.Line2D([0], [0], color='orange', lw=1, label='60일 이평선')
-                ]
-                
-                all_legend_elements = legend_elements + base_legend_elements
-                
-                axes[0].legend(
-                    handles=all_legend_elements,
-                    loc='upper left',
-                    fontsize=10,
-                    frameon=True,
-                    fancybox=True,
-                    shadow=True,
-                    ncol=2,
-                    bbox_to_anchor=(0, 1)
-                )
-            except Exception as e:
-                logger.warning(f"범례 추가 실패: {e}")
+        # 1. 키움 API에서 데이터 가져오기 (연속조회로 이력 확보)
+        chart_data = await kiwoom_api.get_cached_chart_data(stock_code, "1D", max_age=60,
+                                                            max_bars=CHART_IMAGE_HISTORY_BARS,
+                                                            stale_while_revalidate=True)
         
-        # 10. 이미지 반환
-        buf.seek(0)
-        image_data = buf.getvalue()
-        buf.close()
+        if not chart_data:
+            raise HTTPException(status_code=404, detail="차트 데이터가 없습니다")
         
-        # Base64 인코딩
-        image_base64 = base64.b64encode(image_data).decode('utf-8')
+        # 2. 지표 계산/렌더링은 작업 풀 프로세스에서 (이벤트 루프를 막지 않음)
+        image_base64 = await cpu_pool.submit(render_strategy_chart, chart_data.to_frame(), strategy_type, period)
         
         return {
             "image": f"data:image/png;base64,{image_base64}",
@@ -2103,6 +1945,9 @@ async def get_strategy_chart(stock_code: str, strategy_type: str, period: str =
         
     except HTTPException:
         raise
+    except ExecutorBusy as e:
+        logger.warning(f"⚙️ [EXECUTOR] 전략 차트 렌더링 거절: {e}")
+        raise HTTPException(status_code=503, detail="차트 생성 요청이 많습니다. 잠시 후 다시 시도하세요.")
     except Exception as e:
         logger.error(f"전략 차트 생성 오류: {e}")
         raise HTTPException(status_code=500, detail="전략 차트 생성 중 오류가 발생했습니다.")
@@ -2111,138 +1956,16 @@ async def get_strategy_chart(stock_code: str, strategy_type: str, period: str =
 async def get_all_strategies_chart(stock_code: str, period: str = "1M"):
     """모든 전략 지표가 포함된 종합 차트 생성"""
     try:
-        # 1. 키움 API에서 데이터 가져오기
-        chart_data = await kiwoom_api.get_stock_chart_data(stock_code, "1D")
+        # 1. 키움 API에서 데이터 가져오기 (연속조회로 이력 확보)
+        chart_data = await kiwoom_api.get_cached_chart_data(stock_code, "1D", max_age=60,
+                                                            max_bars=CHART_IMAGE_HISTORY_BARS,
+                                                            stale_while_revalidate=True)
         
         if not chart_data:
             raise HTTPException(status_code=404, detail="차트 데이터가 없습니다")
         
-        # 2. DataFrame으로 변환
-        df = pd.DataFrame(chart_data)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df.set_index('timestamp', inplace=True)
-        df = df.sort_index()
-        
-        # 3. 기간에 따른 데이터 필터링
-        if period == "1Y":
-            df = df.tail(250)
-        elif period == "1M":
-            df = df.tail(30)
-        elif period == "1W":
-            df = df.tail(7)
-        else:
-            df = df.tail(500)
-        
-        # 4. 컬럼명 변경
-        df = df.rename(columns={
-            'open': 'Open',
-            'high': 'High', 
-            'low': 'Low',
-            'close': 'Close',
-            'volume': 'Volume'
-        })
-        
-        # 5. 모든 전략 지표 계산
-        # 모멘텀
-        df['momentum'] = df['Close'] - df['Close'].shift(10)
-        
-        # 이격도
-        df['ma20'] = df['Close'].rolling(window=20).mean()
-        df['disparity'] = (df['Close'] / df['ma20']) * 100
-        
-        # 볼린저밴드
-        bb_indicator = BollingerBands(close=df['Close'], window=20, window_dev=2)
-        df['bb_upper'] = bb_indicator.bollinger_hband()
-        df['bb_middle'] = bb_indicator.bollinger_mavg()
-        df['bb_lower'] = bb_indicator.bollinger_lband()
-        
-        # RSI
-        rsi_indicator = RSIIndicator(close=df['Close'], window=14)
-        df['rsi'] = rsi_indicator.rsi()
-        
-        # 차이킨 오실레이터
-        df['hlc3'] = (df['High'] + df['Low'] + df['Close']) / 3
-        df['clv'] = ((df['Close'] - df['Low']) - (df['High'] - df['Close'])) / (df['High'] - df['Low'])
-        df['clv'] = df['clv'].fillna(0)
-        df['ad'] = (df['clv'] * df['Volume']).cumsum()
-        df['ad_short_ma'] = df['ad'].rolling(window=3).mean()
-        df['ad_long_ma'] = df['ad'].rolling(window=10).mean()
-        df['chaikin_oscillator'] = df['ad_short_ma'] - df['ad_long_ma']
-        
-        # 6. 차트 플롯 설정
-        added_plots = [
-            # 볼린저밴드
-            mpf.make_addplot(df['bb_upper'], color='red', alpha=0.5, width=1),
-            mpf.make_addplot(df['bb_middle'], color='blue', alpha=0.7, width=1.5),
-            mpf.make_addplot(df['bb_lower'], color='red', alpha=0.5, width=1),
-            # 이동평균
-            mpf.make_addplot(df['ma20'], color='orange', alpha=0.8, width=2),
-        ]
-        
-        # 7. 색상 설정
-        mc = mpf.make_marketcolors(
-            up="red",
-            down="blue",
-            volume="inherit"
-        )
-        
-        # 8. 스타일 설정
-        s = mpf.make_mpf_style(
-            base_mpf_style="charles",
-            marketcolors=mc,
-            gridaxis='both',
-            y_on_right=True,
-            facecolor='white',
-            edgecolor='black'
-        )
-        
-        # 9. 차트 생성
-        buf = io.BytesIO()
-        fig, axes = mpf.plot(
-            data=df,
-            type='candle',
-            style=s,
-            figratio=(18, 10),
-            mav=(20, 60),
-            volume=True,
-            scale_width_adjustment=dict(volume=0.6, candle=1.2),
-            addplot=added_plots,
-            savefig=dict(fname=buf, format='png', dpi=200, bbox_inches='tight'),
-            returnfig=True,
-            tight_layout=True
-        )
-        
-        # 10. 범례 추가
-        if fig and axes and len(axes) > 0:
-            try:
-                legend_elements = [
-                    mlines.Line2D([0], [0], color='red', lw=1, alpha=0.5, label='볼린저밴드 상/하단'),
-                    mlines.Line2D([0], [0], color='blue', lw=1.5, alpha=0.7, label='볼린저밴드 중간'),
-                    mlines.Line2D([0], [0], color='orange', lw=2, alpha=0.8, label='20일 이동평균'),
-                    mlines.Line2D([0], [0], color='blue', lw=1, label='20일 이평선'),
-                    mlines.Line2D([0], [0], color='orange', lw=1, label='60일 이평선')
-                ]
-                
-                axes[0].legend(
-                    handles=legend_elements,
-                    loc='upper left',
-                    fontsize=10,
-                    frameon=True,
-                    fancybox=True,
-                    shadow=True,
-                    ncol=2,
-                    bbox_to_anchor=(0, 1)
-                )
-            except Exception as e:
-                logger.warning(f"범례 추가 실패: {e}")
-        
-        # 11. 이미지 반환
-        buf.seek(0)
-        image_data = buf.getvalue()
-        buf.close()
-        
-        # Base64 인코딩
-        image_base64 = base64.b64encode(image_data).decode('utf-8')
+        # 2. 지표 계산/렌더링은 작업 풀 프로세스에서 (이벤트 루프를 막지 않음)
+        image_base64 = await cpu_pool.submit(render_all_strategies_chart, chart_data.to_frame(), period)
         
         return {
             "image": f"data:image/png;base64,{image_base64}",
@@ -2253,6 +1976,9 @@ async def get_all_strategies_chart(stock_code: str, period: str = "1M"):
         
     except HTTPException:
         raise
+    except ExecutorBusy as e:
+        logger.warning(f"⚙️ [EXECUTOR] 종합 전략 차트 렌더링 거절: {e}")
+        raise HTTPException(status_code=503, detail="차트 생성 요청이 많습니다. 잠시 후 다시 시도하세요.")
     except Exception as e:
         logger.error(f"종합 전략 차트 생성 오류: {e}")
         raise HTTPException(status_code=500, detail="종합 전략 차트 생성 중 오류가 발생했습니다.")
@@ -2583,23 +2309,17 @@ async def get_surge_stocks(
             # 각 종목의 최근 일봉 데이터 조회
             for idx, stock_code in enumerate(watchlist, 1):
                 try:
-                    # API 제한 고려: 5초마다 1개 종목 조회
-                    if idx > 1:
-                        await asyncio.sleep(5)
-                    
-                    chart_data = await kiwoom_api.get_stock_chart_data(stock_code, "1D")
+                    # 호출 간격은 api_rate_limiter.acquire가 조절
+                    chart_data = await kiwoom_api.get_cached_chart_data(stock_code, "1D", max_age=60)
                     
                     if not chart_data or len(chart_data) < 2:
                         continue
                     
                     # 최근 2일 데이터
-                    today = chart_data[-1]
-                    yesterday = chart_data[-2]
-                    
-                    current_price = int(today.get('close', 0))
-                    prev_close = int(yesterday.get('close', 0))
-                    today_volume = int(today.get('volume', 0))
-                    yesterday_volume = int(yesterday.get('volume', 0))
+                    current_price = int(chart_data.close[-1])
+                    prev_close = int(chart_data.close[-2])
+                    today_volume = int(chart_data.volume[-1])
+                    yesterday_volume = int(chart_data.volume[-2])
                     
                     if prev_close == 0:
                         continue
@@ -2695,7 +2415,7 @@ async def manual_sell_position(position_id: int, sell_price: int = 0):
         
         # 현재가 조회 (시장가인 경우)
         if sell_price == 0:
-            current_price = await kiwoom_api.get_current_price(position.stock_code)
+            current_price = await kiwoom_api.get_current_price(position.stock_code, priority=APIPriority.ORDER)
             if not current_price:
                 raise HTTPException(status_code=500, detail="현재가 조회 실패")
             sell_price = current_price
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Generator
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, create_engine, UniqueConstraint, Date, text, JSON, Float, Index
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, create_engine, UniqueConstraint, Date, text, JSON, Float, Index, inspect
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
 from .config import Config
 
@@ -166,9 +166,14 @@ class Position(Base):
     take_profit_rate = Column(Float, nullable=False, default=10.0)  # 익절 비율 (%)
     stop_loss_price = Column(Integer, nullable=True)  # 손절가
     take_profit_price = Column(Integer, nullable=True)  # 익절가
+
+    # 포지션 종류 - NORMAL: StopLossManager가 손절/익절 관리, SCALP: ScalpingStrategyManager가 실시간 청산
+    position_type = Column(String(20), nullable=False, default="NORMAL", server_default="NORMAL")
+    strategy_type = Column(String(50), nullable=True)  # 스캘핑 전략 (MOMENTUM_SCALP 등)
+    max_hold_until = Column(DateTime, nullable=True)  # 스캘핑 최대 보유 시각 (UTC)
     
     # 상태 관리
-    status = Column(String(20), nullable=False, default="HOLDING", index=True)  # HOLDING, STOP_LOSS, TAKE_PROFIT, MANUAL_SELL
+    status = Column(String(20), nullable=False, default="HOLDING", index=True)  # HOLDING, STOP_LOSS, TAKE_PROFIT, MAX_HOLD, MANUAL_SELL
     current_price = Column(Integer, nullable=True)  # 현재가
     current_profit_loss = Column(Integer, nullable=True)  # 현재 손익
     current_profit_loss_rate = Column(Float, nullable=True)  # 현재 손익률 (%)
@@ -185,6 +190,7 @@ class Position(Base):
     __table_args__ = (
         Index("idx_position_status_stock", "status", "stock_code"),
         Index("idx_position_monitoring", "status", "last_monitored"),
+        Index("idx_position_type_status", "position_type", "status"),
     )
 
 
@@ -248,6 +254,44 @@ class ConditionWatchlistSync(Base):
     )
 
 
+class Candle(Base):
+    """캔들 저장소 테이블 (종목/주기별 OHLCV, 증분 적재)"""
+    __tablename__ = "candles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    stock_code = Column(String(20), nullable=False)
+    timeframe = Column(String(10), nullable=False)   # 1M, 3M, 5M, ..., 60M, 1D
+    ts = Column(BigInteger, nullable=False)          # 봉 시각 (한국 시간 epoch 초, api.candles.to_epoch)
+    open = Column(Integer, nullable=False)
+    high = Column(Integer, nullable=False)
+    low = Column(Integer, nullable=False)
+    close = Column(Integer, nullable=False)
+    volume = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        # (종목, 주기, 시각) 유니크 인덱스가 구간 조회 인덱스 역할도 겸함
+        UniqueConstraint("stock_code", "timeframe", "ts", name="uq_candle_code_tf_ts"),
+    )
+
+
+class IndicatorState(Base):
+    """증분 지표 상태 테이블 (종목/주기/지표/파라미터별 마지막 반영 봉과 상태)"""
+    __tablename__ = "indicator_states"
+
+    id = Column(Integer, primary_key=True, index=True)
+    stock_code = Column(String(20), nullable=False)
+    timeframe = Column(String(10), nullable=False)
+    indicator = Column(String(30), nullable=False)    # utils.indicators.INDICATORS 키
+    params = Column(String(255), nullable=False)      # 정렬된 JSON (utils.indicators.params_key)
+    last_ts = Column(BigInteger, nullable=False)      # 마지막으로 반영한 마감 봉 시각 (epoch 초)
+    state = Column(JSON, nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("stock_code", "timeframe", "indicator", "params", name="uq_indicator_state_key"),
+    )
+
+
 def get_db() -> Generator[Session, None, None]:
     db: Session = SessionLocal()
     try:
@@ -312,6 +356,24 @@ def init_db() -> None:
         print(f"Migration warning: {e}")
         pass
 
+    # positions 테이블 마이그레이션 (스캘핑 포지션 영속화 컬럼) - SQLite/PostgreSQL 공통
+    try:
+        columns = {column["name"] for column in inspect(engine).get_columns("positions")}
+        new_columns = [
+            ("position_type", "VARCHAR(20) NOT NULL DEFAULT 'NORMAL'"),
+            ("strategy_type", "VARCHAR(50)"),
+            ("max_hold_until", "TIMESTAMP"),
+        ]
+        with engine.connect() as conn:
+            for col_name, col_def in new_columns:
+                if col_name not in columns:
+                    conn.execute(text(f"ALTER TABLE positions ADD COLUMN {col_name} {col_def}"))
+            if "position_type" not in columns:
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_position_type_status ON positions (position_type, status)"))
+            conn.commit()
+    except Exception as e:
+        print(f"Migration warning: {e}")
+
 
 # 모듈 import 시점에 테이블 보장
 init_db()
@@ -0,0 +1,287 @@
+"""
+전략 백테스트
+저장된 캔들을 실시간 스캔과 같은 전략 판정(PanelStrategy.bar_signals)으로 재생하고,
+StopLossManager와 같은 수수료/제세금 모델과 AutoTradeSettings 손절/익절 규칙으로 청산합니다.
+
+- 신호: 종목마다 모든 봉을 한 번에 계산 (봉 t 신호는 봉 t까지의 데이터만 사용)
+- 진입: 매수 신호 다음 봉 시가, 수량 = 최대 투자금액 // 가격 (BuyOrderExecutor와 같음)
+- 청산: 진입 봉부터 봉 종가 기준 수익률이 -손절% 이하 / 익절% 이상인 첫 봉 (StopLossManager 주기 점검에 해당)
+        exit_on_sell_signal이면 매도 신호 다음 봉 시가, 마지막 봉까지 보유하면 마지막 종가로 평가
+- 종목당 보유 포지션은 하나 (청산 전 매수 신호는 무시)
+- 모든 종목을 하나의 계좌(initial_capital)로 시간 순 재생: 현금이 최대 투자금액보다 적으면 진입하지 않음
+  (BuyOrderExecutor 잔고 확인과 같음), 청산하면 평가금액(수수료/제세금 차감)이 현금으로 돌아옴
+
+DB를 import하지 않으므로 cpu_pool(프로세스 풀)에서 실행할 수 있습니다.
+"""
+
+import heapq
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from api.candles import CandleSeries, from_epoch
+from core.config import Config
+from managers.indicator_nodes import BarArrays
+from managers.strategies import STRATEGIES
+from utils.trading_fees import evaluate_position, profit_loss_rates
+
+# 청산 구간 탐색 시작 크기 (보유 기간이 길면 두 배씩 늘려 가며 벡터 계산)
+_EXIT_SEARCH_CHUNK = 64
+
+
+class BacktestSettings:
+    """백테스트 매매 규칙 (기본값은 AutoTradeSettings 기본값)"""
+
+    __slots__ = ("stop_loss_rate", "take_profit_rate", "max_invest_amount", "mock", "exit_on_sell_signal")
+
+    def __init__(self, stop_loss_rate: float = 5, take_profit_rate: float = 10,
+                 max_invest_amount: int = 1000000, mock: Optional[bool] = None,
+                 exit_on_sell_signal: bool = False):
+        self.stop_loss_rate = stop_loss_rate
+        self.take_profit_rate = take_profit_rate
+        self.max_invest_amount = max_invest_amount
+        self.mock = Config.KIWOOM_USE_MOCK_ACCOUNT if mock is None else mock
+        self.exit_on_sell_signal = exit_on_sell_signal
+
+    @classmethod
+    def from_auto_trade_settings(cls, settings, **kwargs) -> "BacktestSettings":
+        """AutoTradeSettings 행(없으면 기본값)에서 생성"""
+        if settings is None:
+            return cls(**kwargs)
+        return cls(stop_loss_rate=settings.stop_loss_rate, take_profit_rate=settings.take_profit_rate,
+                   max_invest_amount=settings.max_invest_amount, **kwargs)
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Trade:
+    """백테스트 거래 한 건"""
+
+    __slots__ = ("stock_code", "signal_ts", "entry_ts", "entry_price", "quantity", "buy_amount",
+                 "exit_ts", "exit_price", "exit_reason", "profit_loss", "profit_loss_rate")
+
+    def __init__(self, stock_code: str, signal_ts: int, entry_ts: int, entry_price: int, quantity: int):
+        self.stock_code = stock_code
+        self.signal_ts = signal_ts
+        self.entry_ts = entry_ts
+        self.entry_price = entry_price
+        self.quantity = quantity
+        self.buy_amount = entry_price * quantity
+        self.exit_ts = 0
+        self.exit_price = 0
+        self.exit_reason = ""
+        self.profit_loss = 0.0
+        self.profit_loss_rate = 0.0
+
+    def close(self, exit_ts: int, exit_price: int, reason: str, mock: bool):
+        self.exit_ts = exit_ts
+        self.exit_price = exit_price
+        self.exit_reason = reason
+        _, self.profit_loss, self.profit_loss_rate = evaluate_position(exit_price, self.quantity, self.buy_amount, mock)
+
+    def to_dict(self) -> Dict:
+        return {
+            "stock_code": self.stock_code,
+            "signal_time": from_epoch(self.signal_ts).isoformat(),
+            "entry_time": from_epoch(self.entry_ts).isoformat(),
+            "entry_price": self.entry_price,
+            "quantity": self.quantity,
+            "buy_amount": self.buy_amount,
+            "exit_time": from_epoch(self.exit_ts).isoformat(),
+            "exit_price": self.exit_price,
+            "exit_reason": self.exit_reason,
+            "profit_loss": int(self.profit_loss),
+            "profit_loss_rate": round(self.profit_loss_rate, 2),
+        }
+
+
+def _find_exit(bars: BarArrays, sell: np.ndarray, start: int, n: int, quantity: int, buy_amount: int,
+               settings: BacktestSettings) -> Tuple[int, str, bool]:
+    """start 봉부터 n 봉 전까지 첫 청산 지점 -> (봉 번호, 사유, 시가 체결 여부)"""
+    chunk = _EXIT_SEARCH_CHUNK
+    while start < n:
+        end = min(n, start + chunk)
+        rates = profit_loss_rates(bars.close[start:end], quantity, buy_amount, settings.mock)
+        stop_hits = np.flatnonzero(rates <= -settings.stop_loss_rate)
+        take_hits = np.flatnonzero(rates >= settings.take_profit_rate)
+        stop = stop_hits[0] if len(stop_hits) else end - start
+        take = take_hits[0] if len(take_hits) else end - start
+        sell_at = end - start
+        if settings.exit_on_sell_signal:
+            sell_hits = np.flatnonzero(sell[start:end])
+            if len(sell_hits):
+                sell_at = sell_hits[0]
+
+        first = min(stop, take)
+        if sell_at < end - start and sell_at < first:
+            # 매도 신호 다음 봉 시가 (마지막 봉이면 그 종가)
+            index = start + sell_at
+            return (index + 1, "SELL_SIGNAL", True) if index + 1 < n else (index, "SELL_SIGNAL", False)
+        if first < end - start:
+            return start + first, ("STOP_LOSS" if stop <= take else "TAKE_PROFIT"), False
+        start = end
+        chunk *= 2
+    return n - 1, "END", False
+
+
+class SymbolSignals:
+    """종목 하나의 재생 입력 (캔들, 봉 배열, 매수/매도 신호, 재생 구간 [start, stop))"""
+
+    __slots__ = ("series", "bars", "buy", "sell", "start", "stop")
+
+    def __init__(self, series: CandleSeries, bars: BarArrays, buy: np.ndarray, sell: np.ndarray,
+                 start: int = 0, stop: Optional[int] = None):
+        self.series = series
+        self.bars = bars
+        self.buy = buy
+        self.sell = sell
+        self.start = start
+        self.stop = len(bars) if stop is None else stop
+
+    def window(self, start: int, stop: int) -> "SymbolSignals":
+        return SymbolSignals(self.series, self.bars, self.buy, self.sell, start, stop)
+
+
+def symbol_signals(series: CandleSeries, strategy_type: str, resolved: Dict) -> SymbolSignals:
+    """전체 이력으로 봉 단위 신호 계산 (구간만 바꿔 재생할 수 있음 - 워크포워드 최적화)"""
+    bars = BarArrays(series)
+    buy, sell = STRATEGIES[strategy_type].bar_signals(bars, resolved)
+    return SymbolSignals(series, bars, buy, sell)
+
+
+def simulate(symbols: List[SymbolSignals], settings: BacktestSettings, initial_capital: float) -> List[Trade]:
+    """여러 종목을 한 계좌로 진입 시각 순 재생 -> 거래 목록 (구간 끝까지 보유한 포지션은 마지막 종가로 평가)
+
+    진입 시점 현금(그 전에 청산된 포지션의 평가금액 포함)이 최대 투자금액보다 적으면 그 매수 신호는 건너뛴다.
+    """
+    cash = float(initial_capital)
+    trades: List[Trade] = []
+    pending = []    # (진입 시각, 종목 순번) - 종목마다 다음 매수 신호 하나씩
+    releases = []   # (청산 시각, 돌려받을 평가금액)
+    signals = []
+    cursor = [0] * len(symbols)
+
+    def push(j: int):
+        if cursor[j] < len(signals[j]):
+            entry = int(signals[j][cursor[j]]) + 1
+            heapq.heappush(pending, (int(symbols[j].series.timestamps[entry]), j))
+
+    for j, symbol in enumerate(symbols):
+        start, n = symbol.start, symbol.stop
+        signals.append(start + np.flatnonzero(symbol.buy[start:n - 1]) if n - 1 > start else np.empty(0, dtype=np.int64))
+        push(j)
+
+    while pending:
+        entry_ts, j = heapq.heappop(pending)
+        # 진입 봉 시작 전에 청산된 포지션의 대금 반영
+        while releases and releases[0][0] < entry_ts:
+            cash += heapq.heappop(releases)[1]
+
+        symbol = symbols[j]
+        series, n = symbol.series, symbol.stop
+        signal = int(signals[j][cursor[j]])
+        cursor[j] += 1
+        entry = signal + 1
+        entry_price = int(series.open[entry])
+        quantity = settings.max_invest_amount // entry_price if entry_price > 0 else 0
+        if cash < settings.max_invest_amount or quantity < 1:
+            push(j)
+            continue
+
+        trade = Trade(series.stock_code, int(series.timestamps[signal]), entry_ts, entry_price, int(quantity))
+        exit_index, reason, at_open = _find_exit(symbol.bars, symbol.sell, entry, n, trade.quantity,
+                                                 trade.buy_amount, settings)
+        exit_price = int(series.open[exit_index]) if at_open else int(series.close[exit_index])
+        trade.close(int(series.timestamps[exit_index]), exit_price, reason, settings.mock)
+        trades.append(trade)
+        cash -= trade.buy_amount
+        heapq.heappush(releases, (trade.exit_ts, trade.buy_amount + trade.profit_loss))
+        # 보유 중에 난 매수 신호는 건너뜀
+        cursor[j] = int(np.searchsorted(signals[j], exit_index))
+        push(j)
+    return trades
+
+
+def _drawdown(trades: List[Trade], initial_capital: float) -> Tuple[float, float]:
+    """청산 시각 순 누적 손익 곡선의 최대 낙폭 (원, 고점 자본 대비 %)"""
+    if not trades:
+        return 0.0, 0.0
+    ordered = sorted(trades, key=lambda t: t.exit_ts)
+    equity = initial_capital + np.cumsum([t.profit_loss for t in ordered])
+    peak = np.maximum.accumulate(np.concatenate(([initial_capital], equity)))[1:]
+    drawdown = peak - equity
+    worst = int(np.argmax(drawdown))
+    rate = drawdown[worst] / peak[worst] * 100 if peak[worst] > 0 else 0.0
+    return float(drawdown[worst]), float(rate)
+
+
+def _summary(trades: List[Trade]) -> Dict:
+    wins = sum(1 for t in trades if t.profit_loss > 0)
+    total = sum(t.profit_loss for t in trades)
+    return {
+        "trades": len(trades),
+        "wins": wins,
+        "win_rate": round(wins / len(trades) * 100, 2) if trades else 0.0,
+        "total_profit_loss": int(total),
+        "avg_profit_loss_rate": round(sum(t.profit_loss_rate for t in trades) / len(trades), 2) if trades else 0.0,
+    }
+
+
+def summarize(trades: List[Trade], initial_capital: float) -> Dict:
+    """거래 목록 성과 요약 (거래 수/승률/손익/수익률/최대낙폭)"""
+    max_drawdown, max_drawdown_rate = _drawdown(trades, initial_capital)
+    total = sum(t.profit_loss for t in trades)
+    return {
+        **_summary(trades),
+        "total_profit_loss_rate": round(total / initial_capital * 100, 2) if initial_capital else 0.0,
+        "max_drawdown": int(max_drawdown),
+        "max_drawdown_rate": round(max_drawdown_rate, 2),
+    }
+
+
+def run_backtest(series_by_code: Dict[str, CandleSeries], strategy_type: str, params: Dict,
+                 settings: BacktestSettings, initial_capital: Optional[float] = None,
+                 trade_limit: Optional[int] = None) -> Dict:
+    """종목별 캔들로 전략 백테스트 -> 거래/손익/낙폭 보고서
+
+    initial_capital 기본값은 모든 종목이 동시에 한 포지션씩 잡을 수 있는 금액 (최대 투자금액 x 종목 수)이며,
+    손실로 현금이 줄면 그만큼 동시 보유 포지션 수가 줄어든다.
+    trade_limit: 보고서에 담을 거래 수 (최근 청산 순, None이면 전체)
+    """
+    if strategy_type not in STRATEGIES:
+        raise ValueError(f"지원하지 않는 전략 타입: {strategy_type}")
+    started = time.perf_counter()
+    resolved = STRATEGIES[strategy_type].resolve(params)
+    if initial_capital is None:
+        initial_capital = settings.max_invest_amount * max(1, len(series_by_code))
+
+    symbols = [symbol_signals(series, strategy_type, resolved) for series in series_by_code.values() if len(series) >= 2]
+    bars = sum(len(series) for series in series_by_code.values())
+    trades = simulate(symbols, settings, initial_capital)
+
+    trades_by_symbol: Dict[str, List[Trade]] = {}
+    for trade in trades:
+        trades_by_symbol.setdefault(trade.stock_code, []).append(trade)
+    by_symbol = {stock_code: _summary(symbol_trades) for stock_code, symbol_trades in trades_by_symbol.items()}
+
+    exit_reasons: Dict[str, int] = {}
+    for trade in trades:
+        exit_reasons[trade.exit_reason] = exit_reasons.get(trade.exit_reason, 0) + 1
+
+    trades.sort(key=lambda t: t.exit_ts)
+    listed = trades if trade_limit is None else trades[-trade_limit:] if trade_limit > 0 else []
+    return {
+        "strategy_type": strategy_type,
+        "parameters": STRATEGIES[strategy_type].resolve(params),
+        "settings": settings.to_dict(),
+        "symbols": len(series_by_code),
+        "bars": bars,
+        "initial_capital": int(initial_capital),
+        **summarize(trades, initial_capital),
+        "exit_reasons": exit_reasons,
+        "by_symbol": by_symbol,
+        "trade_list": [t.to_dict() for t in listed],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
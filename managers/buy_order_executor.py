@@ -4,11 +4,13 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 
-from api.kiwoom_api import KiwoomAPI
+from api.kiwoom_api import KiwoomAPI, get_kiwoom_api
+from api.api_rate_limiter import APIPriority
 from core.models import PendingBuySignal, get_db, AutoTradeCondition, AutoTradeSettings, Position
 from managers.stop_loss_manager import StopLossManager
 from core.config import Config
 from utils.debug_tracer import debug_tracer
+from utils.market_hours import is_market_open
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +18,6 @@ class BuyOrderExecutor:
     """매수 주문 실행기 - 별도 프로세스에서 매수 주문 처리"""
     
     def __init__(self):
-        self.kiwoom_api = KiwoomAPI()
         self.is_running = False
         self.max_retry_attempts = 3  # 최대 재시도 횟수
         self.retry_delay_seconds = 30  # 재시도 간격 (초)
@@ -27,6 +28,11 @@ class BuyOrderExecutor:
         # 손절/익절 모니터링 매니저
         self.stop_loss_manager = StopLossManager()
         
+    @property
+    def kiwoom_api(self) -> KiwoomAPI:
+        """프로세스 공용 KiwoomAPI (set_kiwoom_api로 교체 가능)"""
+        return get_kiwoom_api()
+
     async def start_processing(self):
         """매수 주문 처리 시작"""
         logger.info("💰 [BUY_EXECUTOR] 매수 주문 처리기 시작")
@@ -93,9 +99,8 @@ class BuyOrderExecutor:
                     logger.error(f"💰 [BUY_EXECUTOR] 신호 처리 오류 (ID: {signal.id}): {e}")
                     await self._update_signal_status(signal.id, "FAILED", str(e))
                 
-                # API 제한을 고려한 대기 (키움 제한: 1분당 20회)
-                debug_tracer.log_checkpoint(f"[{idx}/{len(pending_signals)}] 신호 처리 완료, 5초 대기", "BUY_EXECUTOR")
-                await asyncio.sleep(5)
+                # 호출 간격은 api_rate_limiter.acquire가 ORDER 우선순위로 조절
+                debug_tracer.log_checkpoint(f"[{idx}/{len(pending_signals)}] 신호 처리 완료", "BUY_EXECUTOR")
                 
         except Exception as e:
             logger.error(f"💰 [BUY_EXECUTOR] 대기 신호 처리 중 오류: {e}")
@@ -204,13 +209,7 @@ class BuyOrderExecutor:
     
     def _is_market_open(self, now: datetime) -> bool:
         """시장 시간 확인 (평일 09:00-15:30)"""
-        if now.weekday() >= 5:  # 주말
-            return False
-        
-        market_start = now.replace(hour=9, minute=0, second=0, microsecond=0)
-        market_end = now.replace(hour=15, minute=30, second=0, microsecond=0)
-        
-        return market_start <= now <= market_end
+        return is_market_open(now)
     
     async def _get_account_info(self) -> Optional[Dict]:
         """계좌 정보 조회"""
@@ -221,7 +220,7 @@ class BuyOrderExecutor:
                 logger.error("💰 [BUY_EXECUTOR] 계좌번호가 설정되지 않았습니다 (KIWOOM_ACCOUNT_NUMBER / KIWOOM_MOCK_ACCOUNT_NUMBER)")
                 return None
 
-            raw = await self.kiwoom_api.get_account_balance(account_number)
+            raw = await self.kiwoom_api.get_account_balance(account_number, priority=APIPriority.ORDER)
             if not raw:
                 return None
 
@@ -255,7 +254,7 @@ class BuyOrderExecutor:
         try:
             # 기존 구현은 get_stock_info()를 호출했는데 KiwoomAPI에 해당 메서드가 없어 항상 실패했음.
             # 최소 검증으로 현재가 조회 성공 여부로 거래 가능 여부를 판단한다.
-            current_price = await self.kiwoom_api.get_current_price(stock_code)
+            current_price = await self._get_current_price(stock_code)
             if not current_price or current_price <= 0:
                 return {"tradeable": False, "reason": "현재가 조회 실패/0원"}
             return {"tradeable": True, "reason": "정상(현재가 조회 성공)"}
@@ -291,8 +290,8 @@ class BuyOrderExecutor:
     async def _get_current_price(self, stock_code: str) -> Optional[int]:
         """현재가 조회"""
         try:
-            # 키움 API로 현재가 조회
-            current_price = await self.kiwoom_api.get_current_price(stock_code)
+            # 실시간 체결 시세 우선 (구독 후 첫 체결 대기, 없으면 REST 조회)
+            current_price = await self.kiwoom_api.await_price_update(stock_code, priority=APIPriority.ORDER)
             return current_price
         except Exception as e:
             logger.error(f"💰 [BUY_EXECUTOR] 현재가 조회 오류: {e}")
@@ -389,7 +388,7 @@ class BuyOrderExecutor:
             
             # 키움 API에서 보유종목 정보 조회
             account_number = Config.KIWOOM_MOCK_ACCOUNT_NUMBER if Config.KIWOOM_USE_MOCK_ACCOUNT else Config.KIWOOM_ACCOUNT_NUMBER
-            balance_data = await self.kiwoom_api.get_account_balance(account_number)
+            balance_data = await self.kiwoom_api.get_account_balance(account_number, priority=APIPriority.ORDER)
             
             if not balance_data or 'stk_acnt_evlt_prst' not in balance_data:
                 logger.warning(f"💰 [BUY_EXECUTOR] 보유종목 정보 조회 실패 - Position ID: {position_id}")
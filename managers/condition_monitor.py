@@ -5,14 +5,14 @@ from datetime import datetime, timedelta
 from typing import Dict, Set, List, Optional
 # pandas 제거됨 - 기준봉 전략에서만 사용
 # DB 관련 import
-from api.kiwoom_api import KiwoomAPI
+from api.kiwoom_api import KiwoomAPI, get_kiwoom_api
 from core.models import PendingBuySignal, get_db, AutoTradeCondition
 from sqlalchemy.orm import Session
 from core.config import Config
 
 # 개선된 모듈들 import
 from managers.signal_manager import signal_manager, SignalType, SignalStatus
-from api.api_rate_limiter import api_rate_limiter
+from api.api_rate_limiter import api_rate_limiter, APIPriority
 from managers.buy_order_executor import buy_order_executor
 from managers.watchlist_sync_manager import watchlist_sync_manager
 
@@ -22,7 +22,6 @@ class ConditionMonitor:
     """조건식 모니터링 시스템"""
     
     def __init__(self):
-        self.kiwoom_api = KiwoomAPI()
         self.is_running = False
         self.loop_sleep_seconds = 600  # 10분 주기
         self._monitor_task: Optional[asyncio.Task] = None
@@ -30,22 +29,24 @@ class ConditionMonitor:
         
         # 기준봉 전략 제거됨 - 현재 매매전략에 집중
     
+    @property
+    def kiwoom_api(self) -> KiwoomAPI:
+        """프로세스 공용 KiwoomAPI (set_kiwoom_api로 교체 가능)"""
+        return get_kiwoom_api()
+
     async def start_monitoring(self, condition_id: int, condition_name: str) -> bool:
         """조건식 모니터링 시작 (조건식 결과 -> PendingBuySignal 신호 생성)"""
         logger.info(f"🔍 [CONDITION_MONITOR] 조건식 모니터링 시작 요청 - ID: {condition_id}, 이름: {condition_name}")
         try:
-            # API 제한 확인
-            if not api_rate_limiter.is_api_available():
-                logger.warning(f"🔍 [CONDITION_MONITOR] API 제한 상태 - 조건식 {condition_id} 모니터링 건너뜀")
+            # 호출 허가 대기 (조건식 검색 우선순위)
+            if not await api_rate_limiter.acquire(APIPriority.CONDITION_SEARCH, f"search_condition_stocks_{condition_id}"):
+                logger.warning(f"🔍 [CONDITION_MONITOR] 호출 허가 대기 시간 초과 - 조건식 {condition_id} 모니터링 건너뜀")
                 return False
             
             # 조건식으로 종목 검색
             logger.debug(f"🔍 [CONDITION_MONITOR] 키움 API로 종목 검색 시작 - 조건식 ID: {condition_id}")
             results = await self.kiwoom_api.search_condition_stocks(str(condition_id), condition_name)
             
-            # API 호출 기록
-            api_rate_limiter.record_api_call(f"search_condition_stocks_{condition_id}")
-            
             if results:
                 logger.info(f"🔍 [CONDITION_MONITOR] 종목 검색 완료 - {len(results)}개 종목 발견")
 
@@ -210,12 +211,8 @@ class ConditionMonitor:
                     pass
             finally:
                 self._monitor_task = None
-        # WebSocket 연결 종료 추가 (타임아웃 내 비차단)
-        try:
-            await asyncio.wait_for(self.kiwoom_api.disconnect(), timeout=3.0)
-        except asyncio.TimeoutError:
-            logger.warning("🔍 [CONDITION_MONITOR] disconnect 타임아웃 - 강제 종료 진행")
-        logger.info("🔍 [CONDITION_MONITOR] 모든 조건식 모니터링 중지 및 WebSocket 연결 종료")
+        # WebSocket 연결은 lifespan이 소유 (실시간 체결/손절 감시가 계속 쓰므로 끊지 않음)
+        logger.info("🔍 [CONDITION_MONITOR] 모든 조건식 모니터링 중지")
     
     async def get_monitoring_status(self) -> Dict:
         """모니터링 상태 조회 (개선된 상태 정보 포함)"""
@@ -0,0 +1,232 @@
+"""
+패널 지표 노드
+종목 x 봉 2차원 배열 묶음(PanelGroup)에 대해 지표를 이름 + 파라미터 단위 노드로 계산합니다.
+같은 노드(예: 종가 20봉 이동평균)는 묶음마다 한 번만 계산되어 이를 선언한 모든 전략이 공유합니다.
+
+백테스트용으로 한 종목의 전체 봉을 봉마다 평가하는 1차원 도우미(BarArrays, rolling, lag)도 둡니다.
+"""
+
+import functools
+import inspect
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+_rolling_std = functools.partial(np.std, ddof=1)
+
+# 원본 컬럼 이름 (노드 source로 지정 가능)
+COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def _rolling_last(x: np.ndarray, window: int, func: Callable, offset: int = 0) -> np.ndarray:
+    """행마다 끝에서 offset번째 봉까지 window개 구간에 func 적용 (pandas rolling과 같이 구간이 모자라면 NaN)"""
+    stop = x.shape[1] - offset
+    if window < 1 or window > stop:
+        return np.full(x.shape[0], np.nan)
+    return func(x[:, stop - window:stop], axis=1)
+
+
+def _at(x: np.ndarray, offset: int) -> np.ndarray:
+    """행마다 끝에서 offset번째 값 (없으면 NaN) - pandas shift(offset).iloc[-1]"""
+    if offset >= x.shape[1]:
+        return np.full(x.shape[0], np.nan)
+    return x[:, x.shape[1] - 1 - offset]
+
+
+class _NodeSpec:
+    __slots__ = ("name", "func", "signature", "_keys")
+
+    def __init__(self, name: str, func: Callable):
+        self.name = name
+        self.func = func
+        self.signature = inspect.signature(func)
+        self._keys: Dict[Tuple, Tuple] = {}
+
+    def key(self, params: Dict) -> Tuple:
+        """기본값을 채운 파라미터로 노드 키 생성 (생략한 파라미터와 명시한 기본값이 같은 노드가 되도록)"""
+        given = tuple(sorted(params.items()))
+        key = self._keys.get(given)
+        if key is None:
+            bound = self.signature.bind(None, **params)
+            bound.apply_defaults()
+            key = self._keys[given] = (self.name,) + tuple(sorted((k, v) for k, v in bound.arguments.items() if k != "g"))
+        return key
+
+
+# 노드 이름 -> 계산 함수 (첫 인자는 PanelGroup, 나머지는 키워드 파라미터)
+INDICATOR_NODES: Dict[str, _NodeSpec] = {}
+
+
+def indicator_node(name: str):
+    """지표 노드 등록 데코레이터 - 의존 노드는 함수 안에서 g.node()/g.column()으로 요청"""
+    def register(func: Callable) -> Callable:
+        INDICATOR_NODES[name] = _NodeSpec(name, func)
+        return func
+    return register
+
+
+class PanelGroup:
+    """같은 길이로 맞춘 종목 묶음 (각 컬럼은 종목 x 봉 2차원 float64 배열) + 계산한 지표 노드"""
+
+    __slots__ = ("codes", "lengths", "open", "high", "low", "close", "volume", "_nodes", "computed", "reused")
+
+    def __init__(self, codes: List[str], lengths: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.codes = codes
+        self.lengths = lengths    # 종목별 실제 캔들 수 (데이터 부족 판정용)
+        self.open = columns["open"]
+        self.high = columns["high"]
+        self.low = columns["low"]
+        self.close = columns["close"]
+        self.volume = columns["volume"]
+        self._nodes: Dict[Tuple, np.ndarray] = {}
+        self.computed = 0
+        self.reused = 0
+
+    def node(self, name: str, **params) -> np.ndarray:
+        """지표 노드 값 (묶음 안에서 같은 노드는 한 번만 계산)"""
+        spec = INDICATOR_NODES.get(name)
+        if spec is None:
+            raise ValueError(f"등록되지 않은 지표 노드: {name}")
+        key = spec.key(params)
+        value = self._nodes.get(key)
+        if value is not None:
+            self.reused += 1
+            return value
+        value = self._nodes[key] = spec.func(self, **params)
+        self.computed += 1
+        return value
+
+    def column(self, source: str) -> np.ndarray:
+        """원본 컬럼 또는 파라미터 없는 노드(예: AD)의 2차원 배열"""
+        return getattr(self, source) if source in COLUMNS else self.node(source)
+
+
+# ---- 기본 노드 (행마다 끝에서 offset번째 봉 기준 값) ----
+@indicator_node("PRICE")
+def _price(g: PanelGroup, source: str = "close", offset: int = 0) -> np.ndarray:
+    return _at(g.column(source), offset)
+
+
+@indicator_node("SMA")
+def _sma(g: PanelGroup, period: int = 20, source: str = "close", offset: int = 0) -> np.ndarray:
+    return _rolling_last(g.column(source), period, np.mean, offset)
+
+
+@indicator_node("STD")
+def _std(g: PanelGroup, period: int = 20, source: str = "close", offset: int = 0) -> np.ndarray:
+    """표본표준편차 (pandas rolling std와 같은 ddof=1)"""
+    return _rolling_last(g.column(source), period, _rolling_std, offset)
+
+
+@indicator_node("MIDPOINT")
+def _midpoint(g: PanelGroup, period: int = 9, offset: int = 0) -> np.ndarray:
+    """(period 구간 최고가 + 최저가) / 2 - 일목균형표 전환선/기준선/선행스팬B"""
+    return (_rolling_last(g.high, period, np.max, offset) + _rolling_last(g.low, period, np.min, offset)) / 2
+
+
+# ---- RSI ----
+@indicator_node("DELTA")
+def _delta(g: PanelGroup) -> np.ndarray:
+    """종가 변화량 (pandas diff의 첫 값(NaN)은 where 조건에서 0으로 바뀌므로 0)"""
+    return np.diff(g.close, axis=1, prepend=g.close[:, :1])
+
+
+@indicator_node("GAIN")
+def _gain(g: PanelGroup) -> np.ndarray:
+    delta = g.node("DELTA")
+    return np.where(delta > 0, delta, 0.0)
+
+
+@indicator_node("LOSS")
+def _loss(g: PanelGroup) -> np.ndarray:
+    delta = g.node("DELTA")
+    return np.where(delta < 0, -delta, 0.0)
+
+
+@indicator_node("RSI")
+def _rsi(g: PanelGroup, period: int = 14, offset: int = 0) -> np.ndarray:
+    """RSI (상승/하락폭 단순평균 방식)"""
+    rs = g.node("SMA", source="GAIN", period=period, offset=offset) / g.node("SMA", source="LOSS", period=period, offset=offset)
+    return 100 - (100 / (1 + rs))
+
+
+# ---- 거래량 ----
+@indicator_node("WEIGHTED_VOLUME")
+def _weighted_volume(g: PanelGroup, period: int = 20) -> np.ndarray:
+    """가중평균거래량 (최근일수록 큰 가중치, 데이터가 모자라면 0)"""
+    if g.volume.shape[1] < period:
+        return np.zeros(len(g.codes))
+    weights = np.arange(1, period + 1, dtype=float)
+    return g.volume[:, -period:] @ (weights / weights.sum())
+
+
+# ---- 차이킨 ----
+@indicator_node("MONEY_FLOW")
+def _money_flow(g: PanelGroup) -> np.ndarray:
+    return money_flow(g.high, g.low, g.close, g.volume)
+
+
+@indicator_node("AD")
+def _ad(g: PanelGroup) -> np.ndarray:
+    """AD 누적합 - 시작점이 잘린 구간이어도 이동평균 간 차이는 같음"""
+    return np.cumsum(g.node("MONEY_FLOW"), axis=1)
+
+
+def money_flow(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """CLV x 거래량 (고가=저가인 봉은 0)"""
+    clv = ((close - low) - (high - close)) / (high - low)
+    return np.nan_to_num(clv, nan=0.0) * volume
+
+
+# ---- 봉 단위 (백테스트) ----
+class BarArrays:
+    """한 종목 전체 봉의 float64 컬럼 - 봉 t의 값은 t번째 봉까지의 데이터만으로 계산"""
+
+    __slots__ = ("stock_code", "timestamps", "open", "high", "low", "close", "volume", "lengths")
+
+    def __init__(self, series):
+        self.stock_code = series.stock_code
+        self.timestamps = series.timestamps
+        self.open = series.open.astype(np.float64)
+        self.high = series.high.astype(np.float64)
+        self.low = series.low.astype(np.float64)
+        self.close = series.close.astype(np.float64)
+        self.volume = series.volume.astype(np.float64)
+        self.lengths = np.arange(1, len(series) + 1)   # 봉 t 시점의 캔들 수 (데이터 부족 판정용)
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+
+# 구간 최대/최소는 겹치는 두 구간의 결과를 합쳐 구간 길이를 두 배씩 늘려 계산 (봉당 O(log window))
+_EXTREMES = {np.max: np.maximum, np.min: np.minimum}
+
+
+def _rolling_extreme(x: np.ndarray, window: int, pair: Callable) -> np.ndarray:
+    span, step = x, 1
+    while step * 2 <= window:
+        span = pair(span[:-step], span[step:])
+        step *= 2
+    rest = window - step
+    return pair(span[:len(span) - rest], span[rest:]) if rest else span
+
+
+def rolling(x: np.ndarray, window: int, func: Callable) -> np.ndarray:
+    """봉마다 자신까지 window개 구간에 func 적용 (pandas rolling과 같이 구간이 모자란 앞부분은 NaN)"""
+    out = np.full(len(x), np.nan)
+    if 1 <= window <= len(x):
+        pair = _EXTREMES.get(func)
+        if pair is not None:
+            out[window - 1:] = _rolling_extreme(x, window, pair)
+        else:
+            out[window - 1:] = func(sliding_window_view(x, window), axis=-1)
+    return out
+
+
+def lag(x: np.ndarray, k: int) -> np.ndarray:
+    """k봉 전 값 (pandas shift(k) - 앞부분은 NaN)"""
+    out = np.full(len(x), np.nan)
+    if k < len(x):
+        out[k:] = x[:len(x) - k]
+    return out
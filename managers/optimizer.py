@@ -0,0 +1,289 @@
+"""
+전략 파라미터 최적화
+그리드/무작위 탐색으로 만든 파라미터 조합마다 백테스트(managers/backtest.py)를 프로세스 풀에 나눠 실행합니다.
+
+- 캔들 배열은 공유 메모리 한 블록에 올려 작업자가 복사 없이 읽음 (작업마다 캔들을 피클하지 않음)
+- 조합 하나당 신호는 전체 이력으로 한 번 계산하고 모든 구간(학습/검증)을 재생
+- 워크포워드: 기간을 같은 길이 구간으로 나눠 학습 구간 train_segments개에서 고른 파라미터를 바로 다음 구간에서 평가
+"""
+
+import itertools
+import logging
+import multiprocessing
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from api.candles import CandleSeries, from_epoch
+from core.config import Config
+from managers.backtest import BacktestSettings, simulate, summarize, symbol_signals
+from managers.strategies import STRATEGIES
+from utils.executor import ExecutorBusy
+
+logger = logging.getLogger(__name__)
+
+# 전략별 기본 탐색 공간 (파라미터 -> 후보 값)
+DEFAULT_SEARCH_SPACES = {
+    "MOMENTUM": {"momentum_period": [5, 10, 12, 24, 36, 48], "trend_confirmation_days": [0, 3, 5]},
+    "DISPARITY": {"ma_period": [10, 20, 40, 60], "buy_threshold": [90.0, 95.0, 97.0, 99.0],
+                  "sell_threshold": [101.0, 103.0, 105.0, 110.0]},
+    "BOLLINGER": {"ma_period": [10, 20, 30], "std_multiplier": [1.5, 2.0, 2.5, 3.0]},
+    "RSI": {"rsi_period": [7, 9, 14, 21], "oversold_threshold": [20.0, 25.0, 30.0, 35.0],
+            "overbought_threshold": [65.0, 70.0, 75.0, 80.0], "volume_threshold": [1.0, 1.5, 2.0]},
+    "ICHIMOKU": {"conversion_period": [5, 9, 12], "base_period": [20, 26, 30], "span_b_period": [44, 52],
+                 "displacement": [22, 26]},
+    "CHAIKIN": {"short_period": [2, 3, 5], "long_period": [8, 10, 15, 20]},
+}
+
+# 목적 함수 (summarize() 결과에서 계산, 클수록 좋음)
+OBJECTIVES = {
+    "total_profit_loss": lambda s: s["total_profit_loss"],
+    "avg_profit_loss_rate": lambda s: s["avg_profit_loss_rate"],
+    "win_rate": lambda s: s["win_rate"],
+    "return_over_drawdown": lambda s: s["total_profit_loss"] / max(s["max_drawdown"], 1),
+}
+
+# 공유 메모리 컬럼 배치 (이름, dtype) - 종목들을 이어 붙인 컬럼을 차례로 둠
+_COLUMNS = (("timestamps", np.int64), ("open", np.int32), ("high", np.int32), ("low", np.int32),
+            ("close", np.int32), ("volume", np.int64))
+
+# 동시에 한 최적화만 실행 (각 실행이 CPU 코어를 모두 씀)
+_run_lock = threading.Lock()
+
+
+def parameter_combinations(space: Dict[str, List], method: str = "grid", samples: int = 50,
+                           seed: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
+    """탐색 공간 -> 파라미터 조합 목록
+
+    grid: 모든 조합 (limit를 넘으면 ValueError)
+    random: 전체 조합 중 samples개를 중복 없이 추출 (전체 조합을 펼치지 않음)
+    """
+    limit = limit or Config.OPTIMIZER_MAX_COMBINATIONS
+    names = list(space)
+    values = [list(space[name]) for name in names]
+    if any(not v for v in values):
+        raise ValueError("후보 값이 없는 파라미터가 있습니다")
+    total = int(np.prod([len(v) for v in values])) if values else 1
+
+    if method == "grid":
+        if total > limit:
+            raise ValueError(f"조합 수 {total}개가 상한 {limit}개를 넘습니다 (random 탐색을 사용하세요)")
+        return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+    if method == "random":
+        picks = random.Random(seed).sample(range(total), min(samples, total, limit))
+        combos = []
+        for pick in picks:
+            combo = {}
+            for name, candidates in zip(reversed(names), reversed(values)):
+                pick, digit = divmod(pick, len(candidates))
+                combo[name] = candidates[digit]
+            combos.append({name: combo[name] for name in names})
+        return combos
+    raise ValueError(f"지원하지 않는 탐색 방식: {method}")
+
+
+def walk_forward_windows(first_ts: int, last_ts: int, folds: int,
+                         train_segments: int = 3) -> List[Tuple[Tuple[int, int], Optional[Tuple[int, int]]]]:
+    """[(학습 구간, 검증 구간)] - 구간은 [시작, 끝) epoch 초
+
+    folds=0이면 전체 기간 하나를 학습 구간으로 (검증 없음).
+    그 외에는 기간을 folds + train_segments개 구간으로 나눠 학습 train_segments개 -> 다음 1개 검증을 한 칸씩 민다.
+    """
+    end = last_ts + 1
+    if folds <= 0:
+        return [((first_ts, end), None)]
+    bounds = np.linspace(first_ts, end, folds + train_segments + 1).astype(np.int64)
+    bounds[-1] = end
+    return [((int(bounds[i]), int(bounds[i + train_segments])),
+             (int(bounds[i + train_segments]), int(bounds[i + train_segments + 1])))
+            for i in range(folds)]
+
+
+class SharedCandles:
+    """여러 종목 캔들을 공유 메모리 한 블록에 올림 (작업자는 attach_shared_candles로 복사 없이 읽음)"""
+
+    __slots__ = ("shm", "total", "layout", "period")
+
+    def __init__(self, series_by_code: Dict[str, CandleSeries], period: str = ""):
+        self.period = period
+        self.total = sum(len(s) for s in series_by_code.values())
+        self.layout: List[Tuple[str, int, int]] = []   # (종목, 시작 위치, 봉 수)
+        size = sum(np.dtype(dtype).itemsize for _, dtype in _COLUMNS) * self.total
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+        columns = _column_views(self.shm, self.total)
+        position = 0
+        for stock_code, series in series_by_code.items():
+            for name, _ in _COLUMNS:
+                columns[name][position:position + len(series)] = getattr(series, name)
+            self.layout.append((stock_code, position, len(series)))
+            position += len(series)
+
+    @property
+    def handle(self) -> Tuple[str, int, List[Tuple[str, int, int]], str]:
+        """작업자 초기화 인자 (피클 가능)"""
+        return self.shm.name, self.total, self.layout, self.period
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _column_views(shm: shared_memory.SharedMemory, total: int) -> Dict[str, np.ndarray]:
+    views, offset = {}, 0
+    for name, dtype in _COLUMNS:
+        views[name] = np.ndarray((total,), dtype=dtype, buffer=shm.buf, offset=offset)
+        offset += np.dtype(dtype).itemsize * total
+    return views
+
+
+def attach_shared_candles(handle) -> Tuple[shared_memory.SharedMemory, Dict[str, CandleSeries]]:
+    """SharedCandles.handle -> (공유 메모리, 종목별 CandleSeries 뷰)"""
+    name, total, layout, period = handle
+    shm = shared_memory.SharedMemory(name=name)
+    columns = _column_views(shm, total)
+    series = {
+        stock_code: CandleSeries(stock_code, period, *(columns[column][start:start + length] for column, _ in _COLUMNS))
+        for stock_code, start, length in layout
+    }
+    return shm, series
+
+
+# ---- 작업자 프로세스 ----
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_series: Dict[str, CandleSeries] = {}
+
+
+def _init_worker(handle):
+    global _worker_shm, _worker_series
+    _worker_shm, _worker_series = attach_shared_candles(handle)
+
+
+def _evaluate_combination(strategy_type: str, params: Dict, settings: BacktestSettings,
+                          windows: List[Tuple[int, int]], initial_capital: float) -> List[Dict]:
+    """한 조합의 구간별 성과 요약 (신호는 종목마다 전체 이력으로 한 번 계산, 구간마다 initial_capital 계좌로 재생)"""
+    resolved = STRATEGIES[strategy_type].resolve(params)
+    symbols = [symbol_signals(series, strategy_type, resolved) for series in _worker_series.values() if len(series) >= 2]
+    summaries = []
+    for start_ts, end_ts in windows:
+        window_symbols = []
+        for symbol in symbols:
+            start, stop = np.searchsorted(symbol.series.timestamps, (start_ts, end_ts))
+            if stop - start >= 2:
+                window_symbols.append(symbol.window(int(start), int(stop)))
+        summaries.append(summarize(simulate(window_symbols, settings, initial_capital), initial_capital))
+    return summaries
+
+
+def _score(summary: Dict, objective: str, min_trades: int) -> float:
+    if summary["trades"] < min_trades:
+        return float("-inf")
+    return float(OBJECTIVES[objective](summary))
+
+
+def _window_dict(window: Tuple[int, int]) -> Dict:
+    return {"start": from_epoch(window[0]).isoformat(), "end": from_epoch(window[1]).isoformat()}
+
+
+def optimize(series_by_code: Dict[str, CandleSeries], strategy_type: str, settings: BacktestSettings,
+             space: Optional[Dict[str, List]] = None, method: str = "grid", samples: int = 50,
+             seed: Optional[int] = None, folds: int = 0, train_segments: int = 3,
+             objective: str = "total_profit_loss", min_trades: int = 5,
+             base_params: Optional[Dict] = None, max_workers: Optional[int] = None, top: int = 10) -> Dict:
+    """파라미터 탐색 + (선택) 워크포워드 검증 -> 보고서
+
+    추천 파라미터(best_parameters)는 가장 최근 학습 구간에서 목적 함수가 가장 높은 조합이며,
+    탐색하지 않은 파라미터는 base_params(현재 설정) 값을 유지한다.
+    동시에 한 실행만 허용한다 (실행 중이면 ExecutorBusy).
+    """
+    if strategy_type not in STRATEGIES:
+        raise ValueError(f"지원하지 않는 전략 타입: {strategy_type}")
+    if objective not in OBJECTIVES:
+        raise ValueError(f"지원하지 않는 목적 함수: {objective}")
+    series_by_code = {code: s for code, s in series_by_code.items() if len(s)}
+    if not series_by_code:
+        raise ValueError("캔들 데이터가 없습니다")
+
+    space = space or DEFAULT_SEARCH_SPACES.get(strategy_type, {})
+    base_params = base_params or {}
+    combos = parameter_combinations(space, method, samples, seed)
+    first_ts = min(int(s.timestamps[0]) for s in series_by_code.values())
+    last_ts = max(int(s.timestamps[-1]) for s in series_by_code.values())
+    folds_windows = walk_forward_windows(first_ts, last_ts, folds, train_segments)
+    # 평가할 전체 구간 목록 (학습 구간들 + 검증 구간들)
+    windows = [train for train, _ in folds_windows] + [test for _, test in folds_windows if test]
+    initial_capital = settings.max_invest_amount * len(series_by_code)
+
+    if not _run_lock.acquire(blocking=False):
+        raise ExecutorBusy("다른 파라미터 최적화가 실행 중입니다")
+    started = time.perf_counter()
+    shared = SharedCandles(series_by_code, next(iter(series_by_code.values())).period)
+    results: List[Optional[List[Dict]]] = [None] * len(combos)
+    failed = 0
+    try:
+        workers = max(1, min(max_workers or Config.OPTIMIZER_WORKERS, len(combos)))
+        logger.info(f"🔧 [OPTIMIZER] {strategy_type} 조합 {len(combos)}개 x 구간 {len(windows)}개 평가 시작 "
+                    f"({len(series_by_code)}종목 {shared.total:,}봉, 작업자 {workers})")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(shared.handle,)) as executor:
+            futures = {
+                executor.submit(_evaluate_combination, strategy_type, {**base_params, **combo}, settings,
+                                windows, initial_capital): i
+                for i, combo in enumerate(combos)
+            }
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"🔧 [OPTIMIZER] 조합 평가 실패 {combos[futures[future]]}: {e}")
+    finally:
+        shared.close()
+        _run_lock.release()
+
+    evaluated = [i for i, r in enumerate(results) if r is not None]
+    folds_report = []
+    oos_trades = oos_profit_loss = 0
+    best_index = None
+    for fold, (train, test) in enumerate(folds_windows):
+        ranked = sorted(evaluated, key=lambda i: _score(results[i][fold], objective, min_trades), reverse=True)
+        chosen = ranked[0] if ranked and _score(results[ranked[0]][fold], objective, min_trades) > float("-inf") else None
+        entry = {"train": _window_dict(train), "best_parameters": combos[chosen] if chosen is not None else None,
+                 "train_result": results[chosen][fold] if chosen is not None else None}
+        if test is not None:
+            entry["test"] = _window_dict(test)
+            entry["test_result"] = results[chosen][len(folds_windows) + fold] if chosen is not None else None
+            if entry["test_result"]:
+                oos_trades += entry["test_result"]["trades"]
+                oos_profit_loss += entry["test_result"]["total_profit_loss"]
+        folds_report.append(entry)
+        best_index = chosen   # 마지막(가장 최근) 학습 구간의 선택
+
+    last_fold = len(folds_windows) - 1
+    ranking = sorted(evaluated, key=lambda i: _score(results[i][last_fold], objective, min_trades), reverse=True)
+    elapsed = time.perf_counter() - started
+    best_parameters = {**base_params, **combos[best_index]} if best_index is not None else None
+    logger.info(f"🔧 [OPTIMIZER] {strategy_type} 완료 ({elapsed:.1f}초) - 추천: {combos[best_index] if best_index is not None else '없음'}")
+    return {
+        "strategy_type": strategy_type,
+        "method": method,
+        "objective": objective,
+        "min_trades": min_trades,
+        "space": space,
+        "symbols": len(series_by_code),
+        "bars": shared.total,
+        "combinations": len(combos),
+        "failed": failed,
+        "folds": folds_report,
+        "walk_forward": {"trades": oos_trades, "total_profit_loss": int(oos_profit_loss)} if folds > 0 else None,
+        "best_parameters": best_parameters,
+        "top": [{"parameters": combos[i], "score": _score(results[i][last_fold], objective, min_trades),
+                 **results[i][last_fold]} for i in ranking[:top]
+                if _score(results[i][last_fold], objective, min_trades) > float("-inf")],
+        "elapsed_seconds": round(elapsed, 2),
+    }
@@ -1,30 +1,132 @@
 """
 스캘핑 전략 관리자
 고빈도 단기 매매를 위한 전략들을 구현합니다.
+신호 탐색은 전략별 봉 주기(1/3/5분)가 마감될 때마다 실행합니다 (utils/bar_scheduler.py).
+보유 포지션 청산은 실시간 체결마다 확인하고, 실시간 시세가 없는 종목만 REST로 주기 확인합니다.
+포지션은 positions 테이블(position_type=SCALP)에 저장되어 서버 재시작 후에도 청산 감시가 이어집니다.
 """
 
 import asyncio
+import functools
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-import pandas as pd
-import numpy as np
+import math
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any, Set
 from sqlalchemy.orm import Session
 
-from core.models import get_db, WatchlistStock, TradingStrategy, StrategySignal, PendingBuySignal
-from api.kiwoom_api import KiwoomAPI
+from core.models import get_db, Position, WatchlistStock, TradingStrategy, StrategySignal, PendingBuySignal
+from api.kiwoom_api import KiwoomAPI, get_kiwoom_api
+from api.api_rate_limiter import APIPriority
+from api.indicator_store import indicator_store
+from api.tick_store import Tick, tick_store
 from managers.signal_manager import SignalManager, SignalType, SignalStatus
+from managers.stop_loss_manager import StopLossManager
+from managers.strategies import SCALP_STRATEGIES
+from utils.bar_scheduler import bar_scheduler
 from core.config import Config
 
 logger = logging.getLogger(__name__)
 
+# 청산 사유 -> 로그 문구
+EXIT_REASONS = {
+    "TAKE_PROFIT": "수익 목표 달성",
+    "STOP_LOSS": "손절선 도달",
+    "MAX_HOLD": "최대 보유 시간 초과",
+}
+
+
+def _to_utc(epoch: float) -> datetime:
+    """epoch 초 -> naive UTC (positions 테이블 시각 기준)"""
+    return datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None)
+
+
+def _from_utc(value: datetime) -> float:
+    """naive UTC -> epoch 초"""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class ScalpPosition:
+    """스캘핑 보유 포지션 - 익절/손절 가격과 만기 시각을 진입 시 계산해 두어 체결마다 O(1)로 확인
+
+    체결가는 정수(원)이므로 익절가는 올림, 손절가는 내림한 정수로 두어 positions 테이블 값과 같게 비교한다.
+    """
+
+    __slots__ = ("stock_code", "stock_name", "strategy", "entry_time", "entry_price", "quantity",
+                 "target", "stop", "deadline", "position_id", "exiting", "retry_at", "timer")
+
+    def __init__(self, stock_code: str, stock_name: str, strategy: str, entry_price: float, quantity: int,
+                 params: Dict, entry_time: Optional[datetime] = None, position_id: Optional[int] = None):
+        self.stock_code = stock_code
+        self.stock_name = stock_name
+        self.strategy = strategy
+        self.entry_time = entry_time or datetime.now()
+        self.entry_price = entry_price
+        self.quantity = quantity
+        self.target = math.ceil(round(entry_price * (1 + params['profit_target'] / 100), 6))
+        self.stop = math.floor(round(entry_price * (1 - params['stop_loss'] / 100), 6))
+        self.deadline = self.entry_time.timestamp() + params['max_hold_minutes'] * 60  # epoch 초
+        self.position_id = position_id  # positions 테이블 ID
+        self.exiting = False    # 매도 주문 진행 중 (중복 주문 방지)
+        self.retry_at = 0.0     # 매도 실패 후 재시도 가능 시각 (epoch 초)
+        self.timer: Optional[asyncio.TimerHandle] = None  # 최대 보유 시간 타이머
+
+    @classmethod
+    def from_row(cls, row: Position, params: Optional[Dict] = None) -> "ScalpPosition":
+        """positions 행에서 복구 (저장된 손절/익절가와 최대 보유 시각 사용)"""
+        params = params or {'profit_target': row.take_profit_rate, 'stop_loss': row.stop_loss_rate,
+                            'max_hold_minutes': 0}
+        position = cls(row.stock_code, row.stock_name, row.strategy_type, row.buy_price, row.buy_quantity, params,
+                       entry_time=datetime.fromtimestamp(_from_utc(row.buy_time)), position_id=row.id)
+        if row.take_profit_price:
+            position.target = row.take_profit_price
+        if row.stop_loss_price:
+            position.stop = row.stop_loss_price
+        if row.max_hold_until:
+            position.deadline = _from_utc(row.max_hold_until)
+        return position
+
+    def exit_reason(self, price: float, now: float) -> Optional[str]:
+        """청산 사유 (없으면 None) - now는 epoch 초"""
+        if price >= self.target:
+            return "TAKE_PROFIT"
+        if price <= self.stop:
+            return "STOP_LOSS"
+        if now >= self.deadline:
+            return "MAX_HOLD"
+        return None
+
+    def to_dict(self) -> Dict:
+        return {
+            "stock_code": self.stock_code,
+            "stock_name": self.stock_name,
+            "strategy": self.strategy,
+            "entry_time": self.entry_time.isoformat(),
+            "entry_price": self.entry_price,
+            "quantity": self.quantity,
+            "position_id": self.position_id,
+            "target": self.target,
+            "stop": self.stop,
+            "deadline": datetime.fromtimestamp(self.deadline).isoformat(),
+            "exiting": self.exiting,
+        }
+
+
 class ScalpingStrategyManager:
     """스캘핑 전략 관리자"""
     
     def __init__(self):
-        self.running = False
-        self.monitoring_task = None
-        self.kiwoom_api = KiwoomAPI()
+        self.running = False  # 신호 탐색 실행 여부
+        self.exit_monitoring = False  # 보유 포지션 청산 감시 여부 (복구된 포지션은 탐색 시작 전부터 감시)
+        self.stop_loss_manager = StopLossManager()  # 포지션 저장 경로 (positions/sell_orders)
+        self.monitoring_task = None  # 실시간 시세가 없는 포지션의 REST 확인 루프
+        self.scan_tasks: List[asyncio.Task] = []  # 봉 주기별 신호 탐색 스케줄
+        self.position_check_interval = 30  # 실시간 시세가 없는 포지션의 REST 확인 주기 (초)
+        self.exit_retry_delay = 5  # 매도 주문 실패 후 재시도 간격 (초)
+        self._exit_tasks: Set[asyncio.Task] = set()
+        # 최근 청산 기록 (체결 수신 -> 주문 전송/응답 지연 포함)
+        self.recent_exits = deque(maxlen=200)
         self.signal_manager = SignalManager()
         
         # 스캘핑 전략 파라미터
@@ -59,9 +161,17 @@ class ScalpingStrategyManager:
             }
         }
         
+        # 차트 재사용 시간 (초) - 캐시는 봉 마감(+여유) 시각에도 만료되므로 마감 후 탐색은 항상 최신 봉 반영
+        self.chart_max_age = 20
+
         # 활성 포지션 추적
-        self.active_positions = {}  # {stock_code: {entry_time, entry_price, strategy, target, stop}}
+        self.active_positions: Dict[str, ScalpPosition] = {}
         
+    @property
+    def kiwoom_api(self) -> KiwoomAPI:
+        """프로세스 공용 KiwoomAPI (set_kiwoom_api로 교체 가능)"""
+        return get_kiwoom_api()
+
     async def start_scalping_monitoring(self):
         """스캘핑 모니터링 시작"""
         if self.running:
@@ -69,101 +179,202 @@ class ScalpingStrategyManager:
             return
             
         self.running = True
-        self.monitoring_task = asyncio.create_task(self._scalping_loop())
+        await self.restore_positions()
+        await self._start_exit_monitoring()
+        # 전략 봉 주기마다 하나의 스케줄 (같은 주기 전략은 함께 평가)
+        for timeframe in sorted({params['timeframe'] for params in self.scalping_strategies.values()}):
+            self.scan_tasks.append(bar_scheduler.schedule(
+                f"scalping_{timeframe}", timeframe,
+                functools.partial(self._scan_on_bar_close, timeframe),
+                prefetch=self._prefetch_watchlist))
         logger.info("🚀 [SCALPING] 스캘핑 모니터링 시작")
     
     async def stop_scalping_monitoring(self):
-        """스캘핑 모니터링 중지"""
+        """스캘핑 모니터링 중지 (청산 감시 포함 - 보유 포지션은 DB에 남아 다음 시작 시 복구)"""
         self.running = False
+        tasks = [task for task in self.scan_tasks if task]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.scan_tasks = []
+        await self._stop_exit_monitoring()
+        logger.info("🛑 [SCALPING] 스캘핑 모니터링 중지")
+
+    async def restore_positions(self) -> int:
+        """보유 중인 스캘핑 포지션을 한 번의 조회로 메모리 색인에 복구하고 청산 감시 시작 (서버 시작 시)"""
+        rows = []
+        for db in get_db():
+            session: Session = db
+            try:
+                rows = session.query(Position).filter(
+                    Position.position_type == "SCALP",
+                    Position.status == "HOLDING"
+                ).all()
+            except Exception as e:
+                logger.error(f"🚀 [SCALPING] 포지션 복구 조회 오류: {e}")
+            break
+
+        restored = 0
+        for row in rows:
+            if row.stock_code in self.active_positions:
+                continue
+            self.active_positions[row.stock_code] = ScalpPosition.from_row(
+                row, self.scalping_strategies.get(row.strategy_type))
+            restored += 1
+        if restored:
+            logger.info(f"🚀 [SCALPING] 스캘핑 포지션 {restored}개 복구: {[row.stock_code for row in rows]}")
+            await self._start_exit_monitoring()
+        return restored
+
+    async def _start_exit_monitoring(self):
+        """보유 종목 체결마다 청산 확인 시작 (실시간 구독, 최대 보유 시간 타이머, REST 확인 루프)"""
+        if not self.exit_monitoring:
+            self.exit_monitoring = True
+            tick_store.add_listener(self.on_tick)
+            self.monitoring_task = asyncio.create_task(self._position_loop())
+        if self.active_positions:
+            await self.kiwoom_api.subscribe_realtime(list(self.active_positions))
+        for position in self.active_positions.values():
+            if position.timer is None and not position.exiting:
+                self._arm_max_hold_timer(position)
+
+    async def _stop_exit_monitoring(self):
+        self.exit_monitoring = False
+        tick_store.remove_listener(self.on_tick)
+        for position in self.active_positions.values():
+            if position.timer is not None:
+                position.timer.cancel()
+                position.timer = None
         if self.monitoring_task:
             self.monitoring_task.cancel()
             try:
                 await self.monitoring_task
             except asyncio.CancelledError:
                 pass
-        logger.info("🛑 [SCALPING] 스캘핑 모니터링 중지")
+            self.monitoring_task = None
     
-    async def _scalping_loop(self):
-        """스캘핑 메인 루프"""
-        while self.running:
+    async def _position_loop(self):
+        """실시간 시세가 없는 포지션 관리 루프 (나머지는 on_tick, 신호 탐색은 봉 마감 스케줄에서 실행)"""
+        while self.exit_monitoring:
             try:
-                # 1. 활성 포지션 관리 (손절/익절)
                 await self._manage_active_positions()
-                
-                # 2. 새로운 스캘핑 기회 탐색
-                await self._scan_scalping_opportunities()
-                
-                # 3. 30초 대기 (고빈도)
-                await asyncio.sleep(30)
+                await asyncio.sleep(self.position_check_interval)
                 
             except Exception as e:
                 logger.error(f"🚀 [SCALPING] 루프 오류: {e}")
                 await asyncio.sleep(60)  # 오류 시 1분 대기
+
+    async def _prefetch_watchlist(self, bar_close: datetime):
+        """봉 마감 직전 관심종목 실시간 구독 - 마감 봉을 REST 조회 없이 실시간 집계 봉에서 읽도록"""
+        watchlist_stocks = await self._get_watchlist_stocks()
+        await self.kiwoom_api.subscribe_realtime([stock.stock_code for stock in watchlist_stocks])
+
+    async def _scan_on_bar_close(self, timeframe: str, bar_close: datetime):
+        """timeframe 봉 마감 시 그 주기 전략들로 기회 탐색"""
+        await self._scan_scalping_opportunities(timeframe)
+        for strategy_name, params in self.scalping_strategies.items():
+            if params['timeframe'] == timeframe:
+                bar_scheduler.record_latency(strategy_name, bar_close)
     
+    def on_tick(self, tick: Tick):
+        """tick_store 리스너 - 보유 종목 체결마다 익절/손절/최대 보유 시간 확인 (종목당 O(1))"""
+        position = self.active_positions.get(tick.stock_code)
+        if position is None or position.exiting or tick.received_at < position.retry_at:
+            return
+        reason = position.exit_reason(tick.price, tick.received_at)
+        if reason:
+            self._start_exit(position, tick.price, reason, tick.received_at)
+
+    def _arm_max_hold_timer(self, position: ScalpPosition, delay: Optional[float] = None):
+        """체결이 없어도 최대 보유 시간에 청산되도록 타이머 등록"""
+        if position.timer is not None:
+            position.timer.cancel()
+        if delay is None:
+            delay = position.deadline - time.time()
+        position.timer = asyncio.get_running_loop().call_later(max(0.0, delay), self._on_max_hold, position)
+
+    def _on_max_hold(self, position: ScalpPosition):
+        position.timer = None
+        if self.active_positions.get(position.stock_code) is not position or position.exiting:
+            return
+        tick = tick_store.get(position.stock_code)
+        # 실시간 시세가 있으면 최신 체결가, 없으면 주문 직전 REST 조회
+        self._start_exit(position, tick.price if tick else None, "MAX_HOLD", time.time())
+
+    def _start_exit(self, position: ScalpPosition, price: Optional[float], reason: str, triggered_at: float):
+        """청산 주문을 즉시 시작 (리스너/타이머에서 호출되므로 태스크로 실행)"""
+        position.exiting = True
+        if position.timer is not None:
+            position.timer.cancel()
+            position.timer = None
+        task = asyncio.create_task(self._exit_position(position, price, reason, triggered_at))
+        self._exit_tasks.add(task)
+        task.add_done_callback(self._exit_tasks.discard)
+
+    async def _exit_position(self, position: ScalpPosition, price: Optional[float], reason: str,
+                             triggered_at: float):
+        """청산 주문 - 성공 시 포지션 제거, 실패 시 exit_retry_delay초 뒤 다시 확인"""
+        stock_code = position.stock_code
+        try:
+            if price is None:
+                price = await self.kiwoom_api.get_current_price(stock_code, priority=APIPriority.STOP_LOSS)
+            if price and await self._execute_scalp_sell(position, price, reason, triggered_at):
+                if self.active_positions.get(stock_code) is position:
+                    del self.active_positions[stock_code]
+                return
+        except Exception as e:
+            logger.error(f"🚀 [SCALPING] 청산 오류 - {stock_code}: {e}")
+
+        position.exiting = False
+        position.retry_at = time.time() + self.exit_retry_delay
+        if self.exit_monitoring and self.active_positions.get(stock_code) is position:
+            # 보유 시간이 이미 지났으면 재시도 시각에 다시 청산, 아니면 원래 만기까지
+            self._arm_max_hold_timer(position, max(self.exit_retry_delay, position.deadline - time.time()))
+
     async def _manage_active_positions(self):
-        """활성 포지션 관리 (손절/익절)"""
-        current_time = datetime.now()
-        
+        """실시간 시세가 없는 포지션 손절/익절 확인 (REST 현재가)"""
         for stock_code, position in list(self.active_positions.items()):
+            if position.exiting or self.kiwoom_api.has_live_price(stock_code):
+                continue
             try:
-                # 현재가 조회
-                current_price = await self.kiwoom_api.get_current_price(stock_code)
-                if not current_price:
+                current_price = await self.kiwoom_api.get_current_price(stock_code, priority=APIPriority.STOP_LOSS)
+                if not current_price or position.exiting:
                     continue
-                
-                entry_price = position['entry_price']
-                strategy = position['strategy']
-                entry_time = position['entry_time']
-                
-                # 수익률 계산
-                profit_rate = ((current_price - entry_price) / entry_price) * 100
-                
-                # 보유 시간 계산
-                hold_minutes = (current_time - entry_time).total_seconds() / 60
-                
-                # 전략별 파라미터
-                params = self.scalping_strategies[strategy]
-                
-                # 손절/익절 조건 확인
-                should_sell = False
-                sell_reason = ""
-                
-                # 1. 수익 목표 달성
-                if profit_rate >= params['profit_target']:
-                    should_sell = True
-                    sell_reason = f"수익 목표 달성: {profit_rate:.2f}%"
-                
-                # 2. 손절선 도달
-                elif profit_rate <= -params['stop_loss']:
-                    should_sell = True
-                    sell_reason = f"손절선 도달: {profit_rate:.2f}%"
-                
-                # 3. 최대 보유 시간 초과
-                elif hold_minutes >= params['max_hold_minutes']:
-                    should_sell = True
-                    sell_reason = f"최대 보유 시간 초과: {hold_minutes:.1f}분"
-                
-                if should_sell:
-                    await self._execute_scalp_sell(stock_code, current_price, sell_reason)
-                    del self.active_positions[stock_code]
+                now = time.time()
+                if now < position.retry_at:
+                    continue
+                reason = position.exit_reason(current_price, now)
+                if reason:
+                    self._start_exit(position, current_price, reason, now)
                     
             except Exception as e:
                 logger.error(f"🚀 [SCALPING] 포지션 관리 오류 - {stock_code}: {e}")
     
-    async def _scan_scalping_opportunities(self):
-        """스캘핑 기회 탐색"""
+    async def _scan_scalping_opportunities(self, timeframe: Optional[str] = None):
+        """스캘핑 기회 탐색 (timeframe을 지정하면 그 봉 주기 전략만)"""
         try:
+            strategies = {
+                name: params for name, params in self.scalping_strategies.items()
+                if timeframe is None or params['timeframe'] == timeframe
+            }
             # 관심종목 목록 조회
             watchlist_stocks = await self._get_watchlist_stocks()
+            # 실시간 체결 구독 - 1/3/5분봉을 초 단위로 갱신된 실시간 집계 봉에서 읽음
+            await self.kiwoom_api.subscribe_realtime([stock.stock_code for stock in watchlist_stocks])
             
             for stock in watchlist_stocks:
                 if stock.stock_code in self.active_positions:
                     continue  # 이미 포지션이 있으면 스킵
                 
                 # 각 전략별로 신호 확인
-                for strategy_name, params in self.scalping_strategies.items():
+                for strategy_name, params in strategies.items():
                     signal = await self._check_scalping_signal(stock, strategy_name, params)
-                    if signal:
+                    # 같은 시각에 마감된 다른 주기 스케줄이 먼저 진입했을 수 있음
+                    if signal and stock.stock_code not in self.active_positions:
                         await self._execute_scalp_buy(stock, strategy_name, signal)
                         break  # 하나의 신호만 실행
                         
@@ -171,140 +382,37 @@ class ScalpingStrategyManager:
             logger.error(f"🚀 [SCALPING] 기회 탐색 오류: {e}")
     
     async def _check_scalping_signal(self, stock: WatchlistStock, strategy_name: str, params: Dict) -> Optional[Dict]:
-        """스캘핑 신호 확인"""
+        """스캘핑 신호 확인 (전략 클래스가 선언한 지표를 지표 저장소에서 계산해 전달)"""
         try:
-            # 차트 데이터 조회
-            chart_data = await self.kiwoom_api.get_stock_chart_data(
-                stock.stock_code, 
+            strategy = SCALP_STRATEGIES.get(strategy_name)
+            if strategy is None:
+                logger.warning(f"🚀 [SCALPING] 등록되지 않은 스캘핑 전략: {strategy_name}")
+                return None
+
+            # 차트 데이터 조회 - 1/3/5분봉 모두 캔들 저장소의 1분봉 한 스트림에서 만들어짐
+            chart_data = await self.kiwoom_api.get_cached_chart_data(
+                stock.stock_code,
                 params['timeframe'],
-                count=params.get('lookback_period', 20) + 10
+                max_age=self.chart_max_age,
+                priority=APIPriority.STRATEGY_SCAN,
+                max_bars=strategy.bars(params)
             )
             
             if not chart_data or len(chart_data) < params.get('lookback_period', 20):
                 return None
-            
-            df = pd.DataFrame(chart_data)
-            
-            # 전략별 신호 확인
-            if strategy_name == "MOMENTUM_SCALP":
-                return await self._check_momentum_scalp_signal(df, params)
-            elif strategy_name == "BOLLINGER_SCALP":
-                return await self._check_bollinger_scalp_signal(df, params)
-            elif strategy_name == "VOLUME_SCALP":
-                return await self._check_volume_scalp_signal(df, params)
+
+            # 같은 (종목, 주기, 지표, 파라미터)는 저장소에서 하나의 상태로 공유 - 새로 마감된 봉만 반영
+            indicators = {
+                alias: indicator_store.sync(stock.stock_code, params['timeframe'], kind, kind_params, chart_data)
+                for alias, (kind, kind_params) in strategy.indicators(params).items()
+            }
+            return strategy.check(chart_data, indicators, params)
                 
         except Exception as e:
             logger.error(f"🚀 [SCALPING] 신호 확인 오류 - {stock.stock_name}: {e}")
         
         return None
     
-    async def _check_momentum_scalp_signal(self, df: pd.DataFrame, params: Dict) -> Optional[Dict]:
-        """모멘텀 스캘핑 신호 확인"""
-        try:
-            # 최근 5개 봉 분석
-            recent_bars = df.tail(params['lookback_period'])
-            
-            # 1. 연속 상승 확인
-            price_changes = recent_bars['close'].pct_change() * 100
-            consecutive_ups = 0
-            for change in price_changes.tail(3):
-                if change > params['min_price_change']:
-                    consecutive_ups += 1
-                else:
-                    break
-            
-            if consecutive_ups < 2:  # 최소 2연속 상승
-                return None
-            
-            # 2. 거래량 급증 확인
-            avg_volume = recent_bars['volume'].mean()
-            current_volume = recent_bars['volume'].iloc[-1]
-            
-            if current_volume < avg_volume * params['volume_threshold']:
-                return None
-            
-            # 3. 현재가 확인
-            current_price = recent_bars['close'].iloc[-1]
-            
-            return {
-                'signal_type': 'BUY',
-                'entry_price': current_price,
-                'strategy': 'MOMENTUM_SCALP',
-                'confidence': min(consecutive_ups * 0.3, 1.0)
-            }
-            
-        except Exception as e:
-            logger.error(f"🚀 [SCALPING] 모멘텀 신호 확인 오류: {e}")
-            return None
-    
-    async def _check_bollinger_scalp_signal(self, df: pd.DataFrame, params: Dict) -> Optional[Dict]:
-        """볼린저밴드 스캘핑 신호 확인"""
-        try:
-            # 볼린저밴드 계산
-            df['ma'] = df['close'].rolling(window=params['ma_period']).mean()
-            df['std'] = df['close'].rolling(window=params['ma_period']).std()
-            df['upper'] = df['ma'] + (df['std'] * params['std_multiplier'])
-            df['lower'] = df['ma'] - (df['std'] * params['std_multiplier'])
-            
-            # RSI 계산
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=params['rsi_period']).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=params['rsi_period']).mean()
-            rs = gain / loss
-            df['rsi'] = 100 - (100 / (1 + rs))
-            
-            # 최근 데이터
-            current = df.iloc[-1]
-            prev = df.iloc[-2]
-            
-            # 하단밴드 터치 후 상승 + RSI 과매도
-            if (prev['close'] <= prev['lower'] and 
-                current['close'] > prev['close'] and 
-                current['rsi'] <= params['rsi_oversold']):
-                
-                return {
-                    'signal_type': 'BUY',
-                    'entry_price': current['close'],
-                    'strategy': 'BOLLINGER_SCALP',
-                    'confidence': 0.8
-                }
-            
-        except Exception as e:
-            logger.error(f"🚀 [SCALPING] 볼린저밴드 신호 확인 오류: {e}")
-            return None
-    
-    async def _check_volume_scalp_signal(self, df: pd.DataFrame, params: Dict) -> Optional[Dict]:
-        """거래량 스캘핑 신호 확인"""
-        try:
-            # 최근 데이터
-            recent_bars = df.tail(10)
-            
-            # 평균 거래량
-            avg_volume = recent_bars['volume'].mean()
-            current_volume = recent_bars['volume'].iloc[-1]
-            
-            # 거래량 급증 확인
-            if current_volume < avg_volume * params['volume_multiplier']:
-                return None
-            
-            # 가격 모멘텀 확인
-            price_change = ((recent_bars['close'].iloc[-1] - recent_bars['close'].iloc[-2]) / 
-                           recent_bars['close'].iloc[-2]) * 100
-            
-            if price_change < params['price_momentum']:
-                return None
-            
-            return {
-                'signal_type': 'BUY',
-                'entry_price': recent_bars['close'].iloc[-1],
-                'strategy': 'VOLUME_SCALP',
-                'confidence': min(current_volume / avg_volume / 10, 1.0)
-            }
-            
-        except Exception as e:
-            logger.error(f"🚀 [SCALPING] 거래량 신호 확인 오류: {e}")
-            return None
-    
     async def _execute_scalp_buy(self, stock: WatchlistStock, strategy_name: str, signal: Dict):
         """스캘핑 매수 실행"""
         try:
@@ -323,15 +431,28 @@ class ScalpingStrategyManager:
             )
             
             if order_result.get('success'):
-                # 포지션 등록
-                self.active_positions[stock.stock_code] = {
-                    'entry_time': datetime.now(),
-                    'entry_price': signal['entry_price'],
-                    'strategy': strategy_name,
-                    'quantity': quantity,
-                    'target': signal['entry_price'] * (1 + self.scalping_strategies[strategy_name]['profit_target'] / 100),
-                    'stop': signal['entry_price'] * (1 - self.scalping_strategies[strategy_name]['stop_loss'] / 100)
-                }
+                # 보유 중에는 실시간 체결로 현재가 확인 (REST 폴링 대신)
+                await self.kiwoom_api.subscribe_realtime([stock.stock_code])
+
+                # 포지션 등록 - 이후 체결마다 on_tick에서 청산 확인
+                params = self.scalping_strategies[strategy_name]
+                position = ScalpPosition(stock.stock_code, stock.stock_name, strategy_name, signal['entry_price'],
+                                         quantity, params)
+                self.active_positions[stock.stock_code] = position
+                self._arm_max_hold_timer(position)
+
+                # 재시작 후 복구할 수 있도록 positions 테이블에 저장 (StopLossManager 손절/익절 대상에서는 제외됨)
+                try:
+                    row = await self.stop_loss_manager.create_position(
+                        stock.stock_code, stock.stock_name, int(signal['entry_price']), quantity,
+                        buy_order_id=order_result.get('order_id', ''),
+                        stop_loss_rate=params['stop_loss'], take_profit_rate=params['profit_target'],
+                        stop_loss_price=position.stop, take_profit_price=position.target,
+                        position_type="SCALP", strategy_type=strategy_name,
+                        max_hold_until=_to_utc(position.deadline))
+                    position.position_id = row.id if row else None
+                except Exception as e:
+                    logger.error(f"🚀 [SCALPING] 포지션 저장 실패 - {stock.stock_name}: {e}")
                 
                 logger.info(f"🚀 [SCALPING] 매수 완료 - {stock.stock_name}({stock.stock_code}) "
                            f"전략: {strategy_name}, 수량: {quantity}, 가격: {signal['entry_price']}")
@@ -341,31 +462,60 @@ class ScalpingStrategyManager:
         except Exception as e:
             logger.error(f"🚀 [SCALPING] 매수 실행 오류 - {stock.stock_name}: {e}")
     
-    async def _execute_scalp_sell(self, stock_code: str, current_price: float, reason: str):
-        """스캘핑 매도 실행"""
+    async def _execute_scalp_sell(self, position: ScalpPosition, current_price: float, reason: str,
+                                  triggered_at: float) -> bool:
+        """스캘핑 매도 실행 (triggered_at: 청산 조건을 감지한 체결 수신 시각, epoch 초)"""
+        stock_code = position.stock_code
+        quantity = position.quantity
         try:
-            position = self.active_positions[stock_code]
-            quantity = position['quantity']
-            
             # 매도 주문
+            sent_at = time.time()
             order_result = await self.kiwoom_api.place_sell_order(
                 stock_code,
                 quantity,
                 current_price
             )
+            acked_at = time.time()
             
             if order_result.get('success'):
-                profit = (current_price - position['entry_price']) * quantity
-                profit_rate = ((current_price - position['entry_price']) / position['entry_price']) * 100
+                profit = (current_price - position.entry_price) * quantity
+                profit_rate = ((current_price - position.entry_price) / position.entry_price) * 100
+                hold_minutes = (acked_at - position.entry_time.timestamp()) / 60
+                tick_to_order_ms = (sent_at - triggered_at) * 1000
+                order_ms = (acked_at - sent_at) * 1000
+                self.recent_exits.append({
+                    "stock_code": stock_code,
+                    "strategy": position.strategy,
+                    "reason": reason,
+                    "entry_price": position.entry_price,
+                    "exit_price": current_price,
+                    "quantity": quantity,
+                    "profit": round(profit),
+                    "profit_rate": round(profit_rate, 2),
+                    "hold_minutes": round(hold_minutes, 2),
+                    "tick_to_order_ms": round(tick_to_order_ms, 1),
+                    "order_ms": round(order_ms, 1),
+                    "exited_at": datetime.fromtimestamp(acked_at).isoformat(),
+                })
                 
+                if position.position_id is not None:
+                    await self.stop_loss_manager.close_position(
+                        position.position_id, int(current_price), reason,
+                        f"{position.strategy} {EXIT_REASONS.get(reason, reason)}: {profit_rate:.2f}% (보유 {hold_minutes:.1f}분)",
+                        order_result.get('order_id', ''))
+
                 logger.info(f"🚀 [SCALPING] 매도 완료 - {stock_code} "
                            f"수량: {quantity}, 가격: {current_price}, "
-                           f"수익: {profit:,.0f}원 ({profit_rate:.2f}%), 사유: {reason}")
+                           f"수익: {profit:,.0f}원 ({profit_rate:.2f}%), "
+                           f"사유: {EXIT_REASONS.get(reason, reason)} (보유 {hold_minutes:.1f}분), "
+                           f"체결->주문 {tick_to_order_ms:.1f}ms, 주문 응답 {order_ms:.0f}ms")
+                return True
             else:
                 logger.error(f"🚀 [SCALPING] 매도 실패 - {stock_code}: {order_result.get('error')}")
                 
         except Exception as e:
             logger.error(f"🚀 [SCALPING] 매도 실행 오류 - {stock_code}: {e}")
+        return False
     
     async def _get_watchlist_stocks(self) -> List[WatchlistStock]:
         """관심종목 목록 조회"""
@@ -386,11 +536,29 @@ class ScalpingStrategyManager:
         """스캘핑 상태 조회"""
         return {
             "is_running": self.running,
+            "exit_monitoring": self.exit_monitoring,
             "active_positions": len(self.active_positions),
             "strategies": list(self.scalping_strategies.keys()),
-            "positions_detail": self.active_positions
+            "schedules": {
+                name: info for name, info in bar_scheduler.get_status_info()["schedules"].items()
+                if name.startswith("scalping_")
+            },
+            "positions_detail": {code: position.to_dict() for code, position in self.active_positions.items()},
+            "exit_latency": {
+                "tick_to_order_ms": self._latency_summary("tick_to_order_ms"),
+                "order_ms": self._latency_summary("order_ms"),
+            },
+            "recent_exits": list(self.recent_exits)[-20:],
         }
 
+    def _latency_summary(self, key: str) -> Dict:
+        values = sorted(record[key] for record in self.recent_exits)
+
+        def ms(q):
+            return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+        return {"count": len(values), "p50_ms": ms(0.5), "p95_ms": ms(0.95), "max_ms": ms(1.0)}
+
 # 전역 인스턴스
 scalping_manager = ScalpingStrategyManager()
 
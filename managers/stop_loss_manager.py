@@ -1,29 +1,62 @@
 import logging
 import asyncio
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
-from api.kiwoom_api import KiwoomAPI
-from core.models import Position, SellOrder, AutoTradeSettings, get_db
+from api.kiwoom_api import KiwoomAPI, get_kiwoom_api
+from api.api_rate_limiter import APIPriority
+from api.tick_store import Tick, tick_store
+from core.models import Position, SellOrder, AutoTradeSettings, PendingBuySignal, get_db
 from core.config import Config
 from utils.debug_tracer import debug_tracer
+from utils.trading_fees import evaluate_position
+from managers.trigger_book import trigger_book
 
 logger = logging.getLogger(__name__)
 
+
+def _account_int(value) -> int:
+    """계좌 TR 숫자 문자열 ('000012345', '+1,234', '-500') -> int"""
+    try:
+        return int(float(str(value).replace(',', '').replace('+', '') or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _account_code(stock_code: str) -> str:
+    """계좌 TR 종목코드 앞의 'A' 제거"""
+    return stock_code[1:] if stock_code.startswith('A') else stock_code
+
+
 class StopLossManager:
     """손절/익절 모니터링 매니저"""
     
     def __init__(self):
-        self.kiwoom_api = KiwoomAPI()
         self.is_running = False
         self.monitoring_interval = 120  # 120초(2분)마다 모니터링 (API 제한 고려)
         self.auto_trade_settings = None
+        self.sell_retry_delay = 5  # 매도 실패 후 같은 포지션 트리거를 다시 감시하기까지 (초)
+        self._trigger_tasks = set()
+        self.account_cache_ttl = 30  # 계좌 조회 결과 재사용 시간 (현재가 일괄 갱신 -> 보유 종목 대조) (초)
+        self._account_prices: Dict[str, int] = {}
+        self._account_prices_at = 0.0
+        self.revaluation_stats: Dict = {}
         
+    @property
+    def kiwoom_api(self) -> KiwoomAPI:
+        """프로세스 공용 KiwoomAPI (set_kiwoom_api로 교체 가능)"""
+        return get_kiwoom_api()
+
     async def start_monitoring(self):
         """손절/익절 모니터링 시작"""
         logger.info("🛡️ [STOP_LOSS] 손절/익절 모니터링 시작")
         self.is_running = True
+        # 손절/익절가 색인 - 이후 체결마다 넘은 트리거만 확인 (managers/trigger_book.py)
+        trigger_book.load()
+        tick_store.add_listener(self.on_tick)
         
         try:
             while self.is_running:
@@ -43,6 +76,7 @@ class StopLossManager:
         except Exception as e:
             logger.error(f"🛡️ [STOP_LOSS] 모니터링 중 오류: {e}")
         finally:
+            tick_store.remove_listener(self.on_tick)
             logger.info("🛡️ [STOP_LOSS] 손절/익절 모니터링 종료")
     
     async def stop_monitoring(self):
@@ -58,6 +92,7 @@ class StopLossManager:
                 settings = session.query(AutoTradeSettings).first()
                 if settings:
                     self.auto_trade_settings = settings
+                    trigger_book.set_rates(settings.stop_loss_rate, settings.take_profit_rate)
                     logger.debug(f"🛡️ [STOP_LOSS] 자동매매 설정 로드: 활성화={settings.is_enabled}, 손절={settings.stop_loss_rate}%, 익절={settings.take_profit_rate}%")
                 else:
                     logger.warning("🛡️ [STOP_LOSS] 자동매매 설정이 없습니다.")
@@ -65,64 +100,149 @@ class StopLossManager:
         except Exception as e:
             logger.error(f"🛡️ [STOP_LOSS] 자동매매 설정 로드 오류: {e}")
     
+    def on_tick(self, tick: Tick):
+        """실시간 체결 수신 - 이 가격이 넘은 손절/익절 트리거만 처리 (포지션 수와 무관)"""
+        if not self.is_running or not (self.auto_trade_settings and self.auto_trade_settings.is_enabled):
+            return
+        for position_id, reason in trigger_book.crossed(tick.stock_code, tick.price):
+            self._fire_trigger(position_id, tick.price, reason)
+
+    def _fire_trigger(self, position_id: int, price: int, reason: str) -> asyncio.Task:
+        """트리거 발동 - 매도가 끝날 때까지 색인에서 빼 두어 같은 포지션 중복 주문 방지"""
+        trigger_book.suspend(position_id)
+        task = asyncio.create_task(self._sell_triggered(position_id, price, reason))
+        self._trigger_tasks.add(task)
+        task.add_done_callback(self._trigger_tasks.discard)
+        return task
+
+    async def _sell_triggered(self, position_id: int, price: int, reason: str):
+        """발동한 포지션을 수수료 포함 수익률로 다시 확인한 뒤 매도 (실패 시 sell_retry_delay 후 재감시)"""
+        sold = False
+        try:
+            position = None
+            for db in get_db():
+                position = db.query(Position).filter(Position.id == position_id).first()
+                break
+            if not position or position.status != "HOLDING":
+                return
+
+            actual_buy_amount = position.actual_buy_amount or position.buy_amount
+            evaluation_amount, profit_loss, profit_loss_rate = evaluate_position(
+                price, position.buy_quantity, actual_buy_amount)
+            await self._update_position_price(position.id, price, int(profit_loss), profit_loss_rate)
+
+            if reason == "STOP_LOSS" and profit_loss_rate <= -self.auto_trade_settings.stop_loss_rate:
+                sell_reason_detail = f"손절: {profit_loss_rate:.2f}% (기준: -{self.auto_trade_settings.stop_loss_rate}%)"
+                logger.warning(f"🛡️ [STOP_LOSS] 손절 신호 - {position.stock_name}: {profit_loss_rate:.2f}% ({price:,}원)")
+            elif reason == "TAKE_PROFIT" and profit_loss_rate >= self.auto_trade_settings.take_profit_rate:
+                sell_reason_detail = f"익절: {profit_loss_rate:.2f}% (기준: {self.auto_trade_settings.take_profit_rate}%)"
+                logger.info(f"🛡️ [STOP_LOSS] 익절 신호 - {position.stock_name}: {profit_loss_rate:.2f}% ({price:,}원)")
+            else:
+                # 트리거 가격 경계의 원 단위 절사 오차 - 매도하지 않고 다시 감시
+                trigger_book.resume(position_id)
+                return
+
+            sold = await self._execute_sell_order(position, price, reason, sell_reason_detail)
+        except Exception as e:
+            logger.error(f"🛡️ [STOP_LOSS] 트리거 매도 처리 오류 (ID: {position_id}): {e}")
+        finally:
+            # 성공하면 포지션 상태 변경 커밋으로 트리거가 삭제되므로 resume은 무시됨
+            if not sold and trigger_book.get(position_id) is not None:
+                asyncio.get_running_loop().call_later(self.sell_retry_delay, trigger_book.resume, position_id)
+
     @debug_tracer.trace_async(component="STOP_LOSS")
     async def _monitor_positions(self):
-        """포지션 모니터링"""
+        """포지션 모니터링 - 종목별 현재가 1회로 트리거 북 평가 (실시간 체결이 없는 종목 보완)"""
         try:
-            debug_tracer.log_checkpoint("포지션 조회 시작", "STOP_LOSS")
-            
-            # HOLDING 상태인 포지션들 조회
-            positions = await self._get_active_positions()
-            
-            debug_tracer.log_checkpoint(f"조회된 포지션 개수: {len(positions)}", "STOP_LOSS")
+            if not trigger_book.loaded:
+                trigger_book.load()
+            stock_codes = trigger_book.stock_codes()
+            debug_tracer.log_checkpoint(f"트리거 종목 수: {len(stock_codes)}", "STOP_LOSS")
             
-            if not positions:
+            if not stock_codes:
                 logger.debug("🛡️ [STOP_LOSS] 모니터링할 포지션이 없습니다.")
                 return
             
-            logger.info(f"🛡️ [STOP_LOSS] {len(positions)}개 포지션 모니터링 중...")
+            # 실제 계좌에 없는 종목은 제외 (조회 실패 시 전체 평가)
+            actual_holdings = await self._get_actual_holdings()
+            if actual_holdings:
+                stock_codes = [code for code in stock_codes if code in actual_holdings]
             
-            for idx, position in enumerate(positions, 1):
+            logger.info(f"🛡️ [STOP_LOSS] {len(trigger_book)}개 포지션 / {len(stock_codes)}개 종목 트리거 평가 중...")
+            
+            tasks = []
+            for stock_code in stock_codes:
                 try:
-                    debug_tracer.log_checkpoint(f"[{idx}/{len(positions)}] 포지션 점검: {position.stock_name}({position.stock_code})", "STOP_LOSS")
-                    await self._check_position_stop_loss(position)
+                    # 실시간 구독 종목은 시세 저장소, 아니면 REST (api_rate_limiter가 STOP_LOSS 우선순위로 조절)
+                    current_price = await self._get_current_price(stock_code)
+                    if not current_price:
+                        continue
+                    for position_id, reason in trigger_book.crossed(stock_code, current_price):
+                        tasks.append(self._fire_trigger(position_id, current_price, reason))
                 except Exception as e:
-                    logger.error(f"🛡️ [STOP_LOSS] 포지션 모니터링 오류 (ID: {position.id}): {e}")
-                
-                # API 제한을 고려한 대기 (키움 제한: 1분당 20회)
-                debug_tracer.log_checkpoint(f"[{idx}/{len(positions)}] 포지션 점검 완료, 5초 대기", "STOP_LOSS")
-                await asyncio.sleep(5)
+                    logger.error(f"🛡️ [STOP_LOSS] 종목 트리거 평가 오류 ({stock_code}): {e}")
+            
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
                 
         except Exception as e:
             logger.error(f"🛡️ [STOP_LOSS] 포지션 모니터링 중 오류: {e}")
     
+    async def _get_account_prices(self) -> Dict[str, int]:
+        """계좌 조회 1회로 보유 종목 -> 현재가 (kt00004, 실패 시 ka10085)
+
+        account_cache_ttl초 이내에 조회한 결과는 재사용 (현재가 일괄 갱신과 보유 종목 대조가 같은 조회를 공유)
+        """
+        if self._account_prices_at and time.monotonic() - self._account_prices_at <= self.account_cache_ttl:
+            return self._account_prices
+
+        account_number = Config.KIWOOM_MOCK_ACCOUNT_NUMBER if Config.KIWOOM_USE_MOCK_ACCOUNT else Config.KIWOOM_ACCOUNT_NUMBER
+        prices: Dict[str, int] = {}
+        try:
+            account_balance = await self.kiwoom_api.get_account_balance(account_number, priority=APIPriority.STOP_LOSS)
+            if account_balance and 'stk_acnt_evlt_prst' in account_balance:
+                for holding in account_balance['stk_acnt_evlt_prst']:
+                    prices[_account_code(holding.get('stk_cd', ''))] = abs(_account_int(holding.get('cur_pr', '0')))
+            else:
+                logger.debug(f"🛡️ [STOP_LOSS] 계좌 조회 결과 없음 (API 제한 또는 보유 종목 없음)")
+        except Exception as e:
+            logger.debug(f"🛡️ [STOP_LOSS] 계좌 조회 실패 (계속 진행): {e}")
+
+        if not prices:
+            # 계좌수익률(ka10085)도 보유 종목별 현재가를 한 번에 반환 (cur_prc는 부호 포함)
+            try:
+                account_profit = await self.kiwoom_api.get_account_profit(priority=APIPriority.STOP_LOSS)
+                for holding in account_profit.get("positions", []):
+                    if holding.get("quantity", 0) > 0:
+                        prices[_account_code(holding.get("stock_code", ""))] = abs(holding.get("current_price_delta", 0))
+            except Exception as e:
+                logger.debug(f"🛡️ [STOP_LOSS] 계좌수익률 조회 실패 (계속 진행): {e}")
+
+        prices.pop('', None)
+        if prices:
+            self._account_prices = prices
+            self._account_prices_at = time.monotonic()
+            logger.debug(f"🛡️ [STOP_LOSS] 실제 보유 종목: {len(prices)}개 - {set(prices)}")
+        return prices
+
+    async def _get_actual_holdings(self) -> set:
+        """실제 계좌 보유 종목 코드 (조회 실패 시 빈 집합)"""
+        return set(await self._get_account_prices())
+    
     async def _get_active_positions(self) -> List[Position]:
         """활성 포지션 조회 (실제 보유 종목과 대조)"""
         positions = []
         for db in get_db():
             try:
                 session: Session = db
+                # 스캘핑 포지션은 ScalpingStrategyManager가 실시간으로 청산
                 db_positions = session.query(Position).filter(
-                    Position.status == "HOLDING"
+                    Position.status == "HOLDING",
+                    Position.position_type != "SCALP"
                 ).all()
                 
                 # 실제 계좌 보유 종목 조회 (선택적 - 실패해도 계속 진행)
-                account_number = Config.KIWOOM_MOCK_ACCOUNT_NUMBER if Config.KIWOOM_USE_MOCK_ACCOUNT else Config.KIWOOM_ACCOUNT_NUMBER
-                account_balance = None
-                actual_holdings = set()
-                
-                try:
-                    account_balance = await self.kiwoom_api.get_account_balance(account_number)
-                    
-                    # 실제 보유 종목 코드 목록
-                    if account_balance and 'stk_acnt_evlt_prst' in account_balance:
-                        for holding in account_balance['stk_acnt_evlt_prst']:
-                            actual_holdings.add(holding.get('stk_cd', ''))
-                        logger.debug(f"🛡️ [STOP_LOSS] 실제 보유 종목: {len(actual_holdings)}개 - {actual_holdings}")
-                    else:
-                        logger.debug(f"🛡️ [STOP_LOSS] 계좌 조회 결과 없음 (API 제한 또는 보유 종목 없음)")
-                except Exception as e:
-                    logger.debug(f"🛡️ [STOP_LOSS] 계좌 조회 실패 (계속 진행): {e}")
+                actual_holdings = await self._get_actual_holdings()
                 
                 # 계좌 조회 성공 시에만 검증, 실패 시에는 DB의 모든 HOLDING Position 사용
                 if actual_holdings:
@@ -156,6 +276,96 @@ class StopLossManager:
     
     async def _update_all_positions_price(self):
         """모든 HOLDING 상태 Position의 현재가만 업데이트 (손절/익절 판단 없음)"""
+        if Config.STOP_LOSS_BULK_REVALUATION:
+            await self._revalue_positions_bulk()
+        else:
+            await self._update_positions_price_per_symbol()
+
+    async def _revalue_positions_bulk(self):
+        """계좌 조회 1회로 HOLDING 포지션 전체 평가 후 UPDATE 한 번으로 저장
+
+        현재가 우선순위: 실시간 체결(구독 중) > 계좌 조회(kt00004/ka10085) > 개별 현재가 조회(응답에 없는 종목만)
+        수익률은 계좌의 손익 대신 evaluate_position으로 다시 계산 (손절/익절 판단과 같은 기준)
+        """
+        started = time.perf_counter()
+        try:
+            rows = []
+            for db in get_db():
+                rows = db.query(Position.id, Position.stock_code, Position.stock_name, Position.buy_quantity,
+                                Position.buy_amount, Position.actual_buy_amount).filter(Position.status == "HOLDING").all()
+                break
+            
+            if not rows:
+                logger.debug("🛡️ [STOP_LOSS] 업데이트할 포지션이 없습니다.")
+                return
+            
+            stock_codes = sorted({row.stock_code for row in rows})
+            # 보유 종목 실시간 체결 구독 (이후 현재가는 REST 호출 없이 시세 저장소에서 조회)
+            await self.kiwoom_api.subscribe_realtime(stock_codes)
+            account_prices = await self._get_account_prices()
+            
+            prices: Dict[str, int] = {}
+            sources = {"realtime": 0, "account": 0, "per_symbol": 0}
+            missing = []
+            for stock_code in stock_codes:
+                if self.kiwoom_api.has_live_price(stock_code):
+                    prices[stock_code] = tick_store.get_price(stock_code)
+                    sources["realtime"] += 1
+                elif account_prices.get(stock_code):
+                    prices[stock_code] = account_prices[stock_code]
+                    sources["account"] += 1
+                else:
+                    missing.append(stock_code)
+            
+            for stock_code in missing:
+                current_price = await self._get_current_price(stock_code)
+                if current_price and current_price > 0:
+                    prices[stock_code] = current_price
+                    sources["per_symbol"] += 1
+            
+            now = datetime.utcnow()
+            values = []
+            for row in rows:
+                current_price = prices.get(row.stock_code)
+                if not current_price:
+                    logger.warning(f"🛡️ [STOP_LOSS] 현재가 조회 실패 - {row.stock_name}")
+                    continue
+                # 평가금액/손익/수익률 - 키움 공식 (모의투자/실계좌 구분, utils/trading_fees.py)
+                evaluation_amount, profit_loss, profit_loss_rate = evaluate_position(
+                    current_price, row.buy_quantity, row.actual_buy_amount or row.buy_amount)
+                values.append({
+                    "id": row.id,
+                    "current_price": current_price,
+                    "current_profit_loss": int(profit_loss),
+                    "current_profit_loss_rate": profit_loss_rate,
+                    "last_monitored": now,
+                })
+            
+            if values:
+                # 기본키 기준 일괄 UPDATE (현재가/손익 컬럼만 - 트리거 북 동기화 대상 컬럼은 건드리지 않음)
+                for db in get_db():
+                    db.execute(update(Position), values)
+                    db.commit()
+                    break
+            
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+            self.revaluation_stats = {
+                "positions": len(rows),
+                "updated": len(values),
+                "stocks": len(stock_codes),
+                **sources,
+                "elapsed_ms": elapsed_ms,
+                "at": now.isoformat(),
+            }
+            logger.info(f"🛡️ [STOP_LOSS] {len(values)}/{len(rows)}개 포지션 일괄 평가 완료 - 실시간 {sources['realtime']}, "
+                        f"계좌 {sources['account']}, 개별 조회 {sources['per_symbol']}개 종목 ({elapsed_ms}ms)")
+        except Exception as e:
+            logger.error(f"🛡️ [STOP_LOSS] 포지션 일괄 평가 중 오류: {e}")
+            import traceback
+            logger.error(f"🛡️ [STOP_LOSS] 스택 트레이스: {traceback.format_exc()}")
+
+    async def _update_positions_price_per_symbol(self):
+        """HOLDING 포지션마다 현재가를 조회해 업데이트 (STOP_LOSS_BULK_REVALUATION=false)"""
         try:
             for db in get_db():
                 session: Session = db
@@ -166,6 +376,9 @@ class StopLossManager:
                     return
                 
                 logger.info(f"🛡️ [STOP_LOSS] {len(positions)}개 포지션 현재가 업데이트 중...")
+
+                # 보유 종목 실시간 체결 구독 (이후 현재가는 REST 호출 없이 시세 저장소에서 조회)
+                await self.kiwoom_api.subscribe_realtime([p.stock_code for p in positions])
                 
                 for idx, position in enumerate(positions, 1):
                     try:
@@ -180,34 +393,9 @@ class StopLossManager:
                             # 총 투자비용 (매입금액 + 매수 수수료)
                             total_investment = actual_buy_amount
                             
-                            # 키움 공식 적용 (모의투자/실계좌 구분)
-                            import math
-                            from core.config import Config
-                            
-                            is_mock_account = Config.KIWOOM_USE_MOCK_ACCOUNT
-                            
-                            if is_mock_account:
-                                # 모의투자 계좌: 매도 수수료 0.35%, 제세금 총 0.557% (기본 0.23% + 추가)
-                                sell_fee = math.floor(current_price * position.buy_quantity * 0.0035)  # 0.35%
-                                # 제세금: 기본 0.23% + 추가(제세금1+2+3+농특세) = 총 0.557%
-                                tax = math.floor(current_price * position.buy_quantity * 0.00557)  # 0.557%
-                            else:
-                                # 실계좌: 매도 수수료 0.015% (10원미만 절사), 제세금 0.05% + 0.15%
-                                sell_fee_base = current_price * position.buy_quantity * 0.00015
-                                sell_fee = math.floor(sell_fee_base / 10) * 10  # 10원미만 절사
-                                
-                                tax_005 = math.floor(current_price * position.buy_quantity * 0.0005)  # 0.05%, 원미만 절사
-                                tax_015 = math.floor(current_price * position.buy_quantity * 0.0015)  # 0.15%, 원미만 절사
-                                tax = tax_005 + tax_015
-                            
-                            # 평가금액 = 현재가 × 수량 - 매도 수수료 - 제세금
-                            evaluation_amount = current_price * position.buy_quantity - sell_fee - tax
-                            
-                            # 손익 = 평가금액 - 매입금액
-                            profit_loss = evaluation_amount - actual_buy_amount
-                            
-                            # 수익률 = 손익 / 매입금액 × 100
-                            profit_loss_rate = (profit_loss / actual_buy_amount) * 100 if actual_buy_amount > 0 else 0
+                            # 평가금액/손익/수익률 - 키움 공식 (모의투자/실계좌 구분, utils/trading_fees.py)
+                            evaluation_amount, profit_loss, profit_loss_rate = evaluate_position(
+                                current_price, position.buy_quantity, actual_buy_amount)
                             
                             # DB 업데이트
                             position.current_price = current_price
@@ -219,10 +407,7 @@ class StopLossManager:
                             logger.debug(f"🛡️ [STOP_LOSS] 현재가 업데이트 - {position.stock_name}: {current_price:,}원 ({profit_loss_rate:+.2f}%, 실제매입가: {actual_buy_price:,.0f}원)")
                         else:
                             logger.warning(f"🛡️ [STOP_LOSS] 현재가 조회 실패 - {position.stock_name}")
-                        
-                        # API 제한 고려 (5초 대기)
-                        if idx < len(positions):
-                            await asyncio.sleep(5)
+
                     
                     except Exception as e:
                         logger.error(f"🛡️ [STOP_LOSS] 포지션 현재가 업데이트 오류 (ID: {position.id}): {e}")
@@ -236,92 +421,11 @@ class StopLossManager:
             import traceback
             logger.error(f"🛡️ [STOP_LOSS] 스택 트레이스: {traceback.format_exc()}")
     
-    @debug_tracer.trace_async(component="STOP_LOSS")
-    async def _check_position_stop_loss(self, position: Position):
-        """개별 포지션 손절/익절 확인"""
-        try:
-            # 현재가 조회
-            debug_tracer.log_checkpoint(f"현재가 조회: {position.stock_code}", "STOP_LOSS")
-            current_price = await self._get_current_price(position.stock_code)
-            debug_tracer.log_checkpoint(f"현재가: {current_price:,}원" if current_price else "현재가 조회 실패", "STOP_LOSS")
-            
-            if not current_price:
-                logger.warning(f"🛡️ [STOP_LOSS] 현재가 조회 실패 - {position.stock_name}")
-                return
-            
-            # 키움 방식 수익률 계산 (매도 수수료 + 거래세 포함)
-            # actual_buy_amount가 있으면 사용, 없으면 buy_amount 사용
-            actual_buy_amount = getattr(position, 'actual_buy_amount', None) or position.buy_amount
-            
-            # 총 투자비용 (매입금액 + 매수 수수료)
-            total_investment = actual_buy_amount
-            
-            # 키움 공식 적용 (모의투자/실계좌 구분)
-            import math
-            from core.config import Config
-            
-            is_mock_account = Config.KIWOOM_USE_MOCK_ACCOUNT
-            
-            if is_mock_account:
-                # 모의투자 계좌: 매도 수수료 0.35%, 제세금 총 0.557% (기본 0.23% + 추가)
-                sell_fee = math.floor(current_price * position.buy_quantity * 0.0035)  # 0.35%
-                # 제세금: 기본 0.23% + 추가(제세금1+2+3+농특세) = 총 0.557%
-                tax = math.floor(current_price * position.buy_quantity * 0.00557)  # 0.557%
-            else:
-                # 실계좌: 매도 수수료 0.015% (10원미만 절사), 제세금 0.05% + 0.15%
-                sell_fee_base = current_price * position.buy_quantity * 0.00015
-                sell_fee = math.floor(sell_fee_base / 10) * 10  # 10원미만 절사
-                
-                tax_005 = math.floor(current_price * position.buy_quantity * 0.0005)  # 0.05%, 원미만 절사
-                tax_015 = math.floor(current_price * position.buy_quantity * 0.0015)  # 0.15%, 원미만 절사
-                tax = tax_005 + tax_015
-            
-            # 평가금액 = 현재가 × 수량 - 매도 수수료 - 제세금
-            evaluation_amount = current_price * position.buy_quantity - sell_fee - tax
-            
-            # 손익 = 평가금액 - 매입금액
-            profit_loss = evaluation_amount - actual_buy_amount
-            
-            # 수익률 = 손익 / 매입금액 × 100
-            profit_loss_rate = (profit_loss / actual_buy_amount) * 100 if actual_buy_amount > 0 else 0
-            
-            actual_buy_price = actual_buy_amount / position.buy_quantity if position.buy_quantity > 0 else position.buy_price
-            debug_tracer.log_checkpoint(f"손익: {profit_loss:+,}원 ({profit_loss_rate:+.2f}%), 매수가: {position.buy_price:,}원, 실제매입가: {actual_buy_price:,.0f}원, 총투자비용: {total_investment:,}원", "STOP_LOSS")
-            
-            # 포지션 정보 업데이트
-            await self._update_position_price(position.id, current_price, profit_loss, profit_loss_rate)
-            
-            # 손절/익절 확인
-            should_sell = False
-            sell_reason = ""
-            sell_reason_detail = ""
-            
-            # 손절 확인
-            if profit_loss_rate <= -self.auto_trade_settings.stop_loss_rate:
-                should_sell = True
-                sell_reason = "STOP_LOSS"
-                sell_reason_detail = f"손절: {profit_loss_rate:.2f}% (기준: -{self.auto_trade_settings.stop_loss_rate}%)"
-                logger.warning(f"🛡️ [STOP_LOSS] 손절 신호 - {position.stock_name}: {profit_loss_rate:.2f}%")
-            
-            # 익절 확인
-            elif profit_loss_rate >= self.auto_trade_settings.take_profit_rate:
-                should_sell = True
-                sell_reason = "TAKE_PROFIT"
-                sell_reason_detail = f"익절: {profit_loss_rate:.2f}% (기준: {self.auto_trade_settings.take_profit_rate}%)"
-                logger.info(f"🛡️ [STOP_LOSS] 익절 신호 - {position.stock_name}: {profit_loss_rate:.2f}%")
-            
-            # 매도 실행
-            if should_sell:
-                await self._execute_sell_order(position, current_price, sell_reason, sell_reason_detail)
-            
-        except Exception as e:
-            logger.error(f"🛡️ [STOP_LOSS] 포지션 확인 오류 - {position.stock_name}: {e}")
-    
     async def _get_current_price(self, stock_code: str) -> Optional[int]:
         """현재가 조회"""
         try:
             logger.debug(f"🛡️ [STOP_LOSS] 현재가 조회 시도: {stock_code}")
-            current_price = await self.kiwoom_api.get_current_price(stock_code)
+            current_price = await self.kiwoom_api.get_current_price(stock_code, priority=APIPriority.STOP_LOSS)
             if current_price:
                 logger.debug(f"🛡️ [STOP_LOSS] 현재가 조회 성공: {stock_code} = {current_price:,}원")
             else:
@@ -350,8 +454,8 @@ class StopLossManager:
         except Exception as e:
             logger.error(f"🛡️ [STOP_LOSS] 포지션 업데이트 오류: {e}")
     
-    async def _execute_sell_order(self, position: Position, sell_price: int, sell_reason: str, sell_reason_detail: str):
-        """매도 주문 실행"""
+    async def _execute_sell_order(self, position: Position, sell_price: int, sell_reason: str, sell_reason_detail: str) -> bool:
+        """매도 주문 실행 (주문 접수 성공 여부 반환)"""
         try:
             logger.info(f"🛡️ [STOP_LOSS] 매도 주문 실행 - {position.stock_name}: {sell_reason}")
             
@@ -374,6 +478,7 @@ class StopLossManager:
                 
                 # 포지션 상태 업데이트
                 await self._update_position_status(position.id, sell_reason, sell_price)
+                return True
                 
             else:
                 error_msg = result.get("error", "알 수 없는 오류")
@@ -382,6 +487,7 @@ class StopLossManager:
                 
         except Exception as e:
             logger.error(f"🛡️ [STOP_LOSS] 매도 주문 실행 오류 - {position.stock_name}: {e}")
+        return False
     
     async def _create_sell_order(self, position: Position, sell_price: int, sell_reason: str, sell_reason_detail: str) -> SellOrder:
         """매도 주문 생성"""
@@ -404,6 +510,9 @@ class StopLossManager:
                 )
                 session.add(sell_order)
                 session.commit()
+                # 세션 종료 후에도 id를 쓸 수 있도록 분리
+                session.refresh(sell_order)
+                session.expunge(sell_order)
                 break
             
             return sell_order
@@ -445,40 +554,97 @@ class StopLossManager:
         except Exception as e:
             logger.error(f"🛡️ [STOP_LOSS] 포지션 상태 업데이트 오류: {e}")
     
-    async def create_position_from_buy_signal(self, signal_id: int, buy_price: int, buy_quantity: int, buy_order_id: str = ""):
-        """매수 신호로부터 포지션 생성"""
+    async def create_position(self, stock_code: str, stock_name: str, buy_price: int, buy_quantity: int,
+                              buy_order_id: str = "", stop_loss_rate: Optional[float] = None,
+                              take_profit_rate: Optional[float] = None, stop_loss_price: Optional[int] = None,
+                              take_profit_price: Optional[int] = None, position_type: str = "NORMAL",
+                              strategy_type: Optional[str] = None, max_hold_until: Optional[datetime] = None,
+                              condition_id: Optional[int] = None, signal_id: Optional[int] = None) -> Position:
+        """포지션 생성 (매수 신호/스캘핑 공통 저장 경로) - 세션에서 분리된 Position 반환"""
         try:
-            # 매수 신호 정보 조회
-            signal = None
+            if stop_loss_rate is None:
+                stop_loss_rate = self.auto_trade_settings.stop_loss_rate if self.auto_trade_settings else 5.0
+            if take_profit_rate is None:
+                take_profit_rate = self.auto_trade_settings.take_profit_rate if self.auto_trade_settings else 10.0
+            position = None
             for db in get_db():
                 session: Session = db
-                from models import PendingBuySignal
-                signal = session.query(PendingBuySignal).filter(PendingBuySignal.id == signal_id).first()
-                if signal:
-                    # 포지션 생성
-                    position = Position(
-                        stock_code=signal.stock_code,
-                        stock_name=signal.stock_name,
-                        buy_price=buy_price,
-                        buy_quantity=buy_quantity,
-                        buy_amount=buy_price * buy_quantity,
-                        buy_order_id=buy_order_id,
-                        stop_loss_rate=self.auto_trade_settings.stop_loss_rate if self.auto_trade_settings else 5.0,
-                        take_profit_rate=self.auto_trade_settings.take_profit_rate if self.auto_trade_settings else 10.0,
-                        condition_id=signal.condition_id,
-                        signal_id=signal.id,
-                        status="HOLDING"
-                    )
-                    session.add(position)
-                    session.commit()
-                    
-                    logger.info(f"🛡️ [STOP_LOSS] 포지션 생성 - {signal.stock_name}: {buy_quantity}주 @ {buy_price:,}원")
-                    break
-            
+                position = Position(
+                    stock_code=stock_code,
+                    stock_name=stock_name,
+                    buy_price=buy_price,
+                    buy_quantity=buy_quantity,
+                    buy_amount=buy_price * buy_quantity,
+                    buy_order_id=buy_order_id,
+                    stop_loss_rate=stop_loss_rate,
+                    take_profit_rate=take_profit_rate,
+                    stop_loss_price=stop_loss_price,
+                    take_profit_price=take_profit_price,
+                    position_type=position_type,
+                    strategy_type=strategy_type,
+                    max_hold_until=max_hold_until,
+                    condition_id=condition_id,
+                    signal_id=signal_id,
+                    status="HOLDING"
+                )
+                session.add(position)
+                session.commit()
+                session.refresh(position)
+                session.expunge(position)
+                logger.info(f"🛡️ [STOP_LOSS] 포지션 생성 ({position_type}) - {stock_name}: {buy_quantity}주 @ {buy_price:,}원")
+                break
             return position
         except Exception as e:
             logger.error(f"🛡️ [STOP_LOSS] 포지션 생성 오류: {e}")
             raise
+
+    async def create_position_from_buy_signal(self, signal_id: int, buy_price: int, buy_quantity: int, buy_order_id: str = ""):
+        """매수 신호로부터 포지션 생성"""
+        signal = None
+        for db in get_db():
+            session: Session = db
+            signal = session.query(PendingBuySignal).filter(PendingBuySignal.id == signal_id).first()
+            break
+        if not signal:
+            return None
+        return await self.create_position(signal.stock_code, signal.stock_name, buy_price, buy_quantity,
+                                          buy_order_id=buy_order_id, condition_id=signal.condition_id,
+                                          signal_id=signal.id)
+
+    async def close_position(self, position_id: int, sell_price: int, sell_reason: str,
+                             sell_reason_detail: str = "", sell_order_id: str = ""):
+        """외부에서 청산 주문을 낸 포지션 기록 (매도 주문 ORDERED + 포지션 상태, 한 트랜잭션)"""
+        try:
+            for db in get_db():
+                session: Session = db
+                position = session.query(Position).filter(Position.id == position_id).first()
+                if not position:
+                    logger.warning(f"🛡️ [STOP_LOSS] 청산 기록할 포지션 없음 - ID: {position_id}")
+                    break
+                now = datetime.utcnow()
+                session.add(SellOrder(
+                    position_id=position.id,
+                    stock_code=position.stock_code,
+                    stock_name=position.stock_name,
+                    sell_price=sell_price,
+                    sell_quantity=position.buy_quantity,
+                    sell_amount=sell_price * position.buy_quantity,
+                    sell_order_id=sell_order_id or None,
+                    sell_reason=sell_reason,
+                    sell_reason_detail=sell_reason_detail,
+                    profit_loss=(sell_price - position.buy_price) * position.buy_quantity,
+                    profit_loss_rate=(sell_price - position.buy_price) / position.buy_price * 100,
+                    status="ORDERED",
+                    ordered_at=now
+                ))
+                position.status = sell_reason
+                position.sell_time = now
+                position.current_price = sell_price
+                session.commit()
+                logger.info(f"🛡️ [STOP_LOSS] 포지션 청산 기록 - {position.stock_name}: {sell_reason}")
+                break
+        except Exception as e:
+            logger.error(f"🛡️ [STOP_LOSS] 포지션 청산 기록 오류: {e}")
     
     async def get_monitoring_status(self) -> Dict:
         """모니터링 상태 조회"""
@@ -503,6 +669,9 @@ class StopLossManager:
                 "stop_loss_rate": self.auto_trade_settings.stop_loss_rate if self.auto_trade_settings else 0,
                 "take_profit_rate": self.auto_trade_settings.take_profit_rate if self.auto_trade_settings else 0,
                 "active_positions_count": len(active_positions),
+                "trigger_book": trigger_book.get_status_info(),
+                "bulk_revaluation": Config.STOP_LOSS_BULK_REVALUATION,
+                "last_revaluation": self.revaluation_stats,
                 "recent_sell_orders": [
                     {
                         "id": order.id,
@@ -0,0 +1,570 @@
+"""
+전략 클래스
+전략 타입마다 필요한 지표(의존 노드)를 선언하고 신호 판정만 구현합니다.
+지표 계산은 엔진이 맡아 같은 노드를 선언한 전략끼리 결과를 공유합니다.
+
+- PanelStrategy: StrategyManager 전략 - StrategyPanel이 종목 x 봉 묶음 단위로 노드 계산 (managers/indicator_nodes.py),
+  백테스트는 같은 판정을 한 종목의 모든 봉에 대해 한 번에 계산 (bar_signals, managers/backtest.py)
+- ScalpStrategy: ScalpingStrategyManager 전략 - 종목/주기별 증분 지표 저장소에서 노드 계산 (api/indicator_store.py)
+"""
+
+import functools
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from api.candles import CandleSeries
+from managers.indicator_nodes import BarArrays, PanelGroup, lag, money_flow, rolling
+from utils.indicators import Indicator
+
+# 의존 지표 선언: 별칭 -> (노드/지표 이름, 파라미터)
+IndicatorSpec = Dict[str, Tuple[str, Dict]]
+
+_sample_std = functools.partial(np.std, ddof=1)
+
+
+class PanelStrategy:
+    """패널 전략 기본 클래스
+
+    width: 마지막 두 봉의 지표에 영향을 주는 최근 봉 수 (패널이 이 길이 이상으로 잘라 계산)
+    indicators: 의존 노드 선언 -> 엔진이 계산해 signals()의 values로 전달
+    signals: (행 번호, 신호) 생성 - 신호 형식은 StrategyManager._calculate_*_signal과 같음
+    bar_signals: 봉마다 그 봉까지의 데이터로 signals()와 같은 판정을 한 (매수, 매도) bool 배열
+    """
+
+    strategy_type = ""
+    defaults: Dict = {}
+
+    def resolve(self, params: Dict) -> Dict:
+        return {**self.defaults, **(params or {})}
+
+    def width(self, params: Dict) -> int:
+        raise NotImplementedError
+
+    def indicators(self, params: Dict) -> IndicatorSpec:
+        return {}
+
+    def signals(self, panel, g: PanelGroup, values: Dict[str, np.ndarray],
+                params: Dict) -> Iterable[Tuple[int, Dict]]:
+        raise NotImplementedError
+
+    def bar_signals(self, bars: BarArrays, params: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        raise NotImplementedError
+
+    @staticmethod
+    def crossings(buy: np.ndarray, sell: np.ndarray) -> List[Tuple[int, str]]:
+        """매수 우선으로 신호가 난 행 목록"""
+        return ([(int(i), "BUY") for i in np.flatnonzero(buy)]
+                + [(int(i), "SELL") for i in np.flatnonzero(sell & ~buy)])
+
+
+# 전략 타입 -> 전략 인스턴스
+STRATEGIES: Dict[str, PanelStrategy] = {}
+
+
+def register_strategy(cls):
+    """패널 전략 등록 데코레이터"""
+    STRATEGIES[cls.strategy_type] = cls()
+    return cls
+
+
+@register_strategy
+class MomentumStrategy(PanelStrategy):
+    strategy_type = "MOMENTUM"
+    defaults = {"momentum_period": 10, "trend_confirmation_days": 3}
+
+    def width(self, params):
+        return params["momentum_period"] + 2
+
+    def indicators(self, params):
+        period = params["momentum_period"]
+        return {
+            "price": ("PRICE", {"offset": 0}),
+            "prev_price": ("PRICE", {"offset": 1}),
+            "base": ("PRICE", {"offset": period}),
+            "prev_base": ("PRICE", {"offset": period + 1}),
+        }
+
+    def signals(self, panel, g, values, params):
+        period = params["momentum_period"]
+        enough = g.lengths >= period + params["trend_confirmation_days"]
+        current = values["price"] - values["base"]
+        prev = values["prev_price"] - values["prev_base"]
+
+        buy = enough & (current > 0) & (prev <= 0)
+        sell = enough & (current < 0) & (prev >= 0)
+        for row, signal_type in self.crossings(buy, sell):
+            yield row, {
+                "signal_type": signal_type,
+                "signal_value": current[row],
+                "additional_data": {
+                    "momentum_period": period,
+                    "current_price": g.close[row, -1],
+                    "prev_price": values["base"][row],
+                },
+            }
+
+    def bar_signals(self, bars, params):
+        period = params["momentum_period"]
+        enough = bars.lengths >= period + params["trend_confirmation_days"]
+        current = bars.close - lag(bars.close, period)
+        prev = lag(current, 1)
+
+        buy = enough & (current > 0) & (prev <= 0)
+        sell = enough & (current < 0) & (prev >= 0)
+        return buy, sell & ~buy
+
+
+@register_strategy
+class DisparityStrategy(PanelStrategy):
+    strategy_type = "DISPARITY"
+    defaults = {"ma_period": 20, "buy_threshold": 95.0, "sell_threshold": 105.0}
+
+    def width(self, params):
+        return params["ma_period"] + 1
+
+    def indicators(self, params):
+        period = params["ma_period"]
+        return {
+            "price": ("PRICE", {"offset": 0}),
+            "prev_price": ("PRICE", {"offset": 1}),
+            "ma": ("SMA", {"period": period}),
+            "prev_ma": ("SMA", {"period": period, "offset": 1}),
+        }
+
+    def signals(self, panel, g, values, params):
+        buy_threshold = params["buy_threshold"]
+        sell_threshold = params["sell_threshold"]
+        enough = g.lengths >= params["ma_period"]
+        ma = values["ma"]
+        current = values["price"] / ma * 100
+        prev = values["prev_price"] / values["prev_ma"] * 100
+
+        buy = enough & (current < buy_threshold) & (prev >= buy_threshold)
+        sell = enough & (current > sell_threshold) & (prev <= sell_threshold)
+        for row, signal_type in self.crossings(buy, sell):
+            yield row, {
+                "signal_type": signal_type,
+                "signal_value": current[row],
+                "additional_data": {
+                    "ma_period": params["ma_period"],
+                    "current_price": g.close[row, -1],
+                    "ma_value": ma[row],
+                    "buy_threshold": buy_threshold,
+                    "sell_threshold": sell_threshold,
+                },
+            }
+
+    def bar_signals(self, bars, params):
+        buy_threshold = params["buy_threshold"]
+        sell_threshold = params["sell_threshold"]
+        enough = bars.lengths >= params["ma_period"]
+        current = bars.close / rolling(bars.close, params["ma_period"], np.mean) * 100
+        prev = lag(current, 1)
+
+        buy = enough & (current < buy_threshold) & (prev >= buy_threshold)
+        sell = enough & (current > sell_threshold) & (prev <= sell_threshold)
+        return buy, sell & ~buy
+
+
+@register_strategy
+class BollingerStrategy(PanelStrategy):
+    strategy_type = "BOLLINGER"
+    defaults = {"ma_period": 20, "std_multiplier": 2.0, "confirmation_days": 3}
+
+    def width(self, params):
+        return params["ma_period"]
+
+    def indicators(self, params):
+        return {
+            "price": ("PRICE", {"offset": 0}),
+            "ma": ("SMA", {"period": params["ma_period"]}),
+            "std": ("STD", {"period": params["ma_period"]}),
+        }
+
+    def signals(self, panel, g, values, params):
+        std_multiplier = params["std_multiplier"]
+        enough = g.lengths >= params["ma_period"] + params["confirmation_days"]
+        ma, price = values["ma"], values["price"]
+        upper = ma + values["std"] * std_multiplier
+        lower = ma - values["std"] * std_multiplier
+
+        buy = enough & (price <= lower)
+        sell = enough & (price >= upper)
+        for row, signal_type in self.crossings(buy, sell):
+            yield row, {
+                "signal_type": signal_type,
+                "signal_value": price[row],
+                "additional_data": {
+                    "ma_period": params["ma_period"],
+                    "std_multiplier": std_multiplier,
+                    "current_price": price[row],
+                    "upper_band": upper[row],
+                    "lower_band": lower[row],
+                    "ma_value": ma[row],
+                },
+            }
+
+    def bar_signals(self, bars, params):
+        period = params["ma_period"]
+        enough = bars.lengths >= period + params["confirmation_days"]
+        ma = rolling(bars.close, period, np.mean)
+        band = rolling(bars.close, period, _sample_std) * params["std_multiplier"]
+
+        buy = enough & (bars.close <= ma - band)
+        sell = enough & (bars.close >= ma + band)
+        return buy, sell & ~buy
+
+
+@register_strategy
+class RSIStrategy(PanelStrategy):
+    """RSI (가중평균거래량 필터)"""
+
+    strategy_type = "RSI"
+    defaults = {"rsi_period": 14, "oversold_threshold": 30.0, "overbought_threshold": 70.0,
+                "volume_period": 20, "volume_threshold": 1.5, "use_volume_filter": True}
+
+    def width(self, params):
+        return max(params["rsi_period"] + 2, params["volume_period"])
+
+    def indicators(self, params):
+        period = params["rsi_period"]
+        return {
+            "volume": ("PRICE", {"source": "volume"}),
+            "rsi": ("RSI", {"period": period}),
+            "prev_rsi": ("RSI", {"period": period, "offset": 1}),
+            "weighted_avg_volume": ("WEIGHTED_VOLUME", {"period": params["volume_period"]}),
+        }
+
+    def signals(self, panel, g, values, params):
+        oversold = params["oversold_threshold"]
+        overbought = params["overbought_threshold"]
+        volume_threshold = params["volume_threshold"]
+        use_volume_filter = params["use_volume_filter"]
+        enough = g.lengths >= params["rsi_period"] + 1
+        current, prev = values["rsi"], values["prev_rsi"]
+
+        volume = values["volume"]
+        weighted_avg_volume = values["weighted_avg_volume"]
+        volume_ratio = np.where(weighted_avg_volume > 0, volume / weighted_avg_volume, 0.0)
+        volume_ok = volume_ratio >= volume_threshold if use_volume_filter else np.ones(len(g.codes), dtype=bool)
+
+        buy = enough & (current > oversold) & (prev <= oversold) & volume_ok
+        sell = enough & (current < overbought) & (prev >= overbought) & volume_ok
+        for row, signal_type in self.crossings(buy, sell):
+            yield row, {
+                "signal_type": signal_type,
+                "signal_value": current[row],
+                "additional_data": {
+                    "rsi_period": params["rsi_period"],
+                    "current_price": g.close[row, -1],
+                    "oversold_threshold": oversold,
+                    "overbought_threshold": overbought,
+                    "current_volume": volume[row],
+                    "weighted_avg_volume": weighted_avg_volume[row],
+                    "volume_ratio": volume_ratio[row],
+                    "volume_threshold": volume_threshold,
+                    "use_volume_filter": use_volume_filter,
+                },
+            }
+
+    def bar_signals(self, bars, params):
+        period = params["rsi_period"]
+        oversold = params["oversold_threshold"]
+        overbought = params["overbought_threshold"]
+        enough = bars.lengths >= period + 1
+
+        delta = np.diff(bars.close, prepend=bars.close[:1])
+        gain = rolling(np.where(delta > 0, delta, 0.0), period, np.mean)
+        loss = rolling(np.where(delta < 0, -delta, 0.0), period, np.mean)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            current = 100 - (100 / (1 + gain / loss))
+        prev = lag(current, 1)
+
+        if params["use_volume_filter"]:
+            # 가중평균거래량 (봉 t까지 최근 volume_period개, 데이터가 모자라면 0)
+            volume_period = params["volume_period"]
+            weighted_avg_volume = np.zeros(len(bars))
+            if len(bars) >= volume_period:
+                weights = np.arange(1, volume_period + 1, dtype=float)
+                weighted_avg_volume[volume_period - 1:] = sliding_window_view(bars.volume, volume_period) @ (weights / weights.sum())
+            with np.errstate(divide="ignore", invalid="ignore"):
+                volume_ratio = np.where(weighted_avg_volume > 0, bars.volume / weighted_avg_volume, 0.0)
+            volume_ok = volume_ratio >= params["volume_threshold"]
+        else:
+            volume_ok = np.ones(len(bars), dtype=bool)
+
+        buy = enough & (current > oversold) & (prev <= oversold) & volume_ok
+        sell = enough & (current < overbought) & (prev >= overbought) & volume_ok
+        return buy, sell & ~buy
+
+
+@register_strategy
+class IchimokuStrategy(PanelStrategy):
+    strategy_type = "ICHIMOKU"
+    defaults = {"conversion_period": 9, "base_period": 26, "span_b_period": 52, "displacement": 26}
+
+    def width(self, params):
+        longest = max(params["conversion_period"], params["base_period"], params["span_b_period"])
+        return longest + params["displacement"] + 1
+
+    def indicators(self, params):
+        conversion_period = params["conversion_period"]
+        base_period = params["base_period"]
+        displacement = params["displacement"]
+        # 선행스팬은 displacement개 봉 앞선 값
+        return {
+            "price": ("PRICE", {"offset": 0}),
+            "conversion": ("MIDPOINT", {"period": conversion_period}),
+            "base": ("MIDPOINT", {"period": base_period}),
+            "prev_conversion": ("MIDPOINT", {"period": conversion_period, "offset": 1}),
+            "prev_base": ("MIDPOINT", {"period": base_period, "offset": 1}),
+            "lead_conversion": ("MIDPOINT", {"period": conversion_period, "offset": displacement}),
+            "lead_base": ("MIDPOINT", {"period": base_period, "offset": displacement}),
+            "span_b": ("MIDPOINT", {"period": params["span_b_period"], "offset": displacement}),
+        }
+
+    def signals(self, panel, g, values, params):
+        enough = g.lengths >= max(params["span_b_period"], params["displacement"]) + 2
+        conversion, base = values["conversion"], values["base"]
+        span_a = (values["lead_conversion"] + values["lead_base"]) / 2
+        span_b = values["span_b"]
+
+        price = values["price"]
+        has_cloud = ~np.isnan(span_a) & ~np.isnan(span_b)
+        cloud_top = np.where(has_cloud, np.fmax(span_a, span_b), price)
+        cloud_bottom = np.where(has_cloud, np.fmin(span_a, span_b), price)
+        above_cloud = price > cloud_top
+        below_cloud = price < cloud_bottom
+
+        buy = enough & (conversion > base) & (values["prev_conversion"] <= values["prev_base"]) & above_cloud
+        sell = enough & (conversion < base) & (values["prev_conversion"] >= values["prev_base"]) & below_cloud
+        for row, signal_type in self.crossings(buy, sell):
+            yield row, {
+                "signal_type": signal_type,
+                "signal_value": conversion[row] - base[row],
+                "additional_data": {
+                    "conversion_period": params["conversion_period"],
+                    "base_period": params["base_period"],
+                    "current_price": price[row],
+                    "conversion_line": conversion[row],
+                    "base_line": base[row],
+                    "span_a": span_a[row],
+                    "span_b": span_b[row],
+                    "above_cloud": bool(above_cloud[row]),
+                    "below_cloud": bool(below_cloud[row]),
+                },
+            }
+
+    def bar_signals(self, bars, params):
+        displacement = params["displacement"]
+        enough = bars.lengths >= max(params["span_b_period"], displacement) + 2
+
+        def midpoint(period):
+            return (rolling(bars.high, period, np.max) + rolling(bars.low, period, np.min)) / 2
+
+        conversion = midpoint(params["conversion_period"])
+        base = midpoint(params["base_period"])
+        span_a = lag((conversion + base) / 2, displacement)
+        span_b = lag(midpoint(params["span_b_period"]), displacement)
+        prev_conversion, prev_base = lag(conversion, 1), lag(base, 1)
+
+        price = bars.close
+        has_cloud = ~np.isnan(span_a) & ~np.isnan(span_b)
+        above_cloud = price > np.where(has_cloud, np.fmax(span_a, span_b), price)
+        below_cloud = price < np.where(has_cloud, np.fmin(span_a, span_b), price)
+
+        buy = enough & (conversion > base) & (prev_conversion <= prev_base) & above_cloud
+        sell = enough & (conversion < base) & (prev_conversion >= prev_base) & below_cloud
+        return buy, sell & ~buy
+
+
+@register_strategy
+class ChaikinStrategy(PanelStrategy):
+    """차이킨 오실레이터"""
+
+    strategy_type = "CHAIKIN"
+    defaults = {"short_period": 3, "long_period": 10, "buy_threshold": 0.0, "sell_threshold": 0.0}
+
+    def width(self, params):
+        return params["long_period"] + 1
+
+    def indicators(self, params):
+        short_period, long_period = params["short_period"], params["long_period"]
+        return {
+            "short": ("SMA", {"source": "AD", "period": short_period}),
+            "long": ("SMA", {"source": "AD", "period": long_period}),
+            "prev_short": ("SMA", {"source": "AD", "period": short_period, "offset": 1}),
+            "prev_long": ("SMA", {"source": "AD", "period": long_period, "offset": 1}),
+        }
+
+    def signals(self, panel, g, values, params):
+        buy_threshold = params["buy_threshold"]
+        sell_threshold = params["sell_threshold"]
+        enough = g.lengths >= params["long_period"] + 1
+        current = values["short"] - values["long"]
+        prev = values["prev_short"] - values["prev_long"]
+
+        buy = enough & (current > buy_threshold) & (prev <= buy_threshold)
+        sell = enough & (current < sell_threshold) & (prev >= sell_threshold)
+        for row, signal_type in self.crossings(buy, sell):
+            yield row, {
+                "signal_type": signal_type,
+                "signal_value": current[row],
+                "additional_data": {
+                    "short_period": params["short_period"],
+                    "long_period": params["long_period"],
+                    "current_price": g.close[row, -1],
+                    "buy_threshold": buy_threshold,
+                    "sell_threshold": sell_threshold,
+                    "ad_value": self._ad_value(panel.series.get(g.codes[row])),
+                },
+            }
+
+    def bar_signals(self, bars, params):
+        buy_threshold = params["buy_threshold"]
+        sell_threshold = params["sell_threshold"]
+        enough = bars.lengths >= params["long_period"] + 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ad = np.cumsum(money_flow(bars.high, bars.low, bars.close, bars.volume))
+        current = rolling(ad, params["short_period"], np.mean) - rolling(ad, params["long_period"], np.mean)
+        prev = lag(current, 1)
+
+        buy = enough & (current > buy_threshold) & (prev <= buy_threshold)
+        sell = enough & (current < sell_threshold) & (prev >= sell_threshold)
+        return buy, sell & ~buy
+
+    @staticmethod
+    def _ad_value(s: Optional[CandleSeries]) -> Optional[float]:
+        """전체 이력 기준 AD 라인 마지막 값 (신호가 난 종목만 계산)"""
+        if s is None:
+            return None
+        columns = [np.asarray(a, dtype=np.float64) for a in (s.high, s.low, s.close, s.volume)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return float(money_flow(*columns).sum())
+
+
+class ScalpStrategy:
+    """스캘핑 전략 기본 클래스
+
+    bars: 조회할 최근 봉 수
+    indicators: 의존 증분 지표 선언 (utils.indicators 종류) -> 엔진이 지표 저장소에서 마감 봉까지 반영해 전달
+    check: 신호 판정 (형성 중인 마지막 봉 값이 필요하면 지표의 peek() 사용)
+    """
+
+    strategy_name = ""
+
+    def bars(self, params: Dict) -> int:
+        return params.get("lookback_period", 20) + 10
+
+    def indicators(self, params: Dict) -> IndicatorSpec:
+        return {}
+
+    def check(self, series: CandleSeries, indicators: Dict[str, Indicator], params: Dict) -> Optional[Dict]:
+        raise NotImplementedError
+
+    @staticmethod
+    def last_bar(series: CandleSeries) -> Tuple[int, int, int, int, int]:
+        return (int(series.open[-1]), int(series.high[-1]), int(series.low[-1]),
+                int(series.close[-1]), int(series.volume[-1]))
+
+
+# 스캘핑 전략 이름 -> 전략 인스턴스
+SCALP_STRATEGIES: Dict[str, ScalpStrategy] = {}
+
+
+def register_scalp_strategy(cls):
+    """스캘핑 전략 등록 데코레이터"""
+    SCALP_STRATEGIES[cls.strategy_name] = cls()
+    return cls
+
+
+@register_scalp_strategy
+class MomentumScalp(ScalpStrategy):
+    strategy_name = "MOMENTUM_SCALP"
+
+    def check(self, series, indicators, params):
+        recent = series.tail(params["lookback_period"])
+        close = recent.close.astype(np.float64)
+
+        # 1. 연속 상승 확인 (최근 3개 변동률)
+        price_changes = np.diff(close) / close[:-1] * 100
+        consecutive_ups = 0
+        for change in price_changes[-3:]:
+            if change > params["min_price_change"]:
+                consecutive_ups += 1
+            else:
+                break
+        if consecutive_ups < 2:  # 최소 2연속 상승
+            return None
+
+        # 2. 거래량 급증 확인
+        avg_volume = recent.volume.mean()
+        if recent.volume[-1] < avg_volume * params["volume_threshold"]:
+            return None
+
+        return {
+            "signal_type": "BUY",
+            "entry_price": int(recent.close[-1]),
+            "strategy": self.strategy_name,
+            "confidence": min(consecutive_ups * 0.3, 1.0),
+        }
+
+
+@register_scalp_strategy
+class BollingerScalp(ScalpStrategy):
+    """볼린저밴드 하단 터치 후 반등 + RSI 과매도"""
+
+    strategy_name = "BOLLINGER_SCALP"
+
+    def indicators(self, params):
+        return {
+            "bands": ("BOLLINGER", {"period": params["ma_period"], "multiplier": params["std_multiplier"]}),
+            "rsi": ("RSI", {"period": params["rsi_period"], "method": "sma"}),
+        }
+
+    def check(self, series, indicators, params):
+        if len(series) < 2:
+            return None
+        bands = indicators["bands"].value            # 직전(마감) 봉 기준
+        rsi = indicators["rsi"].peek(*self.last_bar(series))  # 형성 중인 봉 포함
+        if bands is None or rsi is None:
+            return None
+
+        prev_close = int(series.close[-2])
+        current_close = int(series.close[-1])
+        if prev_close <= bands[2] and current_close > prev_close and rsi <= params["rsi_oversold"]:
+            return {
+                "signal_type": "BUY",
+                "entry_price": current_close,
+                "strategy": self.strategy_name,
+                "confidence": 0.8,
+            }
+        return None
+
+
+@register_scalp_strategy
+class VolumeScalp(ScalpStrategy):
+    strategy_name = "VOLUME_SCALP"
+
+    def check(self, series, indicators, params):
+        recent = series.tail(10)
+
+        # 거래량 급증 확인
+        avg_volume = recent.volume.mean()
+        current_volume = int(recent.volume[-1])
+        if current_volume < avg_volume * params["volume_multiplier"]:
+            return None
+
+        # 가격 모멘텀 확인
+        price_change = (int(recent.close[-1]) - int(recent.close[-2])) / int(recent.close[-2]) * 100
+        if price_change < params["price_momentum"]:
+            return None
+
+        return {
+            "signal_type": "BUY",
+            "entry_price": int(recent.close[-1]),
+            "strategy": self.strategy_name,
+            "confidence": min(current_volume / avg_volume / 10, 1.0),
+        }
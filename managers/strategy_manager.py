@@ -1,19 +1,26 @@
 """
 전략 매매 관리자
 관심종목 기반으로 모멘텀, 이격도, 볼린저밴드, RSI 전략을 실행하고 신호를 생성합니다.
+평가는 5분봉이 마감될 때마다 실행합니다 (utils/bar_scheduler.py).
 """
 
 import asyncio
+import json
 import logging
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Tuple, Any
 import pandas as pd
 import numpy as np
 from sqlalchemy.orm import Session
 
 from core.models import get_db, WatchlistStock, TradingStrategy, StrategySignal, PendingBuySignal
-from api.kiwoom_api import KiwoomAPI
+from api.kiwoom_api import KiwoomAPI, get_kiwoom_api
+from api.api_rate_limiter import APIPriority, api_rate_limiter
+from api.candle_store import candle_store
 from managers.signal_manager import SignalManager, SignalType, SignalStatus
+from managers.strategy_panel import StrategyPanel, evaluate_panel
+from utils.bar_scheduler import bar_scheduler
+from utils.executor import ExecutorBusy, cpu_pool
 from core.config import Config
 
 logger = logging.getLogger(__name__)
@@ -26,11 +33,12 @@ class StrategyManager:
         self.running = False
         self.monitoring_task = None
         self.start_time: Optional[datetime] = None  # 모니터링 시작 시간
-        self.kiwoom_api = KiwoomAPI()
         self.signal_manager = SignalManager()
         
-        # 차트 데이터 캐싱 (중복 호출 방지)
-        self.chart_cache = {}
+        # 스캔 봉 주기 - 이 주기의 봉이 마감될 때마다 평가 (utils/bar_scheduler.py)
+        self.timeframe = "5M"
+
+        # 차트 데이터 캐시 유효 시간 (캐시 자체는 KiwoomAPI가 공유 관리)
         self.cache_duration = 600  # 10분 캐시 (API 호출 감소) 유지
         
         # 전략별 파라미터 기본값 (5분봉 기준)
@@ -71,6 +79,11 @@ class StrategyManager:
             }
         }
 
+    @property
+    def kiwoom_api(self) -> KiwoomAPI:
+        """프로세스 공용 KiwoomAPI (set_kiwoom_api로 교체 가능)"""
+        return get_kiwoom_api()
+
     def _to_native_json(self, value: Any) -> Any:
         """pandas/Datetime 등을 JSON 직렬화 가능한 기본 파이썬 타입으로 변환"""
         # 딕셔너리
@@ -111,11 +124,12 @@ class StrategyManager:
         self.running = True
         self.start_time = datetime.now()  # 시작 시간 기록
         
-        # 키움 API 연결
+        # 키움 API 연결 (lifespan에서 연결된 세션이 있으면 그대로 사용)
         await self.kiwoom_api.connect()
         
-        # 모니터링 태스크 시작
-        self.monitoring_task = asyncio.create_task(self._monitoring_loop())
+        # 봉 마감마다 평가 (장 밖에는 다음 장 첫 봉 마감까지 대기)
+        self.monitoring_task = bar_scheduler.schedule("strategy_scan", self.timeframe, self._scan_on_bar_close,
+                                                      prefetch=self._prefetch_watchlist)
     
     async def stop_strategy_monitoring(self):
         """전략 모니터링 중지"""
@@ -135,63 +149,80 @@ class StrategyManager:
             except asyncio.CancelledError:
                 pass
         
-        # 키움 API 연결 종료
-        await self.kiwoom_api.disconnect()
+        # 전략 스캔용 실시간 구독만 해제 (공유 연결과 다른 모듈의 구독은 유지)
+        await self.kiwoom_api.release_realtime("strategy")
     
-    async def _monitoring_loop(self):
-        """전략 모니터링 루프 (1분 주기)"""
-        from datetime import datetime
-        
-        while self.running:
-            try:
-                start_time = datetime.now()
-                logger.info(f"🎯 [STRATEGY_MANAGER] 전략 모니터링 실행 시작 - {start_time.strftime('%H:%M:%S')}")
-                
-                # 활성화된 전략들 조회
-                strategies = await self._get_active_strategies()
-                if not strategies:
-                    logger.info("🎯 [STRATEGY_MANAGER] 활성화된 전략이 없습니다")
-                    await asyncio.sleep(60)  # 1분 대기
-                    continue
-                
-                # 관심종목 조회
-                watchlist = await self._get_active_watchlist()
-                if not watchlist:
-                    logger.info("🎯 [STRATEGY_MANAGER] 활성화된 관심종목이 없습니다")
-                    await asyncio.sleep(60)  # 1분 대기
-                    continue
-                
-                # 각 전략별로 관심종목 스캔 (순차 실행으로 API 제한 방지)
-                for i, strategy in enumerate(strategies):
-                    if not self.running:  # 중지 요청 확인
-                        logger.info("🎯 [STRATEGY_MANAGER] 모니터링 중지 요청으로 루프 종료")
-                        return
-                        
-                    logger.info(f"🎯 [STRATEGY_MANAGER] 전략 {i+1}/{len(strategies)} 실행: {strategy.strategy_name}")
-                    await self._scan_strategy_signals(strategy, watchlist)
-                    
-                    # 전략 간 대기 (마지막 전략 제외)
-                    if i < len(strategies) - 1:
-                        logger.debug(f"🎯 [STRATEGY_MANAGER] 다음 전략 실행 전 3초 대기...")
-                        await asyncio.sleep(3)
-                
-                end_time = datetime.now()
-                duration = (end_time - start_time).total_seconds()
-                logger.info(f"🎯 [STRATEGY_MANAGER] 전략 모니터링 완료 - {len(strategies)}개 전략, {len(watchlist)}개 종목 (소요시간: {duration:.1f}초)")
-                from datetime import timedelta
-                logger.info(f"🎯 [STRATEGY_MANAGER] 다음 실행까지 60초 대기... 다음 실행 예정: {(end_time + timedelta(seconds=60)).strftime('%H:%M:%S')}")
-                
-            except Exception as e:
-                logger.error(f"🎯 [STRATEGY_MANAGER] 모니터링 루프 오류: {e}")
-                import traceback
-                logger.error(f"🎯 [STRATEGY_MANAGER] 스택 트레이스: {traceback.format_exc()}")
-            
-            # 1분 대기 (중지 요청 확인하면서)
-            for i in range(60):
-                if not self.running:
-                    logger.info("🎯 [STRATEGY_MANAGER] 대기 중 중지 요청으로 루프 종료")
+    async def _prefetch_watchlist(self, bar_close: datetime):
+        """봉 마감 직전 준비 - 관심종목 실시간 구독, 저장된 캔들이 없는 종목은 남은 호출 예산 안에서 미리 채움
+
+        이력 전체를 받아야 하는 종목을 마감 전에 채워 두면 마감 직후에는 증분 조회만 남는다.
+        """
+        watchlist = await self._get_active_watchlist()
+        stock_codes = [stock.stock_code for stock in watchlist]
+        if not stock_codes:
+            return
+        await self.kiwoom_api.subscribe_realtime(stock_codes, owner="strategy")
+
+        cold = [code for code in stock_codes if candle_store.last_timestamp(code, "1M") is None]
+        if not cold:
+            return
+        budget = api_rate_limiter.calls_available((bar_close - datetime.now()).total_seconds())
+        for stock_code in cold[:budget]:
+            await self.kiwoom_api.get_cached_chart_data(stock_code, self.timeframe, max_age=self.cache_duration,
+                                                        priority=APIPriority.STRATEGY_SCAN)
+        logger.info(f"🎯 [STRATEGY_MANAGER] 봉 마감 전 캔들 선조회 {min(len(cold), budget)}/{len(cold)}개 종목 "
+                    f"(마감 {bar_close.strftime('%H:%M')})")
+
+    async def _scan_on_bar_close(self, bar_close: datetime):
+        """봉 마감 시 전략 평가 (bar_scheduler가 self.timeframe 봉이 마감될 때마다 호출)"""
+        try:
+            start_time = datetime.now()
+            logger.info(f"🎯 [STRATEGY_MANAGER] 전략 모니터링 실행 시작 - {bar_close.strftime('%H:%M')} 봉 마감 "
+                        f"(지연 {(start_time - bar_close).total_seconds():.1f}초)")
+
+            # 활성화된 전략들 조회
+            strategies = await self._get_active_strategies()
+            if not strategies:
+                logger.info("🎯 [STRATEGY_MANAGER] 활성화된 전략이 없습니다")
+                return
+
+            # 관심종목 조회
+            watchlist = await self._get_active_watchlist()
+            if not watchlist:
+                logger.info("🎯 [STRATEGY_MANAGER] 활성화된 관심종목이 없습니다")
+                return
+
+            # 관심종목 실시간 체결 구독 - 이후 차트는 실시간 집계 봉으로 갱신되어 REST 호출이 없음
+            await self.kiwoom_api.subscribe_realtime([stock.stock_code for stock in watchlist], owner="strategy")
+
+            # 종목별 캔들은 봉 마감당 한 번만 조회 (실제 API 호출만 호출 허가 대기)
+            panel = await StrategyPanel.load(self.kiwoom_api, [stock.stock_code for stock in watchlist],
+                                             period=self.timeframe, max_age=self.cache_duration,
+                                             priority=APIPriority.STRATEGY_SCAN)
+            stocks = {stock.stock_code: stock for stock in watchlist}
+
+            # 전략 전체를 한 패널에서 벡터 연산으로 평가 (공통 지표 노드는 한 번만 계산) - 작업 풀 프로세스에서 실행
+            items = [(strategy.strategy_type, self._parse_parameters(strategy)) for strategy in strategies]
+            results, node_stats = await self._evaluate_panel(panel, items)
+            logger.info(f"🧮 [STRATEGY_PANEL] 지표 노드 계산 {node_stats['computed']}개, 재사용 {node_stats['reused']}회")
+
+            for i, (strategy, signals) in enumerate(zip(strategies, results)):
+                if not self.running:  # 중지 요청 확인
+                    logger.info("🎯 [STRATEGY_MANAGER] 모니터링 중지 요청으로 평가 종료")
                     return
-                await asyncio.sleep(1)
+
+                logger.info(f"🎯 [STRATEGY_MANAGER] 전략 {i+1}/{len(strategies)} 결과 처리: {strategy.strategy_name}")
+                await self._scan_strategy_signals(strategy, signals, stocks)
+                # 봉 마감 -> 전략 신호 처리 완료까지의 지연 (전략별)
+                bar_scheduler.record_latency(strategy.strategy_type, bar_close)
+
+            duration = (datetime.now() - start_time).total_seconds()
+            logger.info(f"🎯 [STRATEGY_MANAGER] 전략 모니터링 완료 - {len(strategies)}개 전략, {len(watchlist)}개 종목 (소요시간: {duration:.1f}초)")
+
+        except Exception as e:
+            logger.error(f"🎯 [STRATEGY_MANAGER] 봉 마감 평가 오류: {e}")
+            import traceback
+            logger.error(f"🎯 [STRATEGY_MANAGER] 스택 트레이스: {traceback.format_exc()}")
     
     async def _get_active_strategies(self) -> List[TradingStrategy]:
         """활성화된 전략들 조회"""
@@ -219,433 +250,47 @@ class StrategyManager:
             logger.error(f"🎯 [STRATEGY_MANAGER] 관심종목 조회 오류: {e}")
             return []
     
-    async def _scan_strategy_signals(self, strategy: TradingStrategy, watchlist: List[WatchlistStock]):
-        """특정 전략으로 관심종목 스캔"""
+    async def _evaluate_panel(self, panel: StrategyPanel,
+                              items: List[Tuple[str, Dict]]) -> Tuple[List[Dict[str, Dict]], Dict[str, int]]:
+        """패널 평가를 작업 풀에서 실행 (풀이 가득 찬 경우에만 루프에서 직접 계산)"""
         try:
-            logger.info(f"🎯 [STRATEGY_MANAGER] {strategy.strategy_name} 전략 스캔 시작 - 대상 종목: {len(watchlist)}개")
-            
-            signal_count = 0
-            for i, stock in enumerate(watchlist, 1):
+            return await cpu_pool.submit(evaluate_panel, panel.series, items)
+        except ExecutorBusy as e:
+            logger.warning(f"🎯 [STRATEGY_MANAGER] 작업 풀 사용 불가 - 직접 계산: {e}")
+            return evaluate_panel(panel.series, items)
+
+    async def _scan_strategy_signals(self, strategy: TradingStrategy, signals: Dict[str, Dict],
+                                     stocks: Dict[str, WatchlistStock]):
+        """패널 평가 결과로 전략 신호 생성"""
+        try:
+            for stock_code, signal_result in signals.items():
+                stock = stocks[stock_code]
+                logger.info(f"🚀 [{strategy.strategy_type}_SIGNAL] {stock_code} {signal_result['signal_type']} 신호 발생! "
+                            f"값: {float(signal_result['signal_value']):.2f}")
                 try:
-                    logger.debug(f"🔍 [SCAN_DEBUG] {i}/{len(watchlist)} - {stock.stock_name}({stock.stock_code}) 스캔 중...")
-                    
-                    # 종목별 신호 계산
-                    signal_result = await self._calculate_strategy_signal(strategy, stock)
-                    
-                    if signal_result:
-                        # 신호 생성
-                        await self._create_strategy_signal(strategy, stock, signal_result)
-                        signal_count += 1
-                        logger.info(f"✅ [SCAN_RESULT] {stock.stock_name} - {signal_result['signal_type']} 신호 감지!")
-                    else:
-                        logger.debug(f"❌ [SCAN_RESULT] {stock.stock_name} - 신호 없음")
-                        
+                    await self._create_strategy_signal(strategy, stock, signal_result)
+                    logger.info(f"✅ [SCAN_RESULT] {stock.stock_name} - {signal_result['signal_type']} 신호 감지!")
                 except Exception as e:
-                    logger.error(f"🎯 [STRATEGY_MANAGER] {stock.stock_name}({stock.stock_code}) 신호 계산 오류: {e}")
-                    continue
-                
-                # API 제한 고려하여 충분한 대기 (최소 1.5초 간격 보장)
-                await asyncio.sleep(1.8)
-            
-            logger.info(f"🎯 [STRATEGY_MANAGER] {strategy.strategy_name} 전략 스캔 완료 - 신호 발생: {signal_count}개")
-            
+                    logger.error(f"🎯 [STRATEGY_MANAGER] {stock.stock_name}({stock.stock_code}) 신호 생성 오류: {e}")
+
+            logger.info(f"🎯 [STRATEGY_MANAGER] {strategy.strategy_name} 전략 스캔 완료 - 신호 발생: {len(signals)}개")
+
         except Exception as e:
             logger.error(f"🎯 [STRATEGY_MANAGER] 전략 스캔 오류: {e}")
-    
-    async def _get_cached_chart_data(self, stock_code: str) -> Optional[List]:
-        """캐시된 차트 데이터 조회 또는 새로 조회"""
-        try:
-            current_time = datetime.now()
-            
-            # 캐시 확인
-            if stock_code in self.chart_cache:
-                cached_data, cache_time = self.chart_cache[stock_code]
-                cache_age = (current_time - cache_time).total_seconds()
-                if cache_age < self.cache_duration:
-                    logger.debug(f"🎯 [CHART_DEBUG] 캐시된 차트 데이터 사용: {stock_code} (캐시나이: {cache_age:.1f}초)")
-                    logger.debug(f"🎯 [CHART_DEBUG] 캐시데이터 개수: {len(cached_data) if cached_data else 0}개")
-                    if cached_data and len(cached_data) > 0:
-                        logger.debug(f"🎯 [CHART_DEBUG] 캐시데이터 샘플: {cached_data[0] if cached_data else 'None'}")
-                    return cached_data
-                else:
-                    logger.debug(f"🎯 [CHART_DEBUG] 캐시 만료: {stock_code} (캐시나이: {cache_age:.1f}초 > {self.cache_duration}초)")
-            
-            # API 제한 확인
-            from api_rate_limiter import api_rate_limiter
-            if not api_rate_limiter.is_api_available():
-                logger.warning(f"🎯 [CHART_DEBUG] API 제한 상태로 차트 조회 건너뜀: {stock_code}")
-                # 제한 상태에서는 캐시된 데이터라도 반환 (빈 데이터가 아닌 경우)
-                if stock_code in self.chart_cache:
-                    cached_data, _ = self.chart_cache[stock_code]
-                    if cached_data and len(cached_data) > 0:
-                        logger.info(f"🎯 [CHART_DEBUG] API 제한 중 - 캐시된 데이터 사용: {stock_code}")
-                        return cached_data
-                return None
-            
-            # 새로 조회
-            logger.info(f"🎯 [CHART_DEBUG] 차트 데이터 새로 조회 시작: {stock_code}")
-            # 데이트레이딩용 5분봉 요청
-            chart_data = await self.kiwoom_api.get_stock_chart_data(stock_code, period="5M")
-            
-            # 디버깅: 조회 결과 상세 분석
-            logger.debug(f"🎯 [CHART_DEBUG] API 조회 결과: {stock_code}")
-            logger.debug(f"🎯 [CHART_DEBUG] - 데이터 타입: {type(chart_data)}")
-            logger.debug(f"🎯 [CHART_DEBUG] - 데이터 개수: {len(chart_data) if chart_data else 0}개")
-            logger.debug(f"🎯 [CHART_DEBUG] - 데이터가 None인가: {chart_data is None}")
-            logger.debug(f"🎯 [CHART_DEBUG] - 데이터가 빈 리스트인가: {chart_data == []}")
-            
-            if chart_data:
-                logger.debug(f"🎯 [CHART_DEBUG] - 첫 번째 데이터: {chart_data[0] if len(chart_data) > 0 else 'None'}")
-                logger.debug(f"🎯 [CHART_DEBUG] - 마지막 데이터: {chart_data[-1] if len(chart_data) > 0 else 'None'}")
-                
-                # 데이터 구조 검증
-                if len(chart_data) > 0:
-                    first_item = chart_data[0]
-                    logger.debug(f"🎯 [CHART_DEBUG] - 첫 데이터 키들: {list(first_item.keys()) if isinstance(first_item, dict) else 'Not a dict'}")
-                    if isinstance(first_item, dict):
-                        for key in ['timestamp', 'open', 'high', 'low', 'close', 'volume']:
-                            value = first_item.get(key, 'MISSING')
-                            logger.debug(f"🎯 [CHART_DEBUG] - {key}: {value}")
-            else:
-                logger.warning(f"🎯 [CHART_DEBUG] ⚠️ {stock_code} 차트 데이터가 비어있음!")
-            
-            # 캐시에 저장
-            if chart_data:
-                self.chart_cache[stock_code] = (chart_data, current_time)
-                logger.debug(f"🎯 [CHART_DEBUG] 캐시에 저장 완료: {stock_code}")
-            else:
-                logger.warning(f"🎯 [CHART_DEBUG] ⚠️ {stock_code} 빈 데이터로 인해 캐시 저장 안함")
-            
-            return chart_data
-            
-        except Exception as e:
-            logger.error(f"🎯 [CHART_DEBUG] 차트 데이터 조회 오류: {stock_code} - {e}")
-            import traceback
-            logger.error(f"🎯 [CHART_DEBUG] 스택 트레이스: {traceback.format_exc()}")
-            return None
 
-    async def _calculate_strategy_signal(self, strategy: TradingStrategy, stock: WatchlistStock) -> Optional[Dict]:
-        """전략별 신호 계산"""
-        try:
-            # 캐시된 차트 데이터 조회
-            chart_data = await self._get_cached_chart_data(stock.stock_code)
-            
-            # 디버깅: 차트 데이터 부족 원인 분석
-            logger.debug(f"🎯 [CHART_DEBUG] {stock.stock_name}({stock.stock_code}) 차트 데이터 검증:")
-            logger.debug(f"🎯 [CHART_DEBUG] - chart_data is None: {chart_data is None}")
-            logger.debug(f"🎯 [CHART_DEBUG] - chart_data == []: {chart_data == []}")
-            logger.debug(f"🎯 [CHART_DEBUG] - len(chart_data): {len(chart_data) if chart_data else 0}")
-            logger.debug(f"🎯 [CHART_DEBUG] - 최소 필요 개수: 20개")
-            
-            if not chart_data:
-                logger.warning(f"🎯 [CHART_DEBUG] ⚠️ {stock.stock_name} 차트 데이터가 None 또는 빈 리스트")
-                logger.warning(f"🎯 [STRATEGY_MANAGER] {stock.stock_name} 차트 데이터 부족 (데이터 없음)")
-                return None
-            
-            # RSI 계산을 위한 최소 데이터 확인 (RSI 기간 + 여유분)
-            min_required = 30  # RSI 14 + 여유분 16
-            if len(chart_data) < min_required:
-                logger.warning(f"🎯 [CHART_DEBUG] ⚠️ {stock.stock_name} 차트 데이터 개수 부족: {len(chart_data)}개 < {min_required}개")
-                logger.warning(f"🎯 [STRATEGY_MANAGER] {stock.stock_name} 차트 데이터 부족 (RSI 계산 불가)")
-                # 데이터가 부족해도 디버깅 정보는 출력
-                self._log_strategy_debug_info(strategy, stock, chart_data, "데이터 부족")
-                return None
-            
-            logger.debug(f"🎯 [CHART_DEBUG] ✅ {stock.stock_name} 차트 데이터 충분: {len(chart_data)}개")
-            
-            # 5분봉 데이터 로그 출력 (전체 개수 + 기간 정보)
-            first_time = chart_data[0].get('timestamp', 'N/A') if chart_data else 'N/A'
-            last_time = chart_data[-1].get('timestamp', 'N/A') if chart_data else 'N/A'
-            
-            logger.info(f"📊 [5분봉 데이터] {stock.stock_name}({stock.stock_code})")
-            logger.info(f"📊 [데이터 범위] 전체: {len(chart_data)}개, 기간: {first_time} ~ {last_time}")
-            
-            # 첫 3개 데이터 (시작 시점)
-            logger.info(f"📊 [첫 3개 봉]:")
-            for i, candle in enumerate(chart_data[:3]):
-                timestamp = candle.get('timestamp', 'N/A')
-                close = candle.get('close', 0)
-                logger.info(f"📊 [{i+1}] {timestamp}, 종가: {close:,}원")
-            
-            # 최신 3개 데이터 (현재 시점)
-            logger.info(f"📊 [최신 3개 봉]:")
-            for i, candle in enumerate(chart_data[-3:]):
-                timestamp = candle.get('timestamp', 'N/A')
-                close = candle.get('close', 0)
-                logger.info(f"📊 [{i+1}] {timestamp}, 종가: {close:,}원")
-            
-            # DataFrame 생성
-            df = pd.DataFrame(chart_data)
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df.set_index('timestamp', inplace=True)
-            df = df.sort_index()
-            
-            # 컬럼명 변경 (키움 API 형식에 맞춤)
-            df = df.rename(columns={
-                'open': 'Open',
-                'high': 'High', 
-                'low': 'Low',
-                'close': 'Close',
-                'volume': 'Volume'
-            })
-            
-            # 기준 시간과 기준 금액 로그 출력
-            latest_time = df.index[-1]
-            latest_close = df['Close'].iloc[-1]
-            logger.info(f"📊 [기준 데이터] {stock.stock_name} - 기준시간: {latest_time}, 기준금액: {latest_close:,}원")
-            
-            # 데이터 타입 변환
-            df['Open'] = pd.to_numeric(df['Open'])
-            df['High'] = pd.to_numeric(df['High'])
-            df['Low'] = pd.to_numeric(df['Low'])
-            df['Close'] = pd.to_numeric(df['Close'])
-            df['Volume'] = pd.to_numeric(df['Volume'])
-            
-            # 전략별 신호 계산
-            # JSON 파라미터 파싱 (이미 dict인 경우와 문자열인 경우 모두 처리)
-            import json
-            try:
-                if isinstance(strategy.parameters, dict):
-                    parameters = strategy.parameters
-                elif isinstance(strategy.parameters, str):
-                    parameters = json.loads(strategy.parameters) if strategy.parameters else {}
-                else:
-                    parameters = {}
-            except (json.JSONDecodeError, TypeError):
-                parameters = {}
-            
-            # 전략별 신호 계산 전 디버깅 정보 출력
-            self._log_strategy_debug_info(strategy, stock, chart_data, "정상")
-            
-            if strategy.strategy_type == "MOMENTUM":
-                return await self._calculate_momentum_signal(df, parameters)
-            elif strategy.strategy_type == "DISPARITY":
-                return await self._calculate_disparity_signal(df, parameters)
-            elif strategy.strategy_type == "BOLLINGER":
-                return await self._calculate_bollinger_signal(df, parameters)
-            elif strategy.strategy_type == "RSI":
-                return await self._calculate_rsi_signal(df, parameters)
-            elif strategy.strategy_type == "ICHIMOKU":
-                return await self._calculate_ichimoku_signal(df, parameters)
-            elif strategy.strategy_type == "CHAIKIN":
-                return await self._calculate_chaikin_signal(df, parameters)
-            
-        except Exception as e:
-            logger.error(f"🎯 [STRATEGY_MANAGER] {stock.stock_name} 신호 계산 오류: {e}")
-            return None
-    
-    def _log_strategy_debug_info(self, strategy, stock, chart_data, status):
-        """전략별 디버깅 정보 출력"""
-        try:
-            logger.info(f"📊 [STRATEGY_DEBUG] ===== {strategy.strategy_name} 전략 디버깅 =====")
-            logger.info(f"📊 [STRATEGY_DEBUG] 종목: {stock.stock_name}({stock.stock_code})")
-            logger.info(f"📊 [STRATEGY_DEBUG] 상태: {status}")
-            logger.info(f"📊 [STRATEGY_DEBUG] 전략 타입: {strategy.strategy_type}")
-            logger.info(f"📊 [STRATEGY_DEBUG] 전략 파라미터: {strategy.parameters}")
-            logger.info(f"📊 [STRATEGY_DEBUG] 차트 데이터 개수: {len(chart_data) if chart_data else 0}")
-            
-            if chart_data and len(chart_data) > 0:
-                # 최신 데이터 정보
-                latest_data = chart_data[-1]
-                logger.info(f"📊 [STRATEGY_DEBUG] 최신 데이터: {latest_data}")
-                
-                # 가격 정보
-                if 'close' in latest_data:
-                    current_price = latest_data['close']
-                    logger.info(f"📊 [STRATEGY_DEBUG] 현재가: {current_price}")
-                    
-                    # 전략별 기준값 계산 및 출력
-                    if strategy.strategy_type == "MOMENTUM":
-                        self._log_momentum_debug(strategy, chart_data, current_price)
-                    elif strategy.strategy_type == "DISPARITY":
-                        self._log_disparity_debug(strategy, chart_data, current_price)
-                    elif strategy.strategy_type == "BOLLINGER":
-                        self._log_bollinger_debug(strategy, chart_data, current_price)
-                    elif strategy.strategy_type == "RSI":
-                        self._log_rsi_debug(strategy, chart_data, current_price)
-            
-            logger.info(f"📊 [STRATEGY_DEBUG] ===== {strategy.strategy_name} 디버깅 완료 =====")
-            
-        except Exception as e:
-            logger.error(f"📊 [STRATEGY_DEBUG] 디버깅 정보 출력 오류: {e}")
-    
-    def _log_momentum_debug(self, strategy, chart_data, current_price):
-        """모멘텀 전략 디버깅 정보"""
-        try:
-            import json
-            # strategy.parameters가 이미 dict인 경우와 문자열인 경우 모두 처리
-            if isinstance(strategy.parameters, dict):
-                parameters = strategy.parameters
-            elif isinstance(strategy.parameters, str):
-                parameters = json.loads(strategy.parameters) if strategy.parameters else {}
-            else:
-                parameters = {}
-            momentum_period = parameters.get("momentum_period", 10)
-            
-            if len(chart_data) >= momentum_period + 1:
-                prev_price = chart_data[-momentum_period-1]['close']
-                momentum = current_price - prev_price
-                
-                logger.info(f"📊 [MOMENTUM_DEBUG] 모멘텀 기간: {momentum_period}일")
-                logger.info(f"📊 [MOMENTUM_DEBUG] 현재가: {current_price}")
-                logger.info(f"📊 [MOMENTUM_DEBUG] {momentum_period}일전가: {prev_price}")
-                logger.info(f"📊 [MOMENTUM_DEBUG] 모멘텀 값: {momentum:.2f}")
-                logger.info(f"📊 [MOMENTUM_DEBUG] 0선 돌파 조건: {momentum > 0}")
-                logger.info(f"📊 [MOMENTUM_DEBUG] 매수 조건: 0선 상향 돌파 (현재 모멘텀 > 0 이고 이전 모멘텀 <= 0)")
-                logger.info(f"📊 [MOMENTUM_DEBUG] 매도 조건: 0선 하향 돌파 (현재 모멘텀 < 0 이고 이전 모멘텀 >= 0)")
-            else:
-                logger.info(f"📊 [MOMENTUM_DEBUG] 데이터 부족으로 모멘텀 계산 불가")
-                
-        except Exception as e:
-            logger.error(f"📊 [MOMENTUM_DEBUG] 모멘텀 디버깅 오류: {e}")
-    
-    def _log_disparity_debug(self, strategy, chart_data, current_price):
-        """이격도 전략 디버깅 정보"""
+    def _parse_parameters(self, strategy: TradingStrategy) -> Dict:
+        """전략 JSON 파라미터 파싱 (이미 dict인 경우와 문자열인 경우 모두 처리)"""
         try:
-            import json
-            # strategy.parameters가 이미 dict인 경우와 문자열인 경우 모두 처리
             if isinstance(strategy.parameters, dict):
-                parameters = strategy.parameters
-            elif isinstance(strategy.parameters, str):
-                parameters = json.loads(strategy.parameters) if strategy.parameters else {}
-            else:
-                parameters = {}
-            ma_period = parameters.get("ma_period", 20)
-            buy_threshold = parameters.get("buy_threshold", 95.0)
-            sell_threshold = parameters.get("sell_threshold", 105.0)
-            
-            if len(chart_data) >= ma_period:
-                # 이동평균 계산
-                recent_prices = [data['close'] for data in chart_data[-ma_period:]]
-                ma_value = sum(recent_prices) / len(recent_prices)
-                disparity = (current_price / ma_value) * 100
-                
-                logger.info(f"📊 [DISPARITY_DEBUG] 이동평균 기간: {ma_period}일")
-                logger.info(f"📊 [DISPARITY_DEBUG] 현재가: {current_price}")
-                logger.info(f"📊 [DISPARITY_DEBUG] {ma_period}일 이동평균: {ma_value:.2f}")
-                logger.info(f"📊 [DISPARITY_DEBUG] 이격도: {disparity:.2f}%")
-                logger.info(f"📊 [DISPARITY_DEBUG] 매수 임계값: {buy_threshold}%")
-                logger.info(f"📊 [DISPARITY_DEBUG] 매도 임계값: {sell_threshold}%")
-                logger.info(f"📊 [DISPARITY_DEBUG] 매수 조건: {disparity < buy_threshold}")
-                logger.info(f"📊 [DISPARITY_DEBUG] 매도 조건: {disparity > sell_threshold}")
-            else:
-                logger.info(f"📊 [DISPARITY_DEBUG] 데이터 부족으로 이격도 계산 불가")
-                
-        except Exception as e:
-            logger.error(f"📊 [DISPARITY_DEBUG] 이격도 디버깅 오류: {e}")
-    
-    def _log_bollinger_debug(self, strategy, chart_data, current_price):
-        """볼린저밴드 전략 디버깅 정보"""
-        try:
-            import json
-            import statistics
-            # strategy.parameters가 이미 dict인 경우와 문자열인 경우 모두 처리
-            if isinstance(strategy.parameters, dict):
-                parameters = strategy.parameters
-            elif isinstance(strategy.parameters, str):
-                parameters = json.loads(strategy.parameters) if strategy.parameters else {}
-            else:
-                parameters = {}
-            ma_period = parameters.get("ma_period", 20)
-            std_multiplier = parameters.get("std_multiplier", 2.0)
-            
-            if len(chart_data) >= ma_period:
-                # 이동평균과 표준편차 계산
-                recent_prices = [data['close'] for data in chart_data[-ma_period:]]
-                ma_value = sum(recent_prices) / len(recent_prices)
-                std_value = statistics.stdev(recent_prices)
-                
-                upper_band = ma_value + (std_value * std_multiplier)
-                lower_band = ma_value - (std_value * std_multiplier)
-                
-                logger.info(f"📊 [BOLLINGER_DEBUG] 이동평균 기간: {ma_period}일")
-                logger.info(f"📊 [BOLLINGER_DEBUG] 표준편차 배수: {std_multiplier}")
-                logger.info(f"📊 [BOLLINGER_DEBUG] 현재가: {current_price}")
-                logger.info(f"📊 [BOLLINGER_DEBUG] {ma_period}일 이동평균: {ma_value:.2f}")
-                logger.info(f"📊 [BOLLINGER_DEBUG] 표준편차: {std_value:.2f}")
-                logger.info(f"📊 [BOLLINGER_DEBUG] 상단밴드: {upper_band:.2f}")
-                logger.info(f"📊 [BOLLINGER_DEBUG] 하단밴드: {lower_band:.2f}")
-                logger.info(f"📊 [BOLLINGER_DEBUG] 매수 조건 (하단밴드 터치): {current_price <= lower_band}")
-                logger.info(f"📊 [BOLLINGER_DEBUG] 매도 조건 (상단밴드 터치): {current_price >= upper_band}")
-            else:
-                logger.info(f"📊 [BOLLINGER_DEBUG] 데이터 부족으로 볼린저밴드 계산 불가")
-                
-        except Exception as e:
-            logger.error(f"📊 [BOLLINGER_DEBUG] 볼린저밴드 디버깅 오류: {e}")
-    
-    def _log_rsi_debug(self, strategy, chart_data, current_price):
-        """RSI 전략 디버깅 정보 (가중평균거래량 포함)"""
-        try:
-            import json
-            # strategy.parameters가 이미 dict인 경우와 문자열인 경우 모두 처리
-            if isinstance(strategy.parameters, dict):
-                parameters = strategy.parameters
-            elif isinstance(strategy.parameters, str):
-                parameters = json.loads(strategy.parameters) if strategy.parameters else {}
-            else:
-                parameters = {}
-            rsi_period = parameters.get("rsi_period", 14)
-            oversold_threshold = parameters.get("oversold_threshold", 30.0)
-            overbought_threshold = parameters.get("overbought_threshold", 70.0)
-            volume_period = parameters.get("volume_period", 20)
-            volume_threshold = parameters.get("volume_threshold", 1.5)
-            use_volume_filter = parameters.get("use_volume_filter", True)
-            
-            if len(chart_data) >= rsi_period + 1:
-                # RSI 계산
-                prices = [data['close'] for data in chart_data[-rsi_period-1:]]
-                gains = []
-                losses = []
-                
-                for i in range(1, len(prices)):
-                    change = prices[i] - prices[i-1]
-                    if change > 0:
-                        gains.append(change)
-                        losses.append(0)
-                    else:
-                        gains.append(0)
-                        losses.append(-change)
-                
-                avg_gain = sum(gains) / len(gains) if gains else 0
-                avg_loss = sum(losses) / len(losses) if losses else 0
-                
-                if avg_loss != 0:
-                    rs = avg_gain / avg_loss
-                    rsi = 100 - (100 / (1 + rs))
-                else:
-                    rsi = 100
-                
-                # 가중평균거래량 계산
-                current_volume = chart_data[-1]['volume']
-                if len(chart_data) >= volume_period:
-                    volumes = [data['volume'] for data in chart_data[-volume_period:]]
-                    weights = list(range(1, volume_period + 1))
-                    weighted_avg_volume = sum(v * w for v, w in zip(volumes, weights)) / sum(weights)
-                    volume_ratio = current_volume / weighted_avg_volume if weighted_avg_volume > 0 else 0
-                else:
-                    weighted_avg_volume = 0
-                    volume_ratio = 0
-                
-                logger.info(f"📊 [RSI_DEBUG] RSI 기간: {rsi_period}일")
-                logger.info(f"📊 [RSI_DEBUG] 현재가: {current_price}")
-                logger.info(f"📊 [RSI_DEBUG] RSI 값: {rsi:.2f}")
-                logger.info(f"📊 [RSI_DEBUG] 과매도 임계값: {oversold_threshold}")
-                logger.info(f"📊 [RSI_DEBUG] 과매수 임계값: {overbought_threshold}")
-                logger.info(f"📊 [RSI_DEBUG] 현재 거래량: {current_volume:,.0f}")
-                logger.info(f"📊 [RSI_DEBUG] 가중평균거래량 ({volume_period}일): {weighted_avg_volume:,.0f}")
-                logger.info(f"📊 [RSI_DEBUG] 거래량 비율: {volume_ratio:.2f}배")
-                logger.info(f"📊 [RSI_DEBUG] 거래량 임계값: {volume_threshold}배")
-                logger.info(f"📊 [RSI_DEBUG] 거래량 필터 사용: {use_volume_filter}")
-                logger.info(f"📊 [RSI_DEBUG] 매수 조건 (과매도): {rsi < oversold_threshold}")
-                logger.info(f"📊 [RSI_DEBUG] 매도 조건 (과매수): {rsi > overbought_threshold}")
-                if use_volume_filter:
-                    logger.info(f"📊 [RSI_DEBUG] 거래량 조건: {volume_ratio >= volume_threshold}")
-            else:
-                logger.info(f"📊 [RSI_DEBUG] 데이터 부족으로 RSI 계산 불가")
-                
-        except Exception as e:
-            logger.error(f"📊 [RSI_DEBUG] RSI 디버깅 오류: {e}")
-    
+                return strategy.parameters
+            if isinstance(strategy.parameters, str):
+                return json.loads(strategy.parameters) if strategy.parameters else {}
+        except (json.JSONDecodeError, TypeError):
+            pass
+        return {}
+
+    # 아래 종목별 계산(pandas)은 StrategyPanel 벡터 계산의 기준 구현 (tests/strategy/test_strategy_panel.py)
+
     async def _calculate_momentum_signal(self, df: pd.DataFrame, params: Dict) -> Optional[Dict]:
         """모멘텀 전략 신호 계산"""
         try:
@@ -1213,7 +858,8 @@ class StrategyManager:
                 ],
                 "watchlist_count": len(watchlist),
                 "recent_signals_24h": recent_signals_count,
-                "monitoring_interval": "60초 (1분)",
+                "monitoring_interval": f"{self.timeframe} 봉 마감마다",
+                "schedule": bar_scheduler.get_status_info()["schedules"].get("strategy_scan"),
                 "chart_cache_duration": f"{self.cache_duration}초"
             }
         except Exception as e:
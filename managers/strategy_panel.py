@@ -0,0 +1,131 @@
+"""
+전략 패널 평가기
+스캔 주기마다 관심종목 캔들을 한 번만 불러와, 활성 전략들의 지표를 종목 전체에 대해
+2차원 배열(종목 x 봉)로 한 번에 계산합니다.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from api.api_rate_limiter import APIPriority
+from api.candles import CandleSeries
+from managers.indicator_nodes import PanelGroup
+from managers.strategies import STRATEGIES
+
+logger = logging.getLogger(__name__)
+
+# 전략 계산에 필요한 최소 봉 수 (RSI 14 + 여유분 16)
+MIN_BARS = 30
+
+
+class StrategyPanel:
+    """관심종목 캔들 묶음 - 전략별 신호를 종목 전체에 대해 벡터 연산으로 계산
+
+    전략 신호는 마지막 두 봉의 지표만 보므로, 전략마다 그 값에 영향을 주는 최근 봉 수(width)만
+    잘라 길이를 맞춘다. width 이상인 종목은 하나의 2차원 배열로, 더 짧은 종목은 길이별로 묶어
+    StrategyManager의 종목별 계산(pandas)과 같은 결과를 낸다.
+
+    전략은 managers/strategies.py에 등록된 클래스가 의존 지표 노드를 선언하고, 노드는 묶음마다
+    한 번만 계산된다. prepare()로 주기의 전략들을 알려 주면 모든 전략이 같은 묶음(가장 긴 width)을
+    사용해 같은 노드(예: 이격도/볼린저의 20봉 이동평균)를 공유한다. 단, 공통 width가 전략 자신의
+    width보다 길어 짧은 종목 묶음이 더 잘게 나뉘는 경우에는 자신의 width로 계산한다.
+    """
+
+    def __init__(self, series: Dict[str, CandleSeries]):
+        self.series = {code: s for code, s in series.items() if len(s) >= MIN_BARS}
+        self.skipped = [code for code, s in series.items() if len(s) < MIN_BARS]
+        self.width = 0
+        self._groups: Dict[int, List[PanelGroup]] = {}
+
+    @classmethod
+    async def load(cls, api, stock_codes: Iterable[str], period: str = "5M",
+                   max_age: float = 600,
+                   priority: APIPriority = APIPriority.STRATEGY_SCAN) -> "StrategyPanel":
+        """종목별 캔들을 한 번씩만 조회 (캔들 저장소 경유 - 실제 API 호출만 호출 허가 대기)"""
+        series = {}
+        for code in dict.fromkeys(stock_codes):
+            try:
+                series[code] = await api.get_cached_chart_data(code, period=period, max_age=max_age,
+                                                               priority=priority)
+            except Exception as e:
+                logger.error(f"🧮 [STRATEGY_PANEL] 차트 조회 오류: {code} - {e}")
+        panel = cls(series)
+        if panel.skipped:
+            logger.warning(f"🧮 [STRATEGY_PANEL] 차트 데이터 부족 (<{MIN_BARS}개) 종목 제외: {panel.skipped}")
+        return panel
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+    def prepare(self, strategies: Iterable[Tuple[str, Dict]]):
+        """이번 주기에 평가할 (전략 타입, 파라미터) 목록으로 공통 width 결정 (노드 공유용)"""
+        for strategy_type, params in strategies:
+            strategy = STRATEGIES.get(strategy_type)
+            if strategy is not None:
+                self.width = max(self.width, strategy.width(strategy.resolve(params)))
+
+    def _width_for(self, width: int) -> int:
+        """공통 width를 써도 묶음이 늘지 않으면 공통 width (노드 공유), 아니면 전략 자신의 width"""
+        if width >= self.width:
+            return width
+        if any(width <= len(s) < self.width for s in self.series.values()):
+            return width
+        return self.width
+
+    def groups(self, width: int) -> List[PanelGroup]:
+        """최근 width개 봉으로 맞춘 종목 묶음 (width보다 짧은 종목은 길이별 묶음)"""
+        cached = self._groups.get(width)
+        if cached is not None:
+            return cached
+
+        by_length: Dict[int, List[str]] = {}
+        for code, s in self.series.items():
+            by_length.setdefault(min(len(s), width), []).append(code)
+
+        groups = []
+        for length, codes in sorted(by_length.items(), reverse=True):
+            columns = {
+                name: np.stack([getattr(self.series[c], name)[-length:] for c in codes]).astype(np.float64)
+                for name in ("open", "high", "low", "close", "volume")
+            }
+            lengths = np.array([len(self.series[c]) for c in codes])
+            groups.append(PanelGroup(codes, lengths, columns))
+        self._groups[width] = groups
+        return groups
+
+    def evaluate(self, strategy_type: str, params: Dict) -> Dict[str, Dict]:
+        """전략 신호 계산 -> {종목코드: 신호} (신호 형식은 StrategyManager._calculate_*_signal과 같음)"""
+        strategy = STRATEGIES.get(strategy_type)
+        if strategy is None:
+            logger.warning(f"🧮 [STRATEGY_PANEL] 지원하지 않는 전략 타입: {strategy_type}")
+            return {}
+        params = strategy.resolve(params)
+        declared = strategy.indicators(params)
+        signals = {}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for group in self.groups(self._width_for(strategy.width(params))):
+                values = {alias: group.node(name, **node_params) for alias, (name, node_params) in declared.items()}
+                for row, signal in strategy.signals(self, group, values, params):
+                    signals[group.codes[row]] = signal
+        return signals
+
+    def node_stats(self) -> Dict[str, int]:
+        """지표 노드 계산/재사용 횟수 (전 묶음 합계)"""
+        groups = [g for gs in self._groups.values() for g in gs]
+        return {
+            "computed": sum(g.computed for g in groups),
+            "reused": sum(g.reused for g in groups),
+        }
+
+
+def evaluate_panel(series: Dict[str, CandleSeries],
+                   strategies: List[Tuple[str, Dict]]) -> Tuple[List[Dict[str, Dict]], Dict[str, int]]:
+    """(전략 타입, 파라미터) 목록을 한 패널에서 평가 -> (전략별 신호, 노드 통계)
+
+    작업 풀(utils/executor.py의 cpu_pool) 프로세스에서 실행되도록 인자/결과는 피클 가능한 값만 사용한다.
+    """
+    panel = StrategyPanel(series)
+    panel.prepare(strategies)
+    return [panel.evaluate(strategy_type, params) for strategy_type, params in strategies], panel.node_stats()
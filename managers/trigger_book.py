@@ -0,0 +1,257 @@
+"""
+손절/익절 트리거 북
+HOLDING 포지션(스캘핑 제외)의 손절가/익절가를 종목별 정렬 리스트로 색인해,
+가격 갱신마다 그 가격이 실제로 넘은 트리거만 찾습니다 (O(log n + 발동 수)).
+
+- 손절/익절 기준은 StopLossManager와 같은 수익률 규칙(수수료/제세금 포함, AutoTradeSettings 비율)이며,
+  포지션마다 그 수익률에 해당하는 정수 가격으로 바꿔 둔다 (utils/trading_fees.price_for_rate).
+- positions 테이블과의 동기화: Position insert/update/delete를 세션별로 모아 두었다가 커밋 후에만 반영
+  (롤백된 변경은 반영하지 않음). 대량 UPDATE(query.update)는 ORM 이벤트가 없으므로 트리거 관련 컬럼에는 쓰지 않는다.
+"""
+import logging
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from core.models import Position, SessionLocal
+from utils.trading_fees import price_for_rate
+
+logger = logging.getLogger(__name__)
+
+# 트리거 가격에 영향을 주는 컬럼 (이 컬럼이 바뀐 update만 반영)
+_TRIGGER_COLUMNS = ("stock_code", "status", "position_type", "buy_quantity", "buy_amount", "actual_buy_amount")
+_PENDING_KEY = "trigger_book_pending"
+
+
+class Trigger:
+    """포지션 하나의 손절/익절 가격"""
+
+    __slots__ = ("position_id", "stock_code", "quantity", "buy_amount", "stop_price", "take_price", "suspended")
+
+    def __init__(self, position_id: int, stock_code: str, quantity: int, buy_amount: int):
+        self.position_id = position_id
+        self.stock_code = stock_code
+        self.quantity = quantity
+        self.buy_amount = buy_amount
+        self.stop_price = 0   # 이 가격 이하이면 손절 (0이면 없음)
+        self.take_price = 0   # 이 가격 이상이면 익절 (0이면 없음)
+        self.suspended = False  # 매도 진행 중 (색인에서 빠져 있음)
+
+
+class StockTriggers:
+    """종목 하나의 정렬된 트리거 (가격, 포지션 ID) 오름차순"""
+
+    __slots__ = ("stops", "takes")
+
+    def __init__(self):
+        self.stops: List[Tuple[int, int]] = []
+        self.takes: List[Tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return max(len(self.stops), len(self.takes))
+
+
+def _remove(items: List[Tuple[int, int]], item: Tuple[int, int]):
+    index = bisect_left(items, item)
+    if index < len(items) and items[index] == item:
+        del items[index]
+
+
+class TriggerBook:
+    """종목별 손절/익절 트리거 정렬 색인"""
+
+    def __init__(self):
+        self.stop_loss_rate: Optional[float] = None
+        self.take_profit_rate: Optional[float] = None
+        self._triggers: Dict[int, Trigger] = {}
+        self._stocks: Dict[str, StockTriggers] = {}
+        self.loaded = False
+        self.stats = {"evaluations": 0, "fired": 0, "eval_ns": 0, "synced": 0, "rebuilds": 0}
+
+    # ----- 색인 관리 -----
+    def _index(self, trigger: Trigger):
+        stock = self._stocks.get(trigger.stock_code)
+        if stock is None:
+            stock = self._stocks[trigger.stock_code] = StockTriggers()
+        if trigger.stop_price > 0:
+            insort(stock.stops, (trigger.stop_price, trigger.position_id))
+        if trigger.take_price > 0:
+            insort(stock.takes, (trigger.take_price, trigger.position_id))
+
+    def _unindex(self, trigger: Trigger):
+        stock = self._stocks.get(trigger.stock_code)
+        if stock is None:
+            return
+        _remove(stock.stops, (trigger.stop_price, trigger.position_id))
+        _remove(stock.takes, (trigger.take_price, trigger.position_id))
+        if not stock.stops and not stock.takes:
+            del self._stocks[trigger.stock_code]
+
+    def _price_trigger(self, trigger: Trigger):
+        """현재 손절/익절 비율로 트리거 가격 계산"""
+        trigger.stop_price = trigger.take_price = 0
+        if self.stop_loss_rate is None or trigger.quantity <= 0 or trigger.buy_amount <= 0:
+            return
+        # 손절: 수익률 <= -손절% 인 가장 높은 가격, 익절: 수익률 >= 익절% 인 가장 낮은 가격
+        trigger.stop_price = price_for_rate(trigger.quantity, trigger.buy_amount, -self.stop_loss_rate, strict=True) - 1
+        trigger.take_price = price_for_rate(trigger.quantity, trigger.buy_amount, self.take_profit_rate)
+
+    def upsert(self, position_id: int, stock_code: str, quantity: int, buy_amount: int):
+        """포지션 트리거 추가/갱신"""
+        current = self._triggers.get(position_id)
+        if current is not None:
+            if not current.suspended:
+                self._unindex(current)
+        trigger = Trigger(position_id, stock_code, quantity, buy_amount)
+        self._price_trigger(trigger)
+        self._triggers[position_id] = trigger
+        self._index(trigger)
+
+    def remove(self, position_id: int):
+        trigger = self._triggers.pop(position_id, None)
+        if trigger is not None and not trigger.suspended:
+            self._unindex(trigger)
+
+    def suspend(self, position_id: int):
+        """매도 진행 중인 포지션을 색인에서 잠시 제외 (같은 트리거 중복 발동 방지)"""
+        trigger = self._triggers.get(position_id)
+        if trigger is not None and not trigger.suspended:
+            self._unindex(trigger)
+            trigger.suspended = True
+
+    def resume(self, position_id: int):
+        """매도 실패 후 다시 감시 (그 사이 청산/삭제되었으면 무시)"""
+        trigger = self._triggers.get(position_id)
+        if trigger is not None and trigger.suspended:
+            trigger.suspended = False
+            self._index(trigger)
+
+    def set_rates(self, stop_loss_rate: float, take_profit_rate: float):
+        """손절/익절 비율 변경 시 전체 트리거 가격 재계산"""
+        if (stop_loss_rate, take_profit_rate) == (self.stop_loss_rate, self.take_profit_rate):
+            return
+        self.stop_loss_rate = stop_loss_rate
+        self.take_profit_rate = take_profit_rate
+        self._stocks.clear()
+        for trigger in self._triggers.values():
+            self._price_trigger(trigger)
+            if not trigger.suspended:
+                self._index(trigger)
+        self.stats["rebuilds"] += 1
+        logger.info(f"🎯 [TRIGGER_BOOK] 손절 -{stop_loss_rate}% / 익절 {take_profit_rate}% 기준으로 "
+                    f"{len(self._triggers)}개 포지션 트리거 재계산")
+
+    def sync_row(self, position_id: int, snapshot: Optional[Tuple]):
+        """positions 행 변경 반영 (snapshot None이면 삭제)"""
+        self.stats["synced"] += 1
+        if snapshot is None:
+            self.remove(position_id)
+            return
+        stock_code, status, position_type, quantity, buy_amount, actual_buy_amount = snapshot
+        if status != "HOLDING" or position_type == "SCALP":
+            self.remove(position_id)
+        else:
+            self.upsert(position_id, stock_code, quantity, actual_buy_amount or buy_amount)
+
+    def load(self) -> int:
+        """HOLDING 포지션(스캘핑 제외) 전체를 한 번의 조회로 다시 색인"""
+        db = SessionLocal()
+        try:
+            rows = (db.query(Position.id, Position.stock_code, Position.buy_quantity, Position.buy_amount,
+                             Position.actual_buy_amount)
+                    .filter(Position.status == "HOLDING", Position.position_type != "SCALP").all())
+        finally:
+            db.close()
+        self._triggers.clear()
+        self._stocks.clear()
+        for position_id, stock_code, quantity, buy_amount, actual_buy_amount in rows:
+            self.upsert(position_id, stock_code, quantity, actual_buy_amount or buy_amount)
+        self.loaded = True
+        logger.info(f"🎯 [TRIGGER_BOOK] {len(rows)}개 포지션 트리거 로드 ({len(self._stocks)}개 종목)")
+        return len(rows)
+
+    # ----- 평가 -----
+    def crossed(self, stock_code: str, price: int) -> List[Tuple[int, str]]:
+        """price가 넘은 트리거 -> [(포지션 ID, STOP_LOSS/TAKE_PROFIT)]"""
+        stock = self._stocks.get(stock_code)
+        if stock is None or not price:
+            return []
+        started = time.perf_counter_ns()
+        # 손절가 >= price 인 뒤쪽 구간, 익절가 <= price 인 앞쪽 구간
+        fired = [(position_id, "STOP_LOSS") for _, position_id in stock.stops[bisect_left(stock.stops, (price, -1)):]]
+        fired += [(position_id, "TAKE_PROFIT") for _, position_id in stock.takes[:bisect_right(stock.takes, (price, float("inf")))]]
+        self.stats["evaluations"] += 1
+        self.stats["fired"] += len(fired)
+        self.stats["eval_ns"] += time.perf_counter_ns() - started
+        return fired
+
+    def stock_codes(self) -> List[str]:
+        return list(self._stocks)
+
+    def get(self, position_id: int) -> Optional[Trigger]:
+        return self._triggers.get(position_id)
+
+    def __len__(self) -> int:
+        return len(self._triggers)
+
+    def get_status_info(self) -> Dict:
+        evaluations = self.stats["evaluations"]
+        return {
+            "loaded": self.loaded,
+            "positions": len(self._triggers),
+            "stocks": len(self._stocks),
+            "suspended": sum(1 for t in self._triggers.values() if t.suspended),
+            "stop_loss_rate": self.stop_loss_rate,
+            "take_profit_rate": self.take_profit_rate,
+            **{key: value for key, value in self.stats.items() if key != "eval_ns"},
+            "avg_eval_us": round(self.stats["eval_ns"] / evaluations / 1000, 2) if evaluations else 0.0,
+        }
+
+
+# 전역 인스턴스
+trigger_book = TriggerBook()
+
+
+# ----- positions 테이블 동기화 (커밋된 변경만) -----
+def _snapshot(target: Position) -> Tuple:
+    return tuple(getattr(target, column) for column in _TRIGGER_COLUMNS)
+
+
+def _queue(target: Position, snapshot: Optional[Tuple]):
+    session = Session.object_session(target)
+    if session is not None and target.id is not None:
+        session.info.setdefault(_PENDING_KEY, {})[target.id] = snapshot
+
+
+@event.listens_for(Position, "after_insert")
+def _after_insert(mapper, connection, target):
+    _queue(target, _snapshot(target))
+
+
+@event.listens_for(Position, "after_update")
+def _after_update(mapper, connection, target):
+    # 현재가/손익만 바뀐 update(주기적 평가)는 트리거와 무관
+    state = inspect(target)
+    if any(state.attrs[column].history.has_changes() for column in _TRIGGER_COLUMNS):
+        _queue(target, _snapshot(target))
+
+
+@event.listens_for(Position, "after_delete")
+def _after_delete(mapper, connection, target):
+    _queue(target, None)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _after_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        for position_id, snapshot in pending.items():
+            trigger_book.sync_row(position_id, snapshot)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
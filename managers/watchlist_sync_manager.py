@@ -4,9 +4,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Set, Optional
 from sqlalchemy.orm import Session
 
-from api.kiwoom_api import KiwoomAPI
+from api.kiwoom_api import KiwoomAPI, get_kiwoom_api
 from core.models import WatchlistStock, ConditionWatchlistSync, AutoTradeCondition, get_db
-from api.api_rate_limiter import api_rate_limiter
+from api.api_rate_limiter import api_rate_limiter, APIPriority
 from core.config import Config
 
 logger = logging.getLogger(__name__)
@@ -15,7 +15,6 @@ class WatchlistSyncManager:
     """조건식 종목을 관심종목으로 동기화하는 관리자"""
     
     def __init__(self):
-        self.kiwoom_api = KiwoomAPI()
         self.is_running = False
         self.sync_interval_seconds = 300  # 5분마다 동기화
         self._sync_task: Optional[asyncio.Task] = None
@@ -31,6 +30,11 @@ class WatchlistSyncManager:
         self.target_condition_names = Config.WATCHLIST_SYNC_TARGET_CONDITION_NAMES  # 동기화할 조건식 이름들
         self.sync_only_target_conditions = Config.WATCHLIST_SYNC_ONLY_TARGET_CONDITIONS  # True면 target_condition_names만 동기화
         
+    @property
+    def kiwoom_api(self) -> KiwoomAPI:
+        """프로세스 공용 KiwoomAPI (set_kiwoom_api로 교체 가능)"""
+        return get_kiwoom_api()
+
     async def start_auto_sync(self):
         """자동 동기화 시작"""
         logger.info("📋 [WATCHLIST_SYNC] 자동 동기화 시작")
@@ -113,14 +117,13 @@ class WatchlistSyncManager:
         try:
             logger.info(f"📋 [WATCHLIST_SYNC] 조건식 동기화 시작: {condition_name} (ID: {condition_id})")
             
-            # API 제한 확인
-            if not api_rate_limiter.is_api_available():
-                logger.warning(f"📋 [WATCHLIST_SYNC] API 제한 상태 - 조건식 {condition_name} 동기화 건너뜀")
+            # 호출 허가 대기 (조건식 검색 우선순위)
+            if not await api_rate_limiter.acquire(APIPriority.CONDITION_SEARCH, f"sync_condition_{condition_id}"):
+                logger.warning(f"📋 [WATCHLIST_SYNC] 호출 허가 대기 시간 초과 - 조건식 {condition_name} 동기화 건너뜀")
                 return
             
             # 조건식으로 종목 검색
             stocks = await self.kiwoom_api.search_condition_stocks(str(condition_id), condition_name)
-            api_rate_limiter.record_api_call(f"sync_condition_{condition_id}")
             
             if not stocks:
                 logger.info(f"📋 [WATCHLIST_SYNC] 조건식 {condition_name}에 해당하는 종목이 없음")
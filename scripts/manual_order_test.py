@@ -48,7 +48,7 @@ async def run(args: argparse.Namespace) -> int:
     print("=" * 70)
 
     # 1) Authenticate / token
-    ok = api.authenticate()
+    ok = await api.authenticate()
     print(f"[1] authenticate(): {ok}")
     token = api.token_manager.get_valid_token()
     print(f"[1] token_valid: {bool(token)}")
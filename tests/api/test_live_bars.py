@@ -0,0 +1,132 @@
+"""
+실시간 1분봉 집계 테스트 스크립트
+
+목적:
+- 실시간 체결(0B)이 bar_aggregator에서 1분봉(OHLCV, VWAP)으로 묶이는지 검증
+- 봉 마감 이벤트 수신 및 같은 구간의 REST 1분봉과 값 비교
+- (오프라인) 이미 마감된 분의 지연 체결이 같은 분 봉을 하나 더 만들지 않는지 확인
+
+예시:
+  python test_live_bars.py
+  python test_live_bars.py --stock-codes 005930,000660 --minutes 3
+"""
+
+# Windows 콘솔 UTF-8 인코딩 설정
+import sys
+import io
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import asyncio
+from datetime import datetime
+
+from core.config import Config
+from api.kiwoom_api import KiwoomAPI
+from api.bar_aggregator import BarAggregator, bar_aggregator
+from api.tick_store import Tick
+
+
+def check_late_trade() -> int:
+    """09:00:30 체결 -> 09:01:00.2 마감 정리 -> 09:00:59 지연 체결 -> 09:01:05 체결: 09:00 봉은 하나만"""
+    aggregator = BarAggregator(capacity=10)
+    day = datetime(2026, 10, 15)
+    aggregator.on_tick(Tick("TEST01", 10000, 5, timestamp=day.replace(hour=9, second=30)))
+    aggregator.flush(day.replace(hour=9, minute=1, microsecond=200000))
+    aggregator.on_tick(Tick("TEST01", 10100, 3, timestamp=day.replace(hour=9, second=59)))
+    aggregator.on_tick(Tick("TEST01", 10200, 2, timestamp=day.replace(hour=9, minute=1, second=5)))
+    aggregator.flush(day.replace(hour=9, minute=2, second=1))
+
+    closed = aggregator.series("TEST01", include_forming=False)
+    timestamps = [int(ts) for ts in closed.timestamps]
+    volumes = [int(v) for v in closed.volume]
+    ok = (len(timestamps) == len(set(timestamps)) == 2 and volumes == [5, 2]
+          and aggregator.get_status_info()["late_trades"] == 1)
+    print(f"{'✅' if ok else '❌'} 마감된 분의 지연 체결 무시: 봉 시각 {timestamps}, 거래량 {volumes}")
+    return 0 if ok else 1
+
+
+async def run(args: argparse.Namespace) -> int:
+    api = KiwoomAPI()
+    stock_codes = [c.strip() for c in args.stock_codes.split(",") if c.strip()]
+
+    print("=" * 70)
+    print("Kiwoom Live Bar Aggregator Test")
+    print(f"- use_mock_account: {Config.KIWOOM_USE_MOCK_ACCOUNT}")
+    print(f"- stock_codes: {stock_codes}")
+    print(f"- current_time: {datetime.now().isoformat()}")
+    print("=" * 70)
+
+    # 0) 지연 체결 처리 (API 호출 없음)
+    print("\n[0] 마감된 분의 지연 체결")
+    if check_late_trade():
+        return 6
+
+    # 1) 토큰 인증 및 WebSocket 연결
+    print("\n[1] 토큰 인증 및 WebSocket 연결")
+    if not await api.authenticate():
+        print("❌ 인증 실패")
+        return 1
+    if not await api.connect():
+        print("❌ WebSocket 연결 실패")
+        return 2
+    print("✅ 연결 성공")
+
+    closed = []
+
+    def on_bar(bar):
+        closed.append(bar)
+        print(f"   🕯️ {bar.stock_code} {bar.timestamp.strftime('%H:%M')} "
+              f"O={bar.open:,} H={bar.high:,} L={bar.low:,} C={bar.close:,} V={bar.volume:,} VWAP={bar.vwap:,.1f}")
+
+    bar_aggregator.start()
+    bar_aggregator.add_bar_listener(on_bar)
+    try:
+        # 2) 실시간 체결 구독
+        print("\n[2] 실시간 체결 구독")
+        if not await api.subscribe_realtime(stock_codes):
+            print("❌ 구독 실패")
+            return 3
+        print("✅ 구독 성공")
+
+        # 3) 봉 마감 이벤트 대기 (첫 봉은 구독 도중 시작되어 일부만 집계됨)
+        print(f"\n[3] {args.minutes}분 동안 봉 마감 대기 (장중에만 체결이 들어옵니다)")
+        await asyncio.sleep(args.minutes * 60 + 2)
+
+        # 4) 완전한 봉을 REST 1분봉과 비교
+        print("\n[4] REST 1분봉과 비교")
+        mismatches = 0
+        for code in stock_codes:
+            live = bar_aggregator.series(code, include_forming=False)
+            rest = await api.get_stock_chart_data(code, "1M")
+            rest_by_ts = {int(ts): rest.bar(i) for i, ts in enumerate(rest.timestamps)}
+            for i in range(1, len(live)):
+                expected = rest_by_ts.get(int(live.timestamps[i]))
+                actual = live.bar(i)
+                status = "✅" if expected == actual else "❌"
+                mismatches += expected != actual
+                print(f"   {status} {code} live={actual} rest={expected}")
+
+        print(f"\n📊 bar_aggregator 상태: {bar_aggregator.get_status_info()}")
+        if not closed:
+            return 4
+        return 5 if mismatches else 0
+    finally:
+        bar_aggregator.remove_bar_listener(on_bar)
+        await bar_aggregator.stop()
+        await api.graceful_shutdown()
+        await api.close()
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--stock-codes", default="005930", help="구독할 종목코드 (쉼표 구분)")
+    p.add_argument("--minutes", type=int, default=2, help="봉 마감 대기 시간 (분)")
+    args = p.parse_args()
+
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+"""
+실시간 체결 시세 구독 테스트 스크립트
+
+목적:
+- WebSocket REG(0B) 구독 후 체결 시세가 tick_store에 기록되는지 검증
+- get_current_price가 REST 호출 없이 실시간 시세를 반환하는지 확인
+
+예시:
+  python test_realtime_price.py
+  python test_realtime_price.py --stock-codes 005930,000660 --seconds 30
+"""
+
+# Windows 콘솔 UTF-8 인코딩 설정
+import sys
+import io
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import asyncio
+from datetime import datetime
+
+from core.config import Config
+from api.kiwoom_api import KiwoomAPI
+from api.tick_store import tick_store
+
+
+async def run(args: argparse.Namespace) -> int:
+    api = KiwoomAPI()
+    stock_codes = [c.strip() for c in args.stock_codes.split(",") if c.strip()]
+
+    print("=" * 70)
+    print("Kiwoom Realtime Price Test")
+    print(f"- use_mock_account: {Config.KIWOOM_USE_MOCK_ACCOUNT}")
+    print(f"- stock_codes: {stock_codes}")
+    print(f"- current_time: {datetime.now().isoformat()}")
+    print("=" * 70)
+
+    # 1) 토큰 인증 및 WebSocket 연결
+    print("\n[1] 토큰 인증 및 WebSocket 연결")
+    if not await api.authenticate():
+        print("❌ 인증 실패")
+        return 1
+    if not await api.connect():
+        print("❌ WebSocket 연결 실패")
+        return 2
+    print("✅ 연결 성공")
+
+    try:
+        # 2) 실시간 체결 구독
+        print("\n[2] 실시간 체결 구독")
+        if not await api.subscribe_realtime(stock_codes):
+            print("❌ 구독 실패")
+            return 3
+        print("✅ 구독 성공")
+
+        # 3) 체결 수신 확인
+        print(f"\n[3] {args.seconds}초 동안 체결 수신 대기 (장중에만 체결이 들어옵니다)")
+        received = {}
+
+        def on_tick(tick):
+            received[tick.stock_code] = received.get(tick.stock_code, 0) + 1
+            print(f"   📶 {tick.stock_code} {tick.price:,}원 체결량={tick.volume} 시각={tick.timestamp.strftime('%H:%M:%S')}")
+
+        tick_store.add_listener(on_tick)
+        await asyncio.sleep(args.seconds)
+        tick_store.remove_listener(on_tick)
+
+        # 4) 현재가 조회 (실시간 시세 사용 여부)
+        print("\n[4] 현재가 조회")
+        for code in stock_codes:
+            price = await api.get_current_price(code)
+            source = "실시간" if api.has_live_price(code) else "REST"
+            print(f"   - {code}: {price if price else 'N/A'} ({source}, 수신 {received.get(code, 0)}건)")
+
+        print(f"\n📊 tick_store 상태: {tick_store.get_status_info()}")
+        return 0 if received else 4
+    finally:
+        await api.graceful_shutdown()
+        await api.close()
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--stock-codes", default="005930", help="구독할 종목코드 (쉼표 구분)")
+    p.add_argument("--seconds", type=int, default=20, help="체결 수신 대기 시간 (초)")
+    args = p.parse_args()
+
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -61,7 +61,7 @@ async def run(args: argparse.Namespace) -> int:
     # 2) 토큰 갱신 (강제 갱신 모드 또는 토큰 없을 때)
     if args.renew or not is_valid:
         print("\n[2] 토큰 발급/갱신 시작")
-        success = api.authenticate()
+        success = await api.authenticate()
         
         if success:
             print("✅ 토큰 발급/갱신 성공")
@@ -45,7 +45,7 @@ async def run(args: argparse.Namespace) -> int:
     
     # 1) 토큰 인증
     print("\n[1] 토큰 인증")
-    ok = api.authenticate()
+    ok = await api.authenticate()
     if not ok:
         print("❌ 인증 실패")
         return 1
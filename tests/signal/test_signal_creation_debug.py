@@ -58,7 +58,7 @@ async def test_signal_creation():
     # 토큰 확인
     if not kiwoom_api.token_manager.get_valid_token():
         print("   - 토큰이 없습니다. 인증 시도...")
-        auth_result = kiwoom_api.authenticate()
+        auth_result = await kiwoom_api.authenticate()
         if not auth_result:
             print("   ❌ 인증 실패!")
             return
@@ -0,0 +1,183 @@
+"""
+보유 포지션 일괄 평가 검증 스크립트
+
+목적:
+- HOLDING 포지션 전체 현재가/손익이 계좌 조회 1회와 UPDATE 문 1회로 갱신되는지 검증
+- 계좌 응답에 없는 종목만 개별 현재가 조회로 보완하는지, 실시간 체결이 있는 종목은 시세 저장소 가격을 쓰는지 확인
+- 저장된 손익/수익률이 evaluate_position 결과와 같은지 확인
+- 종목별 개별 조회 방식(STOP_LOSS_BULK_REVALUATION=false)과 API 호출 수/소요 시간 비교
+
+가짜 API 클라이언트(set_kiwoom_api)가 kt00004 형식 잔고를 돌려주며, 호출마다 --call-delay초 지연을 둡니다
+(실제 API 호출 없음, 테스트 행은 마지막에 삭제).
+
+예시:
+  python test_bulk_revaluation.py
+  python test_bulk_revaluation.py --positions 100 --missing 5 --live 10 --call-delay 0.05
+"""
+
+# Windows 콘솔 UTF-8 인코딩 설정
+import sys
+import io
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import asyncio
+import logging
+import time
+
+import numpy as np
+from sqlalchemy import event
+
+from api.kiwoom_api import set_kiwoom_api
+from api.tick_store import tick_store
+from core.config import Config
+from core.models import Position, engine, get_db
+from managers.stop_loss_manager import StopLossManager
+from utils.trading_fees import evaluate_position
+
+logging.disable(logging.WARNING)
+
+
+class FakeKiwoomAPI:
+    """kt00004 형식 잔고와 종목별 현재가를 돌려주고 호출 수를 세는 가짜 클라이언트"""
+
+    def __init__(self, prices: dict, account_codes: set, live_codes: set, call_delay: float):
+        self.prices = prices
+        self.account_codes = account_codes
+        self.live_codes = live_codes
+        self.call_delay = call_delay
+        self.calls = {"kt00004": 0, "current_price": 0}
+
+    async def subscribe_realtime(self, stock_codes):
+        return True
+
+    def has_live_price(self, stock_code):
+        return stock_code in self.live_codes and tick_store.get(stock_code) is not None
+
+    async def get_current_price(self, stock_code, priority=None):
+        if self.has_live_price(stock_code):
+            return tick_store.get_price(stock_code)
+        self.calls["current_price"] += 1
+        await asyncio.sleep(self.call_delay)
+        return self.prices.get(stock_code)
+
+    async def get_account_balance(self, account_number, priority=None):
+        self.calls["kt00004"] += 1
+        await asyncio.sleep(self.call_delay)
+        return {"stk_acnt_evlt_prst": [
+            {"stk_cd": f"A{code}", "qty": "10", "cur_pr": f"{self.prices[code]:012d}", "pur_amt": "0"}
+            for code in sorted(self.account_codes)
+        ]}
+
+
+class StatementCounter:
+    """positions 테이블 UPDATE 문 실행 횟수 (executemany는 1회)"""
+
+    def __init__(self):
+        self.updates = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE POSITIONS"):
+            self.updates += 1
+
+
+async def revalue(manager: StopLossManager, api: FakeKiwoomAPI, bulk: bool):
+    Config.STOP_LOSS_BULK_REVALUATION = bulk
+    manager._account_prices_at = 0.0
+    api.calls = {key: 0 for key in api.calls}
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    started = time.perf_counter()
+    try:
+        await manager._update_all_positions_price()
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+    return time.perf_counter() - started, dict(api.calls), counter.updates
+
+
+def stored(ids):
+    for db in get_db():
+        return {row.id: row for row in db.query(Position).filter(Position.id.in_(ids)).all()}
+
+
+async def run(args: argparse.Namespace) -> int:
+    rng = np.random.default_rng(args.seed)
+    codes = [f"B{i:05d}" for i in range(args.positions)]
+    prices = {code: int(rng.integers(1000, 200000)) for code in codes}
+    missing = set(codes[:args.missing])
+    live = set(codes[args.missing:args.missing + args.live])
+    api = FakeKiwoomAPI(prices, set(codes) - missing, live, args.call_delay)
+    previous = set_kiwoom_api(api)
+    bulk_setting = Config.STOP_LOSS_BULK_REVALUATION
+    manager = StopLossManager()
+
+    print("=" * 70)
+    print("Bulk Position Revaluation Test")
+    print(f"- 포지션 {args.positions}개 (계좌 응답 없음 {args.missing}, 실시간 {args.live}), API 지연 {args.call_delay * 1000:.0f}ms")
+    print("=" * 70)
+
+    ids = []
+    failures = 0
+    try:
+        for code in codes:
+            buy_price = int(prices[code] * rng.uniform(0.9, 1.1))
+            row = await manager.create_position(code, code, buy_price, 10)
+            ids.append(row.id)
+        # 실시간 종목은 계좌 응답과 다른 최신 체결가
+        for code in live:
+            tick_store.update(code, prices[code] + 50, volume=1)
+
+        elapsed, calls, updates = await revalue(manager, api, bulk=True)
+        rows = stored(ids)
+        wrong = 0
+        for code, position_id in zip(codes, ids):
+            row = rows[position_id]
+            expected_price = prices[code] + 50 if code in live else prices[code]
+            _, profit_loss, rate = evaluate_position(expected_price, row.buy_quantity, row.buy_amount)
+            if (row.current_price != expected_price or row.current_profit_loss != int(profit_loss)
+                    or abs(row.current_profit_loss_rate - rate) > 1e-9 or row.last_monitored is None):
+                wrong += 1
+        ok = calls == {"kt00004": 1, "current_price": args.missing} and updates == 1 and not wrong
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} 일괄 평가: 계좌 조회 {calls['kt00004']}회, 개별 현재가 {calls['current_price']}회, "
+              f"UPDATE 문 {updates}회, 값 불일치 {wrong}, {elapsed * 1000:.0f}ms")
+        print(f"   - {manager.revaluation_stats}")
+
+        elapsed, calls, updates = await revalue(manager, api, bulk=False)
+        print(f"📊 종목별 개별 조회 방식: 계좌 조회 {calls['kt00004']}회, 개별 현재가 {calls['current_price']}회, "
+              f"{elapsed * 1000:.0f}ms")
+
+        # 보유 종목 대조는 방금 일괄 평가에서 받은 계좌 조회를 재사용
+        await revalue(manager, api, bulk=True)
+        before = api.calls["kt00004"]
+        holdings = await manager._get_actual_holdings()
+        ok = api.calls["kt00004"] == before and holdings == set(codes) - missing
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} 보유 종목 대조 시 계좌 조회 재사용: 추가 조회 {api.calls['kt00004'] - before}회, "
+              f"보유 {len(holdings)}개 (A 접두어 제거)")
+    finally:
+        Config.STOP_LOSS_BULK_REVALUATION = bulk_setting
+        set_kiwoom_api(previous)
+        for db in get_db():
+            db.query(Position).filter(Position.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+            break
+    return 1 if failures else 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--positions", type=int, default=24, help="보유 포지션 수")
+    p.add_argument("--missing", type=int, default=3, help="계좌 응답에 없는 종목 수")
+    p.add_argument("--live", type=int, default=5, help="실시간 체결이 있는 종목 수")
+    p.add_argument("--call-delay", type=float, default=0.02, help="가짜 API 호출 지연 (초)")
+    p.add_argument("--seed", type=int, default=5, help="난수 시드")
+    args = p.parse_args()
+
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,144 @@
+"""
+API 제한(429) 중 손절 매도 검증 스크립트
+
+목적:
+- 시세 조회 429로 API 제한(LIMITED)에 걸린 상태에서 손절 트리거가 발동해도 매도 주문이 바로 나가는지 검증
+- 제한 중 대기하던 현재가 조회(STOP_LOSS 우선순위)는 그대로 대기하고, 주문만 토큰 버킷 예산으로 허가되는지 확인
+- 매도 주문 행이 FAILED 없이 1건(ORDERED)만 남고 포지션 상태가 바뀌는지 확인 (테스트 행은 마지막에 삭제)
+
+로컬 키움 에뮬레이터(utils/kiwoom_emulator)를 띄워 실제 KiwoomAPI 주문 경로로 보냅니다 (실서버 호출 없음).
+
+예시:
+  python test_order_during_lockout.py
+  python test_order_during_lockout.py --stock-code 005930 --quantity 10 --stop-loss 3
+"""
+
+# Windows 콘솔 UTF-8 인코딩 설정
+import sys
+import io
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import asyncio
+import logging
+import time
+
+from api.api_rate_limiter import APIPriority, api_rate_limiter
+from api.kiwoom_api import KiwoomAPI, set_kiwoom_api
+from core.config import Config
+from core.models import Position, SellOrder, get_db
+from managers.stop_loss_manager import StopLossManager
+from managers.trigger_book import trigger_book
+from utils.kiwoom_emulator import KiwoomEmulator
+
+logging.disable(logging.WARNING)
+
+
+class FakeSettings:
+    def __init__(self, stop_loss_rate: float, take_profit_rate: float):
+        self.is_enabled = True
+        self.stop_loss_rate = stop_loss_rate
+        self.take_profit_rate = take_profit_rate
+
+
+def sell_orders(position_id: int):
+    for db in get_db():
+        return [row.status for row in db.query(SellOrder).filter(SellOrder.position_id == position_id).all()]
+
+
+def position_status(position_id: int):
+    for db in get_db():
+        row = db.query(Position).filter(Position.id == position_id).first()
+        return row.status if row else None
+
+
+async def run(args: argparse.Namespace) -> int:
+    print("=" * 70)
+    print("Sell Order During API Lockout Test")
+    print(f"- 종목 {args.stock_code} {args.quantity}주, 손절 -{args.stop_loss}%")
+    print("=" * 70)
+
+    saved = (Config.KIWOOM_USE_MOCK_ACCOUNT, Config.KIWOOM_MOCK_API_URL, Config.KIWOOM_MOCK_WS_URL)
+    failures = 0
+    created = []
+    async with KiwoomEmulator(port=0, seed=args.seed, rate_limit=0) as emulator:
+        Config.KIWOOM_USE_MOCK_ACCOUNT = True
+        Config.KIWOOM_MOCK_API_URL = emulator.base_url
+        Config.KIWOOM_MOCK_WS_URL = emulator.ws_url
+        api = KiwoomAPI()
+        previous = set_kiwoom_api(api)
+        manager = StopLossManager()
+        price_task = None
+        try:
+            api_rate_limiter.reset_limits()
+            if not await api.authenticate():
+                print("❌ 에뮬레이터 토큰 발급 실패")
+                return 1
+            bought = await api.place_buy_order(args.stock_code, args.quantity, 0, "3")
+            buy_price = await api.get_current_price(args.stock_code, priority=APIPriority.STOP_LOSS)
+            print(f"📥 매수: {bought.get('success')} ({buy_price:,}원)")
+
+            manager.auto_trade_settings = FakeSettings(args.stop_loss, args.stop_loss * 2)
+            trigger_book.set_rates(args.stop_loss, args.stop_loss * 2)
+            row = await manager.create_position(args.stock_code, "제한중손절", buy_price, args.quantity)
+            created.append(row.id)
+            trigger = trigger_book.get(row.id)
+
+            # 준비 단계 호출 예산은 되돌린 뒤 시세 조회 429 -> 제한(LIMITED), 현재가 조회 하나가 제한 해제를 기다리는 중
+            api_rate_limiter.reset_limits()
+            api_rate_limiter.handle_api_error(Exception("429 Too Many Requests"))
+            api._price_cache.pop(args.stock_code)
+            price_task = asyncio.create_task(api.get_current_price(args.stock_code, priority=APIPriority.STOP_LOSS))
+            await asyncio.sleep(0.2)
+
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(manager._fire_trigger(row.id, trigger.stop_price, "STOP_LOSS"),
+                                       timeout=args.timeout)
+            except asyncio.TimeoutError:
+                pass
+            elapsed = time.perf_counter() - started
+
+            statuses = sell_orders(row.id)
+            status = position_status(row.id)
+            ok = statuses == ["ORDERED"] and status == "STOP_LOSS" and elapsed < args.timeout
+            failures += not ok
+            print(f"{'✅' if ok else '❌'} 제한 중 손절 매도: 매도 주문 {statuses}, 포지션 {status}, {elapsed * 1000:.0f}ms")
+
+            limiter = api_rate_limiter.get_status_info()
+            ok = limiter["status"] == "limited" and not price_task.done()
+            failures += not ok
+            print(f"{'✅' if ok else '❌'} 현재가 조회는 제한 해제까지 대기: 상태 {limiter['status']}, "
+                  f"대기열 {limiter['scheduler']['queue_by_priority']}")
+        finally:
+            if price_task is not None:
+                price_task.cancel()
+            api_rate_limiter.reset_limits()
+            set_kiwoom_api(previous)
+            await api.close()
+            Config.KIWOOM_USE_MOCK_ACCOUNT, Config.KIWOOM_MOCK_API_URL, Config.KIWOOM_MOCK_WS_URL = saved
+            for db in get_db():
+                db.query(SellOrder).filter(SellOrder.position_id.in_(created)).delete(synchronize_session=False)
+                for position in db.query(Position).filter(Position.id.in_(created)).all():
+                    db.delete(position)
+                db.commit()
+                break
+    return 1 if failures else 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--stock-code", default="005930", help="종목코드")
+    p.add_argument("--quantity", type=int, default=10, help="매수/매도 수량")
+    p.add_argument("--stop-loss", type=float, default=3.0, help="손절률 (%%)")
+    p.add_argument("--timeout", type=float, default=5.0, help="매도 완료 허용 시간 (초)")
+    p.add_argument("--seed", type=int, default=7, help="에뮬레이터 가격 시드")
+    args = p.parse_args()
+
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,206 @@
+"""
+스캘핑 실시간 청산 검증 스크립트
+
+목적:
+- 보유 종목 체결마다 익절/손절을 확인해 조건을 처음 넘은 체결 가격으로 바로 매도하는지 검증
+- 체결이 없어도 최대 보유 시간에 청산되는지 확인
+- 같은 가격 경로를 30초 주기로 확인했을 때의 초과 손실/이익과 비교
+- 체결 수신 -> 매도 주문 전송 지연 출력
+- positions 테이블에 저장한 스캘핑 포지션이 새 매니저(재시작)에서 같은 손절/익절가/만기로 복구되고,
+  StopLossManager 손절/익절 대상에서는 빠지는지 확인 (테스트 행은 마지막에 삭제)
+
+가짜 API 클라이언트(set_kiwoom_api)로 주문을 기록하고 tick_store에 임의 보행 체결을 넣습니다 (실제 주문 없음).
+
+예시:
+  python test_scalping_exits.py
+  python test_scalping_exits.py --positions 50 --ticks 2000 --tick-interval 0.002
+"""
+
+# Windows 콘솔 UTF-8 인코딩 설정
+import sys
+import io
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+from api.kiwoom_api import set_kiwoom_api
+from api.tick_store import tick_store
+from core.models import Position, SellOrder, get_db
+from managers.scalping_strategy import ScalpPosition, ScalpingStrategyManager, _to_utc
+
+logging.disable(logging.WARNING)
+
+
+class FakeKiwoomAPI:
+    """주문/구독만 기록하는 가짜 클라이언트"""
+
+    def __init__(self, order_delay: float):
+        self.order_delay = order_delay
+        self.sell_orders = []
+
+    async def subscribe_realtime(self, stock_codes):
+        return True
+
+    def has_live_price(self, stock_code):
+        return tick_store.get(stock_code) is not None
+
+    async def get_current_price(self, stock_code, priority=None):
+        tick = tick_store.get(stock_code)
+        return tick.price if tick else None
+
+    async def get_account_balance(self, account_number, priority=None):
+        return None
+
+    async def place_sell_order(self, stock_code, quantity, price=0, order_type="3"):
+        self.sell_orders.append((stock_code, quantity, price, time.time()))
+        await asyncio.sleep(self.order_delay)
+        return {"success": True}
+
+
+def first_crossing(path, position: ScalpPosition):
+    for i, price in enumerate(path):
+        if price >= position.target or price <= position.stop:
+            return i, price
+    return None, None
+
+
+async def run(args: argparse.Namespace) -> int:
+    rng = np.random.default_rng(args.seed)
+    api = FakeKiwoomAPI(args.order_delay)
+    previous = set_kiwoom_api(api)
+    manager = ScalpingStrategyManager()
+    params = manager.scalping_strategies["MOMENTUM_SCALP"]
+
+    print("=" * 70)
+    print("Scalping Exit Test")
+    print(f"- {args.positions} positions, {args.ticks} ticks/position, tick interval {args.tick_interval * 1000:.1f}ms")
+    print("=" * 70)
+
+    failures = 0
+    try:
+        await manager.start_scalping_monitoring()
+        # 신호 탐색 스케줄은 이 검증과 무관
+        for task in manager.scan_tasks:
+            task.cancel()
+
+        # 1. 실시간 체결 청산
+        paths = {}
+        for i in range(args.positions):
+            code = f"{i:06d}"
+            entry = 10000
+            steps = rng.normal(0, entry * 0.0004, args.ticks).round()
+            paths[code] = np.maximum(entry + np.cumsum(steps), 1).astype(int)
+            position = ScalpPosition(code, code, "MOMENTUM_SCALP", entry, 10, params)
+            manager.active_positions[code] = position
+            manager._arm_max_hold_timer(position)
+
+        expected = {code: first_crossing(path, manager.active_positions[code]) for code, path in paths.items()}
+        for t in range(args.ticks):
+            for code, path in paths.items():
+                tick_store.update(code, int(path[t]), volume=1)
+            await asyncio.sleep(args.tick_interval)
+        await asyncio.sleep(args.order_delay * 2)
+
+        sold = {code: price for code, _, price, _ in api.sell_orders}
+        wrong = [code for code, (index, price) in expected.items() if index is not None and sold.get(code) != price]
+        duplicates = len(api.sell_orders) - len(sold)
+        failures += len(wrong) + duplicates
+        crossed = sum(1 for index, _ in expected.values() if index is not None)
+        print(f"{'✅' if not wrong and not duplicates else '❌'} 조건 도달 {crossed}건 -> 매도 {len(sold)}건 "
+              f"(가격 불일치 {len(wrong)}, 중복 주문 {duplicates})")
+
+        # 같은 경로를 poll_ticks 체결마다 확인했을 때 (30초 주기 확인에 해당) 확인 시점 가격과 첫 도달 가격의 차이
+        poll_every = max(1, args.poll_ticks)
+        overshoot = []
+        for code, (index, price) in expected.items():
+            if index is None:
+                continue
+            checked = min(len(paths[code]) - 1, (index // poll_every + 1) * poll_every - 1)
+            overshoot.append(abs(int(paths[code][checked]) - price) / 10000 * 100)
+        if overshoot:
+            print(f"📉 {poll_every}체결마다 확인 시 첫 도달 가격 대비 차이: 평균 {np.mean(overshoot):.3f}%p, 최대 {np.max(overshoot):.3f}%p")
+
+        latency = manager._latency_summary("tick_to_order_ms")
+        print(f"⏱️ 체결 수신 -> 매도 주문: p50 {latency['p50_ms']}ms, p95 {latency['p95_ms']}ms, max {latency['max_ms']}ms "
+              f"({latency['count']}건), 주문 응답 p50 {manager._latency_summary('order_ms')['p50_ms']}ms")
+
+        # 2. 체결이 없는 포지션은 최대 보유 시간 타이머로 청산
+        hold_params = dict(params, max_hold_minutes=args.max_hold_seconds / 60)
+        quiet = ScalpPosition("999999", "999999", "MOMENTUM_SCALP", 10000, 1, hold_params)
+        manager.active_positions[quiet.stock_code] = quiet
+        manager._arm_max_hold_timer(quiet)
+        tick_store.update(quiet.stock_code, 10000, volume=1)
+        await asyncio.sleep(args.max_hold_seconds + args.order_delay * 2 + 0.2)
+        record = next((e for e in manager.recent_exits if e["stock_code"] == quiet.stock_code), None)
+        ok = record is not None and record["reason"] == "MAX_HOLD" and quiet.stock_code not in manager.active_positions
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} 체결 없는 포지션 최대 보유 시간 청산: {record}")
+    finally:
+        await manager.stop_scalping_monitoring()
+
+    try:
+        failures += await check_restore(manager, params)
+    finally:
+        set_kiwoom_api(previous)
+    return 1 if failures else 0
+
+
+async def check_restore(manager: ScalpingStrategyManager, params) -> int:
+    """저장 -> 새 매니저에서 복구 -> 체결로 청산 -> DB 상태 확인"""
+    code = "TEST01"
+    original = ScalpPosition(code, "테스트", "MOMENTUM_SCALP", 10000, 3, params)
+    row = await manager.stop_loss_manager.create_position(
+        code, "테스트", 10000, 3, stop_loss_rate=params['stop_loss'], take_profit_rate=params['profit_target'],
+        stop_loss_price=original.stop, take_profit_price=original.target, position_type="SCALP",
+        strategy_type="MOMENTUM_SCALP", max_hold_until=_to_utc(original.deadline))
+    try:
+        excluded = all(p.id != row.id for p in await manager.stop_loss_manager._get_active_positions())
+
+        restarted = ScalpingStrategyManager()
+        restored_count = await restarted.restore_positions()
+        restored = restarted.active_positions.get(code)
+        same = (restored is not None and restored.position_id == row.id and restored.target == original.target
+                and restored.stop == original.stop and abs(restored.deadline - original.deadline) < 0.001)
+
+        tick_store.update(code, original.stop, volume=1)
+        await asyncio.sleep(0.3)
+        await restarted.stop_scalping_monitoring()
+        status = None
+        for db in get_db():
+            status = db.query(Position).filter(Position.id == row.id).first().status
+            break
+        ok = excluded and same and status == "STOP_LOSS" and code not in restarted.active_positions
+        print(f"{'✅' if ok else '❌'} 재시작 복구: {restored_count}개 복구, 손절/익절가 {restored.stop if restored else '-'}/"
+              f"{restored.target if restored else '-'}, StopLossManager 제외 {excluded}, 청산 후 상태 {status}")
+        return 0 if ok else 1
+    finally:
+        for db in get_db():
+            db.query(SellOrder).filter(SellOrder.position_id == row.id).delete()
+            db.query(Position).filter(Position.id == row.id).delete()
+            db.commit()
+            break
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--positions", type=int, default=20, help="보유 포지션 수")
+    p.add_argument("--ticks", type=int, default=1000, help="포지션당 체결 수")
+    p.add_argument("--tick-interval", type=float, default=0.001, help="체결 간격 (초)")
+    p.add_argument("--poll-ticks", type=int, default=100, help="비교용 주기 확인 간격 (체결 수)")
+    p.add_argument("--order-delay", type=float, default=0.05, help="가짜 주문 응답 지연 (초)")
+    p.add_argument("--max-hold-seconds", type=float, default=1.0, help="체결 없는 포지션의 최대 보유 시간 (초)")
+    p.add_argument("--seed", type=int, default=7, help="난수 시드")
+    args = p.parse_args()
+
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,268 @@
+"""
+손절/익절 트리거 북 검증 스크립트
+
+목적:
+- 트리거 북이 가격마다 돌려주는 포지션이 전체 포지션을 수수료 포함 수익률로 하나씩 확인한 결과와 같은지 검증
+- 포지션 수를 늘려도 가격 갱신 1회 평가 시간이 거의 일정한지 (전체 순회와 비교) 출력
+- positions 테이블 insert/update/삭제가 커밋 후에만 반영되고 롤백은 무시되는지 확인
+- 체결 한 건으로 손절 트리거가 발동해 매도 주문 1건과 포지션 상태 변경까지 이어지는지 확인 (테스트 행은 마지막에 삭제)
+
+가짜 API 클라이언트(set_kiwoom_api)로 주문을 기록합니다 (실제 주문 없음).
+
+예시:
+  python test_trigger_book.py
+  python test_trigger_book.py --positions 100 1000 10000 --stocks 50 --stop-loss 3 --take-profit 7
+"""
+
+# Windows 콘솔 UTF-8 인코딩 설정
+import sys
+import io
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+from api.kiwoom_api import set_kiwoom_api
+from api.tick_store import tick_store
+from core.models import Position, SellOrder, get_db
+from managers.stop_loss_manager import StopLossManager
+from managers.trigger_book import TriggerBook, trigger_book
+from utils.trading_fees import evaluate_position
+
+logging.disable(logging.WARNING)
+
+
+class FakeKiwoomAPI:
+    """주문만 기록하는 가짜 클라이언트"""
+
+    def __init__(self):
+        self.sell_orders = []
+
+    async def subscribe_realtime(self, stock_codes):
+        return True
+
+    def has_live_price(self, stock_code):
+        return tick_store.get(stock_code) is not None
+
+    async def get_current_price(self, stock_code, priority=None):
+        tick = tick_store.get(stock_code)
+        return tick.price if tick else None
+
+    async def get_account_balance(self, account_number, priority=None):
+        return None
+
+    async def place_sell_order(self, stock_code, quantity, price=0, order_type="3"):
+        self.sell_orders.append((stock_code, quantity))
+        return {"success": True, "order_id": f"T{len(self.sell_orders)}"}
+
+
+class FakeSettings:
+    def __init__(self, stop_loss_rate: float, take_profit_rate: float):
+        self.is_enabled = True
+        self.stop_loss_rate = stop_loss_rate
+        self.take_profit_rate = take_profit_rate
+
+
+def random_positions(rng, count: int, stocks: int):
+    """(포지션 ID, 종목, 수량, 매입금액, 종목 기준가) - 같은 종목 포지션은 기준가 +-2% 안에서 매수"""
+    bases = rng.integers(1000, 300000, stocks)
+    positions = []
+    for position_id in range(1, count + 1):
+        base = int(bases[position_id % stocks])
+        quantity = int(rng.integers(1, 300))
+        buy_amount = int(base * quantity * rng.uniform(0.98, 1.02))
+        positions.append((position_id, f"{position_id % stocks:06d}", quantity, buy_amount, base))
+    return positions
+
+
+def brute_force(positions, stock_code: str, price: int, stop: float, take: float):
+    fired = set()
+    for position_id, code, quantity, buy_amount, _ in positions:
+        if code != stock_code:
+            continue
+        rate = evaluate_position(price, quantity, buy_amount)[2]
+        if rate <= -stop:
+            fired.add((position_id, "STOP_LOSS"))
+        elif rate >= take:
+            fired.add((position_id, "TAKE_PROFIT"))
+    return fired
+
+
+def check_accuracy(args, rng) -> int:
+    positions = random_positions(rng, 300, 10)
+    book = TriggerBook()
+    book.set_rates(args.stop_loss, args.take_profit)
+    for position_id, code, quantity, buy_amount, _ in positions:
+        book.upsert(position_id, code, quantity, buy_amount)
+
+    checked = mismatched = 0
+    for position_id, code, quantity, buy_amount, base in positions[:60]:
+        trigger = book.get(position_id)
+        # 트리거 가격 경계 +-2원과 기준가 주변 임의 가격
+        prices = {trigger.stop_price + d for d in range(-2, 3)} | {trigger.take_price + d for d in range(-2, 3)}
+        prices |= {int(p) for p in rng.uniform(base * 0.85, base * 1.15, 20)}
+        for price in prices:
+            checked += 1
+            if set(book.crossed(code, price)) != brute_force(positions, code, price, args.stop_loss, args.take_profit):
+                mismatched += 1
+    print(f"{'✅' if not mismatched else '❌'} 트리거 북 = 전체 순회 수익률 판정: {checked}개 가격 중 불일치 {mismatched}")
+    return 1 if mismatched else 0
+
+
+def check_scaling(args, rng) -> int:
+    print(f"⏱️ 가격 갱신 1회 평가 시간 ({args.stocks}개 종목, 발동 트리거 수 제외한 탐색 비용)")
+    for count in args.positions:
+        positions = random_positions(rng, count, args.stocks)
+        book = TriggerBook()
+        book.set_rates(args.stop_loss, args.take_profit)
+        for position_id, code, quantity, buy_amount, _ in positions:
+            book.upsert(position_id, code, quantity, buy_amount)
+
+        # 발동이 없는 가격 (매입가 근처) 갱신
+        updates = [(positions[i][1], positions[i][4]) for i in rng.integers(0, count, 2000)]
+        started = time.perf_counter()
+        for code, price in updates:
+            book.crossed(code, price)
+        book_us = (time.perf_counter() - started) / len(updates) * 1e6
+
+        sample = updates[:50]
+        started = time.perf_counter()
+        for code, price in sample:
+            brute_force(positions, code, price, args.stop_loss, args.take_profit)
+        scan_us = (time.perf_counter() - started) / len(sample) * 1e6
+        print(f"   - 포지션 {count:>6,}개: 트리거 북 {book_us:7.2f}us, 전체 순회 {scan_us:10.1f}us")
+    return 0
+
+
+def position_status(position_id: int):
+    for db in get_db():
+        row = db.query(Position).filter(Position.id == position_id).first()
+        return row.status if row else None
+
+
+async def check_sync(args, manager: StopLossManager, created: list) -> int:
+    failures = 0
+    trigger_book.set_rates(args.stop_loss, args.take_profit)
+    trigger_book.load()
+
+    row = await manager.create_position("TBK001", "트리거테스트", 10000, 10)
+    created.append(row.id)
+    inserted = trigger_book.get(row.id)
+    ok = inserted is not None and inserted.stop_price < 10000 < inserted.take_price
+    failures += not ok
+    print(f"{'✅' if ok else '❌'} insert 커밋 반영: 손절가 {inserted.stop_price if inserted else '-'} / "
+          f"익절가 {inserted.take_price if inserted else '-'}")
+
+    # 롤백된 변경은 반영하지 않음
+    for db in get_db():
+        db.query(Position).filter(Position.id == row.id).first().status = "STOP_LOSS"
+        db.flush()
+        db.rollback()
+        break
+    ok = trigger_book.get(row.id) is not None
+    failures += not ok
+    print(f"{'✅' if ok else '❌'} 롤백된 상태 변경 무시")
+
+    # 매입금액 변경(체결 후 실제 매입금액) -> 트리거 가격 재계산, 현재가만 바뀐 update는 무시
+    synced = trigger_book.stats["synced"]
+    for db in get_db():
+        db.query(Position).filter(Position.id == row.id).first().current_price = 10100
+        db.commit()
+        break
+    unchanged = trigger_book.stats["synced"] == synced
+    for db in get_db():
+        db.query(Position).filter(Position.id == row.id).first().actual_buy_amount = 110000
+        db.commit()
+        break
+    updated = trigger_book.get(row.id)
+    ok = unchanged and updated.stop_price > inserted.stop_price and updated.take_price > inserted.take_price
+    failures += not ok
+    print(f"{'✅' if ok else '❌'} update 커밋 반영: 현재가만 변경 시 무시 {unchanged}, "
+          f"매입금액 변경 후 손절가 {updated.stop_price} / 익절가 {updated.take_price}")
+
+    # 스캘핑 포지션은 색인하지 않음
+    scalp = await manager.create_position("TBK002", "스캘핑테스트", 10000, 10, position_type="SCALP")
+    created.append(scalp.id)
+    ok = trigger_book.get(scalp.id) is None
+    failures += not ok
+    print(f"{'✅' if ok else '❌'} 스캘핑 포지션 제외")
+    return failures
+
+
+async def check_tick_exit(args, manager: StopLossManager, created: list) -> int:
+    api = FakeKiwoomAPI()
+    previous = set_kiwoom_api(api)
+    try:
+        manager.auto_trade_settings = FakeSettings(args.stop_loss, args.take_profit)
+        trigger_book.set_rates(args.stop_loss, args.take_profit)
+        manager.is_running = True
+        tick_store.add_listener(manager.on_tick)
+
+        row = await manager.create_position("TBK003", "체결테스트", 20000, 5)
+        created.append(row.id)
+        trigger = trigger_book.get(row.id)
+        tick_store.update("TBK003", trigger.stop_price + 1, volume=1)  # 손절가 위 - 발동 없음
+        await asyncio.sleep(0.05)
+        before = len(api.sell_orders)
+        for _ in range(3):  # 손절가 도달 체결이 연속으로 와도 주문은 1건
+            tick_store.update("TBK003", trigger.stop_price, volume=1)
+        for _ in range(50):
+            await asyncio.sleep(0.02)
+            if position_status(row.id) != "HOLDING":
+                break
+        status = position_status(row.id)
+        ok = before == 0 and len(api.sell_orders) == 1 and status == "STOP_LOSS" and trigger_book.get(row.id) is None
+        print(f"{'✅' if ok else '❌'} 체결로 손절 발동: 손절가 {trigger.stop_price:,}원, 매도 주문 {len(api.sell_orders)}건, "
+              f"상태 {status}, 트리거 북 {trigger_book.get_status_info()}")
+        return 0 if ok else 1
+    finally:
+        manager.is_running = False
+        tick_store.remove_listener(manager.on_tick)
+        set_kiwoom_api(previous)
+
+
+async def run(args: argparse.Namespace) -> int:
+    rng = np.random.default_rng(args.seed)
+    print("=" * 70)
+    print("Trigger Book Test")
+    print(f"- 손절 -{args.stop_loss}% / 익절 {args.take_profit}%")
+    print("=" * 70)
+
+    failures = check_accuracy(args, rng)
+    failures += check_scaling(args, rng)
+
+    manager = StopLossManager()
+    created = []
+    try:
+        failures += await check_sync(args, manager, created)
+        failures += await check_tick_exit(args, manager, created)
+    finally:
+        for db in get_db():
+            db.query(SellOrder).filter(SellOrder.position_id.in_(created)).delete(synchronize_session=False)
+            for row in db.query(Position).filter(Position.id.in_(created)).all():
+                db.delete(row)
+            db.commit()
+            break
+    return 1 if failures else 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--positions", type=int, nargs="+", default=[100, 1000, 10000], help="비교할 포지션 수")
+    p.add_argument("--stocks", type=int, default=50, help="종목 수")
+    p.add_argument("--stop-loss", type=float, default=5.0, help="손절률 (%%)")
+    p.add_argument("--take-profit", type=float, default=10.0, help="익절률 (%%)")
+    p.add_argument("--seed", type=int, default=11, help="난수 시드")
+    args = p.parse_args()
+
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1 @@
+"""전략 계산 테스트"""
@@ -0,0 +1,165 @@
+"""
+전략 백테스트 검증 스크립트
+
+목적:
+- 봉 단위 신호(PanelStrategy.bar_signals)가 StrategyManager의 종목별 pandas 계산을 봉마다 다시 한 것과 같은지 검증
+- 배열 수익률 계산(utils/trading_fees.py)이 StopLossManager와 같은 평가 공식인지 검증 (모의투자/실계좌)
+- 청산 사유가 손절/익절 기준과 맞는지 확인
+- 한 계좌로 재생한 최대낙폭이 100%를 넘지 않는지 확인
+- 많은 종목 x 긴 분봉 이력의 백테스트 소요 시간 측정
+
+API/DB 호출 없이 임의 보행 캔들로 검증합니다.
+
+예시:
+  python test_backtest.py
+  python test_backtest.py --stocks 300 --bars 20000 --check-bars 60
+"""
+
+# Windows 콘솔 UTF-8 인코딩 설정
+import sys
+import io
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+import numpy as np
+
+# 프로젝트 루트 (managers/...) - 같은 폴더의 test_strategy_panel은 스크립트 경로로 찾음
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from managers.backtest import BacktestSettings, run_backtest
+from managers.indicator_nodes import BarArrays
+from managers.strategies import STRATEGIES
+from managers.strategy_manager import StrategyManager
+from test_strategy_panel import PARAMETER_SETS, random_series
+from utils.trading_fees import evaluate_position, profit_loss_rates
+
+# 종목별 계산의 상세 로그(데이터 부족 구간 오류 포함)는 생략
+logging.disable(logging.ERROR)
+
+# scripts/test_calculation.py의 실제 계좌 값 (모의투자, 목표 손익과 100원 이내)
+MOCK_ACCOUNT_CASES = [
+    (74800, 6, 447600, -2827),
+    (431000, 1, 443000, -15911),
+    (24300, 20, 497000, -15402),
+    (486500, 1, 487500, -5372),
+    (104300, 4, 411000, 2477),
+]
+
+
+async def check_signals(args: argparse.Namespace, rng: np.random.Generator) -> int:
+    """마지막 check_bars개 봉 위치마다 종목별 계산(series[:t+1])과 봉 단위 신호 비교"""
+    manager = StrategyManager()
+    calculators = {
+        "MOMENTUM": manager._calculate_momentum_signal,
+        "DISPARITY": manager._calculate_disparity_signal,
+        "BOLLINGER": manager._calculate_bollinger_signal,
+        "RSI": manager._calculate_rsi_signal,
+        "ICHIMOKU": manager._calculate_ichimoku_signal,
+        "CHAIKIN": manager._calculate_chaikin_signal,
+    }
+    mismatches = compared = signals = 0
+    for i in range(args.parity_stocks):
+        s = random_series(f"{i:06d}", args.parity_bars, rng)
+        bars = BarArrays(s)
+        # 앞부분(데이터 부족 구간) + 마지막 check_bars개
+        positions = sorted(set(range(0, min(60, len(s)))) | set(range(max(0, len(s) - args.check_bars), len(s))))
+        for strategy_type, sets in PARAMETER_SETS.items():
+            strategy = STRATEGIES[strategy_type]
+            for params in sets:
+                buy, sell = strategy.bar_signals(bars, strategy.resolve(params))
+                for t in positions:
+                    expected = await calculators[strategy_type](s[:t + 1].to_frame(), params)
+                    expected_type = expected["signal_type"] if expected else None
+                    actual_type = "BUY" if buy[t] else "SELL" if sell[t] else None
+                    compared += 1
+                    signals += actual_type is not None
+                    if expected_type != actual_type:
+                        mismatches += 1
+                        print(f"❌ {strategy_type}{params} {s.stock_code} 봉 {t}: 종목별={expected_type} 봉 단위={actual_type}")
+    print(f"📊 봉 단위 신호 비교 {compared:,}건 (신호 {signals}건), 불일치 {mismatches}건")
+    return mismatches
+
+
+def check_fees() -> int:
+    failures = 0
+    for price, quantity, buy_amount, target in MOCK_ACCOUNT_CASES:
+        _, profit_loss, _ = evaluate_position(price, quantity, buy_amount, mock=True)
+        if abs(profit_loss - target) > 100:
+            failures += 1
+            print(f"❌ 모의투자 손익 {price:,}원 x {quantity}주: 계산 {profit_loss:,.0f}원, 목표 {target:,}원")
+
+    # 배열 수익률 == 건별 평가 공식 (절사 포함)
+    prices = np.arange(1000, 200000, 37)
+    for mock in (True, False):
+        quantity, buy_amount = 7, 350000
+        expected = np.array([evaluate_position(int(p), quantity, buy_amount, mock)[2] for p in prices])
+        if not np.allclose(profit_loss_rates(prices, quantity, buy_amount, mock), expected):
+            failures += 1
+            print(f"❌ 배열 수익률 불일치 (mock={mock})")
+    print(f"💰 수수료/제세금 검증 실패 {failures}건")
+    return failures
+
+
+def check_backtest(args: argparse.Namespace, rng: np.random.Generator) -> int:
+    series = {f"{i:06d}": random_series(f"{i:06d}", args.bars, rng) for i in range(args.stocks)}
+    settings = BacktestSettings(stop_loss_rate=3, take_profit_rate=5, max_invest_amount=1000000,
+                                mock=True, exit_on_sell_signal=args.exit_on_sell_signal)
+    failures = 0
+    for strategy_type in STRATEGIES:
+        started = time.perf_counter()
+        report = run_backtest(series, strategy_type, {}, settings, trade_limit=None)
+        elapsed = time.perf_counter() - started
+
+        for trade in report["trade_list"]:
+            rate = trade["profit_loss_rate"]
+            if (trade["exit_reason"] == "STOP_LOSS" and rate > -settings.stop_loss_rate + 0.01
+                    or trade["exit_reason"] == "TAKE_PROFIT" and rate < settings.take_profit_rate - 0.01):
+                failures += 1
+                print(f"❌ {strategy_type} 청산 사유 불일치: {trade}")
+        # 한 계좌(initial_capital)로 재생하므로 손실이 자본을 넘을 수 없음
+        if report["max_drawdown_rate"] > 100 or report["total_profit_loss"] < -report["initial_capital"]:
+            failures += 1
+            print(f"❌ {strategy_type} 자본 초과 손실: 최대낙폭 {report['max_drawdown_rate']:.2f}%, "
+                  f"손익 {report['total_profit_loss']:+,}원 (초기 자본 {report['initial_capital']:,}원)")
+        print(f"⏱️ {strategy_type:<10} {report['symbols']}종목 {report['bars']:,}봉: {elapsed * 1000:8.1f}ms | "
+              f"거래 {report['trades']:>6}건, 승률 {report['win_rate']:5.1f}%, 손익 {report['total_profit_loss']:+,}원, "
+              f"최대낙폭 {report['max_drawdown']:,}원 ({report['max_drawdown_rate']:.2f}%) {report['exit_reasons']}")
+    return failures
+
+
+async def run(args: argparse.Namespace) -> int:
+    rng = np.random.default_rng(args.seed)
+    print("=" * 70)
+    print("Backtest Test")
+    print(f"- parity: {args.parity_stocks} stocks x {args.parity_bars} bars, backtest: {args.stocks} stocks x {args.bars} bars")
+    print("=" * 70)
+
+    failures = await check_signals(args, rng)
+    failures += check_fees()
+    failures += check_backtest(args, rng)
+    return 1 if failures else 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--parity-stocks", type=int, default=3, help="신호 비교 종목 수")
+    p.add_argument("--parity-bars", type=int, default=400, help="신호 비교 종목당 봉 수")
+    p.add_argument("--check-bars", type=int, default=40, help="종목별 계산과 비교할 마지막 봉 수")
+    p.add_argument("--stocks", type=int, default=100, help="백테스트 종목 수")
+    p.add_argument("--bars", type=int, default=5000, help="백테스트 종목당 봉 수")
+    p.add_argument("--exit-on-sell-signal", action="store_true", help="매도 신호에도 청산")
+    p.add_argument("--seed", type=int, default=7, help="난수 시드")
+    args = p.parse_args()
+
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,195 @@
+"""
+봉 마감 스캔 스케줄러 검증 스크립트
+
+목적:
+- 1/3/5분 스케줄이 장중 봉 마감(+여유) 시각에만 깨어나는지, 장 밖에는 실행하지 않는지 검증
+- 선조회가 마감 BAR_PREFETCH_LEAD_SECONDS초 전에 실행되는지 확인
+- 평가가 다음 봉 마감을 넘기면 밀린 봉을 건너뛰는지 확인
+- 봉 마감 -> 평가/신호 지연 통계 출력
+
+시뮬레이션 시계로 하루를 즉시 재생합니다 (API/DB 호출 없음).
+
+예시:
+  python test_bar_scheduler.py
+  python test_bar_scheduler.py --date 2025-01-06 --overrun 130
+"""
+
+# Windows 콘솔 UTF-8 인코딩 설정
+import sys
+import io
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import asyncio
+import heapq
+import itertools
+import logging
+from datetime import datetime, timedelta
+
+from core.config import Config
+from utils.bar_scheduler import BarCloseScheduler
+from utils.market_hours import is_market_open
+
+logging.disable(logging.WARNING)
+
+
+class VirtualClock:
+    """가장 이른 대기부터 시각을 건너뛰며 깨우는 시뮬레이션 시계"""
+
+    def __init__(self, start: datetime):
+        self.current = start
+        self._waiters = []
+        self._seq = itertools.count()
+
+    def now(self) -> datetime:
+        return self.current
+
+    async def sleep(self, seconds: float):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (self.current + timedelta(seconds=seconds), next(self._seq), future))
+        await future
+
+    async def run_until(self, end: datetime):
+        while True:
+            # 깨운 태스크들이 다음 대기에 들어갈 때까지 양보
+            for _ in range(20):
+                await asyncio.sleep(0)
+            if not self._waiters or self._waiters[0][0] > end:
+                break
+            wake_at, _, future = heapq.heappop(self._waiters)
+            self.current = max(self.current, wake_at)
+            if not future.done():
+                future.set_result(None)
+        self.current = end
+
+
+def expected_closes(day: datetime, minutes: int):
+    """정규장 봉 마감 시각 (09:00 다음 첫 마감 ~ 15:30)"""
+    close = day.replace(hour=9, minute=0) + timedelta(minutes=minutes)
+    session_close = day.replace(hour=15, minute=30)
+    closes = []
+    while close < session_close:
+        closes.append(close)
+        close += timedelta(minutes=minutes)
+    return closes + [session_close]
+
+
+async def check_day(args: argparse.Namespace, day: datetime) -> int:
+    clock = VirtualClock(day.replace(hour=args.start_hour))
+    scheduler = BarCloseScheduler(clock=clock.now, sleep=clock.sleep)
+    calls = {tf: {"prefetch": [], "close": []} for tf in ("1M", "3M", "5M")}
+
+    def make(tf):
+        async def prefetch(bar_close):
+            calls[tf]["prefetch"].append((clock.now(), bar_close))
+
+        async def on_close(bar_close):
+            calls[tf]["close"].append((clock.now(), bar_close))
+            scheduler.record_latency(f"STRATEGY_{tf}", bar_close)
+        return prefetch, on_close
+
+    tasks = []
+    for tf in calls:
+        prefetch, on_close = make(tf)
+        tasks.append(scheduler.schedule(f"scan_{tf}", tf, on_close, prefetch=prefetch))
+    await clock.run_until(day.replace(hour=23, minute=59))
+
+    failures = 0
+    for tf, recorded in calls.items():
+        closes = [bar_close for _, bar_close in recorded["close"]]
+        expected = expected_closes(day, int(tf[:-1]))
+        if closes != expected:
+            failures += 1
+            print(f"❌ {tf} 봉 마감 불일치: {len(closes)}회 (예상 {len(expected)}회) {closes[:3]} ...")
+        late = [woke for woke, bar_close in recorded["close"]
+                if woke != bar_close + timedelta(seconds=scheduler.grace)]
+        outside = [woke for woke, _ in recorded["close"] if not is_market_open(woke - timedelta(seconds=scheduler.grace))]
+        early = [at for at, bar_close in recorded["prefetch"]
+                 if (bar_close - at).total_seconds() != scheduler.prefetch_lead]
+        failures += bool(late) + bool(outside) + bool(early)
+        print(f"{'✅' if not (late or outside or early) and closes == expected else '❌'} {tf}: 평가 {len(closes)}회 "
+              f"(첫 {closes[0].strftime('%H:%M') if closes else '-'}, 마지막 {closes[-1].strftime('%H:%M') if closes else '-'}), "
+              f"선조회 {len(recorded['prefetch'])}회, 여유 밖 {len(late)}, 장 밖 {len(outside)}, 선조회 시각 오류 {len(early)}")
+
+    status = scheduler.get_status_info()
+    print(f"📊 신호 지연: {status['signal_latency']}")
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return failures
+
+
+async def check_overrun(args: argparse.Namespace, day: datetime) -> int:
+    """1분봉 평가가 overrun초 걸리면 그 사이 마감된 봉은 건너뛰고 다음 마감에 맞춰 재개"""
+    clock = VirtualClock(day.replace(hour=9, minute=0))
+    scheduler = BarCloseScheduler(clock=clock.now, sleep=clock.sleep)
+    closes = []
+
+    async def on_close(bar_close):
+        closes.append(bar_close)
+        await clock.sleep(args.overrun)
+
+    task = scheduler.schedule("slow_1M", "1M", on_close)
+    await clock.run_until(day.replace(hour=9, minute=30))
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    info = scheduler.get_status_info()["schedules"]["slow_1M"]
+    step = {int((b - a).total_seconds()) for a, b in zip(closes, closes[1:])}
+    # 평가가 끝난 뒤 첫 마감 (09:01 + grace + overrun 이후)
+    expected_step = (int(scheduler.grace + args.overrun) // 60 + 1) * 60
+    ok = step == {expected_step} and info["skipped_bars"] == info["runs"] * (expected_step // 60 - 1)
+    print(f"{'✅' if ok else '❌'} 평가 {args.overrun}초 지연: 실행 {info['runs']}회, 간격 {sorted(step)}초, "
+          f"건너뛴 봉 {info['skipped_bars']}개, 마감->완료 {info['close_to_done']}")
+    return 0 if ok else 1
+
+
+async def check_weekend(day: datetime) -> int:
+    """토요일에 시작하면 월요일 첫 봉 마감까지 실행하지 않음"""
+    saturday = day + timedelta(days=(5 - day.weekday()) % 7)
+    clock = VirtualClock(saturday.replace(hour=10))
+    scheduler = BarCloseScheduler(clock=clock.now, sleep=clock.sleep)
+    closes = []
+
+    async def on_close(bar_close):
+        closes.append(bar_close)
+
+    task = scheduler.schedule("weekend_5M", "5M", on_close)
+    monday = saturday + timedelta(days=2)
+    await clock.run_until(monday.replace(hour=9, minute=12))
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    expected = [monday.replace(hour=9, minute=5), monday.replace(hour=9, minute=10)]
+    ok = closes == expected
+    print(f"{'✅' if ok else '❌'} 주말 시작: 첫 평가 {[c.strftime('%a %H:%M') for c in closes]}")
+    return 0 if ok else 1
+
+
+async def run(args: argparse.Namespace) -> int:
+    Config.ALLOW_OUT_OF_MARKET_TRADING = False
+    day = datetime.strptime(args.date, "%Y-%m-%d")
+    print("=" * 70)
+    print("Bar Close Scheduler Test")
+    print(f"- {day.strftime('%Y-%m-%d (%a)')}, 평가 지연 시나리오 {args.overrun}초")
+    print("=" * 70)
+
+    failures = await check_day(args, day)
+    failures += await check_overrun(args, day)
+    failures += await check_weekend(day)
+    return 1 if failures else 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--date", default="2025-01-06", help="시뮬레이션 거래일 (평일, YYYY-MM-DD)")
+    p.add_argument("--start-hour", type=int, default=8, help="시뮬레이션 시작 시각 (시)")
+    p.add_argument("--overrun", type=float, default=130, help="1분봉 평가 소요 시간 (초)")
+    args = p.parse_args()
+
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,171 @@
+"""
+증분 지표 검증 스크립트
+
+목적:
+- utils.indicators의 증분 지표(update/peek)가 pandas 일괄 계산과 같은 값을 내는지 봉마다 비교
+- 중간에 상태를 JSON으로 저장/복원해도 이어서 같은 값이 나오는지 확인
+- 봉 하나당 갱신 시간 비교
+
+API 호출 없이 임의 보행 캔들로 검증합니다.
+
+예시:
+  python test_indicators.py
+  python test_indicators.py --bars 3000 --seed 3
+"""
+
+# Windows 콘솔 UTF-8 인코딩 설정
+import sys
+import io
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.indicators import create_indicator, restore_indicator
+
+
+def random_frame(bars: int, rng: np.random.Generator) -> pd.DataFrame:
+    close = np.maximum(1000, 50000 + np.cumsum(rng.integers(-300, 301, bars) // 10 * 10))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    # 고가=저가인 봉도 섞이도록 폭 0 허용
+    high = np.maximum(open_, close) + rng.integers(0, 3, bars) * 10
+    low = np.minimum(open_, close) - rng.integers(0, 3, bars) * 10
+    volume = rng.integers(0, 5000, bars)
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume})
+
+
+def batch_rsi(df: pd.DataFrame, period: int, method: str) -> pd.Series:
+    delta = df['Close'].diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    if method == "wilder":
+        gain = gain.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+        loss = loss.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    else:
+        gain = gain.rolling(window=period).mean()
+        loss = loss.rolling(window=period).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+
+def batch_ichimoku(df: pd.DataFrame, c: int, b: int, s: int, d: int) -> pd.DataFrame:
+    def mid(p):
+        return (df['High'].rolling(window=p).max() + df['Low'].rolling(window=p).min()) / 2
+    conversion, base = mid(c), mid(b)
+    return pd.DataFrame({
+        "conversion": conversion,
+        "base": base,
+        "span_a": ((conversion + base) / 2).shift(d),
+        "span_b": mid(s).shift(d),
+    })
+
+
+def batch_ad(df: pd.DataFrame) -> pd.Series:
+    clv = ((df['Close'] - df['Low']) - (df['High'] - df['Close'])) / (df['High'] - df['Low'])
+    return (clv.fillna(0) * df['Volume']).cumsum()
+
+
+def batch_cases(df: pd.DataFrame):
+    """(지표, 파라미터, 일괄 계산 결과) - 결과는 봉별 값 리스트"""
+    close = df['Close']
+    weights = np.arange(1, 21, dtype=float)
+    ma = close.rolling(window=20).mean()
+    std = close.rolling(window=20).std()
+    ad = batch_ad(df)
+    cases = [
+        ("SMA", {"period": 20}, ma),
+        ("MOMENTUM", {"period": 24}, close - close.shift(24)),
+        ("DISPARITY", {"period": 20}, close / ma * 100),
+        ("BOLLINGER", {"period": 20, "multiplier": 2.0},
+         pd.concat([ma, ma + std * 2.0, ma - std * 2.0, std], axis=1)),
+        ("RSI", {"period": 14, "method": "sma"}, batch_rsi(df, 14, "sma")),
+        ("RSI", {"period": 14, "method": "wilder"}, batch_rsi(df, 14, "wilder")),
+        ("WEIGHTED_VOLUME", {"period": 20},
+         df['Volume'].rolling(window=20).apply(lambda v: np.sum(v * weights) / weights.sum(), raw=True)),
+        ("ICHIMOKU", {"conversion_period": 9, "base_period": 26, "span_b_period": 52, "displacement": 26},
+         batch_ichimoku(df, 9, 26, 52, 26)),
+        ("CHAIKIN", {"short_period": 3, "long_period": 10, "ma": "sma"},
+         ad.rolling(window=3).mean() - ad.rolling(window=10).mean()),
+        ("CHAIKIN", {"short_period": 3, "long_period": 10, "ma": "ema"},
+         ad.ewm(span=3, adjust=False).mean() - ad.ewm(span=10, adjust=False).mean()),
+    ]
+    return cases
+
+
+def as_list(value):
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return [value[k] for k in ("conversion", "base", "span_a", "span_b")]
+    if isinstance(value, tuple):
+        return list(value)
+    return [value]
+
+
+def same(actual, expected) -> bool:
+    expected = [None if pd.isna(x) else float(x) for x in np.atleast_1d(expected)]
+    if all(x is None for x in expected):
+        return actual is None or all(x is None for x in as_list(actual))
+    actual = as_list(actual)
+    if actual is None or len(actual) != len(expected):
+        return False
+    return all((a is None and e is None) or (a is not None and e is not None and np.isclose(a, e, rtol=1e-9, atol=1e-6))
+               for a, e in zip(actual, expected))
+
+
+def run(args: argparse.Namespace) -> int:
+    rng = np.random.default_rng(args.seed)
+    df = random_frame(args.bars, rng)
+    rows = df[["Open", "High", "Low", "Close", "Volume"]].to_numpy().tolist()
+    restore_at = args.bars // 2
+
+    print("=" * 70)
+    print("Incremental Indicator Parity Test")
+    print(f"- bars: {args.bars}, seed: {args.seed}, 상태 복원 위치: {restore_at}")
+    print("=" * 70)
+
+    failures = 0
+    for kind, params, expected in batch_cases(df):
+        expected = expected.to_numpy()
+        indicator = create_indicator(kind, params)
+        mismatches = 0
+        for i, row in enumerate(rows):
+            if i == restore_at:
+                # 저장소 왕복과 같은 JSON 직렬화 후 복원
+                state = json.loads(json.dumps(indicator.to_state()))
+                indicator = restore_indicator(kind, params, state)
+            peeked = indicator.peek(*row)
+            value = indicator.update(*row)
+            if not same(peeked, expected[i]) or not same(value, expected[i]):
+                mismatches += 1
+                if mismatches <= 3:
+                    print(f"   ❌ {kind}{params} #{i}: update={value} peek={peeked} batch={expected[i]}")
+
+        # 갱신만의 봉당 소요 시간
+        timed = create_indicator(kind, params)
+        started = time.perf_counter()
+        for row in rows:
+            timed.update(*row)
+        elapsed = (time.perf_counter() - started) / len(rows) * 1e6
+        status = "✅" if not mismatches else "❌"
+        print(f"{status} {kind:16s} {json.dumps(params):60s} 불일치 {mismatches}건, 봉당 {elapsed:.1f}µs")
+        failures += mismatches > 0
+
+    return 1 if failures else 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--bars", type=int, default=2000, help="봉 수")
+    p.add_argument("--seed", type=int, default=11, help="난수 시드")
+    args = p.parse_args()
+    return run(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
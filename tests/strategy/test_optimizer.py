@@ -0,0 +1,94 @@
+"""
+전략 파라미터 최적화 검증 스크립트
+
+목적:
+- 공유 메모리 작업자에서 평가한 조합 성과가 같은 파라미터의 run_backtest 결과와 같은지 검증
+- 워크포워드 학습/검증 구간이 이어지는지 확인하고 구간별 선택 파라미터와 검증 손익 출력
+- 조합 수 대비 소요 시간 측정
+
+API/DB 호출 없이 임의 보행 캔들로 검증합니다.
+
+예시:
+  python test_optimizer.py
+  python test_optimizer.py --strategy BOLLINGER --stocks 100 --bars 20000 --folds 4 --workers 4
+"""
+
+# Windows 콘솔 UTF-8 인코딩 설정
+import sys
+import io
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import logging
+import os
+
+import numpy as np
+
+# 프로젝트 루트 (managers/...) - 같은 폴더의 test_strategy_panel은 스크립트 경로로 찾음
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from managers.backtest import BacktestSettings, run_backtest
+from managers.optimizer import DEFAULT_SEARCH_SPACES, optimize
+from test_strategy_panel import random_series
+
+logging.disable(logging.INFO)
+
+
+def run(args: argparse.Namespace) -> int:
+    rng = np.random.default_rng(args.seed)
+    series = {f"{i:06d}": random_series(f"{i:06d}", args.bars, rng) for i in range(args.stocks)}
+    settings = BacktestSettings(mock=False)
+
+    print("=" * 70)
+    print("Optimizer Test")
+    print(f"- {args.strategy}: {args.stocks} stocks x {args.bars} bars, folds: {args.folds}, workers: {args.workers}")
+    print("=" * 70)
+
+    failures = 0
+    # 1. 전체 기간 탐색 결과 == 같은 파라미터의 단일 백테스트
+    report = optimize(series, args.strategy, settings, method=args.method, samples=args.samples, seed=args.seed,
+                      min_trades=1, max_workers=args.workers, top=3)
+    print(f"⏱️ 전체 기간: 조합 {report['combinations']}개 {report['elapsed_seconds']:.2f}초 (실패 {report['failed']})")
+    for entry in report["top"]:
+        expected = run_backtest(series, args.strategy, entry["parameters"], settings)
+        same = all(entry[key] == expected[key] for key in ("trades", "wins", "total_profit_loss", "max_drawdown"))
+        failures += not same
+        print(f"{'✅' if same else '❌'} {entry['parameters']}: 거래 {entry['trades']}건, 손익 {entry['total_profit_loss']:+,}원"
+              f" (단일 백테스트 {expected['trades']}건, {expected['total_profit_loss']:+,}원)")
+
+    # 2. 워크포워드
+    report = optimize(series, args.strategy, settings, method=args.method, samples=args.samples, seed=args.seed,
+                      folds=args.folds, train_segments=args.train_segments, min_trades=1, max_workers=args.workers)
+    print(f"\n⏱️ 워크포워드: 조합 {report['combinations']}개 x 구간 {args.folds * 2}개 {report['elapsed_seconds']:.2f}초")
+    for previous, fold in zip([None] + report["folds"], report["folds"]):
+        # 학습 구간 바로 뒤가 검증 구간, 검증 구간끼리는 빈틈없이 이어짐
+        if fold["train"]["end"] != fold["test"]["start"] or (previous and previous["test"]["end"] != fold["test"]["start"]):
+            failures += 1
+            print(f"❌ 구간 불연속: {fold['train']} -> {fold['test']}")
+        test = fold["test_result"]
+        print(f"📅 {fold['train']['start'][:16]} ~ {fold['test']['end'][:16]} | {fold['best_parameters']} | "
+              f"검증 거래 {test['trades'] if test else 0}건, 손익 {test['total_profit_loss'] if test else 0:+,}원")
+    print(f"📊 검증 구간 합계: {report['walk_forward']}, 추천 파라미터: {report['best_parameters']}")
+    return 1 if failures else 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--strategy", default="RSI", choices=sorted(DEFAULT_SEARCH_SPACES), help="전략 타입")
+    p.add_argument("--stocks", type=int, default=30, help="종목 수")
+    p.add_argument("--bars", type=int, default=5000, help="종목당 봉 수")
+    p.add_argument("--method", default="random", choices=["grid", "random"], help="탐색 방식")
+    p.add_argument("--samples", type=int, default=12, help="random 탐색 조합 수")
+    p.add_argument("--folds", type=int, default=3, help="워크포워드 검증 구간 수")
+    p.add_argument("--train-segments", type=int, default=2, help="학습 구간 길이 (구간 수)")
+    p.add_argument("--workers", type=int, default=2, help="작업자 프로세스 수")
+    p.add_argument("--seed", type=int, default=7, help="난수 시드")
+    args = p.parse_args()
+
+    return run(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,144 @@
+"""
+전략 패널 평가기 검증 스크립트
+
+목적:
+- StrategyPanel(종목 x 봉 벡터 계산) 신호가 StrategyManager의 종목별 pandas 계산과 같은지 검증
+- 길이가 서로 다른 종목(짧은 종목 그룹 포함)과 여러 파라미터 조합에서 비교
+- 종목별 계산 대비 소요 시간 비교
+- 전략 간 공유된 지표 노드 수 출력
+
+API 호출 없이 임의 보행 캔들로 검증합니다.
+
+예시:
+  python test_strategy_panel.py
+  python test_strategy_panel.py --stocks 50 --bars 400 --cycles 40
+"""
+
+# Windows 콘솔 UTF-8 인코딩 설정
+import sys
+import io
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from api.candles import CandleSeries, to_epoch
+from managers.strategy_manager import StrategyManager
+from managers.strategy_panel import StrategyPanel
+
+# 종목별 계산의 상세 로그는 생략
+logging.disable(logging.WARNING)
+
+PARAMETER_SETS = {
+    "MOMENTUM": [{}, {"momentum_period": 24, "trend_confirmation_days": 3}, {"momentum_period": 5, "trend_confirmation_days": 0}],
+    "DISPARITY": [{}, {"ma_period": 10, "buy_threshold": 99.0, "sell_threshold": 101.0}],
+    "BOLLINGER": [{}, {"ma_period": 10, "std_multiplier": 1.0}],
+    "RSI": [{}, {"rsi_period": 7, "oversold_threshold": 45, "overbought_threshold": 55, "use_volume_filter": False},
+            {"rsi_period": 14, "oversold_threshold": 40, "overbought_threshold": 60, "volume_threshold": 0.5}],
+    "ICHIMOKU": [{}, {"conversion_period": 5, "base_period": 10, "span_b_period": 20, "displacement": 10}],
+    "CHAIKIN": [{}, {"short_period": 2, "long_period": 6}],
+}
+
+
+def random_series(code: str, bars: int, rng: np.random.Generator) -> CandleSeries:
+    start = to_epoch(datetime(2026, 1, 5, 9, 0))
+    ts = start + np.arange(bars, dtype=np.int64) * 300
+    close = np.maximum(1000, 50000 + np.cumsum(rng.integers(-300, 301, bars) // 10 * 10))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    high = np.maximum(open_, close) + rng.integers(0, 3, bars) * 10
+    low = np.minimum(open_, close) - rng.integers(0, 3, bars) * 10
+    volume = rng.integers(100, 5000, bars)
+    return CandleSeries(code, "5M", ts, open_, high, low, close, volume)
+
+
+def same_signal(a, b) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    if a["signal_type"] != b["signal_type"] or not np.isclose(float(a["signal_value"]), float(b["signal_value"])):
+        return False
+    # 부가 정보(현재가, 이동평균, 밴드 등)도 같은 값인지 확인
+    for key, expected in a["additional_data"].items():
+        actual = b["additional_data"].get(key)
+        if not np.isclose(float(expected), float(actual), equal_nan=True):
+            return False
+    return True
+
+
+async def run(args: argparse.Namespace) -> int:
+    rng = np.random.default_rng(args.seed)
+    manager = StrategyManager()
+    calculators = {
+        "MOMENTUM": manager._calculate_momentum_signal,
+        "DISPARITY": manager._calculate_disparity_signal,
+        "BOLLINGER": manager._calculate_bollinger_signal,
+        "RSI": manager._calculate_rsi_signal,
+        "ICHIMOKU": manager._calculate_ichimoku_signal,
+        "CHAIKIN": manager._calculate_chaikin_signal,
+    }
+    # 일부 종목은 짧게 (길이별 그룹 검증)
+    full = {f"{i:06d}": random_series(f"{i:06d}", args.bars if i % 4 else int(rng.integers(30, 90)), rng)
+            for i in range(args.stocks)}
+
+    print("=" * 70)
+    print("Strategy Panel Parity Test")
+    print(f"- stocks: {args.stocks}, bars: {args.bars}, cycles: {args.cycles}")
+    print("=" * 70)
+
+    mismatches = 0
+    signals = 0
+    panel_seconds = 0.0
+    reference_seconds = 0.0
+    nodes_computed = nodes_reused = 0
+    for cycle in range(args.cycles):
+        # 스캔 주기마다 마지막 봉 위치를 옮겨 가며 비교
+        cut = args.cycles - cycle - 1
+        series = {code: s[:len(s) - cut] if cut else s for code, s in full.items()}
+
+        started = time.perf_counter()
+        panel = StrategyPanel(series)
+        # 운영 루프와 같이 전략들이 공통 묶음/지표 노드를 공유하도록 준비
+        panel.prepare((t, p) for t, sets in PARAMETER_SETS.items() for p in sets)
+        results = {(t, i): panel.evaluate(t, p) for t, sets in PARAMETER_SETS.items() for i, p in enumerate(sets)}
+        panel_seconds += time.perf_counter() - started
+        node_stats = panel.node_stats()
+        nodes_computed += node_stats["computed"]
+        nodes_reused += node_stats["reused"]
+
+        started = time.perf_counter()
+        for (strategy_type, i), panel_signals in results.items():
+            params = PARAMETER_SETS[strategy_type][i]
+            for code, s in panel.series.items():
+                expected = await calculators[strategy_type](s.to_frame(), params)
+                actual = panel_signals.get(code)
+                signals += actual is not None
+                if not same_signal(expected, actual):
+                    mismatches += 1
+                    print(f"❌ {strategy_type}{params} {code} (봉 {len(s)}개): 종목별={expected} 패널={actual}")
+        reference_seconds += time.perf_counter() - started
+
+    print(f"\n📊 신호 {signals}건, 불일치 {mismatches}건")
+    print(f"🧮 지표 노드 계산 {nodes_computed}개, 재사용 {nodes_reused}회")
+    print(f"⏱️ 패널 계산: {panel_seconds * 1000:.1f}ms, 종목별 계산: {reference_seconds * 1000:.1f}ms")
+    return 1 if mismatches else 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--stocks", type=int, default=30, help="종목 수")
+    p.add_argument("--bars", type=int, default=300, help="종목당 봉 수")
+    p.add_argument("--cycles", type=int, default=20, help="비교할 스캔 주기 수")
+    p.add_argument("--seed", type=int, default=7, help="난수 시드")
+    args = p.parse_args()
+
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,170 @@
+"""
+봉 마감 스캔 스케줄러 - 전략/스캘핑 평가를 고정 주기 대신 봉이 마감되는 시각에 실행
+
+- 주기(1M/3M/5M 등)마다 다음 봉 마감 시각을 계산해 그때(+BAR_CLOSE_GRACE)만 깨어남
+- 마감 BAR_PREFETCH_LEAD_SECONDS초 전에 선조회 콜백 실행 (실시간 구독, 캔들 예열)
+- 장 밖에는 다음 장 첫 봉 마감까지 대기 (ALLOW_OUT_OF_MARKET_TRADING이면 장 밖에서도 경계마다 실행)
+- 평가가 다음 봉 마감을 넘기면 밀린 봉은 몰아서 실행하지 않고 건너뛴 봉으로 집계
+- 봉 마감 -> 깨어남/평가 완료/전략별 신호까지의 지연을 기록
+"""
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+
+from core.config import Config
+from utils.market_hours import BAR_CLOSE_GRACE, upcoming_bar_close
+
+logger = logging.getLogger(__name__)
+
+BarCallback = Callable[[datetime], Awaitable]
+
+# 긴 대기(장 마감 후 등)도 이 간격마다 시계를 다시 확인 (시스템 시각 보정 반영)
+_MAX_SLEEP_SECONDS = 60.0
+
+
+def _percentiles(values) -> Dict:
+    ordered = sorted(values)
+
+    def ms(q):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000, 1) if ordered else 0.0
+
+    return {"count": len(ordered), "p50_ms": ms(0.5), "p95_ms": ms(0.95), "max_ms": ms(1.0)}
+
+
+class BarSchedule:
+    """주기 하나의 봉 마감 실행 상태"""
+
+    __slots__ = ("name", "timeframe", "on_close", "prefetch", "task", "next_close", "last_close",
+                 "runs", "failures", "prefetches", "skipped_bars", "wake_delays", "durations")
+
+    def __init__(self, name: str, timeframe: str, on_close: BarCallback, prefetch: Optional[BarCallback]):
+        self.name = name
+        self.timeframe = timeframe
+        self.on_close = on_close
+        self.prefetch = prefetch
+        self.task: Optional[asyncio.Task] = None
+        self.next_close: Optional[datetime] = None
+        self.last_close: Optional[datetime] = None
+        self.runs = 0
+        self.failures = 0
+        self.prefetches = 0
+        self.skipped_bars = 0
+        self.wake_delays = deque(maxlen=256)  # 봉 마감 -> 평가 시작 (초)
+        self.durations = deque(maxlen=256)    # 봉 마감 -> 평가 완료 (초)
+
+    def to_dict(self) -> Dict:
+        return {
+            "timeframe": self.timeframe,
+            "running": self.task is not None and not self.task.done(),
+            "next_close": self.next_close.isoformat() if self.next_close else None,
+            "last_close": self.last_close.isoformat() if self.last_close else None,
+            "runs": self.runs,
+            "failures": self.failures,
+            "prefetches": self.prefetches,
+            "skipped_bars": self.skipped_bars,
+            "wake_delay": _percentiles(self.wake_delays),
+            "close_to_done": _percentiles(self.durations),
+        }
+
+
+class BarCloseScheduler:
+    """봉 마감 시각에 맞춰 평가 콜백을 실행하는 스케줄러
+
+    clock/sleep은 시뮬레이션 시계로 바꿔 끼울 수 있다 (tests/strategy/test_bar_scheduler.py).
+    """
+
+    def __init__(self, grace: float = BAR_CLOSE_GRACE, prefetch_lead: float = Config.BAR_PREFETCH_LEAD_SECONDS,
+                 clock: Callable[[], datetime] = datetime.now,
+                 sleep: Callable[[float], Awaitable] = asyncio.sleep):
+        self.grace = grace
+        self.prefetch_lead = prefetch_lead
+        self._clock = clock
+        self._sleep = sleep
+        self._schedules: Dict[str, BarSchedule] = {}
+        self._latencies: Dict[str, deque] = {}  # 라벨(전략) -> 봉 마감 -> 신호 처리 완료 (초)
+
+    def schedule(self, name: str, timeframe: str, on_close: BarCallback,
+                 prefetch: Optional[BarCallback] = None) -> asyncio.Task:
+        """봉 마감마다 on_close(봉 마감 시각) 실행 - 반환된 태스크를 취소하면 중지
+
+        prefetch(봉 마감 시각)는 마감 prefetch_lead초 전에 실행 (실패해도 평가는 진행)
+        """
+        current = self._schedules.get(name)
+        if current is not None and current.task is not None and not current.task.done():
+            raise RuntimeError(f"이미 실행 중인 스케줄: {name}")
+        job = BarSchedule(name, timeframe, on_close, prefetch)
+        self._schedules[name] = job
+        job.task = asyncio.create_task(self._run(job))
+        logger.info(f"⏰ [BAR_SCHEDULER] {name} 등록 - {timeframe} 봉 마감마다 실행 (선조회 {self.prefetch_lead:.0f}초 전)")
+        return job.task
+
+    async def _sleep_until(self, target: datetime):
+        while True:
+            remaining = (target - self._clock()).total_seconds()
+            if remaining <= 0:
+                return
+            await self._sleep(min(remaining, _MAX_SLEEP_SECONDS))
+
+    async def _run(self, job: BarSchedule):
+        try:
+            while True:
+                bar_close = upcoming_bar_close(job.timeframe, self._clock())
+                job.next_close = bar_close
+
+                if job.prefetch is not None:
+                    await self._sleep_until(bar_close - timedelta(seconds=self.prefetch_lead))
+                    try:
+                        await job.prefetch(bar_close)
+                        job.prefetches += 1
+                    except Exception as e:
+                        logger.error(f"⏰ [BAR_SCHEDULER] {job.name} 선조회 오류: {e}")
+
+                # 봉 마감 후 서버/실시간 집계가 끝날 때까지 여유를 두고 평가
+                await self._sleep_until(bar_close + timedelta(seconds=self.grace))
+                job.wake_delays.append((self._clock() - bar_close).total_seconds())
+                try:
+                    await job.on_close(bar_close)
+                except Exception as e:
+                    job.failures += 1
+                    logger.error(f"⏰ [BAR_SCHEDULER] {job.name} 봉 마감 평가 오류 ({bar_close.strftime('%H:%M')}): {e}")
+                finished = self._clock()
+                job.durations.append((finished - bar_close).total_seconds())
+                job.last_close = bar_close
+                job.runs += 1
+
+                # 평가가 다음 봉 마감(+여유)을 넘겼으면 밀린 봉은 건너뛰고 최신 봉부터 다시 맞춤
+                skipped = 0
+                following = upcoming_bar_close(job.timeframe, bar_close)
+                while following + timedelta(seconds=self.grace) <= finished:
+                    skipped += 1
+                    following = upcoming_bar_close(job.timeframe, following)
+                if skipped:
+                    job.skipped_bars += skipped
+                    logger.warning(f"⏰ [BAR_SCHEDULER] {job.name} 평가 지연 "
+                                   f"{(finished - bar_close).total_seconds():.1f}초 - {skipped}개 봉 건너뜀")
+        except asyncio.CancelledError:
+            logger.info(f"⏰ [BAR_SCHEDULER] {job.name} 중지")
+            raise
+        finally:
+            job.next_close = None
+
+    def record_latency(self, label: str, bar_close: datetime):
+        """봉 마감 -> 전략 신호 처리 완료 지연 기록 (전략별)"""
+        latencies = self._latencies.get(label)
+        if latencies is None:
+            latencies = self._latencies[label] = deque(maxlen=256)
+        latencies.append((self._clock() - bar_close).total_seconds())
+
+    def get_status_info(self) -> Dict:
+        return {
+            "grace_seconds": self.grace,
+            "prefetch_lead_seconds": self.prefetch_lead,
+            "schedules": {name: job.to_dict() for name, job in self._schedules.items()},
+            "signal_latency": {label: _percentiles(values) for label, values in self._latencies.items()},
+        }
+
+
+# 전역 인스턴스
+bar_scheduler = BarCloseScheduler()
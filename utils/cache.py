@@ -0,0 +1,182 @@
+"""
+범용 메모리 캐시 - LRU 축출 + 항목 수/바이트 예산 + 항목별 만료 + stale-while-revalidate
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+TTL = Union[float, Callable[[Any], float], None]
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: Any, expires_at: Optional[float], size: int):
+        self.value = value
+        self.expires_at = expires_at   # time.monotonic() 기준, None이면 만료 없음
+        self.size = size
+
+    def is_fresh(self, now: float) -> bool:
+        return self.expires_at is None or now < self.expires_at
+
+
+class BoundedCache:
+    """LRU 캐시 (max_entries개 / max_bytes 바이트 초과 시 가장 오래 안 쓴 항목부터 축출)
+
+    만료된 항목은 바로 지우지 않고 남겨 두어, 갱신 실패나 API 제한 시
+    get(key, allow_stale=True)로 꺼내 쓸 수 있다 (LRU 순서대로 자연히 밀려남).
+    """
+
+    def __init__(self, name: str, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 sizeof: Optional[Callable[[Any], int]] = None):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 0)
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, allow_stale: bool = False) -> Any:
+        """값 조회 (만료됐으면 allow_stale일 때만 반환, 없으면 None)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if entry.is_fresh(time.monotonic()):
+            self.hits += 1
+            return entry.value
+        if allow_stale:
+            self.stale_hits += 1
+            return entry.value
+        self.misses += 1
+        return None
+
+    def peek(self, key: Hashable) -> Any:
+        """통계/LRU 순서에 영향 없이 값 조회 (만료 여부 무관)"""
+        entry = self._entries.get(key)
+        return entry.value if entry is not None else None
+
+    def is_fresh(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.is_fresh(time.monotonic())
+
+    def set(self, key: Hashable, value: Any, ttl: TTL = None):
+        """값 저장 (ttl: 초, 값을 받아 초를 돌려주는 함수, None이면 만료 없음)"""
+        if callable(ttl):
+            ttl = ttl(value)
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = self._sizeof(value)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old.size
+        self._entries[key] = _Entry(value, expires_at, size)
+        self.bytes += size
+        self._evict()
+
+    def expire(self, key: Hashable):
+        """항목을 만료 상태로 (값은 stale 조회용으로 유지)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.expires_at = 0.0
+
+    def pop(self, key: Hashable) -> Any:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self.bytes -= entry.size
+        return entry.value
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def keys(self):
+        return list(self._entries)
+
+    def _evict(self):
+        while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_bytes is not None and self.bytes > self.max_bytes and len(self._entries) > 1)):
+            _, entry = self._entries.popitem(last=False)
+            self.bytes -= entry.size
+            self.evictions += 1
+
+    async def get_or_load(self, key: Hashable, loader: Loader, ttl: TTL = None,
+                          stale_while_revalidate: bool = False) -> Any:
+        """캐시 조회 후 없거나 만료됐으면 loader로 채움
+
+        stale_while_revalidate면 만료된 값을 즉시 돌려주고 갱신은 백그라운드에서 한 번만 수행한다.
+        loader가 None을 돌려주면 저장하지 않고 (있다면) 만료된 값을 반환한다.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if entry.is_fresh(time.monotonic()):
+                self.hits += 1
+                return entry.value
+            if stale_while_revalidate:
+                self.stale_hits += 1
+                self.refresh(key, loader, ttl)
+                return entry.value
+
+        self.misses += 1
+        value = await loader()
+        if value is None:
+            return entry.value if entry is not None else None
+        self.set(key, value, ttl)
+        return value
+
+    def refresh(self, key: Hashable, loader: Loader, ttl: TTL = None) -> asyncio.Task:
+        """백그라운드 갱신 (같은 키의 갱신이 진행 중이면 그 태스크 재사용)"""
+        task = self._refreshing.get(key)
+        if task is not None and not task.done():
+            return task
+
+        async def _run():
+            try:
+                value = await loader()
+                self.refreshes += 1
+                if value is not None:
+                    self.set(key, value, ttl)
+            except Exception as e:
+                logger.error(f"💾 [CACHE] {self.name} 백그라운드 갱신 실패 - {key}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        task = asyncio.create_task(_run())
+        self._refreshing[key] = task
+        return task
+
+    def get_status_info(self) -> Dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "refreshes": self.refreshes,
+            "refreshing": len(self._refreshing),
+        }
@@ -0,0 +1,279 @@
+"""
+차트 이미지 렌더링 (mplfinance)
+작업 풀(utils/executor.py의 cpu_pool)의 작업자 프로세스에서 실행되므로 DB/API 모듈을 import하지 않고,
+캔들 DataFrame(Open/High/Low/Close/Volume)을 받아 base64 PNG 문자열을 돌려줍니다.
+"""
+import base64
+import io
+import logging
+import warnings
+
+import matplotlib
+matplotlib.use("Agg")  # 작업자 프로세스에는 화면이 없음
+
+import matplotlib.lines as mlines
+import matplotlib.pyplot as plt
+import mplfinance as mpf
+import pandas as pd
+from ta.momentum import RSIIndicator
+from ta.trend import IchimokuIndicator
+from ta.volatility import BollingerBands
+
+# pandas와 ta 라이브러리의 FutureWarning 억제
+warnings.filterwarnings('ignore', category=FutureWarning, module='ta')
+warnings.filterwarnings('ignore', category=FutureWarning, module='pandas')
+
+logger = logging.getLogger(__name__)
+
+# 지표 차트를 지원하는 전략 타입
+STRATEGY_CHART_TYPES = ("MOMENTUM", "DISPARITY", "BOLLINGER", "RSI", "CHAIKIN")
+
+
+def _tail_by_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """기간에 따른 데이터 필터링"""
+    if period == "1Y":
+        return df.tail(250)  # 1년치 데이터 (약 250 거래일)
+    if period == "1M":
+        return df.tail(30)   # 1개월치 데이터
+    if period == "1W":
+        return df.tail(7)    # 1주치 데이터
+    return df.tail(500)      # 기본값 (약 2년치)
+
+
+def _render(df: pd.DataFrame, added_plots: list, legend_elements: list, ncol: int) -> str:
+    """캔들 + 20/60 이동평균 + 거래량 차트를 그려 base64 PNG 반환"""
+    # 색상 설정
+    mc = mpf.make_marketcolors(
+        up="red",
+        down="blue",
+        volume="inherit"
+    )
+
+    # 스타일 설정
+    s = mpf.make_mpf_style(
+        base_mpf_style="charles",
+        marketcolors=mc,
+        gridaxis='both',
+        y_on_right=True,
+        facecolor='white',
+        edgecolor='black'
+    )
+
+    # 차트 생성 (메모리에 저장)
+    buf = io.BytesIO()
+    fig, axes = mpf.plot(
+        data=df,
+        type='candle',
+        style=s,
+        figratio=(18, 10),
+        mav=(20, 60),  # 이동평균 20일선, 60일선
+        volume=True,
+        scale_width_adjustment=dict(volume=0.6, candle=1.2),
+        addplot=added_plots,
+        savefig=dict(fname=buf, format='png', dpi=200, bbox_inches='tight'),
+        returnfig=True,
+        tight_layout=True
+    )
+
+    # 범례 추가
+    if fig and axes and len(axes) > 0:
+        try:
+            axes[0].legend(
+                handles=legend_elements,
+                loc='upper left',
+                fontsize=10,
+                frameon=True,
+                fancybox=True,
+                shadow=True,
+                ncol=ncol,
+                bbox_to_anchor=(0, 1)
+            )
+        except Exception as e:
+            logger.warning(f"범례 추가 실패: {e}")
+
+    # base64 인코딩
+    buf.seek(0)
+    image_base64 = base64.b64encode(buf.getvalue()).decode('utf-8')
+    buf.close()
+
+    # matplotlib figure 메모리 정리 (작업자 프로세스는 계속 재사용됨)
+    if fig:
+        plt.close(fig)
+
+    return image_base64
+
+
+def _moving_average_legend() -> list:
+    return [
+        mlines.Line2D([0], [0], color='blue', lw=1, label='20일 이평선'),
+        mlines.Line2D([0], [0], color='orange', lw=1, label='60일 이평선')
+    ]
+
+
+def render_ichimoku_chart(df: pd.DataFrame, period: str = "1M") -> str:
+    """일목균형표 차트"""
+    df = _tail_by_period(df, period).copy()
+
+    # 일목균형표 데이터 생성 (경고 억제)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        id_ichimoku = IchimokuIndicator(high=df['High'], low=df['Low'], visual=True, fillna=True)
+        df['span_a'] = id_ichimoku.ichimoku_a()
+        df['span_b'] = id_ichimoku.ichimoku_b()
+        df['base_line'] = id_ichimoku.ichimoku_base_line()
+        df['conv_line'] = id_ichimoku.ichimoku_conversion_line()
+
+    added_plots = [
+        mpf.make_addplot(df['span_a'], color='orange', alpha=0.7, width=1.5),
+        mpf.make_addplot(df['span_b'], color='purple', alpha=0.7, width=1.5),
+        mpf.make_addplot(df['base_line'], color='green', alpha=0.8, width=2),
+        mpf.make_addplot(df['conv_line'], color='red', alpha=0.8, width=2)
+    ]
+    legend_elements = [
+        mlines.Line2D([0], [0], color='orange', lw=2, alpha=0.7, label='선행스팬A'),
+        mlines.Line2D([0], [0], color='purple', lw=2, alpha=0.7, label='선행스팬B'),
+        mlines.Line2D([0], [0], color='green', lw=2, alpha=0.8, label='기준선'),
+        mlines.Line2D([0], [0], color='red', lw=2, alpha=0.8, label='전환선'),
+    ] + _moving_average_legend()
+    return _render(df, added_plots, legend_elements, ncol=3)
+
+
+def render_strategy_chart(df: pd.DataFrame, strategy_type: str, period: str = "1M") -> str:
+    """특정 전략 지표가 포함된 차트 (strategy_type은 STRATEGY_CHART_TYPES 중 하나)"""
+    strategy_type = strategy_type.upper()
+    if strategy_type not in STRATEGY_CHART_TYPES:
+        raise ValueError(f"지원하지 않는 전략 타입입니다: {strategy_type}")
+    df = _tail_by_period(df, period).copy()
+
+    if strategy_type == "MOMENTUM":
+        # 모멘텀 계산 (10일 기준)
+        df['momentum'] = df['Close'] - df['Close'].shift(10)
+        df['momentum_ma'] = df['momentum'].rolling(window=5).mean()
+        df['zero_line'] = 0
+
+        added_plots = [
+            mpf.make_addplot(df['momentum'], color='blue', alpha=0.8, width=2, secondary_y=True),
+            mpf.make_addplot(df['momentum_ma'], color='red', alpha=0.8, width=1.5, secondary_y=True),
+            mpf.make_addplot(df['zero_line'], color='black', alpha=0.5, width=1, linestyle='--', secondary_y=True)
+        ]
+        legend_elements = [
+            mlines.Line2D([0], [0], color='blue', lw=2, label='모멘텀'),
+            mlines.Line2D([0], [0], color='red', lw=1.5, label='모멘텀 이동평균'),
+            mlines.Line2D([0], [0], color='black', lw=1, linestyle='--', label='0선')
+        ]
+
+    elif strategy_type == "DISPARITY":
+        # 이격도 계산 (20일 이동평균 기준)
+        df['ma20'] = df['Close'].rolling(window=20).mean()
+        df['disparity'] = (df['Close'] / df['ma20']) * 100
+
+        added_plots = [
+            mpf.make_addplot(df['ma20'], color='orange', alpha=0.8, width=2),
+            mpf.make_addplot(df['disparity'], color='purple', alpha=0.8, width=2, secondary_y=True)
+        ]
+        legend_elements = [
+            mlines.Line2D([0], [0], color='orange', lw=2, label='20일 이동평균'),
+            mlines.Line2D([0], [0], color='purple', lw=2, label='이격도(%)')
+        ]
+
+    elif strategy_type == "BOLLINGER":
+        bb_indicator = BollingerBands(close=df['Close'], window=20, window_dev=2)
+        df['bb_upper'] = bb_indicator.bollinger_hband()
+        df['bb_middle'] = bb_indicator.bollinger_mavg()
+        df['bb_lower'] = bb_indicator.bollinger_lband()
+
+        added_plots = [
+            mpf.make_addplot(df['bb_upper'], color='red', alpha=0.7, width=1.5),
+            mpf.make_addplot(df['bb_middle'], color='blue', alpha=0.8, width=2),
+            mpf.make_addplot(df['bb_lower'], color='red', alpha=0.7, width=1.5)
+        ]
+        legend_elements = [
+            mlines.Line2D([0], [0], color='red', lw=1.5, alpha=0.7, label='볼린저밴드 상단'),
+            mlines.Line2D([0], [0], color='blue', lw=2, alpha=0.8, label='볼린저밴드 중간'),
+            mlines.Line2D([0], [0], color='red', lw=1.5, alpha=0.7, label='볼린저밴드 하단')
+        ]
+
+    elif strategy_type == "RSI":
+        rsi_indicator = RSIIndicator(close=df['Close'], window=14)
+        df['rsi'] = rsi_indicator.rsi()
+
+        # RSI 기준선
+        df['rsi_70'] = 70
+        df['rsi_30'] = 30
+        df['rsi_50'] = 50
+
+        # 가중평균거래량 (RSI 전략용, 최근일수록 큰 가중치)
+        volume_period = 20
+        weights = list(range(1, volume_period + 1))
+
+        def calculate_weighted_avg_volume(volumes):
+            return sum(v * w for v, w in zip(volumes, weights)) / sum(weights)
+
+        df['weighted_avg_volume'] = df['Volume'].rolling(window=volume_period).apply(calculate_weighted_avg_volume, raw=True)
+        df['volume_ratio'] = df['Volume'] / df['weighted_avg_volume']
+        df['volume_threshold'] = 1.5  # 1.5배 기준선
+
+        added_plots = [
+            mpf.make_addplot(df['rsi'], color='purple', alpha=0.8, width=2, secondary_y=True),
+            mpf.make_addplot(df['rsi_70'], color='red', alpha=0.5, width=1, linestyle='--', secondary_y=True),
+            mpf.make_addplot(df['rsi_30'], color='blue', alpha=0.5, width=1, linestyle='--', secondary_y=True),
+            mpf.make_addplot(df['rsi_50'], color='gray', alpha=0.3, width=1, linestyle=':', secondary_y=True),
+            mpf.make_addplot(df['volume_ratio'], color='orange', alpha=0.7, width=1, secondary_y=True),
+            mpf.make_addplot(df['volume_threshold'], color='red', alpha=0.5, width=1, linestyle='--', secondary_y=True)
+        ]
+        legend_elements = [
+            mlines.Line2D([0], [0], color='purple', lw=2, label='RSI'),
+            mlines.Line2D([0], [0], color='red', lw=1, linestyle='--', alpha=0.5, label='과매수(70)'),
+            mlines.Line2D([0], [0], color='blue', lw=1, linestyle='--', alpha=0.5, label='과매도(30)'),
+            mlines.Line2D([0], [0], color='gray', lw=1, linestyle=':', alpha=0.3, label='중립(50)'),
+            mlines.Line2D([0], [0], color='orange', lw=1, label='거래량비율'),
+            mlines.Line2D([0], [0], color='red', lw=1, linestyle='--', alpha=0.5, label='거래량기준(1.5배)')
+        ]
+
+    else:  # CHAIKIN
+        _add_chaikin(df)
+        df['zero_line'] = 0
+
+        added_plots = [
+            mpf.make_addplot(df['chaikin_oscillator'], color='orange', alpha=0.8, width=2, secondary_y=True),
+            mpf.make_addplot(df['zero_line'], color='gray', alpha=0.5, width=1, linestyle='--', secondary_y=True)
+        ]
+        legend_elements = [
+            mlines.Line2D([0], [0], color='orange', lw=2, label='차이킨 오실레이터'),
+            mlines.Line2D([0], [0], color='gray', lw=1, linestyle='--', alpha=0.5, label='기준선(0)')
+        ]
+
+    return _render(df, added_plots, legend_elements + _moving_average_legend(), ncol=2)
+
+
+def render_all_strategies_chart(df: pd.DataFrame, period: str = "1M") -> str:
+    """볼린저밴드 + 20일 이동평균 종합 차트"""
+    df = _tail_by_period(df, period).copy()
+
+    df['ma20'] = df['Close'].rolling(window=20).mean()
+    bb_indicator = BollingerBands(close=df['Close'], window=20, window_dev=2)
+    df['bb_upper'] = bb_indicator.bollinger_hband()
+    df['bb_middle'] = bb_indicator.bollinger_mavg()
+    df['bb_lower'] = bb_indicator.bollinger_lband()
+
+    added_plots = [
+        # 볼린저밴드
+        mpf.make_addplot(df['bb_upper'], color='red', alpha=0.5, width=1),
+        mpf.make_addplot(df['bb_middle'], color='blue', alpha=0.7, width=1.5),
+        mpf.make_addplot(df['bb_lower'], color='red', alpha=0.5, width=1),
+        # 이동평균
+        mpf.make_addplot(df['ma20'], color='orange', alpha=0.8, width=2),
+    ]
+    legend_elements = [
+        mlines.Line2D([0], [0], color='red', lw=1, alpha=0.5, label='볼린저밴드 상/하단'),
+        mlines.Line2D([0], [0], color='blue', lw=1.5, alpha=0.7, label='볼린저밴드 중간'),
+        mlines.Line2D([0], [0], color='orange', lw=2, alpha=0.8, label='20일 이동평균'),
+    ] + _moving_average_legend()
+    return _render(df, added_plots, legend_elements, ncol=2)
+
+
+def _add_chaikin(df: pd.DataFrame):
+    """차이킨 오실레이터 (AD 3일 MA - 10일 MA)"""
+    clv = ((df['Close'] - df['Low']) - (df['High'] - df['Close'])) / (df['High'] - df['Low'])
+    df['ad'] = (clv.fillna(0) * df['Volume']).cumsum()
+    df['chaikin_oscillator'] = df['ad'].rolling(window=3).mean() - df['ad'].rolling(window=10).mean()
@@ -0,0 +1,134 @@
+"""
+작업 실행 풀 - 이벤트 루프를 막는 작업을 루프 밖에서 실행
+- 프로세스 풀: CPU 작업 (전략 패널 평가, 차트 렌더링)
+- 스레드 풀: 블로킹 I/O (동기 HTTP 크롤링 등)
+"""
+import asyncio
+import functools
+import logging
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from core.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorBusy(Exception):
+    """대기열이 가득 차 작업을 받지 않음"""
+
+
+def _timed(func: Callable, *args, **kwargs):
+    """작업자에서 실행 시간 측정 (대기 시간 = 전체 지연 - 실행 시간)"""
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+class TaskPool:
+    """프로세스/스레드 풀 + 대기열 상한 + 지연 지표
+
+    동시에 받는 작업은 max_workers + max_queue개까지이며, 넘치면 ExecutorBusy로 바로 거절한다
+    (요청이 쌓여 응답이 한없이 늦어지는 대신 호출자가 503 등으로 처리).
+    프로세스 풀은 spawn 방식이라 작업 함수와 인자는 피클 가능해야 하며, 작업 모듈은
+    DB 초기화 등 부수 효과 없이 import 가능해야 한다.
+    """
+
+    def __init__(self, name: str, kind: str, max_workers: int, max_queue: int):
+        if kind not in ("process", "thread"):
+            raise ValueError(f"지원하지 않는 풀 종류: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._latencies = deque(maxlen=256)  # (대기 시간, 실행 시간) 초
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "restarts": 0}
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix=f"{self.name}-pool")
+            logger.info(f"⚙️ [EXECUTOR] {self.name} {self.kind} 풀 생성 (작업자 {self.max_workers}, 대기열 {self.max_queue})")
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """작업자를 기다리는 작업 수"""
+        return max(0, self._pending - self.max_workers)
+
+    async def submit(self, func: Callable, *args, **kwargs) -> Any:
+        """작업을 풀에서 실행하고 결과를 기다림 (대기열이 가득 차면 ExecutorBusy)"""
+        if self._pending >= self.max_workers + self.max_queue:
+            self.stats["rejected"] += 1
+            raise ExecutorBusy(f"{self.name} 풀 대기열 초과 (대기 {self.queue_depth}건)")
+
+        self._pending += 1
+        self.stats["submitted"] += 1
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(_timed, func, *args, **kwargs)
+            result, run_seconds = await loop.run_in_executor(self._get_executor(), call)
+        except BrokenProcessPool:
+            # 작업자 프로세스가 비정상 종료되면 다음 작업에서 풀을 새로 만듦
+            self.stats["failed"] += 1
+            self.stats["restarts"] += 1
+            self._discard_executor()
+            logger.error(f"⚙️ [EXECUTOR] {self.name} 작업자 프로세스 비정상 종료 - 풀 재생성 예정")
+            raise
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        elapsed = time.perf_counter() - submitted
+        self._latencies.append((max(0.0, elapsed - run_seconds), run_seconds))
+        self.stats["completed"] += 1
+        return result
+
+    def _discard_executor(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """풀 종료 (진행 중인 작업은 기다리지 않고 대기 작업은 취소)"""
+        if self._executor is not None:
+            self._discard_executor()
+            logger.info(f"⚙️ [EXECUTOR] {self.name} 풀 종료")
+
+    def get_status_info(self) -> Dict:
+        waits = sorted(w for w, _ in self._latencies)
+        runs = sorted(r for _, r in self._latencies)
+
+        def ms(values, q):
+            return round(values[min(len(values) - 1, int(len(values) * q))] * 1000, 1) if values else 0.0
+
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": self._pending - self.queue_depth,
+            "queue_depth": self.queue_depth,
+            **self.stats,
+            "wait_ms_p50": ms(waits, 0.5),
+            "wait_ms_p95": ms(waits, 0.95),
+            "run_ms_p50": ms(runs, 0.5),
+            "run_ms_p95": ms(runs, 0.95),
+        }
+
+
+# 전역 인스턴스
+cpu_pool = TaskPool("cpu", "process", Config.EXECUTOR_PROCESS_WORKERS, Config.EXECUTOR_PROCESS_QUEUE)
+io_pool = TaskPool("io", "thread", Config.EXECUTOR_THREAD_WORKERS, Config.EXECUTOR_THREAD_QUEUE)
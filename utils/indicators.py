@@ -0,0 +1,565 @@
+"""
+증분(스트리밍) 기술 지표
+
+봉이 마감될 때마다 update()로 O(1)에 갱신하고, 형성 중인 봉을 포함한 값은 peek()로 상태를
+바꾸지 않고 계산한다. 값은 StrategyManager/스캘핑 전략의 pandas 계산(rolling, ewm)과 같다.
+지표가 아직 준비되지 않았으면(pandas의 NaN) None을 돌려준다.
+
+상태는 to_state()/from_state()로 JSON 직렬화해 api.indicator_store가 저장한다.
+가격/거래량이 정수이므로 구간 합은 정수로 누적해 오차가 쌓이지 않는다.
+"""
+import json
+import math
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+
+class _Window:
+    """고정 길이 구간의 합/제곱합 (정수면 정확히 누적)"""
+
+    __slots__ = ("size", "values", "total", "squares")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque()
+        self.total = 0
+        self.squares = 0
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) >= self.size
+
+    def push(self, x):
+        self.values.append(x)
+        self.total += x
+        self.squares += x * x
+        if len(self.values) > self.size:
+            old = self.values.popleft()
+            self.total -= old
+            self.squares -= old * old
+
+    def peek(self, x) -> Tuple[Any, Any, bool]:
+        """x를 넣었을 때의 (합, 제곱합, 꽉 찼는지)"""
+        total, squares = self.total + x, self.squares + x * x
+        if len(self.values) + 1 > self.size:
+            old = self.values[0]
+            total, squares = total - old, squares - old * old
+        return total, squares, len(self.values) + 1 >= self.size
+
+    def to_state(self) -> Dict:
+        return {"values": list(self.values)}
+
+    def load(self, state: Dict):
+        for x in state["values"]:
+            self.push(x)
+
+
+class _Extreme:
+    """단조 덱 구간 최댓값/최솟값 (원소마다 한 번씩만 넣고 빼므로 분할 상환 O(1))"""
+
+    __slots__ = ("size", "sign", "items", "index")
+
+    def __init__(self, size: int, maximum: bool = True):
+        self.size = size
+        self.sign = 1 if maximum else -1
+        self.items = deque()    # (봉 번호, 값) - 값이 단조 감소(최댓값 기준)
+        self.index = 0          # 다음 봉 번호
+
+    def push(self, x):
+        while self.items and self.items[-1][1] * self.sign <= x * self.sign:
+            self.items.pop()
+        self.items.append((self.index, x))
+        self.index += 1
+        if self.items[0][0] <= self.index - 1 - self.size:
+            self.items.popleft()
+
+    def value(self):
+        if self.index < self.size:
+            return None
+        return self.items[0][1]
+
+    def peek(self, x):
+        """x를 넣었을 때의 구간 극값 (구간에서 빠지는 봉은 많아야 하나)"""
+        if self.index + 1 < self.size:
+            return None
+        expired = self.index - self.size
+        best = x
+        for i, v in self.items:
+            if i > expired:
+                if v * self.sign > best * self.sign:
+                    best = v
+                break
+        return best
+
+    def to_state(self) -> Dict:
+        return {"items": [list(item) for item in self.items], "index": self.index}
+
+    def load(self, state: Dict):
+        self.items = deque(tuple(item) for item in state["items"])
+        self.index = state["index"]
+
+
+class _EMA:
+    """pandas ewm(alpha, adjust=False): 첫 값에서 시작해 y += alpha * (x - y)"""
+
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.value: Optional[float] = None
+
+    def push(self, x):
+        self.value = float(x) if self.value is None else self.value + self.alpha * (x - self.value)
+
+    def peek(self, x) -> float:
+        return float(x) if self.value is None else self.value + self.alpha * (x - self.value)
+
+
+def _ratio(numerator, denominator) -> Optional[float]:
+    """0으로 나누기는 pandas와 같이 inf/NaN 규칙을 따름 (NaN이면 None)"""
+    if denominator == 0:
+        return math.copysign(math.inf, numerator) if numerator != 0 else None
+    return numerator / denominator
+
+
+class Indicator:
+    """증분 지표 공통 인터페이스
+
+    update(open, high, low, close, volume): 마감된 봉 반영 후 현재 값 반환
+    peek(open, high, low, close, volume): 그 봉(형성 중)을 넣었을 때의 값 (상태 불변)
+    value: 마지막으로 반영한 봉 기준 값
+    """
+
+    kind = ""
+
+    def __init__(self, **params):
+        self.params = params
+        self.count = 0      # 반영한 봉 수
+        self.value = None
+
+    def update(self, open_, high, low, close, volume):
+        self.count += 1
+        self._push(open_, high, low, close, volume)
+        self.value = self._value()
+        return self.value
+
+    def peek(self, open_, high, low, close, volume):
+        raise NotImplementedError
+
+    def _push(self, open_, high, low, close, volume):
+        raise NotImplementedError
+
+    def _value(self):
+        raise NotImplementedError
+
+    def params_key(self) -> str:
+        return params_key(self.params)
+
+    def to_state(self) -> Dict:
+        return {"count": self.count, "value": self.value, **self._state()}
+
+    def _state(self) -> Dict:
+        raise NotImplementedError
+
+    def _load(self, state: Dict):
+        raise NotImplementedError
+
+    @classmethod
+    def from_state(cls, params: Dict, state: Dict) -> "Indicator":
+        indicator = cls(**params)
+        indicator.count = state["count"]
+        indicator.value = _restore(state["value"])
+        indicator._load(state)
+        return indicator
+
+
+def _restore(value):
+    """JSON에서 읽은 값 복원 (튜플 값은 리스트로 저장됨)"""
+    return tuple(value) if isinstance(value, list) else value
+
+
+class SMA(Indicator):
+    """단순 이동평균 (종가)"""
+
+    kind = "SMA"
+
+    def __init__(self, period: int = 20):
+        super().__init__(period=period)
+        self._window = _Window(period)
+
+    def _push(self, open_, high, low, close, volume):
+        self._window.push(close)
+
+    def _value(self):
+        return self._window.total / self._window.size if self._window.full else None
+
+    def peek(self, open_, high, low, close, volume):
+        total, _, full = self._window.peek(close)
+        return total / self._window.size if full else None
+
+    def _state(self):
+        return self._window.to_state()
+
+    def _load(self, state):
+        self._window.load(state)
+
+
+class Momentum(Indicator):
+    """모멘텀: 현재 종가 - period개 봉 전 종가"""
+
+    kind = "MOMENTUM"
+
+    def __init__(self, period: int = 10):
+        super().__init__(period=period)
+        self._closes = deque(maxlen=period + 1)
+
+    def _push(self, open_, high, low, close, volume):
+        self._closes.append(close)
+
+    def _value(self):
+        if len(self._closes) <= self.params["period"]:
+            return None
+        return self._closes[-1] - self._closes[0]
+
+    def peek(self, open_, high, low, close, volume):
+        period = self.params["period"]
+        if len(self._closes) + 1 <= period:
+            return None
+        # 새 봉이 들어가면 맨 앞 봉이 빠지므로 기준은 뒤에서 period번째
+        return close - self._closes[-period] if period else 0
+
+    def _state(self):
+        return {"closes": list(self._closes)}
+
+    def _load(self, state):
+        self._closes.extend(state["closes"])
+
+
+class Disparity(Indicator):
+    """이격도: 종가 / 이동평균 x 100"""
+
+    kind = "DISPARITY"
+
+    def __init__(self, period: int = 20):
+        super().__init__(period=period)
+        self._window = _Window(period)
+        self._close = None
+
+    def _push(self, open_, high, low, close, volume):
+        self._window.push(close)
+        self._close = close
+
+    def _value(self):
+        if not self._window.full:
+            return None
+        return _disparity(self._close, self._window.total / self._window.size)
+
+    def peek(self, open_, high, low, close, volume):
+        total, _, full = self._window.peek(close)
+        return _disparity(close, total / self._window.size) if full else None
+
+    def _state(self):
+        return {"close": self._close, **self._window.to_state()}
+
+    def _load(self, state):
+        self._window.load(state)
+        self._close = state["close"]
+
+
+def _disparity(close, ma) -> Optional[float]:
+    ratio = _ratio(close, ma)
+    return ratio * 100 if ratio is not None else None
+
+
+class Bollinger(Indicator):
+    """볼린저밴드 -> (이동평균, 상단, 하단, 표준편차) - 구간 합/제곱합으로 평균/표본분산 계산"""
+
+    kind = "BOLLINGER"
+
+    def __init__(self, period: int = 20, multiplier: float = 2.0):
+        super().__init__(period=period, multiplier=multiplier)
+        self._window = _Window(period)
+
+    def _bands(self, total, squares):
+        n = self._window.size
+        mean = total / n
+        if n < 2:
+            return None  # 표본표준편차 정의 불가 (pandas NaN)
+        variance = max(n * squares - total * total, 0) / (n * (n - 1))
+        std = math.sqrt(variance)
+        k = self.params["multiplier"]
+        return mean, mean + std * k, mean - std * k, std
+
+    def _push(self, open_, high, low, close, volume):
+        self._window.push(close)
+
+    def _value(self):
+        return self._bands(self._window.total, self._window.squares) if self._window.full else None
+
+    def peek(self, open_, high, low, close, volume):
+        total, squares, full = self._window.peek(close)
+        return self._bands(total, squares) if full else None
+
+    def _state(self):
+        return self._window.to_state()
+
+    def _load(self, state):
+        self._window.load(state)
+
+
+class RSI(Indicator):
+    """RSI - method="sma": 상승/하락폭 단순평균 (전략 매니저 방식), "wilder": ewm(alpha=1/period)
+
+    pandas와 같이 첫 봉의 변화량은 0으로 본다.
+    """
+
+    kind = "RSI"
+
+    def __init__(self, period: int = 14, method: str = "sma"):
+        super().__init__(period=period, method=method)
+        self._prev_close = None
+        if method == "wilder":
+            self._gain, self._loss = _EMA(1 / period), _EMA(1 / period)
+        else:
+            self._gain, self._loss = _Window(period), _Window(period)
+
+    def _changes(self, close):
+        delta = close - self._prev_close if self._prev_close is not None else 0
+        return max(delta, 0), max(-delta, 0)
+
+    @staticmethod
+    def _rsi(gain, loss) -> Optional[float]:
+        rs = _ratio(gain, loss)
+        if rs is None:
+            return None
+        return 100 - (100 / (1 + rs))
+
+    def _push(self, open_, high, low, close, volume):
+        gain, loss = self._changes(close)
+        self._gain.push(gain)
+        self._loss.push(loss)
+        self._prev_close = close
+
+    def _value(self):
+        if self.count < self.params["period"]:
+            return None
+        if self.params["method"] == "wilder":
+            return self._rsi(self._gain.value, self._loss.value)
+        return self._rsi(self._gain.total, self._loss.total)
+
+    def peek(self, open_, high, low, close, volume):
+        if self.count + 1 < self.params["period"]:
+            return None
+        gain, loss = self._changes(close)
+        if self.params["method"] == "wilder":
+            return self._rsi(self._gain.peek(gain), self._loss.peek(loss))
+        return self._rsi(self._gain.peek(gain)[0], self._loss.peek(loss)[0])
+
+    def _state(self):
+        if self.params["method"] == "wilder":
+            return {"prev_close": self._prev_close, "gain": self._gain.value, "loss": self._loss.value}
+        return {"prev_close": self._prev_close, "gain": self._gain.to_state(), "loss": self._loss.to_state()}
+
+    def _load(self, state):
+        self._prev_close = state["prev_close"]
+        if self.params["method"] == "wilder":
+            self._gain.value, self._loss.value = state["gain"], state["loss"]
+        else:
+            self._gain.load(state["gain"])
+            self._loss.load(state["loss"])
+
+
+class WeightedVolume(Indicator):
+    """가중평균거래량 (최근 봉일수록 큰 선형 가중치 1..period)
+
+    가중합 W와 합 S를 유지하면 새 거래량 x에 대해 W' = W - S + period * x 로 O(1) 갱신된다.
+    """
+
+    kind = "WEIGHTED_VOLUME"
+
+    def __init__(self, period: int = 20):
+        super().__init__(period=period)
+        self._window = _Window(period)
+        self._weighted = 0
+
+    def _next_weighted(self, volume) -> int:
+        n = self.params["period"]
+        if self._window.full:
+            return self._weighted - self._window.total + n * volume
+        return self._weighted + (len(self._window.values) + 1) * volume
+
+    def _push(self, open_, high, low, close, volume):
+        self._weighted = self._next_weighted(volume)
+        self._window.push(volume)
+
+    def _average(self, weighted) -> float:
+        n = self.params["period"]
+        return weighted / (n * (n + 1) / 2)
+
+    def _value(self):
+        return self._average(self._weighted) if self._window.full else None
+
+    def peek(self, open_, high, low, close, volume):
+        _, _, full = self._window.peek(volume)
+        return self._average(self._next_weighted(volume)) if full else None
+
+    def _state(self):
+        return {"weighted": self._weighted, **self._window.to_state()}
+
+    def _load(self, state):
+        self._window.load(state)
+        self._weighted = state["weighted"]
+
+
+class Ichimoku(Indicator):
+    """일목균형표 -> {conversion, base, span_a, span_b} (선행스팬은 displacement개 봉 전 값)"""
+
+    kind = "ICHIMOKU"
+
+    def __init__(self, conversion_period: int = 9, base_period: int = 26,
+                 span_b_period: int = 52, displacement: int = 26):
+        super().__init__(conversion_period=conversion_period, base_period=base_period,
+                         span_b_period=span_b_period, displacement=displacement)
+        self._extremes = {
+            name: (_Extreme(period, True), _Extreme(period, False))
+            for name, period in (("conversion", conversion_period), ("base", base_period),
+                                 ("span_b", span_b_period))
+        }
+        # 선행스팬 원값 (최근 displacement + 1개)
+        self._spans = deque(maxlen=displacement + 1)
+        self._last = self._lines()
+
+    @staticmethod
+    def _midpoint(high, low):
+        if high is None or low is None:
+            return None
+        return (high + low) / 2
+
+    def _lines(self, peek_bar=None) -> Dict[str, Optional[float]]:
+        lines = {}
+        for name, (highs, lows) in self._extremes.items():
+            if peek_bar is None:
+                lines[name] = self._midpoint(highs.value(), lows.value())
+            else:
+                lines[name] = self._midpoint(highs.peek(peek_bar[0]), lows.peek(peek_bar[1]))
+        conversion, base = lines["conversion"], lines["base"]
+        span_a = (conversion + base) / 2 if conversion is not None and base is not None else None
+        return {"conversion": conversion, "base": base, "span_a": span_a, "span_b": lines["span_b"]}
+
+    def _result(self, lines, spans) -> Dict[str, Optional[float]]:
+        displacement = self.params["displacement"]
+        span_a = span_b = None
+        if len(spans) > displacement:
+            span_a, span_b = spans[-1 - displacement]
+        return {"conversion": lines["conversion"], "base": lines["base"], "span_a": span_a, "span_b": span_b}
+
+    def _push(self, open_, high, low, close, volume):
+        for highs, lows in self._extremes.values():
+            highs.push(high)
+            lows.push(low)
+        lines = self._lines()
+        self._spans.append((lines["span_a"], lines["span_b"]))
+        self._last = lines
+
+    def _value(self):
+        return self._result(self._last, self._spans)
+
+    def peek(self, open_, high, low, close, volume):
+        lines = self._lines((high, low))
+        spans = list(self._spans) + [(lines["span_a"], lines["span_b"])]
+        return self._result(lines, spans[-(self.params["displacement"] + 1):])
+
+    def _state(self):
+        return {
+            "extremes": {name: [highs.to_state(), lows.to_state()]
+                         for name, (highs, lows) in self._extremes.items()},
+            "spans": [list(span) for span in self._spans],
+        }
+
+    def _load(self, state):
+        for name, (highs, lows) in self._extremes.items():
+            highs.load(state["extremes"][name][0])
+            lows.load(state["extremes"][name][1])
+        self._spans.extend(tuple(span) for span in state["spans"])
+        self._last = self._lines()
+
+
+class Chaikin(Indicator):
+    """차이킨 오실레이터: AD 라인의 단기 평균 - 장기 평균
+
+    ma="sma": 단순이동평균 (전략 매니저 방식), "ema": ewm(span, adjust=False) (표준 차이킨)
+    """
+
+    kind = "CHAIKIN"
+
+    def __init__(self, short_period: int = 3, long_period: int = 10, ma: str = "sma"):
+        super().__init__(short_period=short_period, long_period=long_period, ma=ma)
+        self.ad = 0.0   # 누적 AD 라인
+        if ma == "ema":
+            self._short, self._long = _EMA(2 / (short_period + 1)), _EMA(2 / (long_period + 1))
+        else:
+            self._short, self._long = _Window(short_period), _Window(long_period)
+
+    @staticmethod
+    def money_flow(high, low, close, volume) -> float:
+        """CLV x 거래량 (고가=저가인 봉은 0)"""
+        clv = _ratio((close - low) - (high - close), high - low)
+        return clv * volume if clv is not None else 0.0
+
+    def _oscillator(self, short, long) -> Optional[float]:
+        if self.params["ma"] == "ema":
+            return short - long
+        return short / self._short.size - long / self._long.size
+
+    def _push(self, open_, high, low, close, volume):
+        self.ad += self.money_flow(high, low, close, volume)
+        self._short.push(self.ad)
+        self._long.push(self.ad)
+
+    def _value(self):
+        if self.params["ma"] == "ema":
+            return self._oscillator(self._short.value, self._long.value)
+        if not self._long.full or not self._short.full:
+            return None
+        return self._oscillator(self._short.total, self._long.total)
+
+    def peek(self, open_, high, low, close, volume):
+        ad = self.ad + self.money_flow(high, low, close, volume)
+        if self.params["ma"] == "ema":
+            return self._oscillator(self._short.peek(ad), self._long.peek(ad))
+        short, _, short_full = self._short.peek(ad)
+        long, _, long_full = self._long.peek(ad)
+        return self._oscillator(short, long) if short_full and long_full else None
+
+    def _state(self):
+        if self.params["ma"] == "ema":
+            return {"ad": self.ad, "short": self._short.value, "long": self._long.value}
+        return {"ad": self.ad, "short": self._short.to_state(), "long": self._long.to_state()}
+
+    def _load(self, state):
+        self.ad = state["ad"]
+        if self.params["ma"] == "ema":
+            self._short.value, self._long.value = state["short"], state["long"]
+        else:
+            self._short.load(state["short"])
+            self._long.load(state["long"])
+
+
+# 지표 종류 -> 클래스
+INDICATORS = {cls.kind: cls for cls in (SMA, Momentum, Disparity, Bollinger, RSI, WeightedVolume, Ichimoku, Chaikin)}
+
+
+def params_key(params: Dict) -> str:
+    """파라미터 -> 저장 키 (정렬된 JSON)"""
+    return json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+def create_indicator(kind: str, params: Optional[Dict] = None) -> Indicator:
+    cls = INDICATORS.get(kind)
+    if cls is None:
+        raise ValueError(f"지원하지 않는 지표: {kind}")
+    return cls(**(params or {}))
+
+
+def restore_indicator(kind: str, params: Dict, state: Dict) -> Indicator:
+    return INDICATORS[kind].from_state(params, state)
@@ -0,0 +1,892 @@
+"""
+키움 REST/WebSocket 로컬 에뮬레이터 - 부하 테스트 및 오프라인 벤치마크용
+
+이 프로젝트가 사용하는 TR만 구현한다.
+- POST /oauth2/token                      : 토큰 발급
+- POST /api/dostk/chart  (ka10080/ka10081): 분봉/일봉 (cont-yn/next-key 연속조회)
+- POST /api/dostk/acnt   (ka10085/kt00004): 계좌수익률/계좌평가현황
+- POST /api/dostk/ordr   (kt10000/kt10001): 매수/매도 주문 (즉시 체결, 지정가는 도달 시 체결)
+- WS   /api/dostk/websocket               : LOGIN, PING, CNSRLST, CNSRREQ, REG/REMOVE, REAL(0B)
+- GET  /emulator/status                   : 호출 통계
+
+가격은 종목코드+시드로 고정된 기하 브라운 운동(GBM) 경로라 같은 시드면 같은 가격열이 나온다.
+지연 시간(latency/jitter)과 호출 제한(초과 시 HTTP 429)을 설정할 수 있다.
+
+사용 예:
+  python -m utils.kiwoom_emulator --port 9443 --seed 42 --latency-ms 30 --rate-limit 5
+
+앱 설정 (.env):
+  KIWOOM_USE_MOCK_ACCOUNT=true
+  KIWOOM_MOCK_API_URL=http://127.0.0.1:9443
+  KIWOOM_MOCK_WS_URL=ws://127.0.0.1:9443
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import uuid
+import zlib
+from collections import deque
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Dict, List, Optional, Set
+
+from aiohttp import web, WSMsgType
+
+logger = logging.getLogger(__name__)
+
+SESSION_OPEN = dtime(9, 0)
+SESSION_CLOSE = dtime(15, 30)
+SUCCESS_MSG = "정상적으로 처리되었습니다"
+
+# 자주 쓰는 종목은 실제 이름으로 표시 (나머지는 합성 이름)
+KNOWN_STOCKS = {
+    "005930": "삼성전자",
+    "000660": "SK하이닉스",
+    "035420": "NAVER",
+    "035720": "카카오",
+    "005380": "현대차",
+    "051910": "LG화학",
+    "068270": "셀트리온",
+    "105560": "KB금융",
+}
+
+
+def tick_size(price: float) -> int:
+    """KRX 호가 단위"""
+    if price < 2000:
+        return 1
+    if price < 5000:
+        return 5
+    if price < 20000:
+        return 10
+    if price < 50000:
+        return 50
+    if price < 200000:
+        return 100
+    if price < 500000:
+        return 500
+    return 1000
+
+
+def snap_price(price: float) -> int:
+    """호가 단위로 반올림 (최소 1호가)"""
+    unit = tick_size(price)
+    return max(int(round(price / unit)) * unit, unit)
+
+
+def signed(value: int, base: int) -> str:
+    """키움 형식의 부호 붙은 가격 문자열 (기준가 대비 상승 +, 하락 -)"""
+    if value > base:
+        return f"+{value}"
+    if value < base:
+        return f"-{value}"
+    return str(value)
+
+
+def trading_minutes(end: datetime, count: int) -> List[datetime]:
+    """end 이전(포함) 정규장 1분봉 시작 시각 count개 (오래된 것부터)"""
+    minutes = []
+    t = end.replace(second=0, microsecond=0)
+    while len(minutes) < count:
+        if t.weekday() < 5 and SESSION_OPEN <= t.time() < SESSION_CLOSE:
+            minutes.append(t)
+            t -= timedelta(minutes=1)
+        elif t.weekday() < 5 and t.time() >= SESSION_CLOSE:
+            t = t.replace(hour=15, minute=29)
+        else:
+            # 장 시작 전/주말이면 전날 마지막 분봉으로
+            t = (t - timedelta(days=1)).replace(hour=15, minute=29)
+    minutes.reverse()
+    return minutes
+
+
+def trading_days(end: date, count: int) -> List[date]:
+    """end 이전(미포함) 평일 count개 (오래된 것부터)"""
+    days = []
+    d = end - timedelta(days=1)
+    while len(days) < count:
+        if d.weekday() < 5:
+            days.append(d)
+        d -= timedelta(days=1)
+    days.reverse()
+    return days
+
+
+class SymbolPath:
+    """종목별 합성 가격 경로 (일봉 이력 + 분봉 이력 + 실시간 틱)
+
+    봉은 [시각, 시가, 고가, 저가, 종가, 거래량] 리스트로 보관하고
+    실시간 틱이 들어오면 마지막 분봉과 당일 일봉을 갱신한다.
+    """
+
+    def __init__(self, code: str, seed: int, minute_times: List[datetime], days: List[date],
+                 daily_sigma: float = 0.02, minute_sigma: float = 0.0015, tick_sigma: float = 0.0004):
+        self.code = code
+        self.name = KNOWN_STOCKS.get(code, f"에뮬종목{code}")
+        self.rng = random.Random(zlib.crc32(code.encode()) ^ seed)
+        self.tick_sigma = tick_sigma
+
+        # 종목마다 다른 가격대 (2천원 ~ 30만원, 로그 균등)
+        price = snap_price(math.exp(self.rng.uniform(math.log(2000), math.log(300000))))
+        base_volume = self.rng.randint(50_000, 5_000_000)
+
+        # 분봉 이력이 시작되기 전 날짜만 일봉을 따로 만들고, 이후 날짜의 일봉은
+        # 분봉을 합쳐 만든다 (1분봉 리샘플링 결과와 일봉 TR이 서로 맞도록)
+        first_minute_day = minute_times[0].date() if minute_times else date.max
+        self.daily_bars: List[list] = []
+        for d in days:
+            if d >= first_minute_day:
+                break
+            bar = self._random_bar(datetime.combine(d, SESSION_CLOSE), price, daily_sigma, base_volume)
+            self.daily_bars.append(bar)
+            price = bar[4]
+
+        self.minute_bars: List[list] = []
+        for t in minute_times:
+            bar = self._random_bar(t, price, minute_sigma, max(base_volume // 390, 10))
+            self.minute_bars.append(bar)
+            price = bar[4]
+
+        today = datetime.now().date()
+        by_day: Dict[date, list] = {}
+        for ts, o, h, l, c, v in self.minute_bars:
+            bar = by_day.get(ts.date())
+            if bar is None:
+                by_day[ts.date()] = [datetime.combine(ts.date(), SESSION_CLOSE), o, h, l, c, v]
+            else:
+                bar[2] = max(bar[2], h)
+                bar[3] = min(bar[3], l)
+                bar[4] = c
+                bar[5] += v
+        self.daily_bars.extend(bar for d, bar in sorted(by_day.items()) if d < today)
+        self.prev_close = self.daily_bars[-1][4] if self.daily_bars else price  # 전일 종가 (등락 기준)
+
+        self.price = price
+        self.cum_volume = by_day[today][5] if today in by_day else 0
+        self.today_bar = by_day.get(today) or [datetime.combine(today, SESSION_CLOSE), price, price, price, price, 0]
+
+    def _random_bar(self, ts: datetime, prev_close: int, sigma: float, base_volume: int) -> list:
+        """직전 종가에서 출발하는 GBM 봉 1개 (4스텝으로 고가/저가 생성)"""
+        open_price = prev_close
+        high = low = close = open_price
+        step_sigma = sigma / 2
+        for _ in range(4):
+            close = snap_price(close * math.exp(self.rng.gauss(0.0, step_sigma)))
+            high = max(high, close)
+            low = min(low, close)
+        volume = max(int(base_volume * self.rng.lognormvariate(0.0, 0.5)), 1)
+        return [ts, open_price, high, low, close, volume]
+
+    def step(self, now: datetime) -> int:
+        """틱 1개 진행 후 체결량 반환 (분봉/당일 일봉 갱신)"""
+        self.price = snap_price(self.price * math.exp(self.rng.gauss(0.0, self.tick_sigma)))
+        volume = self.rng.randint(1, 500)
+        self.cum_volume += volume
+
+        minute = now.replace(second=0, microsecond=0)
+        last = self.minute_bars[-1] if self.minute_bars else None
+        if last is None or minute > last[0]:
+            self.minute_bars.append([minute, self.price, self.price, self.price, self.price, volume])
+        else:
+            last[2] = max(last[2], self.price)
+            last[3] = min(last[3], self.price)
+            last[4] = self.price
+            last[5] += volume
+
+        bar = self.today_bar
+        bar[2] = max(bar[2], self.price)
+        bar[3] = min(bar[3], self.price)
+        bar[4] = self.price
+        bar[5] += volume
+        return volume
+
+    def minute_chart(self, scope: int) -> List[Dict]:
+        """ka10080 형식 분봉 (최신순, scope분 단위로 묶음)"""
+        grouped: List[list] = []
+        key = None
+        for ts, o, h, l, c, v in self.minute_bars:
+            minutes = ts.hour * 60 + ts.minute - (SESSION_OPEN.hour * 60)
+            bar_key = (ts.date(), minutes // scope)
+            if bar_key != key:
+                key = bar_key
+                start = datetime.combine(ts.date(), SESSION_OPEN) + timedelta(minutes=(minutes // scope) * scope)
+                grouped.append([start, o, h, l, c, v])
+            else:
+                cur = grouped[-1]
+                cur[2] = max(cur[2], h)
+                cur[3] = min(cur[3], l)
+                cur[4] = c
+                cur[5] += v
+
+        base = self.prev_close
+        return [{
+            "cur_prc": signed(c, base),
+            "trde_qty": str(v),
+            "cntr_tm": ts.strftime("%Y%m%d%H%M%S"),
+            "open_pric": signed(o, base),
+            "high_pric": signed(h, base),
+            "low_pric": signed(l, base),
+            "pred_pre": signed(c - base, 0),
+        } for ts, o, h, l, c, v in reversed(grouped)]
+
+    def daily_chart(self) -> List[Dict]:
+        """ka10081 형식 일봉 (최신순, 당일 포함)"""
+        bars = self.daily_bars + [self.today_bar]
+        return [{
+            "cur_prc": str(c),
+            "trde_qty": str(v),
+            "trde_prica": str(c * v // 1_000_000),
+            "dt": ts.strftime("%Y%m%d"),
+            "open_pric": str(o),
+            "high_pric": str(h),
+            "low_pric": str(l),
+        } for ts, o, h, l, c, v in reversed(bars)]
+
+
+class EmulatorAccount:
+    """에뮬레이터 계좌 (예수금/보유종목/미체결 지정가 주문)"""
+
+    def __init__(self, cash: int):
+        self.cash = cash
+        self.holdings: Dict[str, List[int]] = {}  # 종목코드 -> [수량, 평균단가]
+        self.open_orders: List[Dict] = []
+        self.realized_pl = 0
+        self.order_seq = 0
+
+    def next_order_no(self) -> str:
+        self.order_seq += 1
+        return f"{self.order_seq:07d}"
+
+    def fill(self, code: str, side: str, qty: int, price: int) -> Optional[str]:
+        """체결 반영 (실패 시 오류 메시지 반환)"""
+        if side == "1":
+            cost = price * qty
+            if cost > self.cash:
+                return "주문가능금액이 부족합니다"
+            held_qty, avg = self.holdings.get(code, [0, 0])
+            new_qty = held_qty + qty
+            self.holdings[code] = [new_qty, (held_qty * avg + cost) // new_qty]
+            self.cash -= cost
+            return None
+
+        held_qty, avg = self.holdings.get(code, [0, 0])
+        if qty > held_qty:
+            return "매도가능수량이 부족합니다"
+        self.cash += price * qty
+        self.realized_pl += (price - avg) * qty
+        if qty == held_qty:
+            del self.holdings[code]
+        else:
+            self.holdings[code][0] = held_qty - qty
+        return None
+
+
+class _WsSession:
+    """WebSocket 연결별 상태"""
+
+    def __init__(self, ws: web.WebSocketResponse):
+        self.ws = ws
+        self.logged_in = False
+        self.condition_list_loaded = False
+        self.codes: Set[str] = set()
+        self.send_lock = asyncio.Lock()
+
+
+class KiwoomEmulator:
+    """키움 REST/WebSocket 에뮬레이터 서버
+
+    in-process로도 쓸 수 있다:
+        async with KiwoomEmulator(port=0, seed=1) as emu:
+            Config.KIWOOM_MOCK_API_URL = emu.base_url
+            Config.KIWOOM_MOCK_WS_URL = emu.ws_url
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9443, seed: int = 42,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 rate_limit: int = 5, rate_window: float = 1.0,
+                 tick_interval: float = 0.5, tick_probability: float = 1.0,
+                 universe_size: int = 200, conditions: int = 3, condition_size: int = 20,
+                 cash: int = 10_000_000, history_minutes: int = 1800, history_days: int = 600,
+                 minute_page_size: int = 900, daily_page_size: int = 600, account_page_size: int = 20,
+                 token_ttl_hours: float = 24.0, ping_interval: float = 30.0):
+        self.host = host
+        self.port = port
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit  # rate_window초당 허용 REST 호출 수 (0이면 무제한)
+        self.rate_window = rate_window
+        self.tick_interval = tick_interval
+        self.tick_probability = tick_probability
+        self.history_minutes = history_minutes
+        self.history_days = history_days
+        self.minute_page_size = minute_page_size
+        self.daily_page_size = daily_page_size
+        self.account_page_size = account_page_size
+        self.token_ttl = timedelta(hours=token_ttl_hours)
+        self.ping_interval = ping_interval
+
+        # 지연 시간 난수는 가격 경로와 분리 (지연 설정이 가격열에 영향을 주지 않도록)
+        self._latency_rng = random.Random(seed + 1)
+
+        rng = random.Random(seed)
+        synthetic = sorted(f"{n:06d}" for n in rng.sample(range(100000, 999999), max(universe_size, 0)))
+        self.universe: List[str] = (list(KNOWN_STOCKS) + [c for c in synthetic if c not in KNOWN_STOCKS])[:universe_size]
+        self.conditions: List[Dict] = []
+        for i in range(conditions):
+            members = random.Random(seed * 1000 + i).sample(self.universe, min(condition_size, len(self.universe)))
+            self.conditions.append({"seq": str(i), "name": f"에뮬조건식{i}", "codes": members})
+
+        self.account = EmulatorAccount(cash)
+        self._symbols: Dict[str, SymbolPath] = {}
+        self._minute_times: Optional[List[datetime]] = None
+        self._days: Optional[List[date]] = None
+        self._tokens: Dict[str, datetime] = {}
+        self._call_times: deque = deque()
+        self._sessions: Set[_WsSession] = set()
+
+        self.stats = {
+            "rest_calls": {},
+            "rate_limited": 0,
+            "auth_failed": 0,
+            "tokens_issued": 0,
+            "orders": 0,
+            "ws_sessions_total": 0,
+            "real_messages": 0,
+            "ticks": 0,
+        }
+
+        self._runner: Optional[web.AppRunner] = None
+        self._tick_task: Optional[asyncio.Task] = None
+
+    # ===== 서버 수명주기 =====
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/oauth2/token", self._handle_token)
+        app.router.add_post("/api/dostk/chart", self._handle_chart)
+        app.router.add_post("/api/dostk/acnt", self._handle_account)
+        app.router.add_post("/api/dostk/ordr", self._handle_order)
+        app.router.add_get("/api/dostk/websocket", self._handle_websocket)
+        app.router.add_get("/emulator/status", self._handle_status)
+        return app
+
+    async def start(self):
+        """서버 시작 (port=0이면 빈 포트를 잡고 self.port에 반영)"""
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            self.port = self._runner.addresses[0][1]
+        self._tick_task = asyncio.get_running_loop().create_task(self._tick_loop())
+        logger.info(f"🧪 [EMULATOR] 키움 에뮬레이터 시작: {self.base_url} (seed={self.seed})")
+
+    async def stop(self):
+        if self._tick_task:
+            self._tick_task.cancel()
+            try:
+                await self._tick_task
+            except asyncio.CancelledError:
+                pass
+            self._tick_task = None
+        for session in list(self._sessions):
+            await session.ws.close()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+        logger.info("🧪 [EMULATOR] 키움 에뮬레이터 종료")
+
+    async def __aenter__(self) -> "KiwoomEmulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    # ===== 공통 처리 =====
+
+    def get_symbol(self, code: str) -> SymbolPath:
+        """종목 가격 경로 (처음 조회 시 생성)"""
+        code = code.replace("A", "")
+        path = self._symbols.get(code)
+        if path is None:
+            if self._minute_times is None:
+                now = datetime.now()
+                self._minute_times = trading_minutes(now, self.history_minutes)
+                self._days = trading_days(now.date(), self.history_days)
+            path = SymbolPath(code, self.seed, self._minute_times, self._days)
+            self._symbols[code] = path
+        return path
+
+    async def _delay(self):
+        """설정된 지연 시간 적용"""
+        if self.latency_ms <= 0 and self.jitter_ms <= 0:
+            return
+        delay = self.latency_ms + self._latency_rng.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    def _rate_limited(self) -> bool:
+        """슬라이딩 윈도우 호출 제한 (초과 시 True)"""
+        if self.rate_limit <= 0:
+            return False
+        now = asyncio.get_running_loop().time()
+        while self._call_times and now - self._call_times[0] >= self.rate_window:
+            self._call_times.popleft()
+        if len(self._call_times) >= self.rate_limit:
+            return True
+        self._call_times.append(now)
+        return False
+
+    def _token_valid(self, token: Optional[str]) -> bool:
+        expiry = self._tokens.get(token or "")
+        return expiry is not None and datetime.now() < expiry
+
+    async def _guard(self, request: web.Request, api_id: str) -> Optional[web.Response]:
+        """REST 공통: 지연 → 호출 제한(429) → 토큰 검증. 통과하면 None"""
+        await self._delay()
+        calls = self.stats["rest_calls"]
+        calls[api_id] = calls.get(api_id, 0) + 1
+
+        if self._rate_limited():
+            self.stats["rate_limited"] += 1
+            return web.json_response({
+                "return_code": 5,
+                "return_msg": f"허용된 요청 개수를 초과하였습니다. API ID={api_id}",
+            }, status=429)
+
+        auth = request.headers.get("authorization", "")
+        token = auth[7:] if auth.lower().startswith("bearer ") else None
+        if not self._token_valid(token):
+            self.stats["auth_failed"] += 1
+            return web.json_response({"return_code": 3, "return_msg": "토큰이 유효하지 않습니다"})
+        return None
+
+    @staticmethod
+    async def _read_json(request: web.Request) -> Dict:
+        try:
+            return await request.json()
+        except (json.JSONDecodeError, ValueError):
+            return {}
+
+    @staticmethod
+    def _paginate(request: web.Request, items: List, page_size: int, key_field: Optional[str] = None):
+        """연속조회 페이지 자르기 -> (페이지, 응답 헤더)
+
+        key_field가 있으면 최신순 목록에서 next-key(마지막으로 내려준 봉의 시각)보다
+        과거인 항목부터 이어서 준다. 조회 사이에 새 봉이 붙어도 중복/누락이 없다.
+        key_field가 없으면 next-key를 오프셋으로 쓴다.
+        """
+        next_key = request.headers.get("next-key") or ""
+        offset = 0
+        if request.headers.get("cont-yn") == "Y" and next_key:
+            if key_field:
+                offset = next((i for i, item in enumerate(items) if item[key_field] < next_key), len(items))
+            else:
+                try:
+                    offset = max(int(next_key), 0)
+                except ValueError:
+                    offset = 0
+        page = items[offset:offset + page_size]
+        end = offset + len(page)
+        has_next = end < len(items)
+        if has_next:
+            next_key = page[-1][key_field] if key_field else str(end)
+        headers = {
+            "cont-yn": "Y" if has_next else "N",
+            "next-key": next_key if has_next else "",
+            "api-id": request.headers.get("api-id", ""),
+        }
+        return page, headers
+
+    # ===== REST 핸들러 =====
+
+    async def _handle_token(self, request: web.Request) -> web.Response:
+        """토큰 발급 (호출 제한 미적용 - 앱의 429 쿨다운에 걸리지 않도록)"""
+        await self._delay()
+        body = await self._read_json(request)
+        if not body.get("appkey") or not body.get("secretkey"):
+            return web.json_response({"return_code": 3, "return_msg": "appkey/secretkey가 필요합니다"})
+
+        token = uuid.uuid4().hex
+        expiry = datetime.now() + self.token_ttl
+        self._tokens[token] = expiry
+        self.stats["tokens_issued"] += 1
+        return web.json_response({
+            "expires_dt": expiry.strftime("%Y%m%d%H%M%S"),
+            "token_type": "bearer",
+            "token": token,
+            "return_code": 0,
+            "return_msg": SUCCESS_MSG,
+        })
+
+    async def _handle_chart(self, request: web.Request) -> web.Response:
+        api_id = request.headers.get("api-id", "")
+        rejected = await self._guard(request, api_id)
+        if rejected is not None:
+            return rejected
+
+        body = await self._read_json(request)
+        code = (body.get("stk_cd") or "").strip()
+        if not code:
+            return web.json_response({"return_code": 2, "return_msg": "종목코드(stk_cd)가 필요합니다"})
+        path = self.get_symbol(code)
+
+        if api_id == "ka10080":
+            try:
+                scope = max(int(body.get("tic_scope") or 1), 1)
+            except ValueError:
+                scope = 1
+            page, headers = self._paginate(request, path.minute_chart(scope), self.minute_page_size, "cntr_tm")
+            payload = {"stk_cd": code, "stk_min_pole_chart_qry": page}
+        elif api_id == "ka10081":
+            page, headers = self._paginate(request, path.daily_chart(), self.daily_page_size, "dt")
+            payload = {"stk_cd": code, "stk_dt_pole_chart_qry": page}
+        else:
+            return web.json_response({"return_code": 2, "return_msg": f"지원하지 않는 API ID: {api_id}"})
+
+        payload.update({"return_code": 0, "return_msg": SUCCESS_MSG})
+        return web.json_response(payload, headers=headers)
+
+    async def _handle_account(self, request: web.Request) -> web.Response:
+        api_id = request.headers.get("api-id", "")
+        rejected = await self._guard(request, api_id)
+        if rejected is not None:
+            return rejected
+
+        account = self.account
+        if api_id == "ka10085":
+            rows = []
+            for code, (qty, avg) in sorted(account.holdings.items()):
+                path = self.get_symbol(code)
+                rows.append({
+                    "dt": datetime.now().strftime("%Y%m%d"),
+                    "stk_cd": code,
+                    "stk_nm": path.name,
+                    "cur_prc": str(path.price),
+                    "pur_pric": str(avg),
+                    "pur_amt": str(avg * qty),
+                    "rmnd_qty": str(qty),
+                    "tdy_sel_pl": "0",
+                    "tdy_trde_cmsn": "0",
+                    "tdy_trde_tax": "0",
+                    "crd_tp": "00",
+                    "loan_dt": "",
+                    "setl_remn": str(qty),
+                })
+            page, headers = self._paginate(request, rows, self.account_page_size)
+            return web.json_response({"acnt_prft_rt": page, "return_code": 0, "return_msg": SUCCESS_MSG},
+                                     headers=headers)
+
+        if api_id == "kt00004":
+            items = []
+            total_pur = total_eval = 0
+            for code, (qty, avg) in sorted(account.holdings.items()):
+                path = self.get_symbol(code)
+                pur_amt = avg * qty
+                eval_amt = path.price * qty
+                total_pur += pur_amt
+                total_eval += eval_amt
+                items.append({
+                    "stk_cd": f"A{code}",
+                    "stk_nm": path.name,
+                    "qty": str(qty),
+                    # 문서상 필드(avg_prc/cur_prc)와 기존 파서가 읽는 필드(avg_pr/cur_pr)를 모두 제공
+                    "avg_prc": str(avg),
+                    "avg_pr": str(avg),
+                    "cur_prc": str(path.price),
+                    "cur_pr": str(path.price),
+                    "pur_amt": str(pur_amt),
+                    "evlt_amt": str(eval_amt),
+                    "lspft_amt": str(eval_amt - pur_amt),
+                    "lspft_rt": f"{(eval_amt - pur_amt) / pur_amt * 100:.2f}" if pur_amt else "0.00",
+                })
+            pl = total_eval - total_pur
+            return web.json_response({
+                "acnt_nm": "에뮬레이터",
+                "brch_nm": "에뮬레이터지점",
+                "entr": str(account.cash),
+                "d2_entra": str(account.cash),
+                "tot_est_amt": str(total_eval + account.cash),
+                "aset_evlt_amt": str(total_eval),
+                "tot_pur_amt": str(total_pur),
+                "prsm_dpst_aset_amt": str(total_eval + account.cash),
+                "tdy_lspft": str(account.realized_pl),
+                "tdy_lspft_amt": str(account.realized_pl),
+                "lspft_amt": str(pl),
+                "lspft": str(pl),
+                "lspft_rt": f"{pl / total_pur * 100:.2f}" if total_pur else "0.00",
+                "stk_acnt_evlt_prst": items,
+                "return_code": 0,
+                "return_msg": SUCCESS_MSG,
+            })
+
+        return web.json_response({"return_code": 2, "return_msg": f"지원하지 않는 API ID: {api_id}"})
+
+    async def _handle_order(self, request: web.Request) -> web.Response:
+        api_id = request.headers.get("api-id", "")
+        rejected = await self._guard(request, api_id)
+        if rejected is not None:
+            return rejected
+
+        body = await self._read_json(request)
+        code = (body.get("stk_cd") or "").replace("A", "").strip()
+        # kt10001(매도) 또는 kt10000 + ord_side_cd=2 를 매도로 처리
+        side = "2" if api_id == "kt10001" or str(body.get("ord_side_cd")) == "2" else "1"
+        try:
+            qty = int(body.get("ord_qty") or 0)
+            limit_price = int(body.get("ord_uv") or 0)
+        except ValueError:
+            return web.json_response({"return_code": 2, "return_msg": "주문수량/단가 형식 오류"})
+        if not code or qty <= 0:
+            return web.json_response({"return_code": 2, "return_msg": "종목코드/주문수량을 확인하세요"})
+
+        self.stats["orders"] += 1
+        account = self.account
+        path = self.get_symbol(code)
+        order_no = account.next_order_no()
+        is_market = body.get("trde_tp", "3") == "3" or limit_price <= 0
+
+        marketable = is_market or (path.price <= limit_price if side == "1" else path.price >= limit_price)
+        if marketable:
+            error = account.fill(code, side, qty, path.price)
+            if error:
+                return web.json_response({"return_code": 1, "return_msg": error})
+        else:
+            if side == "1" and limit_price * qty > account.cash:
+                return web.json_response({"return_code": 1, "return_msg": "주문가능금액이 부족합니다"})
+            account.open_orders.append({"ord_no": order_no, "code": code, "side": side,
+                                        "qty": qty, "price": limit_price})
+
+        side_name = "매수" if side == "1" else "매도"
+        return web.json_response({
+            "ord_no": order_no,
+            "dmst_stex_tp": body.get("dmst_stex_tp", "KRX"),
+            "return_code": 0,
+            "return_msg": f"{side_name}주문이 완료되었습니다",
+        })
+
+    async def _handle_status(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            **self.stats,
+            "ws_sessions": len(self._sessions),
+            "symbols": len(self._symbols),
+            "subscribed": len(set().union(*(s.codes for s in self._sessions))) if self._sessions else 0,
+            "holdings": len(self.account.holdings),
+            "open_orders": len(self.account.open_orders),
+            "cash": self.account.cash,
+        })
+
+    # ===== WebSocket =====
+
+    async def _ws_send(self, session: _WsSession, payload: Dict):
+        async with session.send_lock:
+            if not session.ws.closed:
+                await session.ws.send_str(json.dumps(payload, ensure_ascii=False))
+
+    async def _ping_loop(self, session: _WsSession):
+        """키움 서버처럼 주기적으로 PING 전송 (클라이언트는 그대로 되돌려 보냄)"""
+        while not session.ws.closed:
+            await asyncio.sleep(self.ping_interval)
+            await self._ws_send(session, {"trnm": "PING"})
+
+    async def _handle_websocket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        session = _WsSession(ws)
+        self._sessions.add(session)
+        self.stats["ws_sessions_total"] += 1
+        ping_task = asyncio.get_running_loop().create_task(self._ping_loop(session))
+
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    data = json.loads(msg.data)
+                except json.JSONDecodeError:
+                    continue
+                response = self._handle_ws_message(session, data)
+                if response is not None:
+                    await self._delay()
+                    await self._ws_send(session, response)
+        except Exception as e:
+            logger.error(f"🧪 [EMULATOR] WebSocket 처리 오류: {e}")
+        finally:
+            ping_task.cancel()
+            self._sessions.discard(session)
+        return ws
+
+    def _handle_ws_message(self, session: _WsSession, data: Dict) -> Optional[Dict]:
+        trnm = data.get("trnm")
+        if trnm == "PING":
+            return None
+
+        if trnm == "LOGIN":
+            if not self._token_valid(data.get("token")):
+                return {"trnm": "LOGIN", "return_code": 805004, "return_msg": "토큰이 유효하지 않습니다"}
+            session.logged_in = True
+            return {"trnm": "LOGIN", "return_code": 0, "return_msg": "", "sor_yn": "N"}
+
+        if not session.logged_in:
+            return {"trnm": trnm, "return_code": 100013, "return_msg": "LOGIN 후 요청하세요"}
+
+        if trnm == "CNSRLST":
+            session.condition_list_loaded = True
+            return {"trnm": "CNSRLST", "return_code": 0, "return_msg": "",
+                    "data": [[c["seq"], c["name"]] for c in self.conditions]}
+
+        if trnm == "CNSRREQ":
+            seq = str(data.get("seq", "")).strip()
+            if not session.condition_list_loaded:
+                return {"trnm": "CNSRREQ", "seq": seq, "return_code": 1,
+                        "return_msg": "조건검색 목록조회(CNSRLST) 후 요청하세요"}
+            condition = next((c for c in self.conditions if c["seq"] == seq), None)
+            if condition is None:
+                return {"trnm": "CNSRREQ", "seq": seq, "return_code": 1, "return_msg": "조건식이 없습니다"}
+
+            items = []
+            for code in condition["codes"]:
+                path = self.get_symbol(code)
+                diff = path.price - path.prev_close
+                items.append({
+                    "9001": f"A{code}",
+                    "302": path.name,
+                    "10": str(path.price),
+                    "11": str(diff),
+                    "12": f"{diff / path.prev_close * 100:.2f}",
+                    "13": str(path.cum_volume),
+                })
+            return {"trnm": "CNSRREQ", "seq": seq, "cont_yn": "N", "next_key": "",
+                    "return_code": 0, "return_msg": "", "data": items}
+
+        if trnm in ("REG", "REMOVE"):
+            codes = []
+            for entry in data.get("data") or []:
+                codes.extend(str(c).replace("A", "") for c in entry.get("item") or [])
+            if trnm == "REG":
+                if str(data.get("refresh", "1")) == "0":
+                    session.codes.clear()
+                for code in codes:
+                    self.get_symbol(code)
+                session.codes.update(codes)
+            else:
+                session.codes.difference_update(codes)
+            return {"trnm": trnm, "return_code": 0, "return_msg": ""}
+
+        return {"trnm": trnm, "return_code": 1, "return_msg": f"지원하지 않는 trnm: {trnm}"}
+
+    # ===== 시세 진행 =====
+
+    async def _tick_loop(self):
+        """tick_interval마다 생성된 모든 종목 가격을 진행하고 구독자에게 REAL(0B) 전송"""
+        while True:
+            await asyncio.sleep(self.tick_interval)
+            try:
+                now = datetime.now()
+                ticked: Dict[str, Dict] = {}
+                for code, path in list(self._symbols.items()):
+                    if path.rng.random() > self.tick_probability:
+                        continue
+                    volume = path.step(now)
+                    self._match_open_orders(code, path.price)
+                    diff = path.price - path.prev_close
+                    ticked[code] = {
+                        "type": "0B",
+                        "name": "주식체결",
+                        "item": code,
+                        "values": {
+                            "20": now.strftime("%H%M%S"),
+                            "10": signed(path.price, path.prev_close),
+                            "11": signed(diff, 0),
+                            "12": f"{diff / path.prev_close * 100:+.2f}",
+                            "13": str(path.cum_volume),
+                            "15": f"+{volume}" if path.rng.random() < 0.5 else f"-{volume}",
+                        },
+                    }
+                self.stats["ticks"] += len(ticked)
+
+                for session in list(self._sessions):
+                    items = [ticked[code] for code in session.codes if code in ticked]
+                    if items:
+                        await self._ws_send(session, {"trnm": "REAL", "data": items})
+                        self.stats["real_messages"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"🧪 [EMULATOR] 시세 진행 오류: {e}")
+
+    def _match_open_orders(self, code: str, price: int):
+        """가격 도달한 지정가 주문 체결"""
+        account = self.account
+        remaining = []
+        for order in account.open_orders:
+            hit = order["code"] == code and (
+                price <= order["price"] if order["side"] == "1" else price >= order["price"])
+            if hit and account.fill(code, order["side"], order["qty"], order["price"]) is None:
+                continue
+            remaining.append(order)
+        account.open_orders = remaining
+
+
+async def _serve(args: argparse.Namespace):
+    emulator = KiwoomEmulator(
+        host=args.host, port=args.port, seed=args.seed,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        rate_limit=args.rate_limit, rate_window=args.rate_window,
+        tick_interval=args.tick_interval, tick_probability=args.tick_probability,
+        universe_size=args.universe, conditions=args.conditions, condition_size=args.condition_size,
+        cash=args.cash,
+    )
+    await emulator.start()
+    print("=" * 70)
+    print(f"Kiwoom emulator listening on {emulator.base_url}")
+    print(f"  KIWOOM_USE_MOCK_ACCOUNT=true")
+    print(f"  KIWOOM_MOCK_API_URL={emulator.base_url}")
+    print(f"  KIWOOM_MOCK_WS_URL={emulator.ws_url}")
+    print("=" * 70)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await emulator.stop()
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="키움 REST/WebSocket 로컬 에뮬레이터")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=9443)
+    p.add_argument("--seed", type=int, default=42, help="가격 경로 시드 (같은 시드면 같은 가격열)")
+    p.add_argument("--latency-ms", type=float, default=0.0, help="응답 지연 평균 (ms)")
+    p.add_argument("--jitter-ms", type=float, default=0.0, help="응답 지연 변동폭 (±ms)")
+    p.add_argument("--rate-limit", type=int, default=5, help="rate-window초당 허용 REST 호출 수 (0: 무제한)")
+    p.add_argument("--rate-window", type=float, default=1.0, help="호출 제한 윈도우 (초)")
+    p.add_argument("--tick-interval", type=float, default=0.5, help="시세 진행 간격 (초)")
+    p.add_argument("--tick-probability", type=float, default=1.0, help="간격마다 종목별 체결 발생 확률")
+    p.add_argument("--universe", type=int, default=200, help="조건식 검색 대상 종목 수")
+    p.add_argument("--conditions", type=int, default=3, help="조건식 개수")
+    p.add_argument("--condition-size", type=int, default=20, help="조건식별 편입 종목 수")
+    p.add_argument("--cash", type=int, default=10_000_000, help="초기 예수금 (원)")
+    p.add_argument("--log-level", default="INFO")
+    args = p.parse_args()
+
+    logging.basicConfig(level=args.log_level, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+"""
+장 운영 시간 유틸리티 (KRX 정규장 평일 09:00 ~ 15:30, 한국 시간 기준 naive datetime)
+
+캐시 만료 시각 계산에 사용한다. 완성된 봉은 다음 봉 마감 전까지 늘지 않고,
+장 마감 후에는 다음 장 시작 전까지 어떤 시세도 바뀌지 않는다.
+"""
+from datetime import datetime, time, timedelta
+from typing import Optional
+
+from core.config import Config
+
+SESSION_OPEN = time(9, 0)
+SESSION_CLOSE = time(15, 30)
+
+# 봉 마감 직후 서버 집계가 끝날 때까지 두는 여유 (초)
+BAR_CLOSE_GRACE = 2.0
+
+
+def is_trading_day(day: datetime) -> bool:
+    """평일 여부 (공휴일은 고려하지 않음)"""
+    return day.weekday() < 5
+
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    """정규장 시간 여부 (평일 09:00 ~ 15:30)"""
+    now = now or datetime.now()
+    return is_trading_day(now) and SESSION_OPEN <= now.time() <= SESSION_CLOSE
+
+
+def next_session_open(now: Optional[datetime] = None) -> datetime:
+    """다음 장 시작 시각 (장 시작 이후면 다음 거래일)"""
+    now = now or datetime.now()
+    day = now.date()
+    if now.time() >= SESSION_OPEN:
+        day += timedelta(days=1)
+    candidate = datetime.combine(day, SESSION_OPEN)
+    while not is_trading_day(candidate):
+        candidate += timedelta(days=1)
+    return candidate
+
+
+def timeframe_minutes(timeframe: Optional[str]) -> Optional[int]:
+    """'5M' -> 5, '1D' -> 0 (일봉), None/틱 -> None"""
+    if not timeframe:
+        return None
+    timeframe = timeframe.strip().upper()
+    if timeframe.endswith("M") and timeframe[:-1].isdigit():
+        return int(timeframe[:-1])
+    return 0
+
+
+def _next_boundary(now: datetime, minutes: int) -> datetime:
+    """자정 기준 minutes분 단위의 다음 경계 (09:00은 1~60분 모든 주기의 경계)"""
+    midnight = datetime.combine(now.date(), time())
+    step = minutes * 60
+    elapsed = int((now - midnight).total_seconds())
+    return midnight + timedelta(seconds=(elapsed // step + 1) * step)
+
+
+def next_bar_close(timeframe: Optional[str], now: Optional[datetime] = None) -> datetime:
+    """현재 형성 중인 봉이 마감되는 시각 (일봉은 15:30, 장 밖이면 다음 장 시작)"""
+    now = now or datetime.now()
+    if not is_market_open(now) or now.time() == SESSION_CLOSE:
+        return next_session_open(now)
+    session_close = datetime.combine(now.date(), SESSION_CLOSE)
+    minutes = timeframe_minutes(timeframe)
+    if not minutes:
+        return session_close
+    return min(_next_boundary(now, minutes), session_close)
+
+
+def upcoming_bar_close(timeframe: Optional[str], now: Optional[datetime] = None) -> datetime:
+    """다음 봉 마감 시각 (봉 마감 스캔 스케줄용)
+
+    next_bar_close와 달리 장 시작 09:00 자체는 봉 마감이 아니므로 장 밖이면 다음 장의 첫 봉 마감을 돌려준다.
+    ALLOW_OUT_OF_MARKET_TRADING이면 장 밖에서도 자정 기준 경계 사용 (에뮬레이터 테스트용)
+    """
+    now = now or datetime.now()
+    if not is_market_open(now) or now.time() == SESSION_CLOSE:
+        minutes = timeframe_minutes(timeframe)
+        if Config.ALLOW_OUT_OF_MARKET_TRADING and minutes:
+            return _next_boundary(now, minutes)
+        now = next_session_open(now)
+    return next_bar_close(timeframe, now)
+
+
+def cache_ttl(max_age: float, timeframe: Optional[str] = None, now: Optional[datetime] = None) -> float:
+    """시세/차트 캐시 항목의 유효 시간 (초)
+
+    - 장중: max_age와 다음 봉 마감(+여유)까지 남은 시간 중 짧은 쪽 (timeframe이 없으면 max_age)
+    - 장 마감 후: 다음 장 시작까지 (그 사이에는 바뀌지 않음)
+    - ALLOW_OUT_OF_MARKET_TRADING이면 장 밖에서도 장중처럼 계산 (에뮬레이터 테스트용)
+    - max_age <= 0이면 0 (강제 갱신)
+    """
+    if max_age <= 0:
+        return 0.0
+    now = now or datetime.now()
+    minutes = timeframe_minutes(timeframe)
+    if is_market_open(now):
+        if minutes is None:
+            return max_age
+        until_close = (next_bar_close(timeframe, now) - now).total_seconds()
+        return min(max_age, until_close + BAR_CLOSE_GRACE)
+    if Config.ALLOW_OUT_OF_MARKET_TRADING:
+        if not minutes:
+            return max_age
+        until_close = (_next_boundary(now, minutes) - now).total_seconds()
+        return min(max_age, until_close + BAR_CLOSE_GRACE)
+    return (next_session_open(now) - now).total_seconds()
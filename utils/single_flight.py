@@ -0,0 +1,75 @@
+"""
+동일 요청 합치기 (single-flight) - 같은 키로 진행 중인 요청이 있으면 새로 보내지 않고 그 결과를 공유
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    __slots__ = ("task", "priority", "waiters")
+
+    def __init__(self, task: asyncio.Task, priority: int):
+        self.task = task
+        self.priority = priority
+        self.waiters = 1
+
+
+class SingleFlight:
+    """키별 진행 중인 요청(asyncio.Task) 공유
+
+    먼저 온 호출이 loader를 태스크로 실행하고, 끝나기 전에 같은 키로 들어온 호출은
+    그 태스크의 결과(또는 예외)를 그대로 받는다. 결과는 완료 즉시 잊으므로 캐시가 아니다.
+
+    priority는 값이 작을수록 급한 요청 (APIPriority와 같은 순서). 진행 중인 요청보다
+    급한 호출은 덜 급한 요청의 호출 허가 대기에 묶이지 않도록 새 요청을 보내고,
+    이후 같은 키 호출은 새 요청에 합류한다.
+    호출자가 취소되어도 공유 태스크는 취소하지 않는다 (다른 대기자가 있을 수 있음).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.calls = 0
+        self.shared = 0
+        self.escalations = 0
+
+    async def do(self, key: Hashable, loader: Callable[[], Awaitable[Any]], priority: int = 0) -> Any:
+        self.calls += 1
+        flight = self._flights.get(key)
+        if flight is not None and not flight.task.done():
+            if flight.priority <= priority:
+                flight.waiters += 1
+                self.shared += 1
+                logger.debug(f"🔗 [SINGLE_FLIGHT] {self.name} 진행 중인 요청에 합류: {key} (대기 {flight.waiters})")
+                return await asyncio.shield(flight.task)
+            self.escalations += 1
+
+        task = asyncio.create_task(loader())
+        flight = self._flights[key] = _Flight(task, priority)
+        task.add_done_callback(lambda _: self._forget(key, flight))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # 대기자가 모두 취소된 경우에도 예외가 '검색되지 않음' 경고로 남지 않게 소비
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def in_flight(self, key: Optional[Hashable] = None) -> int:
+        if key is not None:
+            flight = self._flights.get(key)
+            return flight.waiters if flight is not None else 0
+        return len(self._flights)
+
+    def get_status_info(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "escalations": self.escalations,
+            "in_flight": len(self._flights),
+            "saved_ratio": round(self.shared / self.calls, 3) if self.calls else 0.0,
+        }
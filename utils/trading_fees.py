@@ -0,0 +1,75 @@
+"""
+키움 수수료/제세금 모델 - 보유 종목 평가금액/손익 계산 (키움 HTS 잔고 화면과 같은 방식)
+
+모의투자 계좌: 매도 수수료 0.35%, 제세금 총 0.557% (기본 0.23% + 제세금1+2+3+농특세)
+실계좌: 매도 수수료 0.015% (10원 미만 절사), 제세금 0.05% + 0.15% (각각 원 미만 절사)
+매입금액(계좌의 실제 매입금액)에는 매수 수수료를 더하지 않는다.
+"""
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from core.config import Config
+
+
+def _is_mock(mock: Optional[bool]) -> bool:
+    return Config.KIWOOM_USE_MOCK_ACCOUNT if mock is None else mock
+
+
+def sell_costs(price: float, quantity: int, mock: Optional[bool] = None) -> Tuple[int, int]:
+    """(매도 수수료, 제세금) - mock 미지정 시 현재 설정(KIWOOM_USE_MOCK_ACCOUNT) 기준"""
+    amount = price * quantity
+    if _is_mock(mock):
+        return math.floor(amount * 0.0035), math.floor(amount * 0.00557)
+    sell_fee = math.floor(amount * 0.00015 / 10) * 10
+    tax = math.floor(amount * 0.0005) + math.floor(amount * 0.0015)
+    return sell_fee, tax
+
+
+def evaluate_position(current_price: float, quantity: int, buy_amount: float,
+                      mock: Optional[bool] = None) -> Tuple[float, float, float]:
+    """(평가금액, 손익, 수익률 %) - 평가금액 = 현재가 x 수량 - 매도 수수료 - 제세금"""
+    sell_fee, tax = sell_costs(current_price, quantity, mock)
+    evaluation_amount = current_price * quantity - sell_fee - tax
+    profit_loss = evaluation_amount - buy_amount
+    profit_loss_rate = (profit_loss / buy_amount) * 100 if buy_amount > 0 else 0
+    return evaluation_amount, profit_loss, profit_loss_rate
+
+
+def profit_loss_rates(prices: np.ndarray, quantity: int, buy_amount: float,
+                      mock: Optional[bool] = None) -> np.ndarray:
+    """evaluate_position의 수익률을 가격 배열 전체에 대해 계산 (백테스트용, 같은 절사 규칙)"""
+    amount = np.asarray(prices, dtype=np.float64) * quantity
+    if _is_mock(mock):
+        costs = np.floor(amount * 0.0035) + np.floor(amount * 0.00557)
+    else:
+        costs = np.floor(amount * 0.00015 / 10) * 10 + np.floor(amount * 0.0005) + np.floor(amount * 0.0015)
+    if buy_amount <= 0:
+        return np.zeros(len(amount))
+    return (amount - costs - buy_amount) / buy_amount * 100
+
+
+def price_for_rate(quantity: int, buy_amount: float, rate: float, mock: Optional[bool] = None,
+                   strict: bool = False) -> int:
+    """evaluate_position 수익률이 rate 이상(strict면 초과)이 되는 가장 낮은 정수 가격 (손절/익절 트리거 가격)
+
+    수익률은 가격에 대해 (절사 1원 단위 오차를 빼면) 증가하므로 이분 탐색으로 찾는다.
+    """
+    def reached(price: int) -> bool:
+        current = evaluate_position(price, quantity, buy_amount, mock)[2]
+        return current > rate if strict else current >= rate
+
+    if quantity <= 0 or buy_amount <= 0:
+        return 0
+    low, high = 0, max(1, math.ceil(buy_amount / quantity * (1 + rate / 100) * 1.02) + 1)
+    while not reached(high):
+        high *= 2
+    # reached(low) 거짓, reached(high) 참을 유지
+    while high - low > 1:
+        middle = (low + high) // 2
+        if reached(middle):
+            high = middle
+        else:
+            low = middle
+    return high